@@ -0,0 +1,2 @@
+from kubr.backends.base import JobNotFoundError, KubrError
+from kubr.sdk import BatchError, Client
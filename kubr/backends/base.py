@@ -18,6 +18,17 @@ class JobOperationStatus(PrettyEnum):
     Failed = "Failed"
 
 
+class KubrError(Exception):
+    pass
+
+
+class JobNotFoundError(KubrError):
+    def __init__(self, job_name: str, namespace: str):
+        super().__init__(f"Job {job_name} not found in namespace {namespace}")
+        self.job_name = job_name
+        self.namespace = namespace
+
+
 class BaseBackend:
     def __init__(self):
         pass
@@ -36,3 +47,39 @@ class BaseBackend:
 
     def describe_job(self, *args, **kwargs):
         raise NotImplementedError
+
+    def get_job(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_checkpoint_marker(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_job_pods(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def job_placement(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_replica_pod(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def exec_in_replica(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def port_forward(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def stream_replica_log(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def list_jobs_at_version(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def watch_jobs(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def restart_job(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_watchdog_config(self, *args, **kwargs):
+        raise NotImplementedError
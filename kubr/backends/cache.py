@@ -0,0 +1,282 @@
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import urllib3
+
+from kubr.backends.base import BaseBackend, KubrError
+from kubr.backends.informer import Informer
+from kubr.backends.k8s_runner import LABEL_COMPLETION_INDEX, LABEL_JOB_NAME, LABEL_REPLICA_ID
+from kubr.backends.queues import GPU_RESOURCE, QueueInfo, queue_info
+from kubr.config.job import Job, JobState
+
+CACHE_PORT = 8080
+
+_GZIP_MIN_BYTES = 1024
+
+
+def _pod_summary(pod: Dict[str, Any]) -> Dict[str, Any]:
+    labels = pod["metadata"].get("labels") or {}
+    return {
+        "name": pod["metadata"]["name"],
+        "namespace": pod["metadata"]["namespace"],
+        "job": labels.get(LABEL_JOB_NAME),
+        "rank": int(labels.get(LABEL_REPLICA_ID, labels.get(LABEL_COMPLETION_INDEX, 0))),
+        "node": pod["spec"].get("nodeName"),
+        "phase": (pod.get("status") or {}).get("phase"),
+    }
+
+
+def _node_summary(node: Dict[str, Any]) -> Dict[str, Any]:
+    status = node.get("status") or {}
+    conditions = status.get("conditions") or []
+    return {
+        "name": node["metadata"]["name"],
+        "ready": any(c["type"] == "Ready" and c["status"] == "True" for c in conditions),
+        "gpu": int(float((status.get("allocatable") or {}).get(GPU_RESOURCE, 0))),
+    }
+
+
+class ClusterCache:
+    """In-memory view of the jobs of every backend, kubr pods, queues and nodes of a cluster.
+
+    Every kind is kept by an ``Informer``, so the whole cluster is watched over one connection per kind no
+    matter how many users query it. Jobs are indexed by namespace and pods by job.
+
+    Args:
+        backend (BaseBackend): Backend providing ``crd_client`` and ``core_client``. The jobs of every backend
+            of a ``ClusterBackend`` are cached, otherwise the ones of the backend, see ``job_informer_source``.
+        watch_seconds (int, optional): Lifetime of a single watch request. Defaults to 300.
+    """
+
+    def __init__(self, backend: BaseBackend, watch_seconds: int = 300):
+        crd, core = backend.crd_client, backend.core_client
+        self.jobs: List[Informer] = []
+        for job_backend in list(getattr(backend, "backends", {}).values()) or [backend]:
+            list_call, to_job = job_backend.job_informer_source()
+            self.jobs.append(
+                Informer(
+                    list_call,
+                    lambda obj, to_job=to_job: to_job(obj).model_dump(mode="json"),
+                    index=lambda job: job["namespace"],
+                    watch_seconds=watch_seconds,
+                    name=f"{job_backend.kind} jobs",
+                )
+            )
+        self.pods = Informer(
+            partial(core.list_pod_for_all_namespaces, label_selector=LABEL_JOB_NAME),
+            _pod_summary,
+            index=lambda pod: f"{pod['namespace']}/{pod['job']}",
+            watch_seconds=watch_seconds,
+            name="pods",
+        )
+        self.queues = Informer(
+            partial(crd.list_cluster_custom_object, group="scheduling.volcano.sh", version="v1beta1", plural="queues"),
+            lambda obj: queue_info(obj).model_dump(),
+            watch_seconds=watch_seconds,
+            name="queues",
+        )
+        self.nodes = Informer(core.list_node, _node_summary, watch_seconds=watch_seconds, name="nodes")
+        self.informers = self.jobs + [self.pods, self.queues, self.nodes]
+
+    def start(self) -> "ClusterCache":
+        for informer in self.informers:
+            informer.start()
+        return self
+
+    def stop(self):
+        for informer in self.informers:
+            informer.stop()
+
+    def wait_synced(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every kind was listed once, returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for informer in self.informers:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not informer.synced.wait(remaining):
+                return False
+        return True
+
+    def failing(self) -> List[str]:
+        """Kinds whose informer failed to sync repeatedly, their objects may be stale."""
+        return [informer.name for informer in self.informers if not informer.healthy]
+
+    @property
+    def version(self) -> Tuple[int, ...]:
+        """Changes whenever any stored object changed."""
+        return tuple(informer.version for informer in self.informers)
+
+    def list_jobs(
+        self, namespace: str = "All", state: Optional[str] = None, backend: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        jobs = [job for informer in self.jobs for job in informer.items(None if namespace == "All" else namespace)]
+        return [
+            job
+            for job in jobs
+            if (state is None or job["state"] == state) and (backend is None or job["backend"] == backend)
+        ]
+
+    def job_pods(self, namespace: str, job_name: str) -> List[Dict[str, Any]]:
+        return sorted(self.pods.items(f"{namespace}/{job_name}"), key=lambda pod: pod["rank"])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "CacheServer"
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes, Nagle would hold the body back for the delayed ACK of the headers
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, compressed: bool = False):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/healthz":
+            synced = self.server.cache.wait_synced(timeout=0)
+            failing = self.server.cache.failing()
+            body = json.dumps({"synced": synced, "failing": failing}, separators=(",", ":")).encode()
+            self._send(200 if synced and not failing else 503, body)
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        answer = self.server.answer(url.path, query)
+        if answer is None:
+            self._send(404, b'{"error":"not found"}')
+            return
+        plain, compressed = answer
+        if compressed is not None and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            self._send(200, compressed, compressed=True)
+        else:
+            self._send(200, plain)
+
+
+class CacheServer(ThreadingHTTPServer):
+    """Serves compact JSON answers from a ``ClusterCache`` for ``kubr ls``, completion, queue selection and stat.
+
+    Answers are serialized and gzipped once per cache version, so identical requests of many users cost
+    a dictionary lookup until the cluster changes.
+
+    Endpoints: ``/healthz``, ``/v1/jobs?namespace=&state=&backend=``, ``/v1/completion?state=&backend=``,
+    ``/v1/pods?namespace=&job=``, ``/v1/queues`` and ``/v1/nodes``.
+
+    Args:
+        cache (ClusterCache): Cache to serve.
+        host (str, optional): Address to listen on. Defaults to "0.0.0.0".
+        port (int, optional): Port to listen on, 0 picks a free one. Defaults to 8080.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, cache: ClusterCache, host: str = "0.0.0.0", port: int = CACHE_PORT):
+        super().__init__((host, port), _Handler)
+        self.cache = cache
+        self._answers: Dict[str, Tuple[Tuple[int, ...], bytes, Optional[bytes]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CacheServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def _payload(self, path: str, query: Dict[str, str]) -> Optional[Any]:
+        cache = self.cache
+        if path == "/v1/jobs":
+            return {"items": cache.list_jobs(query.get("namespace", "All"), query.get("state"), query.get("backend"))}
+        if path == "/v1/completion":
+            jobs = cache.list_jobs(
+                query.get("namespace", "All"), query.get("state", str(JobState.Running)), query.get("backend")
+            )
+            return {"items": [job["name"] for job in jobs]}
+        if path == "/v1/pods":
+            return {"items": cache.job_pods(query.get("namespace", "default"), query.get("job", ""))}
+        if path == "/v1/queues":
+            return {"items": cache.queues.items()}
+        if path == "/v1/nodes":
+            return {"items": cache.nodes.items()}
+        return None
+
+    def answer(self, path: str, query: Dict[str, str]) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        """Serialized and, when large, gzipped answer, reused while the cache did not change."""
+        key = f"{path}?{sorted(query.items())}"
+        version = self.cache.version
+        with self._lock:
+            cached = self._answers.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        payload = self._payload(path, query)
+        if payload is None:
+            return None
+        plain = json.dumps(payload, separators=(",", ":")).encode()
+        compressed = gzip.compress(plain, compresslevel=1) if len(plain) >= _GZIP_MIN_BYTES else None
+        with self._lock:
+            self._answers[key] = (version, plain, compressed)
+        return plain, compressed
+
+
+class CacheClient:
+    """Reads cluster state from a kubr cache server instead of listing it from the API server.
+
+    Args:
+        url (str): Base url of the cache server, e.g. ``http://kube-research.kubr.svc:8080``.
+        timeout (float, optional): Request timeout in seconds. Defaults to 5.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._pool = urllib3.PoolManager(retries=False, timeout=timeout)
+
+    def _get(self, path: str, **params) -> Dict[str, Any]:
+        fields = {key: value for key, value in params.items() if value is not None}
+        response = self._pool.request(
+            "GET", self.url + path, fields=fields, headers={"Accept-Encoding": "gzip"}, timeout=self.timeout
+        )
+        if response.status != 200:
+            raise KubrError(f"Cache server {self.url} answered {response.status} to {path}")
+        return json.loads(response.data)
+
+    def list_jobs(
+        self, namespace: str = "All", state: Optional[str] = None, backend: Optional[str] = None
+    ) -> List[Job]:
+        """Jobs of a namespace or, for "All", of the cluster, only the ones of ``backend`` when given."""
+        items = self._get("/v1/jobs", namespace=namespace, state=state, backend=backend)["items"]
+        return [Job(**dict(item, age=datetime.fromisoformat(item["age"]))) for item in items]
+
+    def running_job_names(self, backend: Optional[str] = None) -> List[str]:
+        return self._get("/v1/completion", backend=backend)["items"]
+
+    def job_pods(self, namespace: str, job_name: str) -> List[Dict[str, Any]]:
+        """Name, rank, node and phase of the pods of a job, ordered by rank."""
+        return self._get("/v1/pods", namespace=namespace, job=job_name)["items"]
+
+    def queues(self) -> List[QueueInfo]:
+        return [QueueInfo(**queue) for queue in self._get("/v1/queues")["items"]]
+
+
+def cache_client_from_env() -> Optional[CacheClient]:
+    """Client of the cache server at ``$KUBR_CACHE_URL``, None when it is not set."""
+    url = os.environ.get("KUBR_CACHE_URL")
+    return CacheClient(url) if url else None
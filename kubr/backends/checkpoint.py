@@ -0,0 +1,96 @@
+import time
+from typing import Callable, Optional
+
+from kubr.backends.base import BaseBackend, JobOperationStatus
+from kubr.config.job import TERMINAL_JOB_STATES, Job, JobState
+from kubr.config.runner import CheckpointConfig, RunnerConfig
+
+
+class CheckpointRetryPolicy:
+    """Decides whether and when a finished job is resubmitted from its latest checkpoint.
+
+    Args:
+        config (CheckpointConfig): Checkpoint configuration of the job.
+    """
+
+    def __init__(self, config: CheckpointConfig):
+        self.config = config
+
+    def should_resubmit(self, state: JobState, resubmits: int) -> bool:
+        if state == JobState.Completed:
+            return False
+        return state in TERMINAL_JOB_STATES and resubmits < self.config.max_resubmits
+
+    def backoff(self, resubmits: int) -> float:
+        return min(self.config.backoff_seconds * 2**resubmits, self.config.max_backoff_seconds)
+
+    def resume_config(self, run_config: RunnerConfig, checkpoint: Optional[str]) -> RunnerConfig:
+        """Copy of ``run_config`` resuming from ``checkpoint``, or restarting from scratch if there is none."""
+        resumed = run_config.model_copy(deep=True)
+        resumed.checkpoint.resume_from = checkpoint
+        return resumed
+
+
+class ResubmissionLoop:
+    """Runs a job until it completes, resubmitting it from the latest checkpoint on failure or preemption.
+
+    The latest checkpoint is remembered across attempts, so an attempt that dies without reporting a
+    checkpoint (e.g. its node was lost) resumes from the one reported by an earlier attempt.
+
+    Args:
+        backend (BaseBackend): Backend to submit jobs to.
+        run_config (RunnerConfig): Configuration of the job, must have ``checkpoint`` set.
+        poll_interval (float, optional): Seconds between job state checks. Defaults to 10.
+        on_resubmit (Optional[Callable[[Job, Optional[str], float], None]], optional): Called with the
+            finished job, the checkpoint to resume from and the backoff before each resubmission.
+        sleep (Callable[[float], None], optional): Sleep function, replaceable in tests. Defaults to time.sleep.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        run_config: RunnerConfig,
+        poll_interval: float = 10,
+        on_resubmit: Optional[Callable[[Job, Optional[str], float], None]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if run_config.checkpoint is None:
+            raise ValueError("Checkpoint-aware resubmission requires checkpoint config")
+        self.backend = backend
+        self.run_config = run_config
+        self.policy = CheckpointRetryPolicy(run_config.checkpoint)
+        self.poll_interval = poll_interval
+        self.on_resubmit = on_resubmit
+        self.sleep = sleep
+        self.resubmits = 0
+        self.latest_checkpoint: Optional[str] = run_config.checkpoint.resume_from
+
+    def wait(self, job: Job) -> Job:
+        while True:
+            job = self.backend.get_job(job_name=job.name, namespace=job.namespace)
+            if job.state in TERMINAL_JOB_STATES:
+                return job
+            self.sleep(self.poll_interval)
+
+    def run(self) -> Job:
+        run_config = self.run_config
+        job, status = self.backend.run_job(run_config)
+        while status == JobOperationStatus.Success:
+            job = self.wait(job)
+            if not self.policy.should_resubmit(job.state, self.resubmits):
+                return job
+
+            self.latest_checkpoint = (
+                self.backend.get_checkpoint_marker(job_name=job.name, namespace=job.namespace) or self.latest_checkpoint
+            )
+            backoff = self.policy.backoff(self.resubmits)
+            if self.on_resubmit is not None:
+                self.on_resubmit(job, self.latest_checkpoint, backoff)
+
+            self.backend.delete_job(job_name=job.name, namespace=job.namespace)
+            self.sleep(backoff)
+            self.resubmits += 1
+            run_config = self.policy.resume_config(self.run_config, self.latest_checkpoint)
+            job, status = self.backend.run_job(run_config)
+
+        raise RuntimeError(f"Job {run_config.experiment.name} submission failed")
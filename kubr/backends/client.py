@@ -0,0 +1,192 @@
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from kubernetes import client, config
+from rich.table import Table
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_NAMESPACE_RE = re.compile(r"/namespaces/[^/]+")
+
+
+class _ThrottleAwareRetry(Retry):
+    """Retries 429 responses for every method: a throttled request was never processed, so even POST is safe."""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class TokenBucket:
+    """Client-side rate limiter allowing ``qps`` requests per second on average and bursts of ``burst``.
+
+    Args:
+        qps (float): Sustained requests per second, non-positive disables limiting.
+        burst (int): Maximum number of requests issued back to back.
+    """
+
+    def __init__(self, qps: float, burst: int):
+        self.qps = qps
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.qps <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.qps)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.qps if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def endpoint_template(method: str, url: str) -> str:
+    """Groups API calls by endpoint, e.g. ``GET /api/v1/namespaces/{namespace}/pods/{name}/log``."""
+    path = url.split("://", 1)[-1]
+    path = path[path.find("/") :].split("?", 1)[0]
+    path = _NAMESPACE_RE.sub("/namespaces/{namespace}", path)
+    parts = path.split("/")
+    # /api/<version>/<resource> and /apis/<group>/<version>/<resource>, namespaced paths are two parts longer
+    resource_index = 3 if len(parts) > 1 and parts[1] == "api" else 4
+    if "{namespace}" in parts:
+        resource_index += 2
+    if len(parts) > resource_index + 1:
+        parts[resource_index + 1] = "{name}"
+    return f"{method} {'/'.join(parts)}"
+
+
+class ApiStats:
+    """Thread-safe per-endpoint counters of API calls, errors and latency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.max_seconds: Dict[str, float] = defaultdict(float)
+
+    def record(self, endpoint: str, seconds: float, failed: bool):
+        with self._lock:
+            self.calls[endpoint] += 1
+            self.errors[endpoint] += failed
+            self.seconds[endpoint] += seconds
+            self.max_seconds[endpoint] = max(self.max_seconds[endpoint], seconds)
+
+    def table(self) -> Table:
+        table = Table(title="API calls", width=120)
+        table.add_column("Endpoint", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Errors", justify="right", style="red")
+        table.add_column("Mean (ms)", justify="right", style="yellow")
+        table.add_column("Max (ms)", justify="right", style="yellow")
+        for endpoint in sorted(self.calls, key=self.seconds.get, reverse=True):
+            calls = self.calls[endpoint]
+            table.add_row(
+                endpoint,
+                str(calls),
+                str(self.errors[endpoint]),
+                f"{self.seconds[endpoint] / calls * 1000:.1f}",
+                f"{self.max_seconds[endpoint] * 1000:.1f}",
+            )
+        return table
+
+
+class TunedApiClient(client.ApiClient):
+    """ApiClient that rate limits requests, applies a default timeout and records per-endpoint statistics.
+
+    Streaming requests (watches, followed logs) only get the connect timeout, since they may stay idle
+    for long periods by design.
+
+    Args:
+        configuration (client.Configuration): Client configuration, with retries and pool size already set.
+        rate_limiter (TokenBucket): Limiter shared by all requests of the client.
+        timeout (Tuple[float, float]): Default (connect, read) timeout in seconds.
+        stats (Optional[ApiStats], optional): Statistics sink. Defaults to a new ApiStats.
+    """
+
+    def __init__(
+        self,
+        configuration: client.Configuration,
+        rate_limiter: TokenBucket,
+        timeout: Tuple[float, float],
+        stats: Optional[ApiStats] = None,
+    ):
+        super().__init__(configuration)
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.stats = stats or ApiStats()
+
+    def request(self, method, url, *args, _preload_content=True, _request_timeout=None, **kwargs):
+        if _request_timeout is None:
+            _request_timeout = self.timeout if _preload_content else (self.timeout[0], None)
+        self.rate_limiter.acquire()
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = super().request(
+                method, url, *args, _preload_content=_preload_content, _request_timeout=_request_timeout, **kwargs
+            )
+            failed = False
+            return response
+        finally:
+            self.stats.record(endpoint_template(method, url), time.perf_counter() - start, failed)
+
+
+def create_api_client(
+    configuration: Optional[client.Configuration] = None,
+    qps: Optional[float] = None,
+    burst: Optional[int] = None,
+    retries: Optional[int] = None,
+    timeout: Optional[float] = None,
+    pool_maxsize: Optional[int] = None,
+) -> TunedApiClient:
+    """
+    Builds a tuned api client. Unset arguments come from ``$KUBR_API_QPS`` (default 50), ``$KUBR_API_BURST``
+    (100), ``$KUBR_API_RETRIES`` (5), ``$KUBR_API_TIMEOUT`` (30 seconds) and ``$KUBR_API_POOL_MAXSIZE`` (32).
+    Without ``configuration`` the kubeconfig or in-cluster config is loaded.
+    """
+    qps = qps if qps is not None else float(os.environ.get("KUBR_API_QPS", 50))
+    burst = burst if burst is not None else int(os.environ.get("KUBR_API_BURST", 100))
+    retries = retries if retries is not None else int(os.environ.get("KUBR_API_RETRIES", 5))
+    timeout = timeout if timeout is not None else float(os.environ.get("KUBR_API_TIMEOUT", 30))
+    pool_maxsize = pool_maxsize if pool_maxsize is not None else int(os.environ.get("KUBR_API_POOL_MAXSIZE", 32))
+
+    if configuration is None:
+        configuration = client.Configuration()
+        config.load_config(client_configuration=configuration)
+    configuration.connection_pool_maxsize = pool_maxsize
+    configuration.retries = _ThrottleAwareRetry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        backoff_factor=0.2,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    return TunedApiClient(configuration, rate_limiter=TokenBucket(qps, burst), timeout=(min(timeout, 10), timeout))
+
+
+_shared_client: Optional[TunedApiClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_api_client() -> TunedApiClient:
+    """Process-wide tuned api client, so every backend shares one connection pool and one rate limiter."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = create_api_client()
+        return _shared_client
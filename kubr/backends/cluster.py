@@ -0,0 +1,239 @@
+import json
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from kubernetes import client
+
+# backends register themselves on import
+import kubr.backends.kubernetes  # noqa: F401
+import kubr.backends.volcano  # noqa: F401
+from kubr.backends.base import BaseBackend, JobOperationStatus
+from kubr.backends.cache import CacheClient
+from kubr.backends.client import shared_api_client
+from kubr.backends.history import HistoryStore
+from kubr.backends.registry import BACKENDS
+from kubr.config.job import Job, JobBackend, JobDescription, JobRecord
+from kubr.config.runner import RunnerConfig, WatchdogConfig
+
+logger = logging.getLogger(__name__)
+
+# answered by a backend the user may not list, e.g. without RBAC on its jobs or without its CRDs installed
+UNAVAILABLE_STATUSES = (403, 404)
+
+
+class ClusterBackend(BaseBackend):
+    """Fronts every registered backend, so commands work the same whichever backend runs a job.
+
+    Jobs are submitted to the backend their config selects, listings merge the jobs of all backends and
+    every per-job call goes to the backend owning the job. The owner is found by asking every backend for the
+    job, Volcano first, and remembered. Jobs are tracked, e.g. by ``kubr wait``, over one watch per backend.
+    A backend whose jobs cannot be listed, e.g. without RBAC on them, is skipped by listings with one warning.
+    Everything else, e.g. ``history``, is served by the Volcano backend.
+
+    Args:
+        api_client (Optional[client.ApiClient], optional): Client shared by all backends. Defaults to the
+            shared client.
+        history (Optional[HistoryStore], optional): History deleted jobs are archived into. Defaults to None.
+        cache (Optional[CacheClient], optional): Cache server, see ``VolcanoBackend``. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        api_client: Optional[client.ApiClient] = None,
+        history: Optional[HistoryStore] = None,
+        cache: Optional[CacheClient] = None,
+    ):
+        api_client = api_client or shared_api_client()
+        self.backends: Dict[JobBackend, BaseBackend] = {
+            kind: backend_class(api_client=api_client, history=history, cache=cache)
+            for kind, backend_class in BACKENDS.items()
+        }
+        self.default = self.backends[JobBackend.Volcano]
+        self._owners: Dict[Tuple[str, str], BaseBackend] = {}
+        self._unavailable: Dict[JobBackend, client.ApiException] = {}
+
+    def __getattr__(self, name: str):
+        if name in ("backends", "default", "_owners", "_unavailable"):
+            raise AttributeError(name)
+        return getattr(self.default, name)
+
+    def backend_for(self, run_config: RunnerConfig) -> BaseBackend:
+        return self.backends[run_config.backend]
+
+    def owner(self, job_name: str, namespace: str) -> BaseBackend:
+        """Backend running the job, raises the 404 of the Volcano backend when no backend knows it."""
+        key = (namespace, job_name)
+        if key in self._owners:
+            return self._owners[key]
+        not_found = None
+        for backend in self.backends.values():
+            try:
+                backend.get_job(job_name, namespace)
+            except client.ApiException as e:
+                if e.status != 404:
+                    raise
+                not_found = not_found or e
+                continue
+            self._owners[key] = backend
+            return backend
+        raise not_found
+
+    def submit_job(self, run_config: RunnerConfig) -> Job:
+        job = self.backend_for(run_config).submit_job(run_config)
+        self._owners[(job.namespace, job.name)] = self.backend_for(run_config)
+        return job
+
+    def run_job(self, run_config: RunnerConfig) -> [Job, JobOperationStatus]:
+        job, status = self.backend_for(run_config).run_job(run_config)
+        if job is not None:
+            self._owners[(job.namespace, job.name)] = self.backend_for(run_config)
+        return job, status
+
+    def _each(self, call: Callable[[BaseBackend], Any]) -> Dict[JobBackend, Any]:
+        """
+        Results of ``call`` by backend, skipping the backends answering 403 or 404 from then on. Raises the error
+        of the first one when no backend is left.
+        """
+        results = {}
+        for kind, backend in self.backends.items():
+            if kind in self._unavailable:
+                continue
+            try:
+                results[kind] = call(backend)
+            except client.ApiException as e:
+                if e.status not in UNAVAILABLE_STATUSES:
+                    raise
+                self._unavailable[kind] = e
+                logger.warning("Skipping jobs of the %s backend, listing them failed: %s %s", kind, e.status, e.reason)
+        if len(self._unavailable) == len(self.backends):
+            raise next(iter(self._unavailable.values()))
+        return results
+
+    def list_jobs(self, namespace: str = "All") -> List[Job]:
+        listings = self._each(lambda backend: backend.list_jobs(namespace=namespace))
+        return [job for jobs in listings.values() for job in jobs]
+
+    def archive_finished_jobs(self, namespace: str = "All") -> int:
+        return sum(self._each(lambda backend: backend.archive_finished_jobs(namespace=namespace)).values())
+
+    def _completion_list_running_jobs(self, **kwargs):
+        listings = self._each(lambda backend: backend._completion_list_running_jobs())
+        return [name for names in listings.values() for name in names]
+
+    def list_jobs_at_version(
+        self, namespace: str = "All", label_selector: Optional[str] = None
+    ) -> Tuple[List[Job], str]:
+        """
+        Lists the jobs of every backend. A resource version is only valid for the resource it was listed from,
+        so the returned version holds one per backend, to be passed back to ``watch_jobs`` as is.
+        """
+        listings = self._each(
+            lambda backend: backend.list_jobs_at_version(namespace=namespace, label_selector=label_selector)
+        )
+        jobs = [job for backend_jobs, _ in listings.values() for job in backend_jobs]
+        versions = {str(kind): version for kind, (_, version) in listings.items()}
+        return jobs, json.dumps(versions, sort_keys=True)
+
+    def watch_jobs(
+        self,
+        resource_version: str,
+        namespace: str = "All",
+        label_selector: Optional[str] = None,
+        timeout_seconds: int = 300,
+    ) -> Iterator[Tuple[str, Optional[Job], str]]:
+        """
+        Watches the jobs of every backend at once, see ``VolcanoBackend.watch_jobs``. Each backend is watched
+        from its own thread and the yielded resource version advances the one of the backend an event came
+        from. The first error of any watch, e.g. a 410 for an expired version, is raised.
+        """
+        versions: Dict[str, str] = json.loads(resource_version)
+        events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        stopped = threading.Event()
+
+        def pump(kind: str, backend: BaseBackend):
+            try:
+                for event in backend.watch_jobs(
+                    versions[kind],
+                    namespace=namespace,
+                    label_selector=label_selector,
+                    timeout_seconds=timeout_seconds,
+                ):
+                    if stopped.is_set():
+                        return
+                    events.put((kind, event))
+            except Exception as e:
+                events.put((kind, e))
+            finally:
+                events.put((kind, None))
+
+        # only the backends listed at the version are watched
+        watched = [(kind, backend) for kind, backend in self.backends.items() if str(kind) in versions]
+        for kind, backend in watched:
+            threading.Thread(target=pump, args=(str(kind), backend), name=f"kubr-watch-{kind}", daemon=True).start()
+        try:
+            running = len(watched)
+            while running:
+                kind, event = events.get()
+                if event is None:
+                    running -= 1
+                    continue
+                if isinstance(event, Exception):
+                    raise event
+                event_type, job, versions[kind] = event
+                yield event_type, job, json.dumps(versions, sort_keys=True)
+        finally:
+            # watches of the other backends end with their next event or their timeout
+            stopped.set()
+
+    def get_job(self, job_name: str, namespace: str) -> Job:
+        return self.owner(job_name, namespace).get_job(job_name, namespace)
+
+    def delete_job(self, job_name: str, namespace: str, archive: bool = True) -> JobOperationStatus:
+        status = self.owner(job_name, namespace).delete_job(job_name, namespace, archive=archive)
+        self._owners.pop((namespace, job_name), None)
+        return status
+
+    def get_logs(self, job_name: str, namespace: str, tail: Optional[int] = None, follow: bool = False):
+        return self.owner(job_name, namespace).get_logs(job_name, namespace, tail=tail, follow=follow)
+
+    def describe_job(self, job_name: str, namespace: str) -> JobDescription:
+        return self.owner(job_name, namespace).describe_job(job_name, namespace)
+
+    def job_metadata(self, job_name: str, namespace: str) -> Tuple[str, Dict[str, str]]:
+        return self.owner(job_name, namespace).job_metadata(job_name, namespace)
+
+    def get_job_pods(self, job_name: str, namespace: str) -> List[client.V1Pod]:
+        return self.owner(job_name, namespace).get_job_pods(job_name, namespace)
+
+    def job_placement(self, job_name: str, namespace: str) -> Dict[str, Tuple[int, Optional[str]]]:
+        return self.owner(job_name, namespace).job_placement(job_name, namespace)
+
+    def get_replica_pod(self, job_name: str, namespace: str, rank: int = 0) -> client.V1Pod:
+        return self.owner(job_name, namespace).get_replica_pod(job_name, namespace, rank)
+
+    def exec_in_replica(self, job_name: str, namespace: str, command: List[str], rank: int = 0, tty: bool = False):
+        return self.owner(job_name, namespace).exec_in_replica(job_name, namespace, command, rank=rank, tty=tty)
+
+    def port_forward(self, job_name: str, namespace: str, ports: List[int], rank: int = 0):
+        return self.owner(job_name, namespace).port_forward(job_name, namespace, ports, rank=rank)
+
+    def stream_replica_log(
+        self, job_name: str, namespace: str, rank: int = 0, since_time: Optional[str] = None, follow: bool = True
+    ):
+        return self.owner(job_name, namespace).stream_replica_log(
+            job_name, namespace, rank=rank, since_time=since_time, follow=follow
+        )
+
+    def get_checkpoint_marker(self, job_name: str, namespace: str) -> Optional[str]:
+        return self.owner(job_name, namespace).get_checkpoint_marker(job_name, namespace)
+
+    def restart_job(self, job_name: str, namespace: str) -> JobOperationStatus:
+        return self.owner(job_name, namespace).restart_job(job_name, namespace)
+
+    def get_watchdog_config(self, job_name: str, namespace: str) -> Optional[WatchdogConfig]:
+        return self.owner(job_name, namespace).get_watchdog_config(job_name, namespace)
+
+    def archive_job(self, job_name: str, namespace: str) -> JobRecord:
+        return self.owner(job_name, namespace).archive_job(job_name, namespace)
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from kubr.backends.base import BaseBackend
+from kubr.config.job import GcReport, JobState
+
+GC_STATES = (JobState.Completed, JobState.Failed)
+
+DEFAULT_TTL = timedelta(days=7)
+
+
+class JobCollector:
+    """Deletes Completed and Failed jobs that finished longer than their namespace's TTL ago.
+
+    Finished Volcano jobs are never removed by the cluster, so every ``kubr ls`` pays for all jobs ever run.
+    Expired jobs are deleted in batches of ``batch_size``, each batch archived to the backend history first
+    when ``archive`` is set, then deleted by ``concurrency`` parallel requests, so a large backlog neither
+    floods the API server nor loses its records if the collection is interrupted.
+
+    Args:
+        backend (BaseBackend): Backend providing ``list_k8s_jobs``, ``archive_k8s_jobs`` and ``delete_k8s_job``.
+        ttl (timedelta, optional): Time to live of finished jobs. Defaults to 7 days.
+        namespace_ttls (Optional[Dict[str, timedelta]], optional): TTL overrides by namespace. Defaults to None.
+        namespace (str, optional): Namespace to collect, "All" for the whole cluster. Defaults to "All".
+        batch_size (int, optional): Jobs archived and deleted per batch. Defaults to 50.
+        concurrency (int, optional): Parallel deletions within a batch. Defaults to 8.
+        archive (bool, optional): Archive jobs to the backend history before deletion, when it has one.
+            Defaults to True.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        ttl: timedelta = DEFAULT_TTL,
+        namespace_ttls: Optional[Dict[str, timedelta]] = None,
+        namespace: str = "All",
+        batch_size: int = 50,
+        concurrency: int = 8,
+        archive: bool = True,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.namespace_ttls = namespace_ttls or {}
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.archive = archive and getattr(backend, "history", None) is not None
+
+    def ttl_for(self, namespace: str) -> timedelta:
+        return self.namespace_ttls.get(namespace, self.ttl)
+
+    def expired(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Raw objects of the expired jobs, oldest first; the job age is the time of its last transition."""
+        now = now or datetime.utcnow()
+        expired = []
+        for k8s_job in self.backend.list_k8s_jobs(self.namespace):
+            job = self.backend._to_job(k8s_job)
+            if job.state in GC_STATES and now - job.age >= self.ttl_for(job.namespace):
+                expired.append((job.age, k8s_job))
+        expired.sort(key=lambda item: item[0])
+        return [k8s_job for _, k8s_job in expired]
+
+    def _delete(self, k8s_job: Dict[str, Any]) -> Optional[str]:
+        try:
+            self.backend.delete_k8s_job(k8s_job)
+        except Exception as e:
+            return str(e)
+        return None
+
+    def collect(self, dry_run: bool = False, now: Optional[datetime] = None) -> GcReport:
+        k8s_jobs = self.expired(now)
+        report = GcReport()
+        if dry_run:
+            report.deleted = [self.backend._to_job(k8s_job) for k8s_job in k8s_jobs]
+            return report
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for start in range(0, len(k8s_jobs), self.batch_size):
+                batch = k8s_jobs[start : start + self.batch_size]
+                if self.archive:
+                    report.archived += self.backend.archive_k8s_jobs(batch)
+                for k8s_job, error in zip(batch, executor.map(self._delete, batch)):
+                    job = self.backend._to_job(k8s_job)
+                    if error is None:
+                        report.deleted.append(job)
+                    else:
+                        report.failed[f"{job.namespace}/{job.name}"] = error
+        return report
@@ -0,0 +1,282 @@
+import datetime
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+from kubr.backends.utils import cache_dir
+from kubr.config.job import GpuUsage, JobRecord, ResourcePeaks
+
+SUMMARY_COLUMNS = [
+    "uid",
+    "name",
+    "namespace",
+    "state",
+    "queue",
+    "user",
+    "gpu",
+    "nodes",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "archived_at",
+]
+DETAIL_COLUMNS = SUMMARY_COLUMNS + ["spec", "status", "logs_tail"]
+_INSERT = f"INSERT OR REPLACE INTO jobs ({', '.join(DETAIL_COLUMNS)}) VALUES ({', '.join('?' * len(DETAIL_COLUMNS))})"
+# below the 999 bound parameters older SQLite builds accept per statement
+_MAX_PARAMS = 500
+
+PEAK_COLUMNS = [
+    "uid",
+    "config_key",
+    "name",
+    "namespace",
+    "cpu_millicores",
+    "memory_mb",
+    "shm_mb",
+    "samples",
+    "recorded_at",
+]
+# several samplers may record the same job, every one only raises the peaks
+_UPSERT_PEAKS = f"""
+INSERT INTO peaks ({', '.join(PEAK_COLUMNS)}) VALUES ({', '.join('?' * len(PEAK_COLUMNS))})
+ON CONFLICT (uid) DO UPDATE SET
+    cpu_millicores = max(coalesce(excluded.cpu_millicores, cpu_millicores), coalesce(cpu_millicores, 0)),
+    memory_mb = max(coalesce(excluded.memory_mb, memory_mb), coalesce(memory_mb, 0)),
+    shm_mb = max(coalesce(excluded.shm_mb, shm_mb), coalesce(shm_mb, 0)),
+    samples = samples + excluded.samples,
+    recorded_at = excluded.recorded_at
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    uid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    state TEXT NOT NULL,
+    queue TEXT,
+    user TEXT,
+    gpu INTEGER NOT NULL,
+    nodes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    archived_at REAL NOT NULL,
+    spec TEXT,
+    status TEXT,
+    logs_tail TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_name ON jobs (name, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_namespace ON jobs (namespace, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_queue ON jobs (queue, state, created_at);
+CREATE TABLE IF NOT EXISTS peaks (
+    uid TEXT PRIMARY KEY,
+    config_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    cpu_millicores REAL,
+    memory_mb REAL,
+    shm_mb REAL,
+    samples INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS peaks_by_config ON peaks (config_key, recorded_at);
+"""
+# columns added after the first release, databases created before get them on open
+_ADDED_COLUMNS = {"user": "TEXT", "started_at": "REAL"}
+_USAGE_SCHEMA = """
+CREATE INDEX IF NOT EXISTS jobs_by_user ON jobs (user, created_at);
+CREATE INDEX IF NOT EXISTS jobs_by_end ON jobs (coalesce(finished_at, archived_at));
+"""
+
+USAGE_DIMENSIONS = ("namespace", "user", "queue")
+# a job holds its GPUs from its start until it finished or, if it was deleted while running, until it was archived;
+# only the part within the period counts. Jobs archived before start times were recorded count from creation.
+_USAGE = """
+SELECT {by},
+    sum(gpu * (min(coalesce(finished_at, archived_at), :until) - max(coalesce(started_at, created_at), :since))),
+    count(*)
+FROM jobs
+WHERE coalesce(finished_at, archived_at) > :since
+    AND coalesce(started_at, created_at) < :until
+    AND (started_at IS NOT NULL OR state != 'Pending')
+GROUP BY {by}
+"""
+
+
+def _to_epoch(moment: datetime.datetime) -> float:
+    return moment.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _from_epoch(seconds: Optional[float]) -> Optional[datetime.datetime]:
+    if seconds is None:
+        return None
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).replace(tzinfo=None)
+
+
+def history_path() -> Path:
+    """Location of the history database, ``$KUBR_HISTORY_PATH`` or ``history.sqlite3`` in the kubr cache dir."""
+    return Path(os.environ.get("KUBR_HISTORY_PATH") or cache_dir() / "history.sqlite3").expanduser()
+
+
+class HistoryStore:
+    """Local SQLite archive of finished jobs, indexed for fast filtering by name, namespace, state, queue and time.
+
+    Times are stored as UTC epoch seconds; listings only read the summary columns, so they stay fast with
+    hundreds of thousands of records, as do GPU-hour reports aggregated from the start and end times. The peak
+    resource usage of sampled jobs is kept alongside, by config.
+
+    Args:
+        path (Optional[Path], optional): Database file. Defaults to ``history_path()``.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(jobs)")}
+        with self._connection:
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    self._connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._connection.executescript(_USAGE_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def archive(self, records: Iterable[JobRecord]) -> int:
+        """Inserts or replaces records by uid, returns the number written."""
+        rows = [
+            (
+                record.uid,
+                record.name,
+                record.namespace,
+                record.state,
+                record.queue,
+                record.user,
+                record.gpu,
+                record.nodes,
+                _to_epoch(record.created_at),
+                _to_epoch(record.started_at) if record.started_at is not None else None,
+                _to_epoch(record.finished_at) if record.finished_at is not None else None,
+                _to_epoch(record.archived_at),
+                json.dumps(record.spec) if record.spec is not None else None,
+                json.dumps(record.status) if record.status is not None else None,
+                record.logs_tail,
+            )
+            for record in records
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(_INSERT, rows)
+        return len(rows)
+
+    def uids(self, namespace: Optional[str] = None, among: Optional[Iterable[str]] = None) -> Set[str]:
+        """Uids in the history, only the ones of ``among`` when given, so callers do not load every record."""
+        if among is None:
+            query, params = "SELECT uid FROM jobs", []
+            if namespace is not None:
+                query, params = query + " WHERE namespace = ?", [namespace]
+            with self._lock:
+                return {uid for (uid,) in self._connection.execute(query, params)}
+        among, found = list(among), set()
+        for start in range(0, len(among), _MAX_PARAMS):
+            chunk = among[start : start + _MAX_PARAMS]
+            query = f"SELECT uid FROM jobs WHERE uid IN ({','.join('?' * len(chunk))})"
+            params = chunk
+            if namespace is not None:
+                query, params = query + " AND namespace = ?", chunk + [namespace]
+            with self._lock:
+                found.update(uid for (uid,) in self._connection.execute(query, params))
+        return found
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        state: Optional[str] = None,
+        queue: Optional[str] = None,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+        limit: Optional[int] = 50,
+        details: bool = False,
+    ) -> List[JobRecord]:
+        """
+        Records matching all given filters, newest first. ``name`` is a glob pattern, ``since`` and ``until``
+        bound the creation time (UTC). ``details`` also loads spec, status and logs.
+        """
+        conditions, params = [], []
+        if name is not None:
+            conditions.append("name GLOB ?" if any(c in name for c in "*?[") else "name = ?")
+            params.append(name)
+        for column, value in [("namespace", namespace), ("state", state), ("queue", queue)]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(_to_epoch(until))
+
+        columns = DETAIL_COLUMNS if details else SUMMARY_COLUMNS
+        query = f"SELECT {', '.join(columns)} FROM jobs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [self._to_record(dict(zip(columns, row))) for row in rows]
+
+    def usage(self, by: str, since: datetime.datetime, until: Optional[datetime.datetime] = None) -> List[GpuUsage]:
+        """
+        GPU-hours of the archived jobs between ``since`` and ``until`` (UTC, defaults to now), by namespace, user
+        or queue, largest first. Aggregated in a single pass over the jobs that ended after ``since``.
+        """
+        if by not in USAGE_DIMENSIONS:
+            raise ValueError(f"Can not group usage by {by!r}, expected one of {', '.join(USAGE_DIMENSIONS)}")
+        until = until if until is not None else datetime.datetime.utcnow()
+        params = {"since": _to_epoch(since), "until": _to_epoch(until)}
+        with self._lock:
+            rows = self._connection.execute(_USAGE.format(by=by), params).fetchall()
+        usage = [GpuUsage(key=key, gpu_hours=(seconds or 0) / 3600, jobs=jobs) for key, seconds, jobs in rows]
+        return sorted(usage, key=lambda row: row.gpu_hours, reverse=True)
+
+    def record_peaks(self, peaks: ResourcePeaks):
+        """Adds the samples of a job, raising its stored peaks."""
+        row = [getattr(peaks, column) for column in PEAK_COLUMNS[:-1]] + [_to_epoch(peaks.recorded_at)]
+        with self._lock, self._connection:
+            self._connection.execute(_UPSERT_PEAKS, row)
+
+    def peaks(self, config_key: str, limit: Optional[int] = 20) -> List[ResourcePeaks]:
+        """Peaks of the latest jobs submitted with the config, newest first."""
+        query = f"SELECT {', '.join(PEAK_COLUMNS)} FROM peaks WHERE config_key = ? ORDER BY recorded_at DESC"
+        params: List[object] = [config_key]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [ResourcePeaks(**dict(zip(PEAK_COLUMNS, row), recorded_at=_from_epoch(row[-1]))) for row in rows]
+
+    @staticmethod
+    def _to_record(row) -> JobRecord:
+        for column in ["created_at", "started_at", "finished_at", "archived_at"]:
+            row[column] = _from_epoch(row.get(column))
+        for column in ["spec", "status"]:
+            if row.get(column) is not None:
+                row[column] = json.loads(row[column])
+        return JobRecord(**row)
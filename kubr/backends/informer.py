@@ -0,0 +1,169 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from kubernetes.client import ApiException
+
+Key = Tuple[str, str]
+
+# consecutive failed list or watch requests after which an informer reports itself unhealthy
+MAX_FAILURES = 5
+
+logger = logging.getLogger(__name__)
+
+
+class _Expired(Exception):
+    pass
+
+
+def _json_lines(response) -> Iterator[Dict[str, Any]]:
+    partial = b""
+    for chunk in response.stream(1 << 16, decode_content=True):
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if partial.strip():
+        yield json.loads(partial)
+
+
+def object_key(obj: Dict[str, Any]) -> Key:
+    return obj["metadata"].get("namespace") or "", obj["metadata"]["name"]
+
+
+class Informer:
+    """Keeps an in-memory copy of one kind of object, listed once and then kept current over a watch.
+
+    Objects are stored in their ``project``-ed, compact form, optionally grouped by an ``index`` key for fast
+    lookups, e.g. jobs by namespace. Raw JSON is read from the API without building client models. Watches
+    are resumed from the last seen resource version, expired versions fall back to listing again. Failed
+    requests are logged and retried, after ``MAX_FAILURES`` in a row the informer is no longer ``healthy``.
+
+    Args:
+        list_call (Callable): Cluster-wide list method of the kubernetes client, e.g. ``core.list_node`` or a
+            ``functools.partial`` of ``list_cluster_custom_object``. Called with ``watch=True`` to watch.
+        project (Callable[[dict], dict]): Turns an API object into the stored form.
+        index (Optional[Callable[[dict], str]], optional): Index key of a stored object. Defaults to None.
+        watch_seconds (int, optional): Lifetime of a single watch request. Defaults to 300.
+        name (str, optional): Kind of the objects, used in log messages. Defaults to "objects".
+    """
+
+    def __init__(
+        self,
+        list_call: Callable,
+        project: Callable[[Dict[str, Any]], Dict[str, Any]],
+        index: Optional[Callable[[Dict[str, Any]], str]] = None,
+        watch_seconds: int = 300,
+        name: str = "objects",
+    ):
+        self.name = name
+        self.list_call = list_call
+        self.project = project
+        self.index = index
+        self.watch_seconds = watch_seconds
+        self.synced = threading.Event()
+        self.version = 0
+        self.failures = 0
+        self._items: Dict[Key, Dict[str, Any]] = {}
+        self._indexed: Dict[str, Dict[Key, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Informer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def healthy(self) -> bool:
+        """False while the last ``MAX_FAILURES`` list or watch requests all failed."""
+        return self.failures < MAX_FAILURES
+
+    def items(self, index_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stored objects, only the ones under ``index_key`` when given."""
+        with self._lock:
+            if index_key is None:
+                return list(self._items.values())
+            return list(self._indexed.get(index_key, {}).values())
+
+    def _replace(self, objects: List[Dict[str, Any]]):
+        with self._lock:
+            self._items, self._indexed = {}, {}
+            for obj in objects:
+                self._store(object_key(obj), self.project(obj))
+            self.version += 1
+
+    def _store(self, key: Key, item: Optional[Dict[str, Any]]):
+        previous = self._items.pop(key, None)
+        if previous is not None and self.index is not None:
+            self._indexed[self.index(previous)].pop(key, None)
+        if item is not None:
+            self._items[key] = item
+            if self.index is not None:
+                self._indexed.setdefault(self.index(item), {})[key] = item
+
+    def _apply(self, event_type: str, obj: Dict[str, Any]):
+        with self._lock:
+            self._store(object_key(obj), None if event_type == "DELETED" else self.project(obj))
+            self.version += 1
+
+    def _list(self) -> str:
+        response = self.list_call(_preload_content=False)
+        data = json.loads(response.data)
+        self._replace(data["items"])
+        self.synced.set()
+        return data["metadata"]["resourceVersion"]
+
+    def _watch(self, resource_version: str) -> str:
+        response = self.list_call(
+            watch=True,
+            resource_version=resource_version,
+            timeout_seconds=self.watch_seconds,
+            allow_watch_bookmarks=True,
+            _preload_content=False,
+        )
+        try:
+            for event in _json_lines(response):
+                if self._stop.is_set():
+                    break
+                obj = event["object"]
+                if event["type"] == "ERROR":
+                    if obj.get("code") == 410:
+                        raise _Expired()
+                    raise ApiException(status=obj.get("code"), reason=obj.get("message"))
+                resource_version = obj["metadata"]["resourceVersion"]
+                if event["type"] != "BOOKMARK":
+                    self._apply(event["type"], obj)
+        finally:
+            response.release_conn()
+        return resource_version
+
+    def _run(self):
+        resource_version = None
+        while not self._stop.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._list()
+                resource_version = self._watch(resource_version)
+                self.failures = 0
+            except _Expired:
+                resource_version = None
+            except ApiException as e:
+                if e.status == 410:
+                    resource_version = None
+                else:
+                    self._failed(e)
+            except Exception as e:
+                self._failed(e)
+
+    def _failed(self, error: Exception):
+        self.failures += 1
+        logger.warning("Syncing %s failed (%d in a row): %s", self.name, self.failures, error, exc_info=error)
+        time.sleep(1)
@@ -1,7 +1,13 @@
 import shlex
 from typing import Dict, Iterable, Optional
 
-from kubernetes.client import V1ContainerPort, V1EnvVarSource, V1HostPathVolumeSource, V1SecretKeySelector
+from kubernetes.client import (
+    V1ConfigMapVolumeSource,
+    V1ContainerPort,
+    V1EnvVarSource,
+    V1HostPathVolumeSource,
+    V1SecretKeySelector,
+)
 from kubernetes.client.models import (  # noqa: F811 redefinition of unused
     V1Container,
     V1EmptyDirVolumeSource,
@@ -11,18 +17,130 @@ from kubernetes.client.models import (  # noqa: F811 redefinition of unused
     V1PodSpec,
     V1ResourceRequirements,
     V1SecurityContext,
+    V1Service,
+    V1ServicePort,
+    V1ServiceSpec,
     V1Volume,
     V1VolumeMount,
 )
 
+from kubr.backends.nccl import NetworkHints, nccl_env
 from kubr.config.job import JobType
-from kubr.config.runner import ContainerConfig, DataConfig, ResourceConfig, RunnerConfig
+from kubr.config.runner import (
+    CheckpointConfig,
+    ContainerConfig,
+    DataConfig,
+    RendezvousConfig,
+    ResourceConfig,
+    RunnerConfig,
+)
 
 RESERVED_MILLICPU = 100
 RESERVED_MEMMB = 1024
+SHM_VOLUME = "dshm"
+# /dev/shm per GPU for NCCL intra-node buffers and CUDA IPC, plus per DataLoader worker for the batches it hands over
+SHM_GB_PER_GPU = 1
+SHM_GB_PER_WORKER = 1
 
 ANNOTATION_ISTIO_SIDECAR = "sidecar.istio.io/inject"
 
+LABEL_JOB_NAME = "kubr.io/job-name"
+LABEL_REPLICA_ID = "kubr.io/replica-id"
+# GPU-hours are accounted to the user who submitted the job
+LABEL_USER = "kubr.io/user"
+# set by Kubernetes on the pods of Indexed Jobs, which share one template and so one set of kubr labels
+LABEL_COMPLETION_INDEX = "batch.kubernetes.io/job-completion-index"
+
+RDZV_WAIT_CONTAINER = "kubr-rdzv-wait"
+STARTUP_GATE_CONTAINER = "kubr-startup-gate"
+STARTUP_GATE_MESSAGE_PATH = "/dev/termination-log"
+
+# The job writes the path of its latest checkpoint here. It is used as the container termination message
+# path, so the kubelet copies the marker into the pod status when the container exits, even on eviction.
+CHECKPOINT_MARKER_PATH = "/dev/kubr-checkpoint"
+
+# Runs inside the job image (torchrun jobs always ship python) and blocks until rank 0 accepts
+# TCP connections, retrying quickly at first and backing off to at most one second.
+_RDZV_WAIT_SCRIPT = """
+import socket, sys, time
+host, port, timeout = sys.argv[1], int(sys.argv[2]), float(sys.argv[3])
+deadline, delay = time.monotonic() + timeout, 0.05
+while True:
+    try:
+        socket.create_connection((host, port), timeout=1).close()
+        break
+    except OSError as e:
+        if time.monotonic() > deadline:
+            sys.exit(f"rendezvous endpoint {host}:{port} is not reachable: {e}")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+"""
+
+# Runs as the last init container of every replica, so reaching it means the pod was scheduled, pulled the
+# job image and finished staging data. Rank 0 listens on the rendezvous port, which torchrun only binds once
+# the gate is passed, and answers every replica at once when all have connected. The seconds waited are
+# written to the termination message, where the kubelet keeps them in the pod status.
+_STARTUP_GATE_SCRIPT = """
+import os, socket, sys, time
+rank, world, host, port = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3], int(sys.argv[4])
+timeout, message_path = float(sys.argv[5]), sys.argv[6]
+if host.startswith("$"):
+    host = os.environ.get(host[1:], "").split(",")[0]
+start = time.monotonic()
+deadline = start + timeout
+
+def remaining():
+    left = deadline - time.monotonic()
+    if left <= 0:
+        sys.exit(f"startup gate: not all {world} replicas reached the gate within {timeout:g}s")
+    return left
+
+if rank == 0:
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(("", port))
+    server.listen(world)
+    peers = {}
+    while len(peers) < world - 1:
+        server.settimeout(min(remaining(), 1))
+        try:
+            conn, _ = server.accept()
+            conn.settimeout(5)
+            peer = int(conn.recv(16))
+        except (OSError, ValueError):
+            continue
+        # a replica restarted while waiting connects again
+        if peer in peers:
+            peers[peer].close()
+        peers[peer] = conn
+    for conn in peers.values():
+        conn.sendall(b"go\\n")
+else:
+    if not host:
+        sys.exit("startup gate: the rank 0 host is unknown")
+    delay = 0.05
+    while True:
+        try:
+            conn = socket.create_connection((host, port), timeout=1)
+            conn.sendall(f"{rank}\\n".encode())
+            break
+        except OSError:
+            time.sleep(min(delay, remaining()))
+            delay = min(delay * 2, 1.0)
+    conn.settimeout(remaining())
+    try:
+        released = conn.recv(16) == b"go\\n"
+    except OSError:
+        released = False
+    if not released:
+        remaining()
+        sys.exit("startup gate: rank 0 left the gate")
+waited = time.monotonic() - start
+print(f"KUBR_GATE rank={rank} world={world} waited={waited:.3f}")
+with open(message_path, "w") as message:
+    message.write(f"waited={waited:.3f}")
+"""
+
 
 class _noquote(str):
     pass
@@ -37,18 +155,81 @@ def _args_join(args: Iterable[str]) -> str:
     return " ".join(quoted)
 
 
+def rendezvous_service_name(job_name: str) -> str:
+    """Name of the headless Service that points at rank 0 of the job."""
+    return f"{job_name}-rdzv"
+
+
+def rendezvous_host(job_name: str, namespace: str) -> str:
+    """Stable DNS name of rank 0 of the job, resolvable from every replica."""
+    return f"{rendezvous_service_name(job_name)}.{namespace}.svc"
+
+
+def create_rendezvous_service(job_name: str, namespace: str, port: int) -> "V1Service":
+    """
+    Headless Service selecting only rank 0 of the job. Not-ready addresses are published so the DNS
+    record appears as soon as the pod gets an IP instead of after the container passes readiness.
+    """
+    return V1Service(
+        metadata=V1ObjectMeta(
+            name=rendezvous_service_name(job_name),
+            namespace=namespace,
+            labels={LABEL_JOB_NAME: job_name},
+        ),
+        spec=V1ServiceSpec(
+            cluster_ip="None",
+            publish_not_ready_addresses=True,
+            selector={LABEL_JOB_NAME: job_name, LABEL_REPLICA_ID: "0"},
+            ports=[V1ServicePort(name="c10d", port=port, target_port=port)],
+        ),
+    )
+
+
+def shm_size(resources: ResourceConfig) -> Optional[float]:
+    """
+    Size limit of ``/dev/shm`` in GB: ``shm`` if set, else derived from the GPUs and their DataLoader workers.
+    Memory backed volumes count against the memory limit, so the derived size takes at most half of it.
+    """
+    if resources.shm is not None or resources.dataloader_workers is None:
+        return resources.shm
+    size = max(resources.gpu, 1) * (SHM_GB_PER_GPU + resources.dataloader_workers * SHM_GB_PER_WORKER)
+    return min(size, resources.memory / 2) if resources.memory > 0 else size
+
+
+def pod_rank(pod: V1Pod) -> int:
+    """Rank of the replica running in the pod."""
+    labels = pod.metadata.labels or {}
+    return int(labels.get(LABEL_REPLICA_ID, labels.get(LABEL_COMPLETION_INDEX, 0)))
+
+
 def create_pod_definition(
     pod_name: str,
     runner_config: RunnerConfig,
     service_account: Optional[str],
-    rank0_env: str,
+    rank0_env: Optional[str],
+    replica_id: int = 0,
+    network: Optional[NetworkHints] = None,
 ) -> "V1Pod":
+    """
+    Builds the pod of a single replica.
+
+    With the "env" rendezvous mode ``rank0_env`` names the environment variable holding the rank 0 host,
+    ``None`` means the replica is rank 0 itself. With the "service" mode rank 0 is reached through the
+    headless Service from ``create_rendezvous_service`` and ``rank0_env`` is ignored. ``network`` are the
+    interconnect hints of the nodes the NCCL environment is derived from, see ``nccl_env``.
+    """
     resource_config: ResourceConfig = runner_config.resources
     container_config: ContainerConfig = runner_config.container
     data_config: Optional[DataConfig] = runner_config.data
     init_container_config: Optional[ContainerConfig] = runner_config.init_container
+    rdzv_config: RendezvousConfig = runner_config.rendezvous
+    checkpoint_config: Optional[CheckpointConfig] = runner_config.checkpoint
 
-    rdzv_port: int = 29500
+    rdzv_port: int = rdzv_config.port
+    multi_node = runner_config.type == JobType.torchrun and resource_config.nodes > 1
+    use_rdzv_service = multi_node and rdzv_config.mode == "service"
+    use_startup_gate = multi_node and rdzv_config.gate
+    rdzv_host = rendezvous_host(runner_config.experiment.name, runner_config.experiment.namespace)
 
     limits = {}
     requests = {}
@@ -56,15 +237,22 @@ def create_pod_definition(
     if resource_config.cpu > 0:
         mcpu = int(resource_config.cpu * 1000)
         limits["cpu"] = f"{mcpu}m"
-        request_mcpu = max(mcpu - RESERVED_MILLICPU, 0)
+        if resource_config.cpu_request is not None:
+            request_mcpu = min(int(resource_config.cpu_request * 1000), mcpu)
+        else:
+            request_mcpu = max(mcpu - RESERVED_MILLICPU, 0)
         requests["cpu"] = f"{request_mcpu}m"
     if resource_config.memory > 0:
-        limits["memory"] = f"{int(resource_config.memory * 2 ** 10)}M"
-        request_memMB = max(int(resource_config.memory) - RESERVED_MEMMB, 0)
+        memMB = int(resource_config.memory * 2**10)
+        limits["memory"] = f"{memMB}M"
+        if resource_config.memory_request is not None:
+            request_memMB = min(int(resource_config.memory_request * 2**10), memMB)
+        else:
+            request_memMB = max(memMB - RESERVED_MEMMB, 0)
         requests["memory"] = f"{request_memMB}M"
     if resource_config.gpu > 0:
         requests["nvidia.com/gpu"] = limits["nvidia.com/gpu"] = str(resource_config.gpu)
-    if resource_config.ib > 0:
+    if resource_config.ib != "auto" and resource_config.ib > 0:
         requests[resource_config.ib_device] = limits[resource_config.ib_device] = str(resource_config.ib)
 
     # for device_name, device_limit in resource_config.devices.items():
@@ -79,12 +267,14 @@ def create_pod_definition(
     # if LABEL_INSTANCE_TYPE in resource.capabilities:
     #     node_selector[LABEL_INSTANCE_TYPE] = resource.capabilities[LABEL_INSTANCE_TYPE]
 
-    SHM_VOL = "dshm"
+    SHM_VOL = SHM_VOLUME
+    shm = shm_size(resource_config)
     volumes = [
         V1Volume(
             name=SHM_VOL,
             empty_dir=V1EmptyDirVolumeSource(
                 medium="Memory",
+                size_limit=f"{int(shm * 2**10)}Mi" if shm is not None else None,
             ),
         ),
     ]
@@ -109,11 +299,27 @@ def create_pod_definition(
                         mount_path=mount_path,
                     )
                 )
+            elif volume.type == "configMap":
+                config_map, mount_path = volume.mount_path.split(":")
+                volumes.append(V1Volume(name=volume.name, config_map=V1ConfigMapVolumeSource(name=config_map)))
+                volume_mounts.append(V1VolumeMount(name=volume.name, mount_path=mount_path, read_only=True))
             else:
                 raise ValueError(f"Unknown volume type {volume.type}")
     security_context = V1SecurityContext()
 
-    container_envs = []
+    container_envs = [
+        V1EnvVar(name="KUBR_NODE_RANK", value=str(replica_id)),
+        V1EnvVar(name="KUBR_NNODES", value=str(resource_config.nodes)),
+    ]
+    if checkpoint_config is not None:
+        container_envs.append(V1EnvVar(name="KUBR_CHECKPOINT_DIR", value=checkpoint_config.dir))
+        container_envs.append(V1EnvVar(name="KUBR_CHECKPOINT_MARKER", value=CHECKPOINT_MARKER_PATH))
+        if checkpoint_config.resume_from is not None:
+            container_envs.append(V1EnvVar(name="KUBR_RESUME_FROM", value=checkpoint_config.resume_from))
+    user_env_names = {env.name for env in container_config.env}
+    for name, value in nccl_env(resource_config, runner_config.nccl, network).items():
+        if name not in user_env_names:
+            container_envs.append(V1EnvVar(name=name, value=value))
     for env in container_config.env:
         container_envs.append(
             V1EnvVar(
@@ -162,13 +368,68 @@ def create_pod_definition(
                 name=f"{pod_name}-init",
             )
         )
+    if use_startup_gate:
+        # the gate releases rank 0 together with the others, so they do not wait for its rendezvous port
+        if use_rdzv_service:
+            gate_host = rdzv_host
+        else:
+            gate_host = f"${rank0_env}" if rank0_env is not None else "localhost"
+        init_containers.append(
+            V1Container(
+                command=[
+                    "python",
+                    "-c",
+                    _STARTUP_GATE_SCRIPT,
+                    str(replica_id),
+                    str(resource_config.nodes),
+                    gate_host,
+                    str(rdzv_port),
+                    str(rdzv_config.gate_timeout),
+                    STARTUP_GATE_MESSAGE_PATH,
+                ],
+                image=container_config.image,
+                image_pull_policy="Always",
+                name=STARTUP_GATE_CONTAINER,
+            )
+        )
+    elif use_rdzv_service and replica_id > 0:
+        init_containers.append(
+            V1Container(
+                command=["python", "-c", _RDZV_WAIT_SCRIPT, rdzv_host, str(rdzv_port), str(rdzv_config.wait_timeout)],
+                image=container_config.image,
+                image_pull_policy="Always",
+                name=RDZV_WAIT_CONTAINER,
+            )
+        )
     cmd = []
 
-    if runner_config.type == JobType.torchrun:
+    if use_rdzv_service:
+        # static rendezvous: every replica already knows its rank, so there is no c10d negotiation round
+        cmd = [
+            "torchrun",
+            "--rdzv_backend",
+            "static",
+            "--master_addr",
+            rdzv_host,
+            "--master_port",
+            str(rdzv_port),
+            "--node_rank",
+            str(replica_id),
+            "--nnodes",
+            str(resource_config.nodes),
+            "--nproc_per_node",
+            str(resource_config.gpu),
+            "--tee",
+            "3",
+            "--role",
+            "",
+        ]
+    elif runner_config.type == JobType.torchrun:
         rdzv_backend = "c10d"
-        # rank0_env = "${rank0_env}"
-        if runner_config.resources.nodes > 1:
+        if multi_node and rank0_env is not None:
             rdzv_endpoint = _noquote(f"$${{{rank0_env}:=localhost}}:{rdzv_port}")
+        elif multi_node:
+            rdzv_endpoint = f"localhost:{rdzv_port}"
         else:
             rdzv_endpoint = "localhost:0"
 
@@ -197,8 +458,10 @@ def create_pod_definition(
         raise ValueError(f"Unknown job type {runner_config.type}")
 
     cmd += container_config.entrypoint.split() if container_config.entrypoint is not None else []
+    if checkpoint_config is not None and checkpoint_config.resume_from is not None:
+        cmd += checkpoint_config.resume_arg.format(checkpoint=checkpoint_config.resume_from).split()
 
-    if runner_config.type == JobType.torchrun:
+    if runner_config.type == JobType.torchrun and not use_rdzv_service:
         cmd = ["bash", "-c", _args_join(cmd)]
 
     container = V1Container(
@@ -211,6 +474,7 @@ def create_pod_definition(
         ports=port_maps,
         volume_mounts=volume_mounts,
         security_context=security_context,
+        termination_message_path=CHECKPOINT_MARKER_PATH if checkpoint_config is not None else None,
     )
 
     return V1Pod(
@@ -228,6 +492,9 @@ def create_pod_definition(
                 # exiting once finished.
                 ANNOTATION_ISTIO_SIDECAR: "false",
             },
-            labels={},
+            labels={
+                LABEL_JOB_NAME: runner_config.experiment.name,
+                LABEL_REPLICA_ID: str(replica_id),
+            },
         ),
     )
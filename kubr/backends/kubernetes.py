@@ -0,0 +1,325 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from kubernetes import client, watch
+
+from kubr.backends.base import JobOperationStatus, KubrError
+from kubr.backends.cache import CacheClient
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import (
+    LABEL_COMPLETION_INDEX,
+    LABEL_JOB_NAME,
+    LABEL_REPLICA_ID,
+    LABEL_USER,
+    create_pod_definition,
+    pod_rank,
+)
+from kubr.backends.pods import (
+    ANNOTATION_WATCHDOG,
+    ARCHIVED_LOG_LINES,
+    DESCRIBE_CONCURRENCY,
+    PodBackend,
+    _replica_status,
+    group_events,
+)
+from kubr.backends.registry import register_backend
+from kubr.backends.rightsizing import LABEL_CONFIG_KEY, config_key
+from kubr.backends.utils import current_user
+from kubr.config.job import (
+    TERMINAL_JOB_STATES,
+    Job,
+    JobBackend,
+    JobDescription,
+    JobRecord,
+    JobState,
+    JobType,
+)
+from kubr.config.runner import RunnerConfig, WatchdogConfig
+
+LABEL_JOB_TYPE = "kubr.io/job-type"
+
+
+def _naive(moment: Optional[datetime]) -> Optional[datetime]:
+    return moment.replace(tzinfo=None) if moment is not None else None
+
+
+@register_backend(JobBackend.Kubernetes)
+class KubernetesBackend(PodBackend):
+    """Runs jobs as Kubernetes Indexed Jobs, scheduled by the default scheduler without a Volcano queue.
+
+    Small jobs skip the gang scheduling round trip of Volcano and start as soon as their pods fit. Every
+    replica is one completion index of the Job, so pods carry their rank in the completion index label and
+    the ``JOB_COMPLETION_INDEX`` and ``KUBR_NODE_RANK`` env. Replicas of multi-node torchrun jobs have to be co-scheduled, so these are
+    rejected and stay with the Volcano backend. Pods are handled by ``PodBackend`` like Volcano pods, only
+    the job object and the pod names differ.
+
+    Args:
+        api_client (Optional[client.ApiClient], optional): Client to use. Defaults to the shared client.
+        history (Optional[HistoryStore], optional): History deleted jobs are archived into. Defaults to None.
+        cache (Optional[CacheClient], optional): Cache server answering listings. Defaults to the one at
+            ``$KUBR_CACHE_URL``.
+    """
+
+    def __init__(
+        self,
+        api_client: Optional[client.ApiClient] = None,
+        history: Optional[HistoryStore] = None,
+        cache: Optional[CacheClient] = None,
+    ):
+        super().__init__(api_client=api_client, history=history, cache=cache)
+        self.batch_client = client.BatchV1Api(self.api_client)
+
+    def submit_job(self, run_config: RunnerConfig) -> Job:
+        """Submits the job as one Indexed Job with a completion per replica, raising on failure."""
+        experiment, resources = run_config.experiment, run_config.resources
+        if run_config.type == JobType.torchrun and resources.nodes > 1:
+            raise KubrError(
+                f"Job {experiment.name} is a multi-node torchrun job, its replicas need gang scheduling: "
+                f"submit it with the {JobBackend.Volcano} backend"
+            )
+        pod = create_pod_definition(
+            pod_name=experiment.name,
+            runner_config=run_config,
+            service_account=None,
+            rank0_env=None,
+            replica_id=0,
+            network=self.network_hints(run_config),
+        )
+        pod.spec.priority_class_name = experiment.priority_class
+        if resources.nodes > 1:
+            # all indices share the template, the rank comes from the completion index label instead
+            pod.metadata.labels.pop(LABEL_REPLICA_ID)
+            # and the completion index annotation, which unlike the label is set on every Kubernetes release
+            node_rank = client.V1EnvVarSource(
+                field_ref=client.V1ObjectFieldSelector(field_path=f"metadata.annotations['{LABEL_COMPLETION_INDEX}']")
+            )
+            for container in pod.spec.containers:
+                for env in container.env or []:
+                    if env.name == "KUBR_NODE_RANK":
+                        env.value, env.value_from = None, node_rank
+
+        labels = {LABEL_USER: current_user(), **experiment.labels}
+        labels.update(
+            {
+                LABEL_JOB_NAME: experiment.name,
+                LABEL_JOB_TYPE: str(run_config.type),
+                # the peak usage of the job is recorded for this key, to right-size the next runs of the config
+                LABEL_CONFIG_KEY: config_key(run_config),
+            }
+        )
+        metadata = client.V1ObjectMeta(name=experiment.name, labels=labels)
+        if experiment.watchdog is not None:
+            metadata.annotations = {ANNOTATION_WATCHDOG: experiment.watchdog.model_dump_json()}
+        job = client.V1Job(
+            api_version="batch/v1",
+            kind="Job",
+            metadata=metadata,
+            spec=client.V1JobSpec(
+                completion_mode="Indexed",
+                completions=resources.nodes,
+                parallelism=resources.nodes,
+                backoff_limit=experiment.job_retries,
+                ttl_seconds_after_finished=experiment.ttl_seconds_after_finished,
+                template=client.V1PodTemplateSpec(metadata=pod.metadata, spec=pod.spec),
+            ),
+        )
+        self.batch_client.create_namespaced_job(namespace=experiment.namespace, body=job)
+        return Job(
+            type=run_config.type,
+            backend=JobBackend.Kubernetes,
+            name=experiment.name,
+            namespace=experiment.namespace,
+            state=JobState.Pending,
+            age=datetime.now(),
+            gpu=resources.gpu * resources.nodes,
+            nodes=resources.nodes,
+        )
+
+    @staticmethod
+    def _selector(label_selector: Optional[str] = None) -> str:
+        # Jobs kubr did not submit, e.g. of the gc CronJob, have no job name label
+        return ",".join(filter(None, [LABEL_JOB_NAME, label_selector]))
+
+    def _to_job(self, k8s_job: client.V1Job) -> Job:
+        status = k8s_job.status or client.V1JobStatus()
+        conditions = {condition.type: condition for condition in status.conditions or [] if condition.status == "True"}
+        if "Complete" in conditions:
+            state, since = JobState.Completed, conditions["Complete"].last_transition_time
+        elif "Failed" in conditions:
+            state, since = JobState.Failed, conditions["Failed"].last_transition_time
+        elif status.ready:
+            state, since = JobState.Running, status.start_time
+        else:
+            state, since = JobState.Pending, None
+        completions = k8s_job.spec.completions or 1
+        gpu = sum(
+            int((container.resources.limits or {}).get("nvidia.com/gpu", 0))
+            for container in k8s_job.spec.template.spec.containers
+            if container.resources is not None
+        )
+        labels = k8s_job.metadata.labels or {}
+        return Job(
+            type=labels.get(LABEL_JOB_TYPE, JobType.basic),
+            backend=JobBackend.Kubernetes,
+            name=k8s_job.metadata.name,
+            namespace=k8s_job.metadata.namespace,
+            state=state,
+            age=_naive(since or k8s_job.metadata.creation_timestamp),
+            gpu=gpu * completions,
+            nodes=completions,
+            user=labels.get(LABEL_USER),
+        )
+
+    def read_k8s_job(self, job_name: str, namespace: str) -> client.V1Job:
+        return self.batch_client.read_namespaced_job(name=job_name, namespace=namespace)
+
+    @staticmethod
+    def job_uid(k8s_job: client.V1Job) -> str:
+        return k8s_job.metadata.uid
+
+    @staticmethod
+    def job_labels(k8s_job: client.V1Job) -> Dict[str, str]:
+        return k8s_job.metadata.labels or {}
+
+    def job_informer_source(self) -> Tuple[Callable, Callable[[Dict[str, Any]], Job]]:
+        list_call = partial(self.batch_client.list_job_for_all_namespaces, label_selector=self._selector())
+        # the informer reads raw JSON, it is turned into the client model the way ``watch`` does it
+        return list_call, lambda obj: self._to_job(
+            self.api_client.deserialize(SimpleNamespace(data=json.dumps(obj)), "V1Job")
+        )
+
+    def list_k8s_jobs(self, namespace: str = "All") -> List[client.V1Job]:
+        """Indexed Jobs submitted by kubr in a namespace or, for "All", in the cluster."""
+        if namespace == "All":
+            return self.batch_client.list_job_for_all_namespaces(label_selector=self._selector()).items
+        return self.batch_client.list_namespaced_job(namespace=namespace, label_selector=self._selector()).items
+
+    def list_jobs_at_version(
+        self, namespace: str = "All", label_selector: Optional[str] = None
+    ) -> Tuple[List[Job], str]:
+        if namespace == "All":
+            jobs = self.batch_client.list_job_for_all_namespaces(label_selector=self._selector(label_selector))
+        else:
+            jobs = self.batch_client.list_namespaced_job(
+                namespace=namespace, label_selector=self._selector(label_selector)
+            )
+        return [self._to_job(k8s_job) for k8s_job in jobs.items], jobs.metadata.resource_version
+
+    def watch_jobs(
+        self,
+        resource_version: str,
+        namespace: str = "All",
+        label_selector: Optional[str] = None,
+        timeout_seconds: int = 300,
+    ) -> Iterator[Tuple[str, Optional[Job], str]]:
+        kwargs = {
+            "label_selector": self._selector(label_selector),
+            "resource_version": resource_version,
+            "timeout_seconds": timeout_seconds,
+            "allow_watch_bookmarks": True,
+        }
+        if namespace == "All":
+            events = watch.Watch().stream(self.batch_client.list_job_for_all_namespaces, **kwargs)
+        else:
+            events = watch.Watch().stream(self.batch_client.list_namespaced_job, namespace=namespace, **kwargs)
+        for event in events:
+            job = self._to_job(event["object"]) if event["type"] != "BOOKMARK" else None
+            yield event["type"], job, event["raw_object"]["metadata"]["resourceVersion"]
+
+    def get_replica_pod(self, job_name: str, namespace: str, rank: int = 0) -> client.V1Pod:
+        """
+        Latest pod of the completion index, failed attempts of the index are kept until the Job is deleted.
+        Raises a 404 ``ApiException`` like reading a missing pod would.
+        """
+        pods = self.core_client.list_namespaced_pod(
+            namespace=namespace, label_selector=f"{LABEL_JOB_NAME}={job_name},{LABEL_COMPLETION_INDEX}={rank}"
+        ).items
+        if not pods:
+            raise client.ApiException(status=404, reason=f"No pod of replica {rank} of job {job_name} found")
+        return max(pods, key=lambda pod: pod.metadata.creation_timestamp or datetime.min)
+
+    def get_job_main_pod(self, job_name: str, namespace: str):
+        try:
+            pod = self.get_replica_pod(job_name, namespace, 0)
+        except client.ApiException:
+            raise Exception(f"No pods found for job {job_name} in namespace {namespace}")
+        return pod.metadata.name, pod
+
+    def delete_k8s_job(self, k8s_job: client.V1Job):
+        """Deletes an Indexed Job together with its pods, then the events of the job and its pods."""
+        job_name, namespace = k8s_job.metadata.name, k8s_job.metadata.namespace
+        pods = self.get_job_pods(job_name, namespace)
+        # without a propagation policy batch/v1 orphans the pods of the Job
+        self.batch_client.delete_namespaced_job(name=job_name, namespace=namespace, propagation_policy="Background")
+        for name in [job_name] + [pod.metadata.name for pod in pods]:
+            self.core_client.delete_collection_namespaced_event(
+                namespace=namespace, field_selector=f"involvedObject.name={name}"
+            )
+
+    def restart_job(self, job_name: str, namespace: str) -> JobOperationStatus:
+        raise KubrError(f"Job {job_name} is an Indexed Job, it can not be restarted in place: delete and resubmit it")
+
+    def get_watchdog_config(self, job_name: str, namespace: str) -> Optional[WatchdogConfig]:
+        k8s_job = self.read_k8s_job(job_name, namespace)
+        raw = (k8s_job.metadata.annotations or {}).get(ANNOTATION_WATCHDOG)
+        return WatchdogConfig.model_validate_json(raw) if raw else None
+
+    def job_record(self, k8s_job: client.V1Job, log_lines: int = ARCHIVED_LOG_LINES) -> JobRecord:
+        """Archive record of an Indexed Job, with the log tail of rank 0 if its pod still exists."""
+        job = self._to_job(k8s_job)
+        logs_tail = None
+        if log_lines:
+            try:
+                logs_tail = self.core_client.read_namespaced_pod_log(
+                    name=self.resolve_replica_pod_name(job.name, job.namespace, 0),
+                    namespace=job.namespace,
+                    tail_lines=log_lines,
+                )
+            except client.ApiException:
+                pass
+        return JobRecord(
+            uid=k8s_job.metadata.uid,
+            name=job.name,
+            namespace=job.namespace,
+            state=str(job.state),
+            user=job.user,
+            gpu=job.gpu,
+            nodes=job.nodes,
+            created_at=_naive(k8s_job.metadata.creation_timestamp),
+            started_at=_naive(k8s_job.status.start_time) if k8s_job.status is not None else None,
+            finished_at=job.age if job.state in TERMINAL_JOB_STATES else None,
+            archived_at=datetime.utcnow(),
+            spec=self.api_client.sanitize_for_serialization(k8s_job.spec),
+            status=self.api_client.sanitize_for_serialization(k8s_job.status),
+            logs_tail=logs_tail,
+        )
+
+    def describe_job(self, job_name: str, namespace: str) -> JobDescription:
+        """Collects the job, every replica and all their events; Indexed Jobs have no pod group."""
+        with ThreadPoolExecutor(max_workers=DESCRIBE_CONCURRENCY) as executor:
+            k8s_job_future = executor.submit(self.read_k8s_job, job_name, namespace)
+            pods_future = executor.submit(self.get_job_pods, job_name, namespace)
+            job_events_future = executor.submit(self._list_object_events, namespace, "Job", job_name)
+
+            pods = pods_future.result()
+            pod_events_futures = [
+                executor.submit(self._list_object_events, namespace, "Pod", pod.metadata.name) for pod in pods
+            ]
+            k8s_job = k8s_job_future.result()
+            events: List[Tuple[str, Optional[int], str, Any]] = [
+                ("Job", None, job_name, event) for event in job_events_future.result()
+            ]
+            for pod, pod_events_future in zip(pods, pod_events_futures):
+                events += [("Pod", pod_rank(pod), pod.metadata.name, event) for event in pod_events_future.result()]
+
+        return JobDescription(
+            name=job_name,
+            namespace=namespace,
+            state=str(self._to_job(k8s_job).state),
+            replicas=[_replica_status(pod) for pod in pods],
+            events=group_events(events),
+        )
@@ -0,0 +1,437 @@
+import bisect
+import calendar
+import heapq
+import threading
+import time
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from kubernetes.client import ApiException
+from urllib3.exceptions import HTTPError
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.k8s_runner import pod_rank
+
+CAPTURE_BLOCK_BYTES = 1 << 20
+CAPTURE_BLOCK_SECONDS = 10.0
+CAPTURE_CHUNK_BYTES = 1 << 16
+
+_GZIP_WBITS = 31
+_FINISHED_POD_PHASES = ("Succeeded", "Failed")
+
+
+@lru_cache(maxsize=4096)
+def _epoch_seconds(head: bytes) -> int:
+    return calendar.timegm(time.strptime(head.decode(), "%Y-%m-%dT%H:%M:%S"))
+
+
+def timestamp_ns(stamp: bytes) -> int:
+    """Nanoseconds since epoch of a kubelet RFC 3339 timestamp, e.g. ``2024-01-31T12:00:00.123456789Z``."""
+    head, _, fraction = stamp.rstrip(b"Z").partition(b".")
+    return _epoch_seconds(head) * 10**9 + int((fraction + b"000000000")[:9])
+
+
+def line_timestamp_ns(data: bytes, start: int = 0) -> int:
+    """Timestamp of the line starting at ``start``."""
+    return timestamp_ns(data[start : data.index(b" ", start)])
+
+
+def format_timestamp(ns: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ns // 10**9)) + f".{ns % 10**9:09d}Z"
+
+
+def datetime_ns(moment: datetime) -> int:
+    """Nanoseconds since epoch of a naive UTC datetime."""
+    return calendar.timegm(moment.utctimetuple()) * 10**9 + moment.microsecond * 1000
+
+
+def _read_index(path: Path) -> List[Tuple[int, int]]:
+    if not path.exists():
+        return []
+    with open(path) as index:
+        return [(int(ns), int(offset)) for ns, offset in (line.split() for line in index if line.strip())]
+
+
+def _read_block(path: Path, start: int, end: Optional[int]) -> Tuple[bytes, bool]:
+    """Decompresses the gzip member at ``start``, returns its data and whether the member is complete."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        raw = file.read(-1 if end is None else end - start)
+    decompressor = zlib.decompressobj(_GZIP_WBITS)
+    try:
+        data = decompressor.decompress(raw)
+    except zlib.error:
+        return b"", False
+    return data, decompressor.eof
+
+
+def _last_line_start(data: bytes, end: int) -> int:
+    return data.rfind(b"\n", 0, end - 1) + 1
+
+
+class ResumePoint:
+    """Last line read from a timestamped log stream, to resume it with ``sinceTime`` without duplicates.
+
+    The kubelet replays every line logged at ``sinceTime`` or later, so the lines already seen with
+    exactly that timestamp are counted and skipped on replay.
+    """
+
+    def __init__(self):
+        self.last_ns = 0
+        self.last_count = 0
+        self._replayed = 0
+
+    def since_time(self) -> Optional[str]:
+        self._replayed = 0
+        return format_timestamp(self.last_ns) if self.last_ns else None
+
+    def skip_replayed(self, data: bytes) -> bytes:
+        """Complete lines of ``data`` that were not read before."""
+        position = 0
+        while position < len(data):
+            ns = line_timestamp_ns(data, position)
+            if ns > self.last_ns or (ns == self.last_ns and self._replayed >= self.last_count):
+                return data[position:]
+            if ns == self.last_ns:
+                self._replayed += 1
+            position = data.index(b"\n", position) + 1
+        return b""
+
+    def advance(self, data: bytes):
+        """Moves past complete lines of ``data``, only the trailing lines are parsed."""
+        if not data:
+            return
+        start = _last_line_start(data, len(data))
+        last, count = line_timestamp_ns(data, start), 1
+        while start > 0:
+            start = _last_line_start(data, start)
+            if line_timestamp_ns(data, start) != last:
+                break
+            count += 1
+        if last == self.last_ns:
+            self.last_count += count
+        else:
+            self.last_ns, self.last_count = last, count
+
+
+class RankLogWriter:
+    """Appends the timestamped log lines of one replica to a gzip file and its ``(timestamp, offset)`` index.
+
+    Lines are compressed in blocks, every block is an independent gzip member, so the file stays readable by
+    ``zcat`` while a reader can start decompressing at any indexed offset. A new block starts every
+    ``block_bytes`` of log or ``block_seconds``, whichever comes first. Every write is flushed to disk, so
+    readers see lines as they are captured. Reopening a file left by an interrupted capture drops its
+    incomplete last block and rewrites the lines recovered from it, ``resume`` then points past them.
+
+    Args:
+        path (Path): Log file, the index is written next to it with an ``.idx`` suffix.
+        block_bytes (int, optional): Uncompressed size of a block. Defaults to 1 MiB.
+        block_seconds (float, optional): Maximum time a block stays open. Defaults to 10.
+    """
+
+    def __init__(
+        self, path: Path, block_bytes: int = CAPTURE_BLOCK_BYTES, block_seconds: float = CAPTURE_BLOCK_SECONDS
+    ):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix(".idx")
+        self.block_bytes = block_bytes
+        self.block_seconds = block_seconds
+        self.resume = ResumePoint()
+        self.written = 0
+        self._lock = threading.Lock()
+        self._compressor = None
+        self._block_size = 0
+        self._block_started = 0.0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        recovered = self._recover()
+        self._file = open(self.path, "ab")
+        self._index = open(self.index_path, "a")
+        if recovered:
+            self.write(recovered)
+            self.resume.advance(recovered)
+            self.written = 0
+
+    def _recover(self) -> bytes:
+        index = _read_index(self.index_path)
+        if not index:
+            return b""
+        data, complete = _read_block(self.path, index[-1][1], None)
+        if complete:
+            self.resume.advance(data)
+            return b""
+        with open(self.path, "r+b") as file:
+            file.truncate(index[-1][1])
+        self.index_path.write_text("".join(f"{ns} {offset}\n" for ns, offset in index[:-1]))
+        return data[: data.rfind(b"\n") + 1]
+
+    def write(self, data: bytes) -> int:
+        """Appends complete lines, returns the number of lines written."""
+        with self._lock:
+            if self._file.closed or not data:
+                return 0
+            if self._compressor is None:
+                self._index.write(f"{line_timestamp_ns(data)} {self._file.tell()}\n")
+                self._index.flush()
+                self._compressor = zlib.compressobj(6, zlib.DEFLATED, _GZIP_WBITS)
+                self._block_size = 0
+                self._block_started = time.monotonic()
+            self._file.write(self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH))
+            self._file.flush()
+            self._block_size += len(data)
+            lines = data.count(b"\n")
+            self.written += lines
+            if self._block_size >= self.block_bytes or time.monotonic() - self._block_started >= self.block_seconds:
+                self._end_block()
+            return lines
+
+    def _end_block(self):
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush())
+            self._compressor = None
+        self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._end_block()
+                self._file.close()
+                self._index.close()
+
+
+class ReplicaLogStreams:
+    """Reads the timestamped logs of all replicas of a job concurrently, one thread per replica.
+
+    Complete lines are handed to ``_on_data`` in chunks of raw bytes, subclasses decide what to do with them.
+    When following, dropped connections are resumed with ``sinceTime`` from the replica ``ResumePoint`` until
+    the replica finished.
+
+    Args:
+        backend (BaseBackend): Backend providing ``get_job_pods``, ``get_replica_pod`` and ``stream_replica_log``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        follow (bool, optional): Keep reading until the replicas finish. Defaults to True.
+        retry_seconds (float, optional): Delay before reconnecting a replica. Defaults to 1.
+    """
+
+    def __init__(
+        self, backend: BaseBackend, job_name: str, namespace: str, follow: bool = True, retry_seconds: float = 1.0
+    ):
+        self.backend = backend
+        self.job_name = job_name
+        self.namespace = namespace
+        self.follow = follow
+        self.retry_seconds = retry_seconds
+        self.resume: Dict[int, ResumePoint] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _open(self, rank: int) -> ResumePoint:
+        return ResumePoint()
+
+    def _on_data(self, rank: int, data: bytes):
+        raise NotImplementedError
+
+    def _on_end(self, rank: int):
+        pass
+
+    def _close(self):
+        pass
+
+    def start(self) -> "ReplicaLogStreams":
+        for pod in self.backend.get_job_pods(self.job_name, self.namespace):
+            rank = pod_rank(pod)
+            self.resume[rank] = self._open(rank)
+            thread = threading.Thread(target=self._stream, args=(rank,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Waits for all replicas to finish, returns False if some are still read after ``timeout``."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        return not any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self):
+        """Stops reading, lines still in flight are dropped."""
+        self._stop.set()
+        self._close()
+
+    def _finished(self, rank: int) -> bool:
+        try:
+            pod = self.backend.get_replica_pod(self.job_name, self.namespace, rank)
+        except ApiException as e:
+            return e.status == 404
+        return pod.status.phase in _FINISHED_POD_PHASES
+
+    def _stream(self, rank: int):
+        try:
+            self._follow(rank)
+        finally:
+            self._on_end(rank)
+
+    def _follow(self, rank: int):
+        resume = self.resume[rank]
+        while not self._stop.is_set():
+            ended = False
+            try:
+                response = self.backend.stream_replica_log(
+                    self.job_name, self.namespace, rank, since_time=resume.since_time(), follow=self.follow
+                )
+                try:
+                    ended = self._consume(rank, response)
+                finally:
+                    response.release_conn()
+            except ApiException as e:
+                # 400 until the container started, 404 once the pod is gone
+                if e.status == 404:
+                    return
+            except (HTTPError, OSError):
+                pass
+            # a dropped connection is resumed even if the pod finished, its log is still served
+            if self._stop.is_set() or (ended and (not self.follow or self._finished(rank))):
+                return
+            self._stop.wait(self.retry_seconds)
+
+    def _consume(self, rank: int, response) -> bool:
+        """Reads the stream until it ends, returns False if reading was stopped first."""
+        resume = self.resume[rank]
+        partial = b""
+        for chunk in response.stream(CAPTURE_CHUNK_BYTES, decode_content=True):
+            if self._stop.is_set():
+                return False
+            data = partial + chunk
+            end = data.rfind(b"\n") + 1
+            data, partial = data[:end], data[end:]
+            if data and line_timestamp_ns(data) <= resume.last_ns:
+                data = resume.skip_replayed(data)
+            if data:
+                self._on_data(rank, data)
+                resume.advance(data)
+        # a line without newline at the end of the stream is read again after resuming
+        return True
+
+
+class LogCapture(ReplicaLogStreams):
+    """Captures the logs of all replicas of a job into compressed local files, one per rank.
+
+    Raw log bytes go straight to a ``RankLogWriter`` per replica, without decoding or printing. Running the
+    capture again into the same directory continues where it stopped. Read the files back with ``LogArchive``.
+
+    Args:
+        backend (BaseBackend): Backend providing ``get_job_pods``, ``get_replica_pod`` and ``stream_replica_log``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        directory (Path): Directory to write ``rank-<rank>.log.gz`` files to.
+        block_bytes (int, optional): Uncompressed size of an indexed block. Defaults to 1 MiB.
+        block_seconds (float, optional): Maximum time a block stays open. Defaults to 10.
+        retry_seconds (float, optional): Delay before reconnecting a replica. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        job_name: str,
+        namespace: str,
+        directory: Path,
+        block_bytes: int = CAPTURE_BLOCK_BYTES,
+        block_seconds: float = CAPTURE_BLOCK_SECONDS,
+        retry_seconds: float = 1.0,
+    ):
+        super().__init__(backend, job_name, namespace, follow=True, retry_seconds=retry_seconds)
+        self.directory = Path(directory)
+        self.block_bytes = block_bytes
+        self.block_seconds = block_seconds
+        self.writers: Dict[int, RankLogWriter] = {}
+
+    def _open(self, rank: int) -> ResumePoint:
+        self.writers[rank] = RankLogWriter(
+            self.directory / f"rank-{rank}.log.gz", block_bytes=self.block_bytes, block_seconds=self.block_seconds
+        )
+        return self.writers[rank].resume
+
+    def _on_data(self, rank: int, data: bytes):
+        self.writers[rank].write(data)
+
+    def _close(self):
+        for writer in self.writers.values():
+            writer.close()
+
+    def run(self) -> Dict[int, int]:
+        """Captures until every replica finished, returns the number of lines written per rank."""
+        self.start()
+        self.join()
+        self.stop()
+        return {rank: writer.written for rank, writer in self.writers.items()}
+
+
+class LogArchive:
+    """Reads logs captured by ``LogCapture``, seeking by time through the block index.
+
+    Args:
+        directory (Path): Capture directory with ``rank-<rank>.log.gz`` files.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path(self, rank: int) -> Path:
+        return self.directory / f"rank-{rank}.log.gz"
+
+    def ranks(self) -> List[int]:
+        return sorted(int(path.name[len("rank-") :].split(".")[0]) for path in self.directory.glob("rank-*.log.gz"))
+
+    def _lines(self, rank: int, since_ns: int, until_ns: Optional[int]) -> Iterator[Tuple[int, bytes]]:
+        path = self.path(rank)
+        index = _read_index(path.with_suffix(".idx"))
+        first = max(bisect.bisect_right([ns for ns, _ in index], since_ns) - 1, 0)
+        for position in range(first, len(index)):
+            end = index[position + 1][1] if position + 1 < len(index) else None
+            data, _ = _read_block(path, index[position][1], end)
+            for line in data.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    continue
+                ns = line_timestamp_ns(line)
+                if until_ns is not None and ns >= until_ns:
+                    return
+                if ns >= since_ns:
+                    yield ns, line
+
+    def read(
+        self,
+        rank: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        timestamps: bool = False,
+    ) -> Iterator[str]:
+        """Lines of one replica logged in ``[since, until)``, naive UTC datetimes, without timestamps by default."""
+        since_ns = datetime_ns(since) if since is not None else 0
+        until_ns = datetime_ns(until) if until is not None else None
+        for _, line in self._lines(rank, since_ns, until_ns):
+            yield (line if timestamps else line[line.index(b" ") + 1 :]).decode(errors="replace")
+
+    def merged(
+        self,
+        ranks: Optional[List[int]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        timestamps: bool = False,
+    ) -> Iterator[Tuple[int, str]]:
+        """``(rank, line)`` of all replicas interleaved by time."""
+        since_ns = datetime_ns(since) if since is not None else 0
+        until_ns = datetime_ns(until) if until is not None else None
+
+        def tagged(rank: int):
+            for ns, line in self._lines(rank, since_ns, until_ns):
+                yield ns, rank, line
+
+        for _, rank, line in heapq.merge(*(tagged(rank) for rank in ranks or self.ranks())):
+            yield rank, (line if timestamps else line[line.index(b" ") + 1 :]).decode(errors="replace")
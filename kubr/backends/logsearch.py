@@ -0,0 +1,179 @@
+import re
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.logcapture import ReplicaLogStreams, timestamp_ns
+
+# the kubelet timestamp in front of every line
+_TIMESTAMP_RE = re.compile(rb"^[^ \n]* ", re.MULTILINE)
+# escaped characters, so an escaped backslash followed by a digit is not taken for a backreference
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+
+class PatternSet:
+    """Several regular expressions compiled into a single alternation, so a chunk of log is scanned once.
+
+    Every pattern becomes a group of the alternation, which renumbers its own groups, so numbered
+    backreferences such as ``(a)\\1`` are rejected, named ones such as ``(?P<a>a)(?P=a)`` work.
+
+    Args:
+        patterns (List[str]): Regular expressions, matched against the message of each line, ``^`` and ``$``
+            anchor at its start and end.
+        ignore_case (bool, optional): Case insensitive matching. Defaults to False.
+    """
+
+    def __init__(self, patterns: List[str], ignore_case: bool = False):
+        if not patterns:
+            raise ValueError("At least one pattern is required")
+        self.patterns = list(patterns)
+        for pattern in self.patterns:
+            if any(escaped.isdigit() and escaped != "0" for escaped in _ESCAPE_RE.findall(pattern)):
+                raise ValueError(
+                    f"Pattern {pattern!r} has a numbered backreference, name the group instead, e.g. (?P<a>a)(?P=a)"
+                )
+        alternation = b"|".join(b"(?P<p%d>%s)" % (index, p.encode()) for index, p in enumerate(self.patterns))
+        self.regex = re.compile(alternation, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+
+    def search(self, data: bytes, start: int = 0) -> Optional[Tuple[str, int]]:
+        """First match in ``data`` from ``start`` on, as the matching pattern and the match position."""
+        match = self.regex.search(data, start)
+        if match is None:
+            return None
+        return self.patterns[int(match.lastgroup[1:])], match.start()
+
+
+class LogMatch(BaseModel):
+    """LogMatch is a log line of a replica matching one of the searched patterns.
+
+    Args:
+        rank (int): Rank of the replica.
+        pattern (str): Pattern that matched.
+        timestamp (float): Unix time the line was logged.
+        line (str): Matching line.
+        before (List[str]): Lines logged right before the match.
+        after (List[str]): Lines logged right after the match, as far as they arrived together with it.
+    """
+
+    rank: int
+    pattern: str
+    timestamp: float
+    line: str
+    before: List[str] = []
+    after: List[str] = []
+
+
+def _text(messages: bytes, start: int, end: int) -> str:
+    return messages[start:end].rstrip(b"\r\n").decode(errors="replace")
+
+
+class LogSearch(ReplicaLogStreams):
+    """Searches the logs of all replicas of a job for any of several patterns, in one pass over each stream.
+
+    Whole chunks of log are stripped of their timestamps and scanned by the combined regex, only the lines
+    around a match are split and decoded. Every match is passed to ``on_match`` as soon as it is found.
+
+    Args:
+        backend (BaseBackend): Backend providing ``get_job_pods``, ``get_replica_pod`` and ``stream_replica_log``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        patterns (PatternSet): Patterns to search for.
+        context (int, optional): Lines of context around a match. Defaults to 2.
+        follow (bool, optional): Keep searching new lines until the replicas finish. Defaults to False.
+        on_match (Optional[Callable[[LogMatch], None]], optional): Called with every match, one at a time.
+        max_matches (Optional[int], optional): Stop searching after this many matches. Defaults to None.
+        retry_seconds (float, optional): Delay before reconnecting a replica. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        job_name: str,
+        namespace: str,
+        patterns: PatternSet,
+        context: int = 2,
+        follow: bool = False,
+        on_match: Optional[Callable[[LogMatch], None]] = None,
+        max_matches: Optional[int] = None,
+        retry_seconds: float = 1.0,
+    ):
+        super().__init__(backend, job_name, namespace, follow=follow, retry_seconds=retry_seconds)
+        self.patterns = patterns
+        self.context = context
+        self.on_match = on_match
+        self.max_matches = max_matches
+        self.matches: List[LogMatch] = []
+        self._tails: Dict[int, Deque[str]] = {}
+        self._lock = threading.Lock()
+
+    def run(self) -> List[LogMatch]:
+        """Searches until every replica finished or ``max_matches`` were found, returns the matches by time."""
+        self.start()
+        self.join()
+        self.stop()
+        return sorted(self.matches, key=lambda match: match.timestamp)
+
+    def first(self) -> Optional[LogMatch]:
+        """Earliest logged match over all replicas."""
+        return min(self.matches, key=lambda match: match.timestamp, default=None)
+
+    def _on_data(self, rank: int, data: bytes):
+        tail = self._tails.setdefault(rank, deque(maxlen=self.context))
+        messages = _TIMESTAMP_RE.sub(b"", data)
+        stamps: Optional[List[bytes]] = None
+        # position is the start of line number line in messages
+        position = line = 0
+        while not self.stopped:
+            found = self.patterns.search(messages, position)
+            if found is None:
+                break
+            pattern, start = found
+            line_start = messages.rfind(b"\n", 0, start) + 1
+            line_end = messages.index(b"\n", start) + 1
+            line += messages.count(b"\n", position, line_start)
+            if stamps is None:
+                stamps = _TIMESTAMP_RE.findall(data)
+            self._report(
+                LogMatch(
+                    rank=rank,
+                    pattern=pattern,
+                    timestamp=timestamp_ns(stamps[line][:-1]) / 1e9,
+                    line=_text(messages, line_start, line_end),
+                    before=self._before(messages, line_start, tail),
+                    after=self._after(messages, line_end),
+                )
+            )
+            position, line = line_end, line + 1
+        if self.context:
+            tail.extend(self._before(messages, len(messages), deque()))
+
+    def _before(self, messages: bytes, end: int, tail: Deque[str]) -> List[str]:
+        lines = []
+        while end > 0 and len(lines) < self.context:
+            start = messages.rfind(b"\n", 0, end - 1) + 1
+            lines.append(_text(messages, start, end))
+            end = start
+        lines.reverse()
+        missing = self.context - len(lines)
+        return (list(tail)[-missing:] if missing else []) + lines
+
+    def _after(self, messages: bytes, start: int) -> List[str]:
+        lines = []
+        while start < len(messages) and len(lines) < self.context:
+            end = messages.index(b"\n", start) + 1
+            lines.append(_text(messages, start, end))
+            start = end
+        return lines
+
+    def _report(self, match: LogMatch):
+        with self._lock:
+            if self.stopped:
+                return
+            self.matches.append(match)
+            if self.on_match is not None:
+                self.on_match(match)
+            if self.max_matches is not None and len(self.matches) >= self.max_matches:
+                self.stop()
@@ -0,0 +1,306 @@
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+from kubernetes import client
+from pydantic import BaseModel
+
+from kubr.backends.base import BaseBackend
+from kubr.config.job import TERMINAL_JOB_STATES, Job, JobState, JobType
+from kubr.config.runner import DataConfig, NcclConfig, ResourceConfig, RunnerConfig, VolumeMount
+
+# set by cluster admins on the nodes, as annotations or, where the value fits a label, as labels
+ANNOTATION_IB_HCA = "kubr.io/nccl-ib-hca"
+ANNOTATION_SOCKET_IFNAME = "kubr.io/nccl-socket-ifname"
+ANNOTATION_GDR_LEVEL = "kubr.io/nccl-net-gdr-level"
+
+# every interface but loopback and the docker bridge, which NCCL otherwise may pick for bootstrap
+DEFAULT_SOCKET_IFNAME = "^lo,docker"
+# prefix match on all Mellanox HCAs handed to the pod by the device plugin
+DEFAULT_IB_HCA = "mlx5"
+# GPUDirect RDMA as long as the GPU and the HCA share a host bridge, the common case on GPU servers
+DEFAULT_GDR_LEVEL = "PHB"
+
+ALLREDUCE_MARKER = "KUBR_ALLREDUCE"
+ALLREDUCE_SCRIPT_NAME = "allreduce.py"
+ALLREDUCE_SCRIPT_DIR = "/opt/kubr"
+_ALLREDUCE_RE = re.compile(ALLREDUCE_MARKER + r"((?: \w+=\S+)+)\s*$")
+_TRANSPORT_RE = re.compile(r"NCCL INFO Using network (\w+)")
+
+
+class NetworkHints(BaseModel):
+    """NetworkHints is the interconnect shared by the nodes a job can run on.
+
+    Args:
+        ib_hca (Optional[str]): HCAs for ``NCCL_IB_HCA``, None when unknown or different between nodes.
+        socket_ifname (Optional[str]): Interface for ``NCCL_SOCKET_IFNAME``, None when unknown.
+        gdr_level (Optional[str]): ``NCCL_NET_GDR_LEVEL`` supported by the nodes, None when unknown.
+    """
+
+    ib_hca: Optional[str] = None
+    socket_ifname: Optional[str] = None
+    gdr_level: Optional[str] = None
+
+
+def _node_hint(node: client.V1Node, key: str) -> Optional[str]:
+    return (node.metadata.annotations or {}).get(key) or (node.metadata.labels or {}).get(key)
+
+
+def _allocatable(node: client.V1Node, resource: str) -> int:
+    try:
+        return int(((node.status and node.status.allocatable) or {}).get(resource, 0))
+    except ValueError:
+        return 0
+
+
+def network_hints(nodes: Iterable[client.V1Node], resources: ResourceConfig) -> NetworkHints:
+    """
+    Hints every node able to run the job agrees on: nodes with GPUs and, when IB devices are requested, with
+    those devices. A hint the nodes disagree on is left out, NCCL then detects it on its own.
+    """
+    candidates = [node for node in nodes if _allocatable(node, "nvidia.com/gpu") > 0]
+    if isinstance(resources.ib, int) and resources.ib > 0:
+        candidates = [node for node in candidates if _allocatable(node, resources.ib_device) > 0]
+    hints = {}
+    for field, key in [
+        ("ib_hca", ANNOTATION_IB_HCA),
+        ("socket_ifname", ANNOTATION_SOCKET_IFNAME),
+        ("gdr_level", ANNOTATION_GDR_LEVEL),
+    ]:
+        values = {_node_hint(node, key) for node in candidates}
+        if len(values) == 1:
+            hints[field] = values.pop()
+    return NetworkHints(**hints)
+
+
+def nccl_env(resources: ResourceConfig, nccl: NcclConfig, network: Optional[NetworkHints] = None) -> Dict[str, str]:
+    """
+    NCCL environment of a GPU job. Explicit ``nccl`` settings win over node hints, which win over defaults.
+    ``NCCL_IB_DISABLE`` is never set, NCCL picks its transport itself unless ``container.env`` sets it.
+    """
+    if resources.gpu == 0:
+        return {}
+    network = network or NetworkHints()
+    env = {}
+    if nccl.debug is not None:
+        env["NCCL_DEBUG"] = nccl.debug
+    if nccl.debug_subsys is not None:
+        env["NCCL_DEBUG_SUBSYS"] = nccl.debug_subsys
+    if not nccl.auto:
+        explicit = {
+            "NCCL_IB_HCA": nccl.ib_hca,
+            "NCCL_SOCKET_IFNAME": nccl.socket_ifname,
+            "NCCL_NET_GDR_LEVEL": nccl.gdr_level,
+        }
+        env.update({name: value for name, value in explicit.items() if value is not None})
+        return env
+
+    env["NCCL_SOCKET_IFNAME"] = nccl.socket_ifname or network.socket_ifname or DEFAULT_SOCKET_IFNAME
+    if resources.ib == "auto":
+        use_ib = nccl.ib_hca is not None or network.ib_hca is not None
+    else:
+        use_ib = resources.ib > 0
+    if use_ib:
+        env["NCCL_IB_HCA"] = nccl.ib_hca or network.ib_hca or DEFAULT_IB_HCA
+        env["NCCL_NET_GDR_LEVEL"] = nccl.gdr_level or network.gdr_level or DEFAULT_GDR_LEVEL
+    return env
+
+
+# Run by torchrun on every GPU of the job. Rank 0 prints one marker line per message size; bus bandwidth is
+# the all-reduce algorithm bandwidth scaled by 2(n-1)/n, comparable to the nccl-tests output.
+ALLREDUCE_SCRIPT = """
+import argparse, os, time
+import torch
+import torch.distributed as dist
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--size-mb", type=int, default=256)
+parser.add_argument("--iterations", type=int, default=20)
+parser.add_argument("--warmup", type=int, default=5)
+args = parser.parse_args()
+
+dist.init_process_group("nccl")
+rank, world = dist.get_rank(), dist.get_world_size()
+torch.cuda.set_device(int(os.environ["LOCAL_RANK"]))
+size_mb = 1
+while size_mb <= args.size_mb:
+    tensor = torch.ones(size_mb * 2**20 // 4, dtype=torch.float32, device="cuda")
+    for _ in range(args.warmup):
+        dist.all_reduce(tensor)
+    torch.cuda.synchronize()
+    dist.barrier()
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        dist.all_reduce(tensor)
+    torch.cuda.synchronize()
+    seconds = (time.perf_counter() - start) / args.iterations
+    algbw = tensor.numel() * 4 / seconds / 1e9
+    if rank == 0:
+        print(
+            f"KUBR_ALLREDUCE bytes={tensor.numel() * 4} seconds={seconds:.6f} algbw={algbw:.3f} "
+            f"busbw={algbw * 2 * (world - 1) / world:.3f} world={world}",
+            flush=True,
+        )
+    size_mb *= 4
+dist.destroy_process_group()
+"""
+
+
+class AllReduceResult(BaseModel):
+    """AllReduceResult is the all-reduce performance for one message size.
+
+    Args:
+        bytes (int): Message size.
+        seconds (float): Mean time of one all-reduce.
+        algbw (float): Algorithm bandwidth in GB/s.
+        busbw (float): Bus bandwidth in GB/s.
+        world (int): Number of GPUs taking part.
+    """
+
+    bytes: int
+    seconds: float
+    algbw: float
+    busbw: float
+    world: int
+
+
+def parse_allreduce(logs: str) -> List[AllReduceResult]:
+    """Results printed by ``ALLREDUCE_SCRIPT``, in the order of the message sizes."""
+    results = []
+    for line in logs.splitlines():
+        match = _ALLREDUCE_RE.search(line)
+        if match is not None:
+            fields = dict(field.split("=", 1) for field in match.group(1).split())
+            results.append(AllReduceResult(**fields))
+    return results
+
+
+def parse_transport(logs: str) -> Optional[str]:
+    """Network NCCL chose, e.g. "IB" or "Socket", from its INFO logs."""
+    match = _TRANSPORT_RE.search(logs)
+    return match.group(1) if match is not None else None
+
+
+class AllReduceReport(BaseModel):
+    """AllReduceReport is the outcome of an all-reduce bandwidth test.
+
+    Args:
+        job (str): Name of the test job.
+        state (str): State the test job ended in.
+        transport (Optional[str]): Network NCCL used between nodes, None when it did not log it.
+        env (Dict[str, str]): NCCL environment of rank 0.
+        results (List[AllReduceResult]): Results by message size, smallest first.
+    """
+
+    job: str
+    state: str
+    transport: Optional[str] = None
+    env: Dict[str, str] = {}
+    results: List[AllReduceResult] = []
+
+    @property
+    def peak_busbw(self) -> Optional[float]:
+        return max((result.busbw for result in self.results), default=None)
+
+
+class AllReduceTest:
+    """Measures all-reduce bandwidth with the NCCL environment kubr derives for a config.
+
+    A short torchrun job with the image, resources and NCCL settings of the config runs ``ALLREDUCE_SCRIPT``,
+    mounted from a ConfigMap so the image needs nothing but torch. NCCL logs at INFO level, so the report
+    shows which network it picked. The job and the ConfigMap are deleted afterwards unless ``keep`` is set.
+
+    Args:
+        backend (BaseBackend): Backend to submit the test job with.
+        run_config (RunnerConfig): Config whose settings are tested.
+        size_mb (int, optional): Largest message size in MiB, sizes grow by 4x from 1 MiB. Defaults to 256.
+        iterations (int, optional): Timed all-reduces per message size. Defaults to 20.
+        name (Optional[str], optional): Name of the test job. Defaults to the job name with a "nccltest" suffix.
+        poll_seconds (float, optional): Seconds between checks of the job state. Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        run_config: RunnerConfig,
+        size_mb: int = 256,
+        iterations: int = 20,
+        name: Optional[str] = None,
+        poll_seconds: float = 5,
+    ):
+        self.backend = backend
+        self.run_config = run_config
+        self.size_mb = size_mb
+        self.iterations = iterations
+        self.name = name or f"{run_config.experiment.name}nccltest"
+        self.namespace = run_config.experiment.namespace
+        self.poll_seconds = poll_seconds
+
+    def test_config(self) -> RunnerConfig:
+        """The config with the benchmark as entrypoint, without retries, checkpoints or a watchdog."""
+        config = self.run_config.model_copy(deep=True)
+        config.type = JobType.torchrun
+        config.experiment.name = self.name
+        config.experiment.job_retries = config.experiment.worker_max_retries = 0
+        config.experiment.watchdog = None
+        config.checkpoint = None
+        config.nccl.debug, config.nccl.debug_subsys = "INFO", "INIT,NET"
+        config.container.entrypoint = (
+            f"{ALLREDUCE_SCRIPT_DIR}/{ALLREDUCE_SCRIPT_NAME} --size-mb {self.size_mb} --iterations {self.iterations}"
+        )
+        volumes = list(config.data.volumes) if config.data is not None else []
+        volumes.append(
+            VolumeMount(name="kubr-allreduce", type="configMap", mount_path=f"{self.name}:{ALLREDUCE_SCRIPT_DIR}")
+        )
+        config.data = DataConfig(volumes=volumes)
+        return config
+
+    def wait(self, timeout: float) -> Job:
+        """Polls the test job until it finished or ``timeout`` seconds passed, returns its last state."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.backend.get_job(self.name, self.namespace)
+            if job.state in TERMINAL_JOB_STATES or time.monotonic() >= deadline:
+                return job
+            time.sleep(self.poll_seconds)
+
+    def run(self, timeout: float = 900, keep: bool = False) -> AllReduceReport:
+        """Runs the test job and reports its results, raises if it can not be submitted."""
+        self.backend.core_client.create_namespaced_config_map(
+            namespace=self.namespace,
+            body=client.V1ConfigMap(
+                metadata=client.V1ObjectMeta(name=self.name), data={ALLREDUCE_SCRIPT_NAME: ALLREDUCE_SCRIPT}
+            ),
+        )
+        try:
+            self.backend.submit_job(self.test_config())
+            job = self.wait(timeout)
+            return self.report(job.state)
+        finally:
+            if not keep:
+                self.cleanup()
+
+    def report(self, state: JobState) -> AllReduceReport:
+        """Results from the log and the NCCL environment of rank 0."""
+        report = AllReduceReport(job=self.name, state=str(state))
+        try:
+            pod = self.backend.get_replica_pod(self.name, self.namespace, 0)
+            logs = self.backend.get_logs(self.name, self.namespace)
+        except client.ApiException:
+            return report
+        report.env = {env.name: env.value for env in pod.spec.containers[0].env or [] if env.name.startswith("NCCL_")}
+        report.transport = parse_transport(logs)
+        report.results = parse_allreduce(logs)
+        return report
+
+    def cleanup(self):
+        """Deletes the test job and its ConfigMap, whichever exists."""
+        for delete in [
+            lambda: self.backend.delete_job(self.name, self.namespace, archive=False),
+            lambda: self.backend.core_client.delete_namespaced_config_map(name=self.name, namespace=self.namespace),
+        ]:
+            try:
+                delete()
+            except client.ApiException as e:
+                if e.status != 404:
+                    raise
@@ -0,0 +1,145 @@
+import queue
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from kubernetes.client import ApiException
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.waiter import JobTracker
+from kubr.config.job import TERMINAL_JOB_STATES, JobState
+from kubr.config.pipeline import LABEL_PIPELINE, PipelineConfig
+from kubr.config.runner import RunnerConfig
+
+STEP_WAITING = "Waiting"
+STEP_SUBMITTED = "Submitted"
+STEP_SKIPPED = "Skipped"
+
+FINAL_STEP_STATES = {str(state) for state in TERMINAL_JOB_STATES} | {STEP_SKIPPED}
+
+
+class PipelineRunner:
+    """Submits the steps of a pipeline as soon as all their dependencies completed.
+
+    Finished steps are reported by a single ``JobTracker`` watch on the pipeline label, so ready steps are
+    submitted on the completion event instead of on the next poll, and independent branches run side by side.
+    When a step does not complete, the steps depending on it are skipped while the other branches go on.
+    Steps whose job already exists, e.g. when a pipeline is run again after a failure, are not resubmitted:
+    completed ones count as done and unfinished ones are tracked.
+
+    Args:
+        backend (BaseBackend): Backend providing ``submit_job``, ``get_job`` and the tracker methods.
+        pipeline (PipelineConfig): Pipeline to run.
+        configs (Dict[str, RunnerConfig]): Resolved configs of the steps, see ``resolve_pipeline``.
+        on_change (Optional[Callable[[str, str], None]], optional): Called with the step name and its new state.
+        watch_seconds (int, optional): Lifetime of a single watch request. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        pipeline: PipelineConfig,
+        configs: Dict[str, RunnerConfig],
+        on_change: Optional[Callable[[str, str], None]] = None,
+        watch_seconds: int = 300,
+    ):
+        self.backend = backend
+        self.pipeline = pipeline
+        self.configs = configs
+        self.on_change = on_change
+        self.states: Dict[str, str] = {name: STEP_WAITING for name in pipeline.order()}
+        namespaces = {config.experiment.namespace for config in configs.values()}
+        self.tracker = JobTracker(
+            backend,
+            namespace=namespaces.pop() if len(namespaces) == 1 else "All",
+            label_selector=f"{LABEL_PIPELINE}={pipeline.name}",
+            watch_seconds=watch_seconds,
+        )
+        self._events: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._futures: List[Future] = []
+
+    @property
+    def done(self) -> bool:
+        return all(state in FINAL_STEP_STATES for state in self.states.values())
+
+    @property
+    def succeeded(self) -> bool:
+        return all(state == str(JobState.Completed) for state in self.states.values())
+
+    def ready(self) -> List[str]:
+        """Waiting steps whose dependencies all completed, in dependency order."""
+        completed = str(JobState.Completed)
+        return [
+            name
+            for name, state in self.states.items()
+            if state == STEP_WAITING
+            and all(self.states[dependency] == completed for dependency in self.pipeline.step(name).depends_on)
+        ]
+
+    def _set(self, name: str, state: str):
+        self.states[name] = state
+        if self.on_change is not None:
+            self.on_change(name, state)
+        if state in FINAL_STEP_STATES and state != str(JobState.Completed):
+            for downstream in self.pipeline.order():
+                if downstream in self.pipeline.downstream(name) and self.states[downstream] == STEP_WAITING:
+                    self._set(downstream, STEP_SKIPPED)
+
+    def _submit(self, name: str) -> bool:
+        """Submits the step, returns whether its job has to be tracked."""
+        config = self.configs[name]
+        try:
+            self.backend.submit_job(config)
+        except ApiException as e:
+            if e.status != 409:
+                self._set(name, str(JobState.Failed))
+                return False
+            job = self.backend.get_job(job_name=config.experiment.name, namespace=config.experiment.namespace)
+            if job.state in TERMINAL_JOB_STATES:
+                self._set(name, str(job.state))
+                return False
+        except Exception:
+            self._set(name, str(JobState.Failed))
+            return False
+        self._set(name, STEP_SUBMITTED)
+        return True
+
+    def _launch(self):
+        while True:
+            ready = self.ready()
+            if not ready:
+                return
+            tracked = [name for name in ready if self._submit(name)]
+            if not tracked:
+                continue
+            futures = self.tracker.track_many(
+                [(self.configs[name].experiment.name, self.configs[name].experiment.namespace) for name in tracked]
+            )
+            self._futures += futures
+            for name, future in zip(tracked, futures):
+                future.add_done_callback(lambda future, name=name: self._events.put((name, future)))
+
+    def run(self, timeout: Optional[float] = None) -> Dict[str, str]:
+        """Runs the pipeline until every step finished or was skipped, or until the timeout, returns the states."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._launch()
+            while not self.done:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    name, future = self._events.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                try:
+                    self._set(name, str(future.result().state))
+                except Exception:
+                    # the job was deleted while tracked
+                    self._set(name, str(JobState.Failed))
+                self._launch()
+        finally:
+            # unfinished steps keep running on the cluster, only the tracking stops
+            for future in self._futures:
+                future.cancel()
+        return dict(self.states)
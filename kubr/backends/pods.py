@@ -0,0 +1,387 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kubernetes import client, stream, watch
+from rich import print
+
+from kubr.backends.base import BaseBackend, JobOperationStatus
+from kubr.backends.cache import CacheClient, cache_client_from_env
+from kubr.backends.client import shared_api_client
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import LABEL_JOB_NAME, STARTUP_GATE_CONTAINER, pod_rank
+from kubr.backends.nccl import NetworkHints, network_hints
+from kubr.config.job import (
+    TERMINAL_JOB_STATES,
+    EventSummary,
+    Job,
+    JobBackend,
+    JobRecord,
+    JobState,
+    ReplicaStatus,
+)
+from kubr.config.runner import RunnerConfig
+
+ANNOTATION_WATCHDOG = "kubr.io/watchdog"
+
+DESCRIBE_CONCURRENCY = 16
+
+ARCHIVED_LOG_LINES = 200
+
+
+def _event_time(event: client.CoreV1Event) -> Optional[datetime]:
+    timestamp = event.last_timestamp or event.event_time or event.metadata.creation_timestamp
+    return timestamp.replace(tzinfo=None) if timestamp is not None else None
+
+
+def group_events(events: Iterable[Tuple[str, Optional[int], str, client.CoreV1Event]]) -> List[EventSummary]:
+    """
+    Merges identical events. ``events`` holds (source, rank, involved object name, event) tuples; events that
+    differ only in the pod they mention are merged into one summary listing all ranks.
+    """
+    grouped: Dict[Tuple[str, str, str, str], EventSummary] = {}
+    for source, rank, object_name, event in events:
+        message = (event.message or "").replace(object_name, "<pod>") if source == "Pod" else event.message or ""
+        key = (source, event.type or "", event.reason or "", message)
+        last_seen = _event_time(event)
+        summary = grouped.get(key)
+        if summary is None:
+            summary = grouped[key] = EventSummary(
+                source=source, type=key[1], reason=key[2], message=message, count=0, last_seen=last_seen
+            )
+        summary.count += event.count or 1
+        if rank is not None and rank not in summary.ranks:
+            summary.ranks.append(rank)
+        if last_seen is not None and (summary.last_seen is None or last_seen > summary.last_seen):
+            summary.last_seen = last_seen
+    for summary in grouped.values():
+        summary.ranks.sort()
+    return sorted(grouped.values(), key=lambda s: s.last_seen or datetime.min, reverse=True)
+
+
+_GATE_WAIT_RE = re.compile(r"waited=(\d+(?:\.\d+)?)")
+
+
+def _gate_wait(pod: client.V1Pod) -> Optional[float]:
+    """Seconds the replica waited in the startup gate, from the termination message the gate leaves."""
+    for init_status in pod.status.init_container_statuses or []:
+        terminated = init_status.state.terminated if init_status.name == STARTUP_GATE_CONTAINER else None
+        if terminated is None or terminated.exit_code != 0:
+            continue
+        match = _GATE_WAIT_RE.search(terminated.message or "")
+        if match is not None:
+            return float(match.group(1))
+        if terminated.started_at is not None and terminated.finished_at is not None:
+            return (terminated.finished_at - terminated.started_at).total_seconds()
+    return None
+
+
+def _replica_status(pod: client.V1Pod) -> ReplicaStatus:
+    main_container = pod.spec.containers[0].name
+    statuses = {status.name: status for status in pod.status.container_statuses or []}
+    status = statuses.get(main_container)
+    container_state, restarts = "Waiting", 0
+    if status is not None:
+        restarts = status.restart_count
+        if status.state.running is not None:
+            container_state = "Running"
+        elif status.state.terminated is not None:
+            terminated = status.state.terminated
+            container_state = f"Terminated ({terminated.reason}, exit {terminated.exit_code})"
+        elif status.state.waiting is not None:
+            container_state = f"Waiting ({status.state.waiting.reason})"
+    else:
+        for init_status in pod.status.init_container_statuses or []:
+            if init_status.state.terminated is None:
+                waiting = init_status.state.waiting
+                container_state = f"Init {init_status.name}" + (f" ({waiting.reason})" if waiting else "")
+                break
+    return ReplicaStatus(
+        rank=pod_rank(pod),
+        pod=pod.metadata.name,
+        node=pod.spec.node_name,
+        phase=pod.status.phase,
+        container_state=container_state,
+        restarts=restarts,
+        gate_wait=_gate_wait(pod),
+    )
+
+
+class PodBackend(BaseBackend):
+    """Base of the backends whose replicas are pods labelled with the kubr job name.
+
+    Everything that only needs the pods of a job, e.g. logs, exec, port forwarding, placement and
+    checkpoint markers, is implemented here, together with listing, archiving and deleting in terms of the
+    raw job objects. Subclasses own their job object: they convert it into a ``Job`` and a ``JobRecord``,
+    read, list and delete it, and locate the pod of a replica.
+
+    Args:
+        api_client (Optional[client.ApiClient], optional): Client to use. Defaults to the shared client.
+        history (Optional[HistoryStore], optional): History deleted jobs are archived into. Defaults to None.
+        cache (Optional[CacheClient], optional): Cache server answering listings. Defaults to the one at
+            ``$KUBR_CACHE_URL``.
+    """
+
+    # set by ``register_backend``
+    kind: JobBackend
+
+    def __init__(
+        self,
+        api_client: Optional[client.ApiClient] = None,
+        history: Optional[HistoryStore] = None,
+        cache: Optional[CacheClient] = None,
+    ):
+        # backends share one tuned client (pool, retries, rate limit) unless given one, e.g. a fake API server in tests
+        self.api_client = api_client or shared_api_client()
+        # listings are answered by the in-cluster cache server when $KUBR_CACHE_URL points to one
+        self.cache = cache or cache_client_from_env()
+        self.core_client = client.CoreV1Api(self.api_client)
+        # jobs are archived here before deletion, so their metadata outlives them on the cluster
+        self.history = history
+        self._network_hints: Dict[Tuple[bool, str], Optional[NetworkHints]] = {}
+
+    # job objects, implemented by every backend
+
+    def submit_job(self, run_config: RunnerConfig) -> Job:
+        raise NotImplementedError
+
+    def _to_job(self, k8s_job) -> Job:
+        raise NotImplementedError
+
+    def read_k8s_job(self, job_name: str, namespace: str):
+        """Job object of the backend, raises a 404 ``ApiException`` when it does not exist."""
+        raise NotImplementedError
+
+    def list_k8s_jobs(self, namespace: str = "All") -> list:
+        raise NotImplementedError
+
+    def delete_k8s_job(self, k8s_job):
+        raise NotImplementedError
+
+    def job_record(self, k8s_job, log_lines: int = ARCHIVED_LOG_LINES) -> JobRecord:
+        raise NotImplementedError
+
+    @staticmethod
+    def job_uid(k8s_job) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def job_labels(k8s_job) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def job_informer_source(self) -> Tuple[Callable, Callable[[Dict[str, Any]], Job]]:
+        """
+        Cluster-wide list method of the job objects and the conversion of a raw JSON job object into a
+        ``Job``, for the ``Informer`` of the cache server.
+        """
+        raise NotImplementedError
+
+    def get_replica_pod(self, job_name: str, namespace: str, rank: int = 0) -> client.V1Pod:
+        raise NotImplementedError
+
+    def get_job_main_pod(self, job_name: str, namespace: str):
+        raise NotImplementedError
+
+    # shared behaviour
+
+    def run_job(self, run_config: RunnerConfig) -> [Job, JobOperationStatus]:
+        try:
+            job = self.submit_job(run_config)
+        except Exception as e:
+            # TODO [run] add exception printing
+            print(e)
+            return None, JobOperationStatus.Failed
+        return job, JobOperationStatus.Success
+
+    def network_hints(self, run_config: RunnerConfig) -> Optional[NetworkHints]:
+        """
+        Interconnect hints of the nodes able to run the job, for its NCCL environment. Nodes are listed once per
+        requested IB device, None when the job has no GPUs or nodes can not be listed, e.g. without RBAC access.
+        """
+        resources = run_config.resources
+        if resources.gpu == 0 or not run_config.nccl.auto:
+            return None
+        # the candidate nodes only depend on whether IB devices are requested
+        key = (resources.ib != "auto" and resources.ib > 0, resources.ib_device)
+        if key not in self._network_hints:
+            try:
+                nodes = self.core_client.list_node().items
+            except client.ApiException:
+                nodes = None
+            self._network_hints[key] = network_hints(nodes, resources) if nodes is not None else None
+        return self._network_hints[key]
+
+    def list_jobs(self, namespace: str = "All") -> List[Job]:
+        if self.cache is not None:
+            try:
+                return self.cache.list_jobs(namespace=namespace, backend=str(self.kind))
+            except Exception:
+                pass
+        return [self._to_job(k8s_job) for k8s_job in self.list_k8s_jobs(namespace)]
+
+    def _completion_list_running_jobs(self, **kwargs):
+        if self.cache is not None:
+            try:
+                return self.cache.running_job_names(backend=str(self.kind))
+            except Exception:
+                pass
+        return [job.name for job in self.list_jobs() if job.state == JobState.Running]
+
+    def get_job(self, job_name: str, namespace: str) -> Job:
+        return self._to_job(self.read_k8s_job(job_name, namespace))
+
+    def job_metadata(self, job_name: str, namespace: str) -> Tuple[str, Dict[str, str]]:
+        """Uid and labels of the job object."""
+        k8s_job = self.read_k8s_job(job_name, namespace)
+        return self.job_uid(k8s_job), self.job_labels(k8s_job)
+
+    def get_job_pods(self, job_name: str, namespace: str) -> List[client.V1Pod]:
+        """Pods of all replicas of the job, ordered by rank."""
+        pods = self.core_client.list_namespaced_pod(
+            namespace=namespace, label_selector=f"{LABEL_JOB_NAME}={job_name}"
+        ).items
+        pods.sort(key=pod_rank)
+        return pods
+
+    def job_placement(self, job_name: str, namespace: str) -> Dict[str, Tuple[int, Optional[str]]]:
+        """Rank and node of every pod of the job, by pod name."""
+        if self.cache is not None:
+            try:
+                pods = self.cache.job_pods(namespace=namespace, job_name=job_name)
+                return {pod["name"]: (pod["rank"], pod["node"]) for pod in pods}
+            except Exception:
+                pass
+        return {
+            pod.metadata.name: (pod_rank(pod), pod.spec.node_name) for pod in self.get_job_pods(job_name, namespace)
+        }
+
+    def resolve_replica_pod_name(self, job_name: str, namespace: str, rank: int) -> str:
+        """Name of the pod of the replica, backends whose pod names can be derived skip the lookup."""
+        return self.get_replica_pod(job_name, namespace, rank).metadata.name
+
+    def _stream_client(self) -> client.CoreV1Api:
+        # stream() swaps the request method of the client it is given while opening the websocket, on the
+        # shared client that would turn concurrent requests of other threads into websocket upgrades
+        return client.CoreV1Api(client.ApiClient(self.api_client.configuration))
+
+    def exec_in_replica(self, job_name: str, namespace: str, command: List[str], rank: int = 0, tty: bool = False):
+        """Opens an exec websocket into the main container of the replica and returns the stream client."""
+        pod = self.get_replica_pod(job_name, namespace, rank)
+        return stream.stream(
+            self._stream_client().connect_get_namespaced_pod_exec,
+            name=pod.metadata.name,
+            namespace=namespace,
+            container=pod.spec.containers[0].name,
+            command=command,
+            stdin=tty,
+            stdout=True,
+            stderr=True,
+            tty=tty,
+            _preload_content=False,
+        )
+
+    def port_forward(self, job_name: str, namespace: str, ports: List[int], rank: int = 0):
+        """Opens a port forwarding websocket to the replica, see ``kubernetes.stream.portforward``."""
+        return stream.portforward(
+            self._stream_client().connect_get_namespaced_pod_portforward,
+            name=self.resolve_replica_pod_name(job_name, namespace, rank),
+            namespace=namespace,
+            ports=",".join(str(port) for port in ports),
+        )
+
+    def stream_replica_log(
+        self, job_name: str, namespace: str, rank: int = 0, since_time: Optional[str] = None, follow: bool = True
+    ):
+        """
+        Opens the timestamped log of the replica and returns the raw ``urllib3`` response to read bytes from.
+        ``since_time`` is an RFC 3339 timestamp, lines logged before it are skipped by the kubelet. The
+        generated client does not expose ``sinceTime``, so the request is built here.
+        """
+        query = [("timestamps", "true"), ("follow", "true" if follow else "false")]
+        if since_time is not None:
+            query.append(("sinceTime", since_time))
+        return self.core_client.api_client.call_api(
+            "/api/v1/namespaces/{namespace}/pods/{name}/log",
+            "GET",
+            path_params={"namespace": namespace, "name": self.resolve_replica_pod_name(job_name, namespace, rank)},
+            query_params=query,
+            header_params={"Accept": "text/plain"},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+        )
+
+    def get_checkpoint_marker(self, job_name: str, namespace: str) -> Optional[str]:
+        """
+        Returns the latest checkpoint reported by the job through its termination message, preferring rank 0.
+        Pods that terminated without writing the marker (e.g. a lost node) are skipped.
+        """
+        for pod in self.get_job_pods(job_name, namespace):
+            for status in pod.status.container_statuses or []:
+                for state in [status.state, status.last_state]:
+                    if state is not None and state.terminated is not None and state.terminated.message:
+                        return state.terminated.message.strip()
+        return None
+
+    def delete_job(self, job_name: str, namespace: str, archive: bool = True) -> JobOperationStatus:
+        # TODO add cli response formatting for deletion confirmation
+        k8s_job = self.read_k8s_job(job_name, namespace)
+        if archive and self.history is not None:
+            try:
+                self.history.archive([self.job_record(k8s_job)])
+            except Exception as e:
+                print(f"Archiving job {job_name} failed: {e}")
+        self.delete_k8s_job(k8s_job)
+        return JobOperationStatus.Success
+
+    def archive_job(self, job_name: str, namespace: str) -> JobRecord:
+        record = self.job_record(self.read_k8s_job(job_name, namespace))
+        self.history.archive([record])
+        return record
+
+    def archive_k8s_jobs(self, k8s_jobs: list) -> int:
+        """Archives the jobs that are not in the history yet, returns the number of new records."""
+        archived = self.history.uids(among=[self.job_uid(k8s_job) for k8s_job in k8s_jobs])
+        new_jobs = [k8s_job for k8s_job in k8s_jobs if self.job_uid(k8s_job) not in archived]
+        with ThreadPoolExecutor(max_workers=DESCRIBE_CONCURRENCY) as executor:
+            records = list(executor.map(self.job_record, new_jobs))
+        return self.history.archive(records)
+
+    def archive_finished_jobs(self, namespace: str = "All") -> int:
+        """Archives every finished job that is not in the history yet, returns the number of new records."""
+        k8s_jobs = self.list_k8s_jobs(namespace)
+        finished = [k8s_job for k8s_job in k8s_jobs if self._to_job(k8s_job).state in TERMINAL_JOB_STATES]
+        return self.archive_k8s_jobs(finished)
+
+    def get_job_events(self, pod_name: str, namespace: str):
+        events = self.core_client.list_namespaced_event(
+            namespace=namespace, field_selector=f"involvedObject.name={pod_name}"
+        )
+        return events
+
+    def get_logs(self, job_name: str, namespace: str, tail: Optional[int] = None, follow: bool = False):
+        pod_name, pod = self.get_job_main_pod(job_name, namespace)
+        containers = pod.spec.containers
+        if len(containers) == 0:
+            return f"No containers found for pod {pod_name} in namespace {namespace}"
+        # TODO add logic for multi container selection for logging extraction
+        container = containers[0]
+        container_name = container.name
+        if tail:
+            return self.core_client.read_namespaced_pod_log(
+                name=pod_name, namespace=namespace, container=container_name, tail_lines=tail
+            )
+        if follow:
+            w = watch.Watch()
+            return w.stream(
+                self.core_client.read_namespaced_pod_log, name=pod_name, namespace=namespace, container=container_name
+            )
+
+        api_response = self.core_client.read_namespaced_pod_log(name=pod_name, namespace=namespace)
+        return api_response
+
+    def _list_object_events(self, namespace: str, kind: str, name: str) -> List[client.CoreV1Event]:
+        return self.core_client.list_namespaced_event(
+            namespace=namespace, field_selector=f"involvedObject.kind={kind},involvedObject.name={name}"
+        ).items
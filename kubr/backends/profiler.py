@@ -0,0 +1,268 @@
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.utils import cache_dir
+
+MODE_DUMP = "dump"
+MODE_RECORD = "record"
+
+_PROCESS_HEADER = "### process "
+_LINE_NUMBER_RE = re.compile(r":\d+\)$")
+_THREAD_RE = re.compile(r'^Thread (\S+) \((\w+)\)(?:: "(.*)")?')
+
+# py-spy is run for every Python process of the container, i.e. the torchrun launcher and all local workers;
+# processes are found by their executable so the shell running this script is not profiled
+_PROFILE_SCRIPT = """
+command -v py-spy >/dev/null || {{ echo "py-spy is not installed in the container" >&2; exit 127; }}
+pids=""
+for pid in $(ls /proc | grep -E '^[0-9]+$'); do
+    case "$(readlink /proc/$pid/exe 2>/dev/null)" in
+        *python*) pids="$pids $pid" ;;
+    esac
+done
+[ -n "$pids" ] || {{ echo "no Python process found in the container" >&2; exit 1; }}
+{body}
+"""
+_DUMP_BODY = """
+for pid in $pids; do
+    echo "### process $pid"
+    py-spy dump --pid $pid {options} 2>&1
+done
+"""
+_RECORD_BODY = """
+for pid in $pids; do
+    py-spy record --pid $pid --duration {duration} --rate {rate} --format raw {options} \\
+        --output /tmp/kubr-profile-$pid.txt >/dev/null 2>&1 &
+done
+wait
+for pid in $pids; do
+    echo "### process $pid"
+    cat /tmp/kubr-profile-$pid.txt 2>/dev/null && rm -f /tmp/kubr-profile-$pid.txt
+done
+"""
+
+
+def profile_script(duration: Optional[float] = None, rate: int = 100, native: bool = False) -> str:
+    """Shell script profiling every Python process of a container, a dump without ``duration``."""
+    options = "--native" if native else ""
+    if duration is None:
+        body = _DUMP_BODY.format(options=options)
+    else:
+        # py-spy can not unwind native stacks without pausing the process
+        options = options or "--nonblocking"
+        body = _RECORD_BODY.format(duration=max(int(duration), 1), rate=rate, options=options)
+    return _PROFILE_SCRIPT.format(body=body)
+
+
+def split_processes(output: str) -> Dict[int, str]:
+    """Splits the script output into the py-spy output of every process."""
+    processes: Dict[int, List[str]] = {}
+    lines: Optional[List[str]] = None
+    for line in output.splitlines():
+        if line.startswith(_PROCESS_HEADER):
+            lines = processes.setdefault(int(line[len(_PROCESS_HEADER) :]), [])
+        elif lines is not None:
+            lines.append(line)
+    return {pid: "\n".join(lines) for pid, lines in processes.items()}
+
+
+class ThreadStack(BaseModel):
+    """ThreadStack is the stack of one thread in a py-spy dump.
+
+    Args:
+        thread (str): Thread id.
+        name (Optional[str]): Thread name, "MainThread" for the main thread.
+        active (bool): Whether the thread was running rather than idle or waiting on the GIL.
+        frames (List[str]): Frames as ``function (file:line)``, innermost first.
+    """
+
+    thread: str
+    name: Optional[str] = None
+    active: bool = False
+    frames: List[str] = []
+
+
+def parse_dump(text: str) -> List[ThreadStack]:
+    """Threads of a ``py-spy dump`` of one process."""
+    threads: List[ThreadStack] = []
+    for line in text.splitlines():
+        match = _THREAD_RE.match(line)
+        if match is not None:
+            thread, status, name = match.groups()
+            threads.append(ThreadStack(thread=thread, name=name, active=status == "active"))
+        elif threads and line.startswith("    ") and line.strip():
+            frame = line.strip()
+            # --locals adds indented variables below the frame
+            if not line.startswith("        "):
+                threads[-1].frames.append(frame)
+    return threads
+
+
+def parse_collapsed(text: str) -> Dict[str, int]:
+    """Sample counts by stack of a ``py-spy record --format raw`` output, frames outermost first and ``;`` joined."""
+    stacks: Counter = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack and count.isdigit():
+            stacks[stack] += int(count)
+    return dict(stacks)
+
+
+def _function(frame: str) -> str:
+    return _LINE_NUMBER_RE.sub(")", frame.strip())
+
+
+class ReplicaProfile(BaseModel):
+    """ReplicaProfile is the profiler output of one replica.
+
+    Args:
+        rank (int): Rank of the replica.
+        pod (str): Name of the pod.
+        mode (str): "dump" or "record".
+        processes (Dict[int, str]): Raw py-spy output by process id.
+        error (Optional[str]): Why profiling the replica failed.
+    """
+
+    rank: int
+    pod: str
+    mode: str
+    processes: Dict[int, str] = {}
+    error: Optional[str] = None
+
+    def main_stacks(self) -> List[List[str]]:
+        """Main thread stack of every dumped process, innermost frame first and without line numbers."""
+        stacks = []
+        for pid in sorted(self.processes):
+            threads = parse_dump(self.processes[pid])
+            if not threads:
+                continue
+            main = next((thread for thread in threads if thread.name == "MainThread"), threads[0])
+            stacks.append([_function(frame) for frame in main.frames])
+        return stacks
+
+    def hot_functions(self) -> List[Tuple[str, float]]:
+        """Functions by their share of the recorded samples as the innermost frame, hottest first."""
+        counts: Counter = Counter()
+        for pid in self.processes:
+            for stack, count in parse_collapsed(self.processes[pid]).items():
+                counts[_function(stack.rpartition(";")[2])] += count
+        total = sum(counts.values())
+        return [(function, count / total) for function, count in counts.most_common()]
+
+    def signature(self, depth: int = 8) -> Tuple[str, ...]:
+        """What the replica was doing: the innermost frames of the dumped stacks, or the hottest function."""
+        if self.error is not None:
+            return ("error: " + self.error.strip().splitlines()[-1],) if self.error.strip() else ("error",)
+        if self.mode == MODE_DUMP:
+            return tuple(" <- ".join(stack[:depth]) for stack in sorted(self.main_stacks()))
+        hot = self.hot_functions()
+        return (hot[0][0],) if hot else ()
+
+
+class StackGroup(BaseModel):
+    """StackGroup is a set of ranks doing the same thing.
+
+    Args:
+        ranks (List[int]): Ranks of the group.
+        signature (List[str]): Shared stacks or hottest function, see ``ReplicaProfile.signature``.
+        diverging (bool): Whether the group differs from the largest group.
+    """
+
+    ranks: List[int]
+    signature: List[str]
+    diverging: bool = False
+
+
+def group_ranks(profiles: List[ReplicaProfile], depth: int = 8) -> List[StackGroup]:
+    """
+    Groups ranks by their signature, largest group first. Every other group diverges: in a hang these are the
+    ranks stuck somewhere else than the collective the rest waits in, when recording the ranks busy elsewhere.
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+    for profile in sorted(profiles, key=lambda profile: profile.rank):
+        groups[profile.signature(depth)].append(profile.rank)
+    ordered = sorted(groups.items(), key=lambda item: (-len(item[1]), item[1][0]))
+    return [
+        StackGroup(ranks=ranks, signature=list(signature), diverging=index > 0)
+        for index, (signature, ranks) in enumerate(ordered)
+    ]
+
+
+class JobProfiler:
+    """Runs py-spy inside the main container of every replica of a job in parallel.
+
+    Without a duration every Python process is dumped once, which shows where a hung job waits; with a
+    duration every process is sampled for that many seconds. The image needs ``py-spy`` installed, and
+    clusters running pods with a restrictive seccomp profile need the ``SYS_PTRACE`` capability.
+
+    Args:
+        backend (BaseBackend): Backend providing ``job_placement`` and ``exec_in_replica``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        duration (Optional[float], optional): Seconds to record, None to dump. Defaults to None.
+        rate (int, optional): Samples per second when recording. Defaults to 100.
+        native (bool, optional): Include native frames, e.g. of NCCL calls. Defaults to False.
+        concurrency (int, optional): Maximum number of replicas profiled at once. Defaults to 32.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        job_name: str,
+        namespace: str,
+        duration: Optional[float] = None,
+        rate: int = 100,
+        native: bool = False,
+        concurrency: int = 32,
+    ):
+        self.backend = backend
+        self.job_name = job_name
+        self.namespace = namespace
+        self.duration = duration
+        self.mode = MODE_DUMP if duration is None else MODE_RECORD
+        self.script = profile_script(duration, rate=rate, native=native)
+        self.concurrency = concurrency
+
+    def _profile(self, pod: str, rank: int) -> ReplicaProfile:
+        profile = ReplicaProfile(rank=rank, pod=pod, mode=self.mode)
+        try:
+            session = self.backend.exec_in_replica(
+                self.job_name, self.namespace, command=["sh", "-c", self.script], rank=rank
+            )
+            session.run_forever(timeout=(self.duration or 0) + 60)
+            stdout, stderr = session.read_stdout() or "", session.read_stderr() or ""
+            session.close()
+        except Exception as e:
+            profile.error = str(e)
+            return profile
+        profile.processes = split_processes(stdout)
+        if not profile.processes:
+            profile.error = stderr or "py-spy produced no output"
+        return profile
+
+    def run(self) -> List[ReplicaProfile]:
+        """Profiles all replicas, returns their profiles ordered by rank."""
+        placement = self.backend.job_placement(self.job_name, self.namespace)
+        if not placement:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(placement), self.concurrency)) as executor:
+            profiles = list(executor.map(lambda item: self._profile(item[0], item[1][0]), placement.items()))
+        return sorted(profiles, key=lambda profile: profile.rank)
+
+    def save(self, profiles: List[ReplicaProfile], directory: Optional[Path] = None) -> Path:
+        """Writes the raw output of every rank, ``rank-<rank>.txt``, to a new directory."""
+        directory = directory or cache_dir() / "profiles" / f"{self.job_name}-{datetime.utcnow():%Y%m%dT%H%M%S}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for profile in profiles:
+            text = "\n".join(f"{_PROCESS_HEADER}{pid}\n{output}" for pid, output in sorted(profile.processes.items()))
+            if profile.error is not None:
+                text += f"\nerror: {profile.error}\n"
+            (directory / f"rank-{profile.rank}.txt").write_text(text)
+        return directory
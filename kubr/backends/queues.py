@@ -0,0 +1,116 @@
+import json
+import math
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from kubr.backends.utils import cache_dir
+
+AUTO_QUEUE = "auto"
+GPU_RESOURCE = "nvidia.com/gpu"
+
+
+class QueueInfo(BaseModel):
+    """QueueInfo is a snapshot of a Volcano queue.
+
+    Args:
+        name (str): Name of the queue.
+        state (str): State of the queue, only "Open" queues accept jobs.
+        gpu_capability (Optional[int]): GPU limit of the queue, None if unlimited.
+        gpu_allocated (int): GPUs allocated to jobs in the queue.
+    """
+
+    name: str
+    state: str
+    gpu_capability: Optional[int] = None
+    gpu_allocated: int = 0
+
+    @property
+    def gpu_free(self) -> float:
+        if self.gpu_capability is None:
+            return math.inf
+        return self.gpu_capability - self.gpu_allocated
+
+
+def _gpu_quantity(resources: Optional[dict]) -> Optional[int]:
+    if not resources or GPU_RESOURCE not in resources:
+        return None
+    return int(float(resources[GPU_RESOURCE]))
+
+
+def queue_info(queue: dict) -> QueueInfo:
+    """Snapshot of a Volcano queue object."""
+    status = queue.get("status", {})
+    return QueueInfo(
+        name=queue["metadata"]["name"],
+        state=status.get("state", "Open"),
+        gpu_capability=_gpu_quantity(queue["spec"].get("capability")),
+        gpu_allocated=_gpu_quantity(status.get("allocated")) or 0,
+    )
+
+
+class QueueSelector:
+    """Picks the Volcano queue with the most free GPU quota.
+
+    Queue status is cached on disk for ``ttl`` seconds, so a sweep of submissions lists queues once.
+    Every selection reserves the requested GPUs in the cached view, which spreads back-to-back submissions
+    across queues instead of piling them into the one that looked emptiest.
+
+    Args:
+        crd_client (CustomObjectsApi): Client for Volcano custom resources.
+        ttl (float, optional): Seconds the cached queue view stays valid. Defaults to 30.
+        cache_path (Optional[Path], optional): Cache file location. Defaults to queues.json in the kubr cache dir.
+        cache (Optional[CacheClient], optional): Cache server asked before the API server. Defaults to None.
+    """
+
+    def __init__(self, crd_client, ttl: float = 30, cache_path: Optional[Path] = None, cache=None):
+        self.crd_client = crd_client
+        self.ttl = ttl
+        self.cache_path = cache_path or cache_dir() / "queues.json"
+        self.cache = cache
+
+    def _fetch_queues(self) -> List[QueueInfo]:
+        if self.cache is not None:
+            try:
+                return self.cache.queues()
+            except Exception:
+                pass
+        raw_queues = self.crd_client.list_cluster_custom_object(
+            group="scheduling.volcano.sh", version="v1beta1", plural="queues"
+        )
+        return [queue_info(queue) for queue in raw_queues["items"]]
+
+    def _cached_view(self) -> Tuple[List[QueueInfo], float]:
+        try:
+            cached = json.loads(self.cache_path.read_text())
+            if time.time() - cached["timestamp"] <= self.ttl:
+                return [QueueInfo(**queue) for queue in cached["queues"]], cached["timestamp"]
+        except (OSError, ValueError, KeyError):
+            pass
+        queues, timestamp = self._fetch_queues(), time.time()
+        self._store_cache(queues, timestamp)
+        return queues, timestamp
+
+    def _store_cache(self, queues: List[QueueInfo], timestamp: float):
+        payload = {"timestamp": timestamp, "queues": [queue.model_dump() for queue in queues]}
+        self.cache_path.write_text(json.dumps(payload))
+
+    def list_queues(self) -> List[QueueInfo]:
+        return self._cached_view()[0]
+
+    def select(self, gpu: int, candidates: Optional[List[str]] = None) -> str:
+        all_queues, timestamp = self._cached_view()
+        queues = [queue for queue in all_queues if queue.state == "Open"]
+        if candidates:
+            queues = [queue for queue in queues if queue.name in candidates]
+        if not queues:
+            raise ValueError(f"No open queues to choose from among {candidates or 'all queues'}")
+
+        # queues that fit the job first, then the most free quota, name keeps the choice stable
+        best = max(queues, key=lambda queue: (queue.gpu_free >= gpu, queue.gpu_free, queue.name))
+
+        best.gpu_allocated += gpu
+        self._store_cache(all_queues, timestamp)
+        return best.name
@@ -0,0 +1,25 @@
+from typing import Callable, Dict, Type
+
+from kubr.backends.base import BaseBackend, KubrError
+from kubr.config.job import JobBackend
+
+# backend classes by the ``RunnerConfig.backend`` they run jobs for, filled in by ``register_backend``
+BACKENDS: Dict[JobBackend, Type[BaseBackend]] = {}
+
+
+def register_backend(kind: JobBackend) -> Callable[[Type[BaseBackend]], Type[BaseBackend]]:
+    """Class decorator registering a backend for the jobs configured with ``backend: <kind>``."""
+
+    def register(backend_class: Type[BaseBackend]) -> Type[BaseBackend]:
+        backend_class.kind = kind
+        BACKENDS[kind] = backend_class
+        return backend_class
+
+    return register
+
+
+def create_backend(kind: JobBackend, **kwargs) -> BaseBackend:
+    """Instantiates the backend registered for ``kind``, ``kwargs`` are passed to its constructor."""
+    if kind not in BACKENDS:
+        raise KubrError(f"No backend is registered for {kind}, known backends are {', '.join(map(str, BACKENDS))}")
+    return BACKENDS[kind](**kwargs)
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import RESERVED_MEMMB, RESERVED_MILLICPU, SHM_VOLUME, shm_size
+from kubr.backends.telemetry import ResourceSample
+from kubr.config.job import ResourcePeaks
+from kubr.config.runner import ResourceConfig, RunnerConfig
+
+LABEL_CONFIG_KEY = "kubr.io/config-key"
+
+SIZING_HEADROOM = 0.25
+
+
+def config_key(config: RunnerConfig) -> str:
+    """
+    Key of the configs expected to use the same resources: the same image, entrypoint, job type and resources,
+    under any job name. The requests themselves are left out, so applying a recommendation keeps the key.
+    """
+    identity = {
+        "image": config.container.image,
+        "entrypoint": config.container.entrypoint,
+        "type": str(config.type),
+        "resources": config.resources.model_dump(mode="json", exclude={"cpu_request", "memory_request", "shm"}),
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def parse_shm_usage(summary: Dict, namespace: str) -> Dict[str, float]:
+    """Used ``/dev/shm`` in MiB by pod of ``namespace``, from a kubelet ``stats/summary`` response."""
+    usage = {}
+    for pod in summary.get("pods") or []:
+        ref = pod["podRef"]
+        if ref["namespace"] != namespace:
+            continue
+        for volume in pod.get("volume") or []:
+            if volume.get("name") == SHM_VOLUME and volume.get("usedBytes") is not None:
+                usage[ref["name"]] = volume["usedBytes"] / 2**20
+    return usage
+
+
+def _peak(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+class UsageRecorder:
+    """Keeps the peak usage of a sampled job in the history, keyed by the config the job was submitted with.
+
+    CPU and memory come from the telemetry samples, ``/dev/shm`` usage from the kubelet summary of the nodes
+    running the job. Jobs submitted without a config key label, e.g. by older kubr versions, are not recorded.
+
+    Args:
+        backend (BaseBackend): Backend providing ``job_metadata`` and ``core_client``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        store (Optional[HistoryStore], optional): History to record into. Defaults to the local history.
+    """
+
+    def __init__(self, backend: BaseBackend, job_name: str, namespace: str, store: Optional[HistoryStore] = None):
+        self.backend = backend
+        self.job_name = job_name
+        self.namespace = namespace
+        self.store = store
+        self._job: Optional[Dict[str, str]] = None
+
+    def _resolve(self) -> Optional[Dict[str, str]]:
+        if self._job is None:
+            try:
+                uid, labels = self.backend.job_metadata(self.job_name, self.namespace)
+            except Exception:
+                return None
+            self._job = {"uid": uid, "config_key": labels.get(LABEL_CONFIG_KEY)}
+        return self._job if self._job["config_key"] else None
+
+    def _shm_usage(self, nodes: List[str]) -> Dict[str, float]:
+        usage = {}
+        for node in nodes:
+            try:
+                summary = self.backend.core_client.connect_get_node_proxy_with_path(name=node, path="stats/summary")
+                usage.update(parse_shm_usage(json.loads(summary), self.namespace))
+            except Exception:
+                pass
+        return usage
+
+    def record(self, samples: List[ResourceSample]) -> Optional[ResourcePeaks]:
+        """Records one snapshot of samples of all replicas, returns its peaks or None if not recorded."""
+        job = self._resolve()
+        if not samples or job is None:
+            return None
+        shm = self._shm_usage(sorted({sample.node for sample in samples if sample.node is not None}))
+        peaks = ResourcePeaks(
+            uid=job["uid"],
+            config_key=job["config_key"],
+            name=self.job_name,
+            namespace=self.namespace,
+            cpu_millicores=_peak([sample.cpu_millicores for sample in samples]),
+            memory_mb=_peak([sample.memory_mb for sample in samples]),
+            shm_mb=_peak([shm.get(sample.pod) for sample in samples]),
+            samples=1,
+            recorded_at=datetime.utcnow(),
+        )
+        if self.store is None:
+            self.store = HistoryStore()
+        self.store.record_peaks(peaks)
+        return peaks
+
+
+class Rightsizing(BaseModel):
+    """Rightsizing are tighter resources of a config, derived from the peak usage of its previous jobs.
+
+    Only the CPU and memory requests are applied, the ``/dev/shm`` limit is a suggestion: exceeding it evicts
+    the pod, so it is left to the user to tighten.
+
+    Args:
+        runs (int): Number of previous jobs the recommendation is based on.
+        cpu_request (Optional[float]): CPUs to request, None to keep the current request.
+        memory_request (Optional[float]): Memory in GB to request, None to keep the current request.
+        shm (Optional[float]): Size limit of ``/dev/shm`` in GB, None to keep the current limit.
+    """
+
+    runs: int
+    cpu_request: Optional[float] = None
+    memory_request: Optional[float] = None
+    shm: Optional[float] = None
+
+    def apply(self, resources: ResourceConfig) -> ResourceConfig:
+        update = self.model_dump(exclude={"runs", "shm"}, exclude_none=True)
+        return resources.model_copy(update=update)
+
+
+def _round_up(value: float, step: float) -> float:
+    return round(math.ceil(value / step - 1e-9) * step, 3)
+
+
+def current_requests(resources: ResourceConfig) -> Dict[str, Optional[float]]:
+    """CPUs and GB of memory the config requests, see ``create_pod_definition``."""
+    cpu, memory = resources.cpu_request, resources.memory_request
+    if cpu is None and resources.cpu > 0:
+        cpu = max(resources.cpu - RESERVED_MILLICPU / 1000, 0)
+    if memory is None and resources.memory > 0:
+        memory = max(resources.memory - RESERVED_MEMMB / 2**10, 0)
+    return {"cpu_request": cpu, "memory_request": memory, "shm": shm_size(resources)}
+
+
+def recommend(
+    peaks: List[ResourcePeaks], resources: ResourceConfig, headroom: float = SIZING_HEADROOM, min_runs: int = 1
+) -> Optional[Rightsizing]:
+    """
+    Requests covering the highest peak of the previous jobs plus ``headroom``, where they are below the current
+    ones, or None when there is nothing to tighten. Requests are never raised above the limits.
+    """
+    if len(peaks) < min_runs:
+        return None
+    current = current_requests(resources)
+    rightsizing = Rightsizing(runs=len(peaks))
+    cpu_peak = _peak([peak.cpu_millicores for peak in peaks])
+    if cpu_peak is not None and current["cpu_request"] is not None:
+        cpu = _round_up(max(cpu_peak, 1) * (1 + headroom) / 1000, 0.1)
+        if cpu < current["cpu_request"]:
+            rightsizing.cpu_request = cpu
+    memory_peak = _peak([peak.memory_mb for peak in peaks])
+    if memory_peak is not None and current["memory_request"] is not None:
+        memory = _round_up(max(memory_peak, 1) * (1 + headroom) / 2**10, 0.5)
+        if memory < current["memory_request"]:
+            rightsizing.memory_request = memory
+    shm_peak = _peak([peak.shm_mb for peak in peaks])
+    if shm_peak is not None:
+        # exceeding the limit evicts the pod, so it is rounded to whole GB on top of the headroom
+        shm = _round_up(max(shm_peak, 1) * (1 + headroom) / 2**10, 1)
+        if current["shm"] is None or shm < current["shm"]:
+            rightsizing.shm = shm
+    if rightsizing.cpu_request is None and rightsizing.memory_request is None and rightsizing.shm is None:
+        return None
+    return rightsizing
@@ -0,0 +1,256 @@
+import re
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from kubr.backends.k8s_runner import LABEL_JOB_NAME
+
+DCGM_GPU_UTIL = "DCGM_FI_DEV_GPU_UTIL"
+DCGM_FB_USED = "DCGM_FI_DEV_FB_USED"
+
+_CPU_UNITS = {"n": 1e-6, "u": 1e-3, "m": 1, "": 1000}
+_MEMORY_UNITS = {
+    "Ki": 2**10,
+    "Mi": 2**20,
+    "Gi": 2**30,
+    "Ti": 2**40,
+    "k": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "": 1,
+}
+_QUANTITY_RE = re.compile(r"^([0-9.]+)([a-zA-Z]*)$")
+_METRIC_RE = re.compile(r"^(\w+)\{(.*)\}\s+(\S+)")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_cpu_millicores(quantity: str) -> float:
+    value, unit = _QUANTITY_RE.match(quantity).groups()
+    return float(value) * _CPU_UNITS[unit]
+
+
+def parse_memory_mb(quantity: str) -> float:
+    value, unit = _QUANTITY_RE.match(quantity).groups()
+    return float(value) * _MEMORY_UNITS[unit] / 2**20
+
+
+def parse_dcgm_metrics(text: str, namespace: str) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Extracts per-GPU utilization and framebuffer usage from a DCGM exporter Prometheus page.
+
+    Returns ``{pod_name: {metric_name: [value per GPU]}}`` for pods of ``namespace``. Exporters without
+    Kubernetes pod mapping do not report pods and yield nothing.
+    """
+    result: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for line in text.splitlines():
+        if not line.startswith((DCGM_GPU_UTIL, DCGM_FB_USED)):
+            continue
+        match = _METRIC_RE.match(line)
+        if match is None:
+            continue
+        name, raw_labels, value = match.groups()
+        labels = dict(_LABEL_RE.findall(raw_labels))
+        pod = labels.get("pod") or labels.get("exported_pod")
+        pod_namespace = labels.get("namespace") or labels.get("exported_namespace")
+        if pod and pod_namespace == namespace:
+            result[pod][name].append(float(value))
+    return result
+
+
+class ResourceSample(BaseModel):
+    """ResourceSample is a single utilization measurement of one replica.
+
+    Args:
+        timestamp (float): Unix time of the measurement.
+        pod (str): Name of the pod.
+        rank (int): Rank of the replica.
+        node (Optional[str]): Node running the replica.
+        cpu_millicores (Optional[float]): CPU usage in millicores.
+        memory_mb (Optional[float]): Memory usage in MiB.
+        gpu_util (Optional[float]): Mean utilization of the replica GPUs in percent.
+        gpu_memory_mb (Optional[float]): Total framebuffer usage of the replica GPUs in MiB.
+    """
+
+    timestamp: float
+    pod: str
+    rank: int
+    node: Optional[str] = None
+    cpu_millicores: Optional[float] = None
+    memory_mb: Optional[float] = None
+    gpu_util: Optional[float] = None
+    gpu_memory_mb: Optional[float] = None
+
+
+class TelemetryCollector:
+    """Samples resource utilization of every replica of a job.
+
+    CPU and memory come from one metrics-server request per sample. GPU metrics are scraped, when a DCGM
+    exporter is deployed, from the exporter pods on the nodes running the job only, in parallel. Pod and
+    exporter placement is resolved once and reused for all samples.
+
+    Args:
+        backend (BaseBackend): Backend exposing ``core_client``, ``crd_client`` and ``job_placement``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        dcgm_namespace (str, optional): Namespace of the DCGM exporter. Defaults to "gpu-operator".
+        dcgm_selector (str, optional): Label selector of the DCGM exporter pods.
+            Defaults to "app=nvidia-dcgm-exporter".
+        dcgm_port (int, optional): Metrics port of the DCGM exporter. Defaults to 9400.
+    """
+
+    def __init__(
+        self,
+        backend,
+        job_name: str,
+        namespace: str,
+        dcgm_namespace: str = "gpu-operator",
+        dcgm_selector: str = "app=nvidia-dcgm-exporter",
+        dcgm_port: int = 9400,
+    ):
+        self.backend = backend
+        self.job_name = job_name
+        self.namespace = namespace
+        self.dcgm_namespace = dcgm_namespace
+        self.dcgm_selector = dcgm_selector
+        self.dcgm_port = dcgm_port
+        self._placement: Optional[Dict[str, Tuple[int, Optional[str]]]] = None
+        self._exporters: Optional[Dict[str, str]] = None
+
+    def _pod_placement(self) -> Dict[str, Tuple[int, Optional[str]]]:
+        if self._placement is None or any(node is None for _, node in self._placement.values()):
+            self._placement = self.backend.job_placement(self.job_name, self.namespace)
+        return self._placement
+
+    def _dcgm_exporters(self) -> Dict[str, str]:
+        if self._exporters is None:
+            try:
+                pods = self.backend.core_client.list_namespaced_pod(
+                    namespace=self.dcgm_namespace, label_selector=self.dcgm_selector
+                ).items
+            except Exception:
+                pods = []
+            self._exporters = {pod.spec.node_name: pod.metadata.name for pod in pods}
+        return self._exporters
+
+    def _scrape_dcgm(self, exporter: str) -> Dict[str, Dict[str, List[float]]]:
+        text = self.backend.core_client.connect_get_namespaced_pod_proxy_with_path(
+            name=f"{exporter}:{self.dcgm_port}", namespace=self.dcgm_namespace, path="metrics"
+        )
+        return parse_dcgm_metrics(text, self.namespace)
+
+    def _gpu_metrics(self, nodes: List[str]) -> Dict[str, Dict[str, List[float]]]:
+        exporters = self._dcgm_exporters()
+        targets = [exporters[node] for node in nodes if node in exporters]
+        metrics: Dict[str, Dict[str, List[float]]] = {}
+        if not targets:
+            return metrics
+        with ThreadPoolExecutor(max_workers=min(len(targets), 16)) as executor:
+            for node_metrics in executor.map(self._scrape_dcgm, targets):
+                metrics.update(node_metrics)
+        return metrics
+
+    def sample(self) -> List[ResourceSample]:
+        placement = self._pod_placement()
+        timestamp = time.time()
+        pod_metrics = self.backend.crd_client.list_namespaced_custom_object(
+            group="metrics.k8s.io",
+            version="v1beta1",
+            namespace=self.namespace,
+            plural="pods",
+            label_selector=f"{LABEL_JOB_NAME}={self.job_name}",
+        )["items"]
+        usage = {}
+        for pod in pod_metrics:
+            containers = pod["containers"]
+            usage[pod["metadata"]["name"]] = (
+                sum(parse_cpu_millicores(c["usage"]["cpu"]) for c in containers),
+                sum(parse_memory_mb(c["usage"]["memory"]) for c in containers),
+            )
+        gpu_metrics = self._gpu_metrics(sorted({node for _, node in placement.values() if node is not None}))
+
+        samples = []
+        for pod_name, (rank, node) in placement.items():
+            cpu, memory = usage.get(pod_name, (None, None))
+            gpu = gpu_metrics.get(pod_name, {})
+            samples.append(
+                ResourceSample(
+                    timestamp=timestamp,
+                    pod=pod_name,
+                    rank=rank,
+                    node=node,
+                    cpu_millicores=cpu,
+                    memory_mb=memory,
+                    gpu_util=statistics.mean(gpu[DCGM_GPU_UTIL]) if gpu.get(DCGM_GPU_UTIL) else None,
+                    gpu_memory_mb=sum(gpu[DCGM_FB_USED]) if gpu.get(DCGM_FB_USED) else None,
+                )
+            )
+        samples.sort(key=lambda s: s.rank)
+        return samples
+
+
+class UtilizationSummary(BaseModel):
+    """UtilizationSummary aggregates samples of one rank or node.
+
+    Args:
+        key (str): Rank or node name.
+        samples (int): Number of aggregated samples.
+        cpu_millicores (Optional[float]): Mean CPU usage.
+        memory_mb_peak (Optional[float]): Peak memory usage.
+        gpu_util (Optional[float]): Mean GPU utilization.
+        gpu_memory_mb_peak (Optional[float]): Peak GPU framebuffer usage.
+    """
+
+    key: str
+    samples: int
+    cpu_millicores: Optional[float] = None
+    memory_mb_peak: Optional[float] = None
+    gpu_util: Optional[float] = None
+    gpu_memory_mb_peak: Optional[float] = None
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return statistics.mean(values) if values else None
+
+
+def _peak(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def aggregate(samples: List[ResourceSample], by: str = "rank") -> List[UtilizationSummary]:
+    """Aggregates samples per ``rank`` or per ``node``."""
+    groups: Dict[str, List[ResourceSample]] = defaultdict(list)
+    for sample in samples:
+        groups[str(getattr(sample, by))].append(sample)
+    return [
+        UtilizationSummary(
+            key=key,
+            samples=len(group),
+            cpu_millicores=_mean([s.cpu_millicores for s in group]),
+            memory_mb_peak=_peak([s.memory_mb for s in group]),
+            gpu_util=_mean([s.gpu_util for s in group]),
+            gpu_memory_mb_peak=_peak([s.gpu_memory_mb for s in group]),
+        )
+        for key, group in sorted(groups.items(), key=lambda item: min(s.rank for s in item[1]))
+    ]
+
+
+def find_straggler(summaries: List[UtilizationSummary], threshold: float = 0.8) -> Optional[str]:
+    """
+    Key of the rank whose mean GPU utilization is below ``threshold`` of the median of all ranks,
+    or None when ranks are balanced or there are no GPU metrics.
+    """
+    with_gpu = [s for s in summaries if s.gpu_util is not None]
+    if len(with_gpu) < 2:
+        return None
+    median = statistics.median(s.gpu_util for s in with_gpu)
+    slowest = min(with_gpu, key=lambda s: s.gpu_util)
+    if slowest.gpu_util < threshold * median:
+        return slowest.key
+    return None
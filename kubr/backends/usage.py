@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from kubr.backends.history import HistoryStore
+from kubr.config.job import TERMINAL_JOB_STATES, GpuUsage, Job, JobState
+
+
+def holds_gpus(job: Job) -> bool:
+    """Whether the job has its GPUs right now: it was scheduled and has not finished yet."""
+    return job.state != JobState.Pending and job.state not in TERMINAL_JOB_STATES
+
+
+def gpu_usage(
+    history: HistoryStore,
+    by: str,
+    since: datetime,
+    until: Optional[datetime] = None,
+    live_jobs: Iterable[Job] = (),
+) -> List[GpuUsage]:
+    """
+    GPU-hours between ``since`` and ``until`` (UTC, defaults to now) by namespace, user or queue, largest first.
+
+    Finished jobs are aggregated in the history, so they have to be archived first, see
+    ``archive_finished_jobs``. ``live_jobs`` adds the jobs still running, from their last transition, e.g. into
+    Running, up to ``until``.
+    """
+    until = until if until is not None else datetime.utcnow()
+    usage: Dict[Optional[str], GpuUsage] = {row.key: row for row in history.usage(by, since, until)}
+    for job in live_jobs:
+        if not holds_gpus(job) or not isinstance(job.age, datetime) or job.age >= until:
+            continue
+        key = getattr(job, by)
+        row = usage.setdefault(key, GpuUsage(key=key))
+        row.gpu_hours += job.gpu * (until - max(job.age, since)).total_seconds() / 3600
+        row.jobs += 1
+        row.running += 1
+    return sorted(usage.values(), key=lambda row: row.gpu_hours, reverse=True)
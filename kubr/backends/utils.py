@@ -0,0 +1,21 @@
+import getpass
+import os
+import re
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Directory for kubr caches, ``$KUBR_CACHE_DIR`` or ``~/.cache/kubr``. Created on first use.
+    """
+    path = Path(os.environ.get("KUBR_CACHE_DIR", "~/.cache/kubr")).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def current_user() -> str:
+    """
+    Name jobs are accounted to, ``$KUBR_USER`` or the login name, reduced to a valid label value.
+    """
+    user = os.environ.get("KUBR_USER") or getpass.getuser()
+    return re.sub(r"[^A-Za-z0-9_.\-]", "", user)[:63].strip("-_.") or "unknown"
@@ -1,17 +1,47 @@
 import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Iterable, Mapping, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-import humanize
-from kubernetes import client, config, watch
+from kubernetes import client, watch
 from rich import print
-from tabulate import tabulate
 
-from kubr.backends.base import BaseBackend, JobOperationStatus
-from kubr.backends.k8s_runner import create_pod_definition
-from kubr.config.job import Job, JobBackend, JobState, JobType
-from kubr.config.runner import EnvVar, RunnerConfig
+from kubr.backends.base import JobOperationStatus
+from kubr.backends.cache import CacheClient
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import (
+    LABEL_USER,
+    create_pod_definition,
+    create_rendezvous_service,
+    pod_rank,
+)
+from kubr.backends.pods import (
+    ANNOTATION_WATCHDOG,
+    ARCHIVED_LOG_LINES,
+    DESCRIBE_CONCURRENCY,
+    PodBackend,
+    _replica_status,
+    group_events,
+)
+from kubr.backends.queues import AUTO_QUEUE, QueueSelector
+from kubr.backends.registry import register_backend
+from kubr.backends.rightsizing import LABEL_CONFIG_KEY, config_key
+from kubr.backends.utils import current_user
+from kubr.config.job import (
+    TERMINAL_JOB_STATES,
+    Job,
+    JobBackend,
+    JobDescription,
+    JobRecord,
+    JobState,
+    JobType,
+)
+from kubr.config.runner import RunnerConfig, WatchdogConfig
+
+ANNOTATION_PREEMPTABLE = "volcano.sh/preemptable"
 
 
 def normalize_str(data: str) -> str:
@@ -27,6 +57,14 @@ def normalize_str(data: str) -> str:
     return "".join(re.findall(pattern, data.lower()))
 
 
+def _started_at(k8s_job: Dict[str, Any]) -> Optional[datetime]:
+    # Volcano appends a condition per phase change, the first Running one is when the GPUs were taken
+    for condition in k8s_job.get("status", {}).get("conditions") or []:
+        if condition.get("status") == str(JobState.Running) and condition.get("lastTransitionTime"):
+            return datetime.strptime(condition["lastTransitionTime"], "%Y-%m-%dT%H:%M:%SZ")
+    return None
+
+
 class RetryPolicy(str, Enum):
     REPLICA = "REPLICA"
     APPLICATION = "APPLICATION"
@@ -41,29 +79,40 @@ RETRY_POLICIES: Mapping[str, Iterable[Mapping[str, str]]] = {
 }
 
 
-class VolcanoBackend(BaseBackend):
+@register_backend(JobBackend.Volcano)
+class VolcanoBackend(PodBackend):
     DEFAULT_TASK_NAME = "worker"
 
-    def __init__(self):
-        self.kubernetes_config = config.load_config()
-        self.crd_client = client.CustomObjectsApi()
-        self.core_client = client.CoreV1Api()
-
-    def run_job(self, run_config: RunnerConfig) -> [Job, JobOperationStatus]:
+    def __init__(
+        self,
+        api_client: Optional[client.ApiClient] = None,
+        history: Optional[HistoryStore] = None,
+        cache: Optional[CacheClient] = None,
+    ):
+        super().__init__(api_client=api_client, history=history, cache=cache)
+        self.crd_client = client.CustomObjectsApi(self.api_client)
+        self.queue_selector: Optional[QueueSelector] = None
+
+    def submit_job(self, run_config: RunnerConfig) -> Job:
+        """Submits the job, raising on failure instead of reporting a status like ``run_job``."""
         tasks = []
+        experiment = run_config.experiment
+        network = self.network_hints(run_config)
 
         for replica_id in range(run_config.resources.nodes):
-            rank0_env = f"VC_{normalize_str(self.DEFAULT_TASK_NAME)}_0_HOSTS".upper()
-            if replica_id == 0:
-                rank0_env = "KUBR_RANK0_HOST"
-                run_config.container.env.append(EnvVar(name="KUBR_RANK0_HOST", value="localhost"))
+            rank0_env = f"VC_{normalize_str(self.DEFAULT_TASK_NAME)}_0_HOSTS".upper() if replica_id > 0 else None
 
             pod = create_pod_definition(
                 pod_name=run_config.experiment.name,
                 runner_config=run_config,
                 service_account=None,
                 rank0_env=rank0_env,
+                replica_id=replica_id,
+                network=network,
             )
+            pod.spec.priority_class_name = experiment.priority_class
+            if experiment.preemptable is not None:
+                pod.metadata.annotations[ANNOTATION_PREEMPTABLE] = str(experiment.preemptable).lower()
 
             # pod.metadata.labels.update(
             #     pod_labels(
@@ -88,9 +137,11 @@ class VolcanoBackend(BaseBackend):
 
             tasks.append(task)
 
+        queue = self._resolve_queue(run_config)
+
         job_spec = {
             "schedulerName": "volcano",
-            "queue": run_config.experiment.queue,
+            "queue": queue,
             "tasks": tasks,
             "maxRetry": run_config.experiment.job_retries,
             "plugins": {
@@ -99,31 +150,36 @@ class VolcanoBackend(BaseBackend):
                 "env": [],
             },
         }
-        # if run_config.experiment.priority_class is not None:
-        #     job_spec["priorityClassName"] = run_config.experiment.priority_class
+        if experiment.priority_class is not None:
+            job_spec["priorityClassName"] = experiment.priority_class
+        if experiment.ttl_seconds_after_finished is not None:
+            job_spec["ttlSecondsAfterFinished"] = experiment.ttl_seconds_after_finished
 
         resource: Dict[str, object] = {
             "apiVersion": "batch.volcano.sh/v1alpha1",
             "kind": "Job",
-            "metadata": {"name": f"{run_config.experiment.name}"},
+            "metadata": {
+                "name": f"{run_config.experiment.name}",
+                # the peak usage of the job is recorded for this key, to right-size the next runs of the config
+                "labels": {LABEL_USER: current_user(), **experiment.labels, LABEL_CONFIG_KEY: config_key(run_config)},
+            },
             "spec": job_spec,
         }
+        if experiment.watchdog is not None:
+            # a watchdog started later, e.g. in the cluster, finds the settings of the job on the job itself
+            resource["metadata"]["annotations"] = {ANNOTATION_WATCHDOG: experiment.watchdog.model_dump_json()}
 
-        try:
-            self.crd_client.create_namespaced_custom_object(
-                group="batch.volcano.sh",
-                version="v1alpha1",
-                namespace=run_config.experiment.namespace,
-                plural="jobs",
-                body=resource,
-            )
-
-        except Exception as e:
-            # TODO [run] add exception printing
-            print(e)
-            return None, JobOperationStatus.Failed
+        created = self.crd_client.create_namespaced_custom_object(
+            group="batch.volcano.sh",
+            version="v1alpha1",
+            namespace=run_config.experiment.namespace,
+            plural="jobs",
+            body=resource,
+        )
+        if run_config.rendezvous.mode == "service" and run_config.resources.nodes > 1:
+            self._create_rendezvous_service(run_config, owner_uid=created["metadata"]["uid"])
 
-        job = Job(
+        return Job(
             type=JobType.torchrun,
             backend=JobBackend.Volcano,
             name=run_config.experiment.name,
@@ -132,11 +188,59 @@ class VolcanoBackend(BaseBackend):
             age=datetime.now(),
             gpu=run_config.resources.gpu * run_config.resources.nodes,
             nodes=run_config.resources.nodes,
+            queue=queue,
+        )
+
+    def _resolve_queue(self, run_config: RunnerConfig) -> str:
+        experiment = run_config.experiment
+        if experiment.queue != AUTO_QUEUE:
+            return experiment.queue
+        if self.queue_selector is None:
+            self.queue_selector = QueueSelector(self.crd_client, cache=self.cache)
+        return self.queue_selector.select(
+            gpu=run_config.resources.gpu * run_config.resources.nodes, candidates=experiment.queue_candidates
+        )
+
+    def _create_rendezvous_service(self, run_config: RunnerConfig, owner_uid: str):
+        """
+        Creates the headless Service of rank 0. The Service is owned by the Volcano job, so it is garbage
+        collected together with it; a leftover Service of a resubmitted job is re-pointed at the new owner.
+        """
+        namespace = run_config.experiment.namespace
+        service = create_rendezvous_service(
+            job_name=run_config.experiment.name, namespace=namespace, port=run_config.rendezvous.port
         )
-        return job, JobOperationStatus.Success
+        service.metadata.owner_references = [
+            client.V1OwnerReference(
+                api_version="batch.volcano.sh/v1alpha1",
+                kind="Job",
+                name=run_config.experiment.name,
+                uid=owner_uid,
+            )
+        ]
+        try:
+            self.core_client.create_namespaced_service(namespace=namespace, body=service)
+        except client.ApiException as e:
+            if e.status != 409:
+                raise
+            self.core_client.replace_namespaced_service(
+                name=service.metadata.name, namespace=namespace, body=self._merge_service(service, namespace)
+            )
+
+    def _merge_service(self, service: client.V1Service, namespace: str) -> client.V1Service:
+        existing = self.core_client.read_namespaced_service(name=service.metadata.name, namespace=namespace)
+        existing.metadata.owner_references = service.metadata.owner_references
+        existing.spec.selector = service.spec.selector
+        existing.spec.ports = service.spec.ports
+        return existing
 
     def _completion_list_running_jobs(self, **kwargs):
         print("Using completion list for running jobs")
+        if self.cache is not None:
+            try:
+                return self.cache.running_job_names(backend=str(self.kind))
+            except Exception:
+                pass
         jobs_stat = self.crd_client.list_cluster_custom_object(
             group="batch.volcano.sh", version="v1alpha1", plural="jobs"
         )
@@ -157,43 +261,189 @@ class VolcanoBackend(BaseBackend):
                     gpu_count += int(container["resources"]["limits"]["nvidia.com/gpu"])
         return gpu_count
 
-    def list_jobs(self, namespace: str = "All"):
-        # TODO [ls] speedup for selected namespace(filter on server side)
-        jobs_stat = self.crd_client.list_cluster_custom_object(
-            group="batch.volcano.sh", version="v1alpha1", plural="jobs"
+    def list_jobs_at_version(
+        self, namespace: str = "All", label_selector: Optional[str] = None
+    ) -> Tuple[List[Job], str]:
+        """Lists jobs together with the resource version to start watching them from."""
+        kwargs = {"group": "batch.volcano.sh", "version": "v1alpha1", "plural": "jobs"}
+        if label_selector:
+            kwargs["label_selector"] = label_selector
+        if namespace == "All":
+            jobs_stat = self.crd_client.list_cluster_custom_object(**kwargs)
+        else:
+            jobs_stat = self.crd_client.list_namespaced_custom_object(namespace=namespace, **kwargs)
+        return [self._to_job(k8s_job) for k8s_job in jobs_stat["items"]], jobs_stat["metadata"]["resourceVersion"]
+
+    def watch_jobs(
+        self,
+        resource_version: str,
+        namespace: str = "All",
+        label_selector: Optional[str] = None,
+        timeout_seconds: int = 300,
+    ) -> Iterator[Tuple[str, Optional[Job], str]]:
+        """
+        Yields (event type, job, resource version) for every change of the jobs after ``resource_version``
+        over a single watch connection, until ``timeout_seconds`` pass. Bookmark events carry no job and only
+        advance the resource version. Raises ``ApiException`` with status 410 when the version is too old
+        and the caller has to list again.
+        """
+        kwargs = {
+            "group": "batch.volcano.sh",
+            "version": "v1alpha1",
+            "plural": "jobs",
+            "resource_version": resource_version,
+            "timeout_seconds": timeout_seconds,
+            "allow_watch_bookmarks": True,
+        }
+        if label_selector:
+            kwargs["label_selector"] = label_selector
+        if namespace == "All":
+            events = watch.Watch().stream(self.crd_client.list_cluster_custom_object, **kwargs)
+        else:
+            events = watch.Watch().stream(self.crd_client.list_namespaced_custom_object, namespace=namespace, **kwargs)
+        for event in events:
+            k8s_job = event["raw_object"]
+            job = self._to_job(k8s_job) if event["type"] != "BOOKMARK" else None
+            yield event["type"], job, k8s_job["metadata"]["resourceVersion"]
+
+    def _to_job(self, k8s_job) -> Job:
+        # freshly created jobs have no status until the Volcano controller picks them up
+        state = k8s_job.get("status", {}).get("state", {})
+        transition = state.get("lastTransitionTime") or k8s_job["metadata"]["creationTimestamp"]
+        return Job(
+            type=JobType.torchrun,
+            backend=JobBackend.Volcano,
+            name=k8s_job["metadata"]["name"],
+            namespace=k8s_job["metadata"]["namespace"],
+            state=state.get("phase") or JobState.Pending,
+            age=datetime.strptime(transition, "%Y-%m-%dT%H:%M:%SZ"),
+            gpu=self._extract_gpu_count(k8s_job),
+            nodes=len(k8s_job["spec"]["tasks"]),
+            queue=k8s_job["spec"].get("queue"),
+            user=(k8s_job["metadata"].get("labels") or {}).get(LABEL_USER),
         )
-        k8s_jobs = jobs_stat["items"]
-
-        extracted_jobs = []
-        for k8s_job in k8s_jobs:
-            if namespace != "All" and k8s_job["metadata"]["namespace"] != namespace:
-                continue
-
-            job = Job(
-                type=JobType.torchrun,
-                backend=JobBackend.Volcano,
-                name=k8s_job["metadata"]["name"],
-                namespace=k8s_job["metadata"]["namespace"],
-                state=k8s_job["status"]["state"]["phase"],
-                age=datetime.strptime(k8s_job["status"]["state"]["lastTransitionTime"], "%Y-%m-%dT%H:%M:%SZ"),
-                gpu=self._extract_gpu_count(k8s_job),
-            )
-            extracted_jobs.append(job)
-
-        return extracted_jobs
 
-    def delete_job(self, job_name: str, namespace: str) -> JobOperationStatus:
-        # TODO add cli response formatting for deletion confirmation
+    def replica_pod_name(self, job_name: str, rank: int) -> str:
+        """Volcano names pods ``<job>-<task>-<index>``, every replica is its own single-pod task."""
+        return f"{job_name}-{self.DEFAULT_TASK_NAME}-{rank}-0"
+
+    def resolve_replica_pod_name(self, job_name: str, namespace: str, rank: int) -> str:
+        """Name of the pod of the replica, for backends whose pod names can not be derived it is looked up."""
+        return self.replica_pod_name(job_name, rank)
+
+    def get_replica_pod(self, job_name: str, namespace: str, rank: int = 0) -> client.V1Pod:
+        return self.core_client.read_namespaced_pod(name=self.replica_pod_name(job_name, rank), namespace=namespace)
+
+    def delete_k8s_job(self, k8s_job: Dict[str, Any]):
+        """
+        Deletes a Volcano job object and the events of the job, its pods and its PodGroup. Pods and the PodGroup
+        are owned by the job, but events are only removed by the cluster-wide event TTL, so they are deleted by
+        field selector per involved object instead of scanning every event of the namespace.
+        """
+        metadata = k8s_job["metadata"]
+        job_name, namespace = metadata["name"], metadata["namespace"]
         self.crd_client.delete_namespaced_custom_object(
             group="batch.volcano.sh", version="v1alpha1", namespace=namespace, plural="jobs", name=job_name
         )
-        events = self.core_client.list_namespaced_event(namespace=namespace)
-        for event in events.items:
-            if event.metadata.name.startswith(f"{job_name}"):
-                self.core_client.delete_namespaced_event(name=event.metadata.name, namespace=namespace)
+        involved = [job_name, f"{job_name}-{metadata['uid']}"]
+        involved += [self.replica_pod_name(job_name, rank) for rank in range(len(k8s_job["spec"]["tasks"]))]
+        for name in involved:
+            self.core_client.delete_collection_namespaced_event(
+                namespace=namespace, field_selector=f"involvedObject.name={name}"
+            )
 
+    def restart_job(self, job_name: str, namespace: str) -> JobOperationStatus:
+        """Restarts all replicas of the job in place through a Volcano bus Command, keeping its queue position."""
+        k8s_job = self.read_k8s_job(job_name, namespace)
+        target = {
+            "apiVersion": "batch.volcano.sh/v1alpha1",
+            "kind": "Job",
+            "name": job_name,
+            "uid": k8s_job["metadata"]["uid"],
+        }
+        command = {
+            "apiVersion": "bus.volcano.sh/v1alpha1",
+            "kind": "Command",
+            "metadata": {
+                "name": f"{job_name}-restart-{uuid.uuid4().hex[:8]}",
+                "namespace": namespace,
+                "ownerReferences": [dict(target, controller=True)],
+            },
+            "action": "RestartJob",
+            "target": target,
+        }
+        self.crd_client.create_namespaced_custom_object(
+            group="bus.volcano.sh", version="v1alpha1", namespace=namespace, plural="commands", body=command
+        )
         return JobOperationStatus.Success
 
+    def get_watchdog_config(self, job_name: str, namespace: str) -> Optional[WatchdogConfig]:
+        """Watchdog settings the job was submitted with, None when it has none."""
+        k8s_job = self.read_k8s_job(job_name, namespace)
+        raw = (k8s_job["metadata"].get("annotations") or {}).get(ANNOTATION_WATCHDOG)
+        return WatchdogConfig.model_validate_json(raw) if raw else None
+
+    def job_record(self, k8s_job: Dict[str, Any], log_lines: int = ARCHIVED_LOG_LINES) -> JobRecord:
+        """Archive record of a Volcano job object, with the log tail of rank 0 if its pod still exists."""
+        job = self._to_job(k8s_job)
+        metadata = k8s_job["metadata"]
+        logs_tail = None
+        if log_lines:
+            try:
+                logs_tail = self.core_client.read_namespaced_pod_log(
+                    name=self.resolve_replica_pod_name(job.name, job.namespace, 0),
+                    namespace=job.namespace,
+                    tail_lines=log_lines,
+                )
+            except client.ApiException:
+                pass
+        return JobRecord(
+            uid=metadata["uid"],
+            name=job.name,
+            namespace=job.namespace,
+            state=str(job.state),
+            queue=job.queue,
+            user=job.user,
+            gpu=job.gpu,
+            nodes=job.nodes,
+            created_at=datetime.strptime(metadata["creationTimestamp"], "%Y-%m-%dT%H:%M:%SZ"),
+            started_at=_started_at(k8s_job),
+            finished_at=job.age if job.state in TERMINAL_JOB_STATES else None,
+            archived_at=datetime.utcnow(),
+            spec=k8s_job.get("spec"),
+            status=k8s_job.get("status"),
+            logs_tail=logs_tail,
+        )
+
+    def read_k8s_job(self, job_name: str, namespace: str) -> Dict[str, Any]:
+        return self.crd_client.get_namespaced_custom_object(
+            group="batch.volcano.sh", version="v1alpha1", namespace=namespace, plural="jobs", name=job_name
+        )
+
+    @staticmethod
+    def job_uid(k8s_job: Dict[str, Any]) -> str:
+        return k8s_job["metadata"]["uid"]
+
+    @staticmethod
+    def job_labels(k8s_job: Dict[str, Any]) -> Dict[str, str]:
+        return k8s_job["metadata"].get("labels") or {}
+
+    def job_informer_source(self) -> Tuple[Callable, Callable[[Dict[str, Any]], Job]]:
+        list_call = partial(
+            self.crd_client.list_cluster_custom_object, group="batch.volcano.sh", version="v1alpha1", plural="jobs"
+        )
+        return list_call, self._to_job
+
+    def list_k8s_jobs(self, namespace: str = "All") -> List[Dict[str, Any]]:
+        """Raw Volcano job objects of a namespace or, for "All", of the cluster."""
+        if namespace == "All":
+            return self.crd_client.list_cluster_custom_object(
+                group="batch.volcano.sh", version="v1alpha1", plural="jobs"
+            )["items"]
+        return self.crd_client.list_namespaced_custom_object(
+            group="batch.volcano.sh", version="v1alpha1", namespace=namespace, plural="jobs"
+        )["items"]
+
     def get_job_main_pod(self, job_name: str, namespace: str):
         pods = self.core_client.list_namespaced_pod(
             namespace=namespace, label_selector=f"volcano.sh/job-name={job_name}"
@@ -205,55 +455,63 @@ class VolcanoBackend(BaseBackend):
         pod_name = pod.metadata.name
         return pod_name, pod
 
-    def get_job_events(self, pod_name: str, namespace: str):
-        events = self.core_client.list_namespaced_event(
-            namespace=namespace, field_selector=f"involvedObject.name={pod_name}"
+    def _get_podgroup(self, k8s_job) -> Optional[Dict[str, Any]]:
+        namespace = k8s_job["metadata"]["namespace"]
+        # Volcano >= 1.6 names the pod group after the job uid, older releases after the job itself
+        for name in [f"{k8s_job['metadata']['name']}-{k8s_job['metadata']['uid']}", k8s_job["metadata"]["name"]]:
+            try:
+                return self.crd_client.get_namespaced_custom_object(
+                    group="scheduling.volcano.sh", version="v1beta1", namespace=namespace, plural="podgroups", name=name
+                )
+            except client.ApiException as e:
+                if e.status != 404:
+                    raise
+        return None
+
+    def describe_job(self, job_name: str, namespace: str) -> JobDescription:
+        """
+        Collects the job, its pod group, every replica and all their events. Requests are issued concurrently
+        in two waves: the job, its pods and job events first, then the pod group, its events and per-replica events
+        that need names from the first wave, so latency does not grow with the number of replicas.
+        """
+        with ThreadPoolExecutor(max_workers=DESCRIBE_CONCURRENCY) as executor:
+            k8s_job_future = executor.submit(self.read_k8s_job, job_name, namespace)
+            pods_future = executor.submit(self.get_job_pods, job_name, namespace)
+            job_events_future = executor.submit(self._list_object_events, namespace, "Job", job_name)
+
+            k8s_job = k8s_job_future.result()
+            pods = pods_future.result()
+            podgroup_future = executor.submit(self._get_podgroup, k8s_job)
+            # the pod group is usually named after the job uid, so its events need not wait for the pod group
+            uid_podgroup_name = f"{job_name}-{k8s_job['metadata']['uid']}"
+            podgroup_events_future = executor.submit(self._list_object_events, namespace, "PodGroup", uid_podgroup_name)
+            pod_events_futures = [
+                executor.submit(self._list_object_events, namespace, "Pod", pod.metadata.name) for pod in pods
+            ]
+
+            events = [("Job", None, job_name, event) for event in job_events_future.result()]
+            for pod, pod_events_future in zip(pods, pod_events_futures):
+                events += [("Pod", pod_rank(pod), pod.metadata.name, event) for event in pod_events_future.result()]
+            podgroup = podgroup_future.result()
+            if podgroup is not None:
+                podgroup_name = podgroup["metadata"]["name"]
+                if podgroup_name == uid_podgroup_name:
+                    podgroup_events = podgroup_events_future.result()
+                else:
+                    podgroup_events = self._list_object_events(namespace, "PodGroup", podgroup_name)
+                events += [("PodGroup", None, podgroup_name, event) for event in podgroup_events]
+
+        podgroup_status = (podgroup or {}).get("status", {})
+        return JobDescription(
+            name=job_name,
+            namespace=namespace,
+            state=k8s_job["status"]["state"]["phase"],
+            queue=k8s_job["spec"].get("queue"),
+            podgroup_phase=podgroup_status.get("phase"),
+            podgroup_conditions=[
+                f"{c.get('type')}: {c.get('reason') or ''} {c.get('message') or ''}".strip()
+                for c in podgroup_status.get("conditions", [])
+            ],
+            replicas=[_replica_status(pod) for pod in pods],
+            events=group_events(events),
         )
-        return events
-
-    def get_logs(self, job_name: str, namespace: str, tail: Optional[int] = None, follow: bool = False):
-        pod_name, pod = self.get_job_main_pod(job_name, namespace)
-        containers = pod.spec.containers
-        if len(containers) == 0:
-            return f"No containers found for pod {pod_name} in namespace {namespace}"
-        # TODO add logic for multi container selection for logging extraction
-        container = containers[0]
-        container_name = container.name
-        if tail:
-            return self.core_client.read_namespaced_pod_log(
-                name=pod_name, namespace=namespace, container=container_name, tail_lines=tail
-            )
-        if follow:
-            w = watch.Watch()
-            return w.stream(
-                self.core_client.read_namespaced_pod_log, name=pod_name, namespace=namespace, container=container_name
-            )
-
-        api_response = self.core_client.read_namespaced_pod_log(name=pod_name, namespace=namespace)
-        return api_response
-
-    def describe_job(self, job_name: str, namespace: str):
-        pod_name, pod = self.get_job_main_pod(job_name, namespace)
-        raw_events = self.get_job_events(pod_name, namespace)
-
-        events = []
-        for event in raw_events.items:
-            events.append(
-                {
-                    "Last Seen": event.last_timestamp,
-                    "From": event.source.component,
-                    "Type": event.type,
-                    "Reason": event.reason,
-                    "Message": event.message,
-                }
-            )
-        events.sort(key=lambda x: x["Last Seen"], reverse=True)
-        for event in events:
-            event["Last Seen"] = humanize.naturaldelta(datetime.now() - event["Last Seen"].replace(tzinfo=None))
-
-        # TODO add handling events longer than 10
-        events = events[:10]
-
-        events = tabulate(events, headers="keys", tablefmt="grid", maxcolwidths=80)
-
-        return events
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from kubernetes.client import ApiException
+
+from kubr.backends.base import BaseBackend, JobNotFoundError
+from kubr.config.job import TERMINAL_JOB_STATES, Job
+
+JobKey = Tuple[str, str]
+
+
+class JobTracker:
+    """Tracks any number of jobs to a terminal state over a single watch of the jobs of the backend.
+
+    The watch is opened on demand in a background thread: the jobs are listed once, then every change is
+    received over one connection until all tracked jobs finished. Expired watches are resumed from the last
+    seen resource version and fall back to listing again when that version is gone.
+
+    Args:
+        backend (BaseBackend): Backend providing ``list_jobs_at_version`` and ``watch_jobs``.
+        namespace (str, optional): Namespace to watch, "All" for the whole cluster. Defaults to "All".
+        label_selector (Optional[str], optional): Only jobs matching the selector are seen. Defaults to None.
+        on_finish (Optional[Callable[[Job], None]], optional): Called from the tracker thread with every job
+            that reached a terminal state.
+        watch_seconds (int, optional): Lifetime of a single watch request. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        namespace: str = "All",
+        label_selector: Optional[str] = None,
+        on_finish: Optional[Callable[[Job], None]] = None,
+        watch_seconds: int = 300,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.on_finish = on_finish
+        self.watch_seconds = watch_seconds
+        self._pending: Dict[JobKey, List[Future]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, job_name: str, namespace: str) -> "Future[Job]":
+        """Future resolved with the job once it is finished, cancel it to stop tracking."""
+        return self.track_many([(job_name, namespace)])[0]
+
+    def track_many(self, keys: Iterable[JobKey]) -> List["Future[Job]"]:
+        """Futures of many (name, namespace) jobs, registered together so they cost at most one request."""
+        keys = list(keys)
+        for job_name, namespace in keys:
+            if self.namespace not in ("All", namespace):
+                raise ValueError(f"Job {job_name} in namespace {namespace} is outside the tracked namespace")
+        futures = [Future() for _ in keys]
+        with self._lock:
+            for key, future in zip(keys, futures):
+                self._pending[key].append(future)
+            running = self._thread is not None
+            if not running:
+                self._thread = threading.Thread(target=self._run, name="kubr-job-tracker", daemon=True)
+                self._thread.start()
+        if running:
+            # the running watch only reports changes, jobs that already finished need one explicit check
+            self._check(keys)
+        return futures
+
+    def track_selected(self) -> List["Future[Job]"]:
+        """Tracks every job currently matching the namespace and label selector of the tracker."""
+        jobs, _ = self.backend.list_jobs_at_version(namespace=self.namespace, label_selector=self.label_selector)
+        return self.track_many([(job.name, job.namespace) for job in jobs])
+
+    def _check(self, keys: List[JobKey]):
+        try:
+            if len(keys) == 1:
+                try:
+                    jobs = [self.backend.get_job(job_name=keys[0][0], namespace=keys[0][1])]
+                except ApiException as e:
+                    if e.status != 404:
+                        raise
+                    jobs = []
+            else:
+                jobs, _ = self.backend.list_jobs_at_version(
+                    namespace=self.namespace, label_selector=self.label_selector
+                )
+        except Exception:
+            # the watch still reports jobs that finish from now on
+            return
+        self._resolve(keys, jobs)
+
+    def _resolve(self, keys: Iterable[JobKey], jobs: Iterable[Job]):
+        seen = {(job.name, job.namespace): job for job in jobs}
+        for key in keys:
+            job = seen.get(key)
+            if job is None:
+                self._fail([key], JobNotFoundError(*key))
+            elif job.state in TERMINAL_JOB_STATES:
+                self._finish(job)
+
+    def _run(self):
+        resource_version = None
+        while True:
+            with self._lock:
+                for key in [key for key, futures in self._pending.items() if all(f.done() for f in futures)]:
+                    del self._pending[key]
+                if not self._pending:
+                    self._thread = None
+                    return
+                keys = list(self._pending)
+
+            if resource_version is None:
+                try:
+                    jobs, resource_version = self.backend.list_jobs_at_version(
+                        namespace=self.namespace, label_selector=self.label_selector
+                    )
+                except Exception as e:
+                    self._fail(keys, e)
+                    continue
+                self._resolve(keys, jobs)
+
+            try:
+                for event_type, job, resource_version in self.backend.watch_jobs(
+                    resource_version=resource_version,
+                    namespace=self.namespace,
+                    label_selector=self.label_selector,
+                    timeout_seconds=self.watch_seconds,
+                ):
+                    if job is None:
+                        continue
+                    if event_type == "DELETED":
+                        self._fail([(job.name, job.namespace)], JobNotFoundError(job.name, job.namespace))
+                    elif job.state in TERMINAL_JOB_STATES:
+                        self._finish(job)
+                    with self._lock:
+                        if not any(not f.done() for futures in self._pending.values() for f in futures):
+                            break
+            except ApiException as e:
+                # an expired version needs a fresh list, other rejections will not go away by retrying
+                if e.status == 410:
+                    resource_version = None
+                else:
+                    self._fail(keys, e)
+            except Exception:
+                # dropped connections are resumed from the last seen version
+                time.sleep(1)
+
+    def _take(self, keys: Iterable[JobKey]) -> List[Future]:
+        with self._lock:
+            futures = [future for key in keys for future in self._pending.pop(key, [])]
+        return [future for future in futures if future.set_running_or_notify_cancel()]
+
+    def _finish(self, job: Job):
+        futures = self._take([(job.name, job.namespace)])
+        if futures and self.on_finish is not None:
+            self.on_finish(job)
+        for future in futures:
+            future.set_result(job)
+
+    def _fail(self, keys: Iterable[JobKey], error: Exception):
+        for future in self._take(keys):
+            future.set_exception(error)
@@ -0,0 +1,278 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+from kubernetes.client import ApiException
+from pydantic import BaseModel
+from urllib3.exceptions import HTTPError
+
+from kubr.backends.base import BaseBackend
+from kubr.backends.client import RETRY_STATUSES
+from kubr.backends.logcapture import ReplicaLogStreams, ResumePoint
+from kubr.backends.rightsizing import UsageRecorder
+from kubr.backends.telemetry import ResourceSample, TelemetryCollector
+from kubr.backends.utils import cache_dir
+from kubr.config.job import TERMINAL_JOB_STATES, JobState
+from kubr.config.runner import WatchdogConfig
+
+DIAGNOSTIC_LOG_LINES = 500
+
+
+class StallReport(BaseModel):
+    """StallReport describes a stalled job and what the watchdog did about it.
+
+    Args:
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        reason (str): Why the job is considered stalled.
+        detected_at (datetime): Time of the first check that found the stall.
+        action (str): Action taken, "notify", "delete" or "restart".
+        diagnostics (Optional[str]): Directory of the dumped diagnostics.
+    """
+
+    job_name: str
+    namespace: str
+    reason: str
+    detected_at: datetime
+    action: str
+    diagnostics: Optional[str] = None
+
+
+class LogProgress(ReplicaLogStreams):
+    """Follows all replicas without keeping their logs, only the time of the latest line of every rank.
+
+    Args:
+        backend (BaseBackend): Backend providing ``get_job_pods``, ``get_replica_pod`` and ``stream_replica_log``.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        since_ns (int): Lines logged before this Unix time in nanoseconds are not read.
+    """
+
+    def __init__(self, backend: BaseBackend, job_name: str, namespace: str, since_ns: int):
+        super().__init__(backend, job_name, namespace, follow=True)
+        self.since_ns = since_ns
+
+    def _open(self, rank: int) -> ResumePoint:
+        resume = ResumePoint()
+        resume.last_ns = self.since_ns
+        return resume
+
+    def _on_data(self, rank: int, data: bytes):
+        # the resume point of the rank moves to the last line, that is all there is to track
+        pass
+
+    def last_line_ns(self) -> int:
+        """Log time of the latest line of any replica, ``since_ns`` when none logged since."""
+        return max([resume.last_ns for resume in self.resume.values()] + [self.since_ns])
+
+
+class JobWatchdog:
+    """Watches a running job for stalls: no log lines from any replica, or idle GPUs on every replica.
+
+    Logs are followed over one stream per replica and only their timestamps are looked at. GPU utilization is
+    sampled with a ``TelemetryCollector`` every check, a replica counts as busy while any sample is above
+    ``gpu_idle_percent``; jobs without GPU metrics are judged by their logs only. The first check finding a
+    stall notifies and dumps diagnostics; if the stall persists for ``grace_minutes`` the configured action is
+    taken. A job that makes progress again during the grace period is left alone.
+
+    Args:
+        backend (BaseBackend): Backend providing the log, telemetry, describe, delete and restart methods.
+        job_name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        config (WatchdogConfig): Stall thresholds and action.
+        telemetry (Optional[TelemetryCollector], optional): GPU utilization source. Defaults to a collector with
+            the default DCGM exporter settings.
+        on_stall (Optional[Callable[[StallReport], None]], optional): Called on the notification and again after
+            the action.
+        diagnostics_dir (Optional[Path], optional): Parent of the diagnostics directories.
+            Defaults to ``cache_dir()/diagnostics``.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        job_name: str,
+        namespace: str,
+        config: WatchdogConfig,
+        telemetry: Optional[TelemetryCollector] = None,
+        on_stall: Optional[Callable[[StallReport], None]] = None,
+        diagnostics_dir: Optional[Path] = None,
+    ):
+        self.backend = backend
+        self.job_name = job_name
+        self.namespace = namespace
+        self.config = config
+        self.telemetry = telemetry or TelemetryCollector(backend, job_name, namespace)
+        self.on_stall = on_stall
+        self.diagnostics_dir = diagnostics_dir or cache_dir() / "diagnostics"
+        self.samples: Deque[ResourceSample] = deque(maxlen=1000)
+        self.recorder = UsageRecorder(backend, job_name, namespace)
+        self.logs: Optional[LogProgress] = None
+        self._active_since = time.time()
+        self._gpu_busy: Dict[int, float] = {}
+        self._stop = threading.Event()
+
+    def _follow_logs(self):
+        """(Re)opens the log streams, e.g. once the pods exist or after they were recreated by a restart."""
+        since_ns = time.time_ns()
+        if self.logs is not None:
+            self.logs.stop()
+            since_ns = self.logs.last_line_ns()
+        self.logs = LogProgress(self.backend, self.job_name, self.namespace, since_ns=since_ns).start()
+
+    def stop(self):
+        self._stop.set()
+        if self.logs is not None:
+            self.logs.stop()
+
+    def reset(self, now: Optional[float] = None):
+        """Restarts the idle clocks, the job is not judged for the time it was not running."""
+        self._active_since = now or time.time()
+        self._gpu_busy.clear()
+
+    def _gpu_idle_since(self, now: float) -> Optional[float]:
+        """Time since which every replica has idle GPUs, None while any is busy or there are no GPU metrics."""
+        try:
+            samples = self.telemetry.sample()
+        except Exception:
+            return None
+        self.samples.extend(samples)
+        self.recorder.record(samples)
+        with_gpu = [sample for sample in samples if sample.gpu_util is not None]
+        if not with_gpu:
+            return None
+        for sample in with_gpu:
+            if sample.gpu_util >= self.config.gpu_idle_percent:
+                self._gpu_busy[sample.rank] = now
+        return max(self._gpu_busy.get(sample.rank, self._active_since) for sample in with_gpu)
+
+    def check(self, now: Optional[float] = None) -> Optional[str]:
+        """Reason the running job is stalled, None if it makes progress."""
+        now = now or time.time()
+        if self.config.log_idle_minutes is not None:
+            if self.logs is None or self.logs.join(timeout=0):
+                self._follow_logs()
+            idle = now - max(self.logs.last_line_ns() / 1e9, self._active_since)
+            if idle >= self.config.log_idle_minutes * 60:
+                return f"no log lines for {idle / 60:.0f} minutes"
+        if self.config.gpu_idle_minutes is not None:
+            idle_since = self._gpu_idle_since(now)
+            if idle_since is not None and now - idle_since >= self.config.gpu_idle_minutes * 60:
+                return (
+                    f"GPU utilization below {self.config.gpu_idle_percent:g}% on every replica "
+                    f"for {(now - idle_since) / 60:.0f} minutes"
+                )
+        return None
+
+    def dump_diagnostics(self, reason: str) -> Path:
+        """Writes the job description, the log tail of every replica and recent samples to a new directory."""
+        directory = self.diagnostics_dir / f"{self.job_name}-{datetime.utcnow():%Y%m%dT%H%M%S}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "reason.txt").write_text(reason + "\n")
+        try:
+            description = self.backend.describe_job(job_name=self.job_name, namespace=self.namespace)
+            (directory / "describe.json").write_text(description.model_dump_json(indent=2))
+        except Exception as e:
+            (directory / "describe.json").write_text(json.dumps({"error": str(e)}))
+        for pod in self._pods():
+            try:
+                tail = self.backend.core_client.read_namespaced_pod_log(
+                    name=pod, namespace=self.namespace, tail_lines=DIAGNOSTIC_LOG_LINES, timestamps=True
+                )
+            except Exception as e:
+                tail = f"Reading logs failed: {e}\n"
+            (directory / f"{pod}.log").write_text(tail)
+        samples = [sample.model_dump() for sample in self.samples]
+        (directory / "samples.json").write_text(json.dumps(samples))
+        return directory
+
+    def _pods(self) -> List[str]:
+        try:
+            return sorted(self.backend.job_placement(self.job_name, self.namespace))
+        except Exception:
+            return []
+
+    def _notify(self, report: StallReport):
+        if self.on_stall is not None:
+            self.on_stall(report)
+        if self.config.command is not None:
+            environment = dict(
+                os.environ,
+                KUBR_JOB=self.job_name,
+                KUBR_NAMESPACE=self.namespace,
+                KUBR_STALL_REASON=report.reason,
+                KUBR_DIAGNOSTICS=report.diagnostics or "",
+            )
+            subprocess.run(self.config.command, shell=True, env=environment)
+
+    def _act(self, report: StallReport):
+        if report.action == "delete":
+            self.backend.delete_job(job_name=self.job_name, namespace=self.namespace)
+        elif report.action == "restart":
+            self.backend.restart_job(job_name=self.job_name, namespace=self.namespace)
+
+    def run(self) -> Optional[StallReport]:
+        """
+        Checks the job until it finishes or was deleted, returns the report of the last stall. Only running
+        jobs are judged, so the time a job is queued or restarting does not count as idle.
+        """
+        last_report = None
+        report: Optional[StallReport] = None
+        try:
+            while not self._stop.wait(self.config.interval_seconds):
+                try:
+                    state = self.backend.get_job(job_name=self.job_name, namespace=self.namespace).state
+                except ApiException as e:
+                    # a deleted job is done, other rejections, e.g. lost RBAC access, will not go away
+                    if e.status == 404:
+                        break
+                    if e.status in RETRY_STATUSES:
+                        continue
+                    raise
+                except (HTTPError, OSError):
+                    # the API server is unreachable for now, the next interval checks again
+                    continue
+                if state in TERMINAL_JOB_STATES:
+                    break
+                if state != JobState.Running:
+                    self.reset()
+                    report = None
+                    continue
+                reason = self.check()
+                if reason is None:
+                    report = None
+                    continue
+                if report is None:
+                    report = StallReport(
+                        job_name=self.job_name,
+                        namespace=self.namespace,
+                        reason=reason,
+                        detected_at=datetime.utcnow(),
+                        action="notify",
+                    )
+                    report.diagnostics = str(self.dump_diagnostics(reason))
+                    self._notify(report)
+                    last_report = report
+                    continue
+                grace = (datetime.utcnow() - report.detected_at).total_seconds()
+                if self.config.action == "notify" or grace < self.config.grace_minutes * 60:
+                    continue
+                report = report.model_copy(update={"action": self.config.action, "reason": reason})
+                self._act(report)
+                if self.on_stall is not None:
+                    self.on_stall(report)
+                last_report = report
+                if self.config.action == "delete":
+                    break
+                # the restarted replicas get a full idle period before they can stall again
+                self.reset()
+                report = None
+        finally:
+            self.stop()
+        return last_report
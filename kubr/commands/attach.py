@@ -1,4 +1,46 @@
+import json
+import os
+import select
+import shlex
+import shutil
+import signal
+import socket
+import sys
+import termios
+import threading
+import tty
+from typing import List, Optional, Tuple
+
+from kubernetes.stream.ws_client import ERROR_CHANNEL, RESIZE_CHANNEL
+from rich import print
+
 from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+
+DEFAULT_SHELL = ["sh", "-c", "command -v bash >/dev/null && exec bash || exec sh"]
+
+
+def parse_port(spec: str) -> Tuple[int, int]:
+    """Parses ``LOCAL:REMOTE`` or ``PORT`` into a (local, remote) pair."""
+    local, _, remote = spec.partition(":")
+    return int(local), int(remote or local)
+
+
+def _pipe(source, target):
+    try:
+        while True:
+            data = source.recv(65536)
+            if not data:
+                break
+            target.sendall(data)
+    except OSError:
+        pass
+    finally:
+        for sock in (source, target):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
 
 class AttachCommand(BaseCommand):
@@ -7,7 +49,92 @@ class AttachCommand(BaseCommand):
         attach_parser = subparsers.add_parser("attach", help="Attach to a running job")
         attach_parser.add_argument("job", help="Name of job to attach to").completer = completer
         attach_parser.add_argument("-n", "--namespace", help="Namespace to attach to", default="default")
+        attach_parser.add_argument("-r", "--rank", help="Rank of the replica to attach to", default=0, type=int)
+        attach_parser.add_argument(
+            "-p",
+            "--port",
+            help="Forward LOCAL:REMOTE (or PORT) to the replica instead of opening a shell, can be repeated",
+            action="append",
+            default=[],
+        )
+        attach_parser.add_argument(
+            "-c", "--command", help="Command to run instead of a shell", default=None, dest="exec_command"
+        )
         return attach_parser
 
-    def __call__(self, job_name: str, namespace: str = "default"):
-        raise NotImplementedError
+    def __call__(
+        self,
+        job_name: str,
+        namespace: str = "default",
+        rank: int = 0,
+        ports: Optional[List[str]] = None,
+        command: Optional[str] = None,
+    ):
+        try:
+            if ports:
+                self.forward(job_name, namespace, rank, [parse_port(port) for port in ports])
+            else:
+                self.shell(job_name, namespace, rank, shlex.split(command) if command else DEFAULT_SHELL)
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Attaching to job {job_name} failed!"))
+
+    def shell(self, job_name: str, namespace: str, rank: int, command: List[str]):
+        interactive = sys.stdin.isatty()
+        session = self.backend.exec_in_replica(job_name, namespace, command=command, rank=rank, tty=interactive)
+        if not interactive:
+            session.run_forever()
+            sys.stdout.write(session.read_stdout() or "")
+            sys.stderr.write(session.read_stderr() or "")
+            return
+
+        def resize(*_):
+            columns, lines = shutil.get_terminal_size()
+            session.write_channel(RESIZE_CHANNEL, json.dumps({"Width": columns, "Height": lines}))
+
+        stdin_fd = sys.stdin.fileno()
+        saved_attrs = termios.tcgetattr(stdin_fd)
+        previous_handler = signal.signal(signal.SIGWINCH, resize)
+        try:
+            tty.setraw(stdin_fd)
+            resize()
+            while session.is_open():
+                session.update(timeout=0.05)
+                if session.peek_stdout():
+                    os.write(sys.stdout.fileno(), session.read_stdout().encode())
+                if session.peek_stderr():
+                    os.write(sys.stderr.fileno(), session.read_stderr().encode())
+                if session.peek_channel(ERROR_CHANNEL):
+                    session.read_channel(ERROR_CHANNEL)
+                    break
+                readable, _, _ = select.select([stdin_fd], [], [], 0)
+                if readable:
+                    data = os.read(stdin_fd, 4096)
+                    if not data:
+                        break
+                    session.write_stdin(data.decode(errors="replace"))
+        finally:
+            termios.tcsetattr(stdin_fd, termios.TCSADRAIN, saved_attrs)
+            signal.signal(signal.SIGWINCH, previous_handler)
+            session.close()
+
+    def forward(self, job_name: str, namespace: str, rank: int, ports: List[Tuple[int, int]]):
+        # resolve the pod once up front so a wrong job or rank fails before anything listens locally
+        self.backend.get_replica_pod(job_name, namespace, rank)
+
+        def serve(listener: socket.socket, remote_port: int):
+            while True:
+                connection, _ = listener.accept()
+                forward = self.backend.port_forward(job_name, namespace, ports=[remote_port], rank=rank)
+                remote = forward.socket(remote_port)
+                threading.Thread(target=_pipe, args=(connection, remote), daemon=True).start()
+                threading.Thread(target=_pipe, args=(remote, connection), daemon=True).start()
+
+        for local_port, remote_port in ports:
+            listener = socket.create_server(("127.0.0.1", local_port))
+            threading.Thread(target=serve, args=(listener, remote_port), daemon=True).start()
+            print(f"Forwarding 127.0.0.1:{local_port} -> {job_name} rank {rank}:{remote_port}")
+        print("Press Ctrl+C to stop")
+        threading.Event().wait()
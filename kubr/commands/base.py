@@ -1,9 +1,9 @@
-from kubr.backends.volcano import VolcanoBackend
+from kubr.backends.cluster import ClusterBackend
 
 
 class BaseCommand:
     def __init__(self, backend=None):
-        self.backend = backend or VolcanoBackend()
+        self.backend = backend or ClusterBackend()
 
     @staticmethod
     def add_parser(subparsers, completer=None):
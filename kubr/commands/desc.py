@@ -1,6 +1,81 @@
+from datetime import datetime
+from typing import List
+
+import humanize
 from rich import print
+from rich.console import Group
+from rich.table import Table
 
 from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.job import JobDescription
+
+
+def format_ranks(ranks: List[int]) -> str:
+    """Compresses ranks into ranges, e.g. ``[0, 1, 2, 5]`` -> ``"0-2,5"``."""
+    ranges = []
+    for rank in ranks:
+        if ranges and rank == ranges[-1][1] + 1:
+            ranges[-1][1] = rank
+        else:
+            ranges.append([rank, rank])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def visualize_description(description: JobDescription, max_events: int = 20) -> Group:
+    header = Table.grid(padding=(0, 2))
+    header.add_row("[bold]Job", f"{description.namespace}/{description.name}")
+    header.add_row("[bold]State", description.state)
+    header.add_row("[bold]Queue", str(description.queue))
+    header.add_row("[bold]PodGroup", str(description.podgroup_phase))
+    for condition in description.podgroup_conditions:
+        header.add_row("", condition)
+
+    replicas = Table(title="Replicas", width=120)
+    replicas.add_column("Rank", style="cyan", justify="center")
+    replicas.add_column("Pod", style="magenta")
+    replicas.add_column("Node", style="yellow")
+    replicas.add_column("Phase", justify="center")
+    replicas.add_column("Container")
+    replicas.add_column("Restarts", justify="center")
+    gated = any(replica.gate_wait is not None for replica in description.replicas)
+    if gated:
+        replicas.add_column("Gate wait", style="yellow", justify="right")
+    for replica in description.replicas:
+        row = [
+            str(replica.rank),
+            replica.pod,
+            replica.node or "-",
+            replica.phase,
+            replica.container_state,
+            str(replica.restarts),
+        ]
+        if gated:
+            row.append(f"{replica.gate_wait:.1f}s" if replica.gate_wait is not None else "-")
+        replicas.add_row(*row)
+
+    now = datetime.utcnow()
+    events = Table(title="Events", width=120)
+    events.add_column("Last Seen", style="yellow", no_wrap=True)
+    events.add_column("Source", style="cyan")
+    events.add_column("Type")
+    events.add_column("Reason", style="magenta")
+    events.add_column("Count", justify="center")
+    events.add_column("Message", overflow="fold")
+    for event in description.events[:max_events]:
+        source = f"{event.source} {format_ranks(event.ranks)}" if event.ranks else event.source
+        events.add_row(
+            humanize.naturaldelta(now - event.last_seen) if event.last_seen else "-",
+            source,
+            f"[red]{event.type}" if event.type == "Warning" else event.type,
+            event.reason,
+            str(event.count),
+            event.message,
+        )
+    if len(description.events) > max_events:
+        events.caption = f"{len(description.events) - max_events} older events hidden, use --events to show more"
+
+    return Group(header, replicas, events)
 
 
 class DescribeCommand(BaseCommand):
@@ -9,8 +84,14 @@ class DescribeCommand(BaseCommand):
         desc_parser = subparsers.add_parser("desc", help="Get info about a job")
         desc_parser.add_argument("job_name", help="Name of job to get info about").completer = completer
         desc_parser.add_argument("-n", "--namespace", help="Namespace to get info from", default="default")
+        desc_parser.add_argument("-e", "--events", help="Number of events to show", default=20, type=int)
         return desc_parser
 
-    def __call__(self, *args, **kwargs):
-        result = self.backend.describe_job(*args, **kwargs)
-        print(result)
+    def __call__(self, job_name: str, namespace: str = "default", events: int = 20):
+        try:
+            description = self.backend.describe_job(job_name=job_name, namespace=namespace)
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {job_name} description failed!"))
+            return
+        print(visualize_description(description, max_events=events))
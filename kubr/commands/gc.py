@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import humanize
+from rich import print
+from rich.table import Table
+
+from kubr.backends.gc import JobCollector
+from kubr.commands.base import BaseCommand
+from kubr.commands.history import parse_duration
+from kubr.commands.utils.reply import confirmation_prompt, mascot_message
+from kubr.config.job import Job
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def parse_namespace_ttls(values: List[str]) -> Dict[str, timedelta]:
+    """Parses ``namespace=duration`` pairs, e.g. ``research=3d``."""
+    ttls = {}
+    for value in values:
+        namespace, sep, duration = value.partition("=")
+        if not sep or not namespace:
+            raise ValueError(f"Invalid namespace TTL {value!r}, expected e.g. research=3d")
+        ttls[namespace] = parse_duration(duration)
+    return ttls
+
+
+def generate_gc_table(jobs: List[Job], title: str) -> Table:
+    now = datetime.utcnow()
+    table = Table(title=title, width=100)
+    table.add_column("Name", style="cyan", no_wrap=True, width=50)
+    table.add_column("Namespace", style="magenta", justify="center")
+    table.add_column("State", justify="center")
+    table.add_column("Finished", style="yellow", justify="center")
+    table.add_column("GPU", style="red", justify="center")
+    for job in jobs:
+        table.add_row(job.name, job.namespace, str(job.state), humanize.naturaltime(now - job.age), str(job.gpu))
+    return table
+
+
+class GcCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers):
+        gc_parser = subparsers.add_parser(
+            "gc",
+            help="Delete Completed and Failed jobs that finished longer than their TTL ago, "
+            "exits with 1 if the collection or any deletion failed",
+        )
+        gc_parser.add_argument("-n", "--namespace", help="Namespace to collect, all by default", default="All")
+        gc_parser.add_argument("--ttl", help="Time to live of finished jobs, e.g. 12h, 7d or 2w", default="7d")
+        gc_parser.add_argument(
+            "--namespace-ttl",
+            help="TTL of one namespace as namespace=duration, repeat for several namespaces",
+            action="append",
+            default=[],
+            dest="namespace_ttl",
+        )
+        gc_parser.add_argument(
+            "--batch-size", help="Jobs archived and deleted per batch", default=50, type=int, dest="batch_size"
+        )
+        gc_parser.add_argument("--concurrency", help="Parallel deletions per batch", default=8, type=int)
+        gc_parser.add_argument(
+            "--no-archive",
+            help="Do not archive jobs to the history before deletion",
+            action="store_false",
+            default=True,
+            dest="archive",
+        )
+        gc_parser.add_argument(
+            "--dry-run", help="Only show the jobs to delete", action="store_true", default=False, dest="dry_run"
+        )
+        gc_parser.add_argument("-y", "--yes", help="Do not ask for confirmation", action="store_true", default=False)
+        return gc_parser
+
+    def __call__(
+        self,
+        namespace: str = "All",
+        ttl: str = "7d",
+        namespace_ttls: Optional[List[str]] = None,
+        batch_size: int = 50,
+        concurrency: int = 8,
+        archive: bool = True,
+        dry_run: bool = False,
+        yes: bool = False,
+    ) -> int:
+        try:
+            collector = JobCollector(
+                self.backend,
+                ttl=parse_duration(ttl),
+                namespace_ttls=parse_namespace_ttls(namespace_ttls or []),
+                namespace=namespace,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                archive=archive,
+            )
+            if not dry_run and not yes:
+                count = len(collector.expired())
+                if count == 0:
+                    print(mascot_message("No expired jobs found!"))
+                    return EXIT_OK
+                if not confirmation_prompt(f"Are you sure you want to delete {count} finished jobs?"):
+                    return EXIT_OK
+            report = collector.collect(dry_run=dry_run)
+        except Exception as e:
+            print(e)
+            print(mascot_message("Garbage collection failed!"))
+            return EXIT_FAILED
+
+        if not report.deleted and not report.failed:
+            print(mascot_message("No expired jobs found!"))
+            return EXIT_OK
+        if report.deleted:
+            print(generate_gc_table(report.deleted, title="Would delete" if dry_run else "Deleted"))
+        for job, error in report.failed.items():
+            print(f"[red]Deleting job {job} failed: {error}")
+        if dry_run:
+            print(mascot_message(f"{len(report.deleted)} jobs would be deleted"))
+        else:
+            print(mascot_message(f"Deleted {len(report.deleted)} jobs, archived {report.archived} to the history"))
+        return EXIT_FAILED if report.failed else EXIT_OK
@@ -0,0 +1,126 @@
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import humanize
+from rich import print
+from rich.console import Group
+from rich.panel import Panel
+from rich.table import Table
+
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.job import JobRecord, JobState
+
+_DURATION_RE = re.compile(r"^(\d+)([smhdw])$")
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parses ``7d``, ``12h``, ``30m``, ``2w`` or ``90s``."""
+    match = _DURATION_RE.match(value)
+    if match is None:
+        raise ValueError(f"Invalid duration {value!r}, expected e.g. 30m, 12h, 7d or 2w")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit]: int(amount)})
+
+
+def parse_time(value: str, now: Optional[datetime] = None) -> datetime:
+    """Parses ``7d``, ``12h``, ``30m`` or ``2w`` as that long ago, or an ISO date or time, into naive UTC."""
+    if _DURATION_RE.match(value) is not None:
+        return (now or datetime.utcnow()) - parse_duration(value)
+    return datetime.fromisoformat(value)
+
+
+def generate_history_table(records: List[JobRecord]) -> Table:
+    now = datetime.utcnow()
+    table = Table(title="History", width=120)
+    table.add_column("Name", style="cyan", no_wrap=True)
+    table.add_column("Namespace", style="magenta", justify="center")
+    table.add_column("Queue", justify="center")
+    table.add_column("State", justify="center")
+    table.add_column("GPU", style="red", justify="center")
+    table.add_column("Created", style="yellow", justify="center")
+    table.add_column("Duration", style="yellow", justify="center")
+    for record in records:
+        state = record.state if record.state == str(JobState.Completed) else f"[red]{record.state}"
+        table.add_row(
+            record.name,
+            record.namespace,
+            record.queue or "-",
+            state,
+            str(record.gpu),
+            humanize.naturaltime(now - record.created_at),
+            humanize.naturaldelta(record.duration) if record.duration is not None else "-",
+        )
+    return table
+
+
+def visualize_record(record: JobRecord) -> Group:
+    header = Table.grid(padding=(0, 2))
+    header.add_row("[bold]Job", f"{record.namespace}/{record.name}")
+    header.add_row("[bold]Uid", record.uid)
+    header.add_row("[bold]State", record.state)
+    header.add_row("[bold]Queue", str(record.queue))
+    header.add_row("[bold]Created", f"{record.created_at} UTC")
+    header.add_row("[bold]Finished", f"{record.finished_at} UTC" if record.finished_at else "-")
+    return Group(header, Panel(record.logs_tail or "No logs archived", title="Logs tail"))
+
+
+class HistoryCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers):
+        history_parser = subparsers.add_parser("history", help="Query archived jobs")
+        history_parser.add_argument("name", help="Job name or glob pattern, e.g. 'sweep-*'", nargs="?")
+        history_parser.add_argument("-n", "--namespace", help="Namespace of the jobs", default=None)
+        history_parser.add_argument("-s", "--state", help="State of the jobs, e.g. Failed", default=None)
+        history_parser.add_argument("-q", "--queue", help="Queue of the jobs", default=None)
+        history_parser.add_argument("--since", help="Created after, e.g. 7d, 12h or 2024-01-31", default=None)
+        history_parser.add_argument("--until", help="Created before, same format as --since", default=None)
+        history_parser.add_argument("-t", "--top", help="Show only first T jobs", default=50, type=int)
+        history_parser.add_argument(
+            "--show", help="Show details and logs of the latest matching job", action="store_true", default=False
+        )
+        history_parser.add_argument(
+            "--sync", help="Archive finished jobs from the cluster first", action="store_true", default=False
+        )
+        return history_parser
+
+    def __call__(
+        self,
+        name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        state: Optional[str] = None,
+        queue: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        head: int = 50,
+        show: bool = False,
+        sync: bool = False,
+    ):
+        history = self.backend.history
+        try:
+            if sync:
+                archived = self.backend.archive_finished_jobs(namespace=namespace or "All")
+                print(f"Archived {archived} finished jobs")
+            records = history.query(
+                name=name,
+                namespace=namespace,
+                state=state,
+                queue=queue,
+                since=parse_time(since) if since else None,
+                until=parse_time(until) if until else None,
+                limit=1 if show else head,
+                details=show,
+            )
+        except Exception as e:
+            print(e)
+            print(mascot_message("History query failed!"))
+            return
+
+        if not records:
+            print(mascot_message("No jobs found in history!"))
+        elif show:
+            print(visualize_record(records[0]))
+        else:
+            print(generate_history_table(records))
@@ -1,16 +1,30 @@
 import pydoc
-from typing import Optional
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
 
 from rich import print
+from rich.markup import escape
+from rich.panel import Panel
 
-from kubr.backends.volcano import VolcanoBackend
+from kubr.backends.logcapture import LogArchive, LogCapture
+from kubr.backends.logsearch import LogMatch, LogSearch, PatternSet
+from kubr.commands.base import BaseCommand
+from kubr.commands.history import parse_time
+from kubr.commands.utils.render import LogRenderer
 from kubr.commands.utils.reply import mascot_message
 
 
-class LogsCommand:
-    def __init__(self, backend=None):
-        self.backend = backend or VolcanoBackend()
+def visualize_match(match: LogMatch) -> Panel:
+    lines = [f"[dim]{escape(line)}" for line in match.before]
+    lines.append(f"[bold red]{escape(match.line)}")
+    lines += [f"[dim]{escape(line)}" for line in match.after]
+    logged = datetime.utcfromtimestamp(match.timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")
+    return Panel("\n".join(lines), title=f"Rank {match.rank} matched {escape(match.pattern)} at {logged} UTC")
 
+
+class LogsCommand(BaseCommand):
     @staticmethod
     def add_parser(subparsers, completer):
         logs_parser = subparsers.add_parser("logs", help="Get logs of a job")
@@ -18,9 +32,62 @@ class LogsCommand:
         logs_parser.add_argument("-n", "--namespace", help="Namespace to get logs from", default="default")
         logs_parser.add_argument("-t", "--tail", help="Number of lines to show", default=None, type=int)
         logs_parser.add_argument("-f", "--follow", help="Follow logs", action="store_true", default=False)
+        logs_parser.add_argument(
+            "-o",
+            "--capture",
+            help="Capture logs of all replicas into compressed files under this directory until the job finishes",
+            default=None,
+        )
+        logs_parser.add_argument(
+            "--archive", help="Read logs captured with --capture from this directory", default=None
+        )
+        logs_parser.add_argument(
+            "-r",
+            "--rank",
+            help="Rank to read from the --archive, all ranks interleaved by default",
+            default=None,
+            type=int,
+        )
+        logs_parser.add_argument(
+            "--since", help="Lines of the --archive after, e.g. 30m or 2024-01-31T12:00", default=None
+        )
+        logs_parser.add_argument("--until", help="Lines of the --archive before, same format as --since", default=None)
+        logs_parser.add_argument(
+            "-g", "--grep", help="Search all replicas for a regex, repeat for several patterns", action="append"
+        )
+        logs_parser.add_argument("-C", "--context", help="Lines of context around matches", default=2, type=int)
+        logs_parser.add_argument(
+            "-i", "--ignore-case", help="Case insensitive --grep", action="store_true", default=False
+        )
         return logs_parser
 
-    def __call__(self, job_name: str, namespace: str, tail: Optional[int] = None, follow: bool = False):
+    def __call__(
+        self,
+        job_name: str,
+        namespace: str,
+        tail: Optional[int] = None,
+        follow: bool = False,
+        capture: Optional[str] = None,
+        archive: Optional[str] = None,
+        rank: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        grep: Optional[List[str]] = None,
+        context: int = 2,
+        ignore_case: bool = False,
+    ):
+        if archive is None and (rank is not None or since or until):
+            print(mascot_message("--rank, --since and --until only apply with --archive!"))
+            return
+        if grep:
+            self.grep(job_name, namespace, grep, context, ignore_case, follow)
+            return
+        if capture is not None:
+            self.capture(job_name, namespace, Path(capture) / namespace / job_name)
+            return
+        if archive is not None:
+            self.read_archive(Path(archive) / namespace / job_name, rank, since, until)
+            return
         try:
             logs = self.backend.get_logs(job_name=job_name, namespace=namespace, tail=tail, follow=follow)
         except Exception as e:
@@ -29,7 +96,74 @@ class LogsCommand:
             return
         if follow:
             # TODO [logs][follow] add pretty Ctrl+C handling
-            for log in logs:
-                print(log)
+            with LogRenderer() as renderer:
+                for log in logs:
+                    renderer.write(log)
         else:
             pydoc.pager(logs)
+
+    def capture(self, job_name: str, namespace: str, directory: Path):
+        try:
+            capture = LogCapture(self.backend, job_name, namespace, directory).start()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {job_name} logs capture failed!"))
+            return
+        print(f"Capturing logs of {len(capture.writers)} replicas to {directory}, press Ctrl+C to stop")
+        try:
+            capture.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            capture.stop()
+        print(f"Captured {sum(writer.written for writer in capture.writers.values())} lines")
+
+    def grep(self, job_name: str, namespace: str, patterns: List[str], context: int, ignore_case: bool, follow: bool):
+        def on_match(match: LogMatch):
+            if follow:
+                print(visualize_match(match))
+
+        try:
+            search = LogSearch(
+                self.backend,
+                job_name,
+                namespace,
+                PatternSet(patterns, ignore_case=ignore_case),
+                context=context,
+                follow=follow,
+                on_match=on_match,
+            ).start()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {job_name} logs search failed!"))
+            return
+        try:
+            search.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            search.stop()
+        if not follow:
+            for match in sorted(search.matches, key=lambda match: match.timestamp):
+                print(visualize_match(match))
+        first = search.first()
+        if first is None:
+            print(mascot_message("No matches found!"))
+        else:
+            print(mascot_message(f"{len(search.matches)} matches, first in rank {first.rank}"))
+
+    def read_archive(self, directory: Path, rank: Optional[int], since: Optional[str], until: Optional[str]):
+        archive = LogArchive(directory)
+        if not archive.ranks():
+            print(mascot_message(f"No captured logs found in {directory}!"))
+            return
+        since_time = parse_time(since) if since else None
+        until_time = parse_time(until) if until else None
+        try:
+            if rank is not None:
+                sys.stdout.writelines(archive.read(rank, since=since_time, until=until_time))
+            else:
+                for line_rank, line in archive.merged(since=since_time, until=until_time):
+                    sys.stdout.write(f"[{line_rank}] {line}")
+        except BrokenPipeError:
+            pass
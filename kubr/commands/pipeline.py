@@ -0,0 +1,82 @@
+from typing import Dict, Optional
+
+from rich import print
+from rich.table import Table
+
+from kubr.backends.pipeline import STEP_SKIPPED, STEP_SUBMITTED, PipelineRunner
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.commands.wait import EXIT_COMPLETED, EXIT_FAILED, EXIT_TIMEOUT
+from kubr.config.job import JobState
+from kubr.config.pipeline import PipelineConfig, load_pipeline
+from kubr.config.runner import RunnerConfig
+
+_STATE_COLORS = {str(JobState.Completed): "green", STEP_SUBMITTED: "yellow", STEP_SKIPPED: "bright_black"}
+
+
+def generate_pipeline_table(pipeline: PipelineConfig, configs: Dict[str, RunnerConfig], states: Dict[str, str]):
+    table = Table(title=f"Pipeline {pipeline.name}", width=120)
+    table.add_column("Step", style="cyan", no_wrap=True)
+    table.add_column("Job", no_wrap=True)
+    table.add_column("Namespace", style="magenta", justify="center")
+    table.add_column("Depends on", justify="center")
+    table.add_column("GPU", style="red", justify="center")
+    table.add_column("State", justify="center")
+    for name, state in states.items():
+        config = configs[name]
+        color = _STATE_COLORS.get(state, "red")
+        table.add_row(
+            name,
+            config.experiment.name,
+            config.experiment.namespace,
+            ", ".join(pipeline.step(name).depends_on) or "-",
+            str(config.resources.gpu * config.resources.nodes),
+            f"[{color}]{state}",
+        )
+    return table
+
+
+class PipelineCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers):
+        pipeline_parser = subparsers.add_parser(
+            "pipeline",
+            help="Run a pipeline of dependent jobs, exits with 0 if all steps completed, 1 if any failed, 2 on timeout",
+        )
+        pipeline_parser.add_argument("config", help="Path to the pipeline config file")
+        pipeline_parser.add_argument("-t", "--timeout", help="Seconds to run at most", default=None, type=float)
+        pipeline_parser.add_argument(
+            "--dry-run", help="Only show the steps", action="store_true", default=False, dest="dry_run"
+        )
+        return pipeline_parser
+
+    def __call__(self, config: str, timeout: Optional[float] = None, dry_run: bool = False) -> int:
+        try:
+            pipeline, configs = load_pipeline(config)
+            runner = PipelineRunner(
+                self.backend,
+                pipeline,
+                configs,
+                on_change=lambda step, state: print(f"[{_STATE_COLORS.get(state, 'red')}]{step}[/] {state}"),
+            )
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Loading pipeline {config} failed!"))
+            return EXIT_FAILED
+        if dry_run:
+            print(generate_pipeline_table(pipeline, configs, runner.states))
+            return EXIT_COMPLETED
+
+        try:
+            states = runner.run(timeout=timeout)
+        except KeyboardInterrupt:
+            states = runner.states
+        print(generate_pipeline_table(pipeline, configs, states))
+        if runner.succeeded:
+            print(mascot_message(f"Pipeline {pipeline.name} completed!"))
+            return EXIT_COMPLETED
+        if runner.done:
+            print(mascot_message(f"Pipeline {pipeline.name} failed!"))
+            return EXIT_FAILED
+        print(mascot_message(f"Pipeline {pipeline.name} is still running, its jobs go on without kubr"))
+        return EXIT_TIMEOUT
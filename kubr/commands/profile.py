@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import List, Optional
+
+from rich import print
+from rich.table import Table
+
+from kubr.backends.profiler import MODE_DUMP, JobProfiler, StackGroup, group_ranks
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+
+
+def format_ranks(ranks: List[int]) -> str:
+    """Compacts sorted ranks into ranges, e.g. ``0-6, 8``."""
+    ranges: List[List[int]] = []
+    for rank in ranks:
+        if ranges and rank == ranges[-1][1] + 1:
+            ranges[-1][1] = rank
+        else:
+            ranges.append([rank, rank])
+    return ", ".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def generate_profile_table(groups: List[StackGroup], mode: str) -> Table:
+    table = Table(title="Replica stacks" if mode == MODE_DUMP else "Hottest functions", width=140)
+    table.add_column("Ranks", style="cyan", justify="center")
+    table.add_column("Main thread stacks" if mode == MODE_DUMP else "Function", style="magenta")
+    for group in groups:
+        table.add_row(
+            format_ranks(group.ranks),
+            "\n".join(group.signature) or "-",
+            style="bold red" if group.diverging else None,
+        )
+    diverging = sorted(rank for group in groups if group.diverging for rank in group.ranks)
+    if diverging:
+        table.caption = f"Ranks {format_ranks(diverging)} diverge from the majority"
+    return table
+
+
+class ProfileCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers, completer):
+        profile_parser = subparsers.add_parser(
+            "profile", help="Sample the Python stacks of all replicas with py-spy and compare them"
+        )
+        profile_parser.add_argument("job", help="Name of job to profile").completer = completer
+        profile_parser.add_argument("-n", "--namespace", help="Namespace of the job", default="default")
+        profile_parser.add_argument(
+            "-d",
+            "--duration",
+            help="Seconds to record samples for, dumps the current stacks once if not set",
+            type=float,
+            default=None,
+        )
+        profile_parser.add_argument("--rate", help="Samples per second when recording", type=int, default=100)
+        profile_parser.add_argument("--native", help="Include native frames", action="store_true", default=False)
+        profile_parser.add_argument("--depth", help="Innermost frames compared between ranks", type=int, default=8)
+        profile_parser.add_argument("-o", "--output", help="Directory for the raw py-spy output", default=None)
+        return profile_parser
+
+    def __call__(
+        self,
+        job_name: str,
+        namespace: str = "default",
+        duration: Optional[float] = None,
+        rate: int = 100,
+        native: bool = False,
+        depth: int = 8,
+        output: Optional[str] = None,
+    ):
+        profiler = JobProfiler(self.backend, job_name, namespace, duration=duration, rate=rate, native=native)
+        action = "Dumping stacks of" if duration is None else f"Recording {duration:g}s of"
+        print(f"{action} all replicas of job {job_name}...")
+        try:
+            profiles = profiler.run()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Profiling job {job_name} failed!"))
+            return
+        if not profiles:
+            print(mascot_message(f"Job {job_name} has no running replicas!"))
+            return
+        directory = profiler.save(profiles, Path(output) if output else None)
+        print(generate_profile_table(group_ranks(profiles, depth=depth), profiler.mode))
+        print(f"Raw profiles saved to {directory}")
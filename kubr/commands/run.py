@@ -1,10 +1,10 @@
+import threading
 from datetime import datetime
 from time import sleep
-from typing import Optional
+from typing import List, Optional, Set
 
 import humanize
 from kubernetes import watch
-from pydantic_yaml import parse_yaml_raw_as
 from rich import print
 from rich.console import Console, Group
 from rich.live import Live
@@ -12,9 +12,17 @@ from rich.panel import Panel
 from rich.progress import Progress
 
 from kubr.backends.base import JobOperationStatus
+from kubr.backends.checkpoint import ResubmissionLoop
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import LABEL_JOB_NAME
+from kubr.backends.rightsizing import config_key, current_requests, recommend
+from kubr.backends.watchdog import JobWatchdog
 from kubr.commands.base import BaseCommand
+from kubr.commands.utils.render import LogRenderer
 from kubr.commands.utils.reply import confirmation_prompt, generate_jobs_table, mascot_message
+from kubr.commands.watchdog import print_stall
 from kubr.config.job import Job, JobState
+from kubr.config.loader import load_runner_config
 from kubr.config.runner import RunnerConfig
 
 
@@ -32,7 +40,30 @@ class RunCommand(BaseCommand):
         run_parser.add_argument("-e", "--entrypoint", help="Entrypoint to run")
         run_parser.add_argument("-n", "--namespace", help="Namespace to submit job to")
         run_parser.add_argument("--name", help="Name of job")
+        run_parser.add_argument(
+            "-p", "--profile", help="Profile from the config to apply, can be repeated", action="append", default=[]
+        )
+        run_parser.add_argument(
+            "-s",
+            "--set",
+            help="Override a config value, e.g. resources.gpu=8, can be repeated",
+            action="append",
+            default=[],
+            dest="overrides",
+        )
         run_parser.add_argument("-v", "--verbose", help="Verbose output", action="store_true", default=False)
+        run_parser.add_argument(
+            "--resubmit",
+            help="Wait for the job and resubmit it from the latest checkpoint on failure",
+            action="store_true",
+            default=False,
+        )
+        run_parser.add_argument(
+            "--rightsize",
+            help="Request the CPU and memory previous runs of the config used instead of suggesting them",
+            action="store_true",
+            default=False,
+        )
 
     def show_job_run(self, job: Job):
         node_update_step = 100 / job.nodes
@@ -99,18 +130,74 @@ class RunCommand(BaseCommand):
             sleep(2)
             try:
                 log_stream = self.backend.get_logs(job_name=job.name, namespace=job.namespace, tail=None, follow=True)
-                for log in log_stream:
-                    # TODO [run] stop if log stopped
-                    if not log_found:
-                        status.update("Job started!")
-                        live_panel.stop()
-                    print(log)
-                    log_found += 1
+                with LogRenderer() as renderer:
+                    for log in log_stream:
+                        if not log_found:
+                            status.update("Job started!")
+                            live_panel.stop()
+                        renderer.write(log)
+                        log_found += 1
 
                 break
             except Exception:
                 status.update("Waiting for logs...")
 
+    def start_watchdog(self, job: Job, config: RunnerConfig) -> JobWatchdog:
+        """Watches the job in the background while its logs are followed, a deleted job ends the log stream."""
+        watchdog = JobWatchdog(self.backend, job.name, job.namespace, config.experiment.watchdog, on_stall=print_stall)
+        threading.Thread(target=watchdog.run, daemon=True).start()
+        return watchdog
+
+    def rightsize(self, config: RunnerConfig, apply: bool = False):
+        """Suggests, or applies, tighter requests from the peak usage recorded for earlier runs of the config."""
+        try:
+            peaks = HistoryStore().peaks(config_key(config))
+        except Exception:
+            return
+        rightsizing = recommend(peaks, config.resources)
+        if rightsizing is None:
+            return
+        current = current_requests(config.resources)
+
+        def changes(names: Set[str]) -> str:
+            return ", ".join(
+                f"{name} {current[name] if current[name] is not None else 'unbounded'} -> {value:g}"
+                for name, value in rightsizing.model_dump(include=names, exclude_none=True).items()
+            )
+
+        requests = changes({"cpu_request", "memory_request"})
+        if requests and apply:
+            config.resources = rightsizing.apply(config.resources)
+            print(f"Right-sized from {rightsizing.runs} previous runs: {requests}")
+        elif requests:
+            print(
+                f"Previous {rightsizing.runs} runs of this config used less than requested: {requests}. "
+                f"Run with [bold]--rightsize[/bold] to apply"
+            )
+        if rightsizing.shm is not None:
+            # a /dev/shm limit below the usage evicts the pod, so it is never applied automatically
+            print(
+                f"Previous {rightsizing.runs} runs of this config used less /dev/shm: {changes({'shm'})}. "
+                f"Set [bold]resources.shm[/bold] to apply"
+            )
+
+    def run_with_resubmission(self, config: RunnerConfig):
+        if config.checkpoint is None:
+            print(mascot_message(f"Job {config.experiment.name} has no checkpoint config to resubmit from!"))
+            return
+
+        def on_resubmit(job: Job, checkpoint: Optional[str], backoff: float):
+            resume = f"checkpoint {checkpoint}" if checkpoint else "scratch"
+            print(mascot_message(f"Job {job.name} is {job.state}, resubmitting from {resume} in {backoff:.0f}s"))
+
+        try:
+            job = ResubmissionLoop(backend=self.backend, run_config=config, on_resubmit=on_resubmit).run()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {config.experiment.name} running failed!"))
+            return
+        print(mascot_message(f"Job {job.name} finished in state {job.state}!"))
+
     def __call__(
         self,
         config: str,
@@ -119,12 +206,19 @@ class RunCommand(BaseCommand):
         entrypoint: Optional[str] = None,
         namespace: Optional[str] = None,
         verbose: bool = False,
+        resubmit: bool = False,
+        rightsize: bool = False,
+        profiles: Optional[List[str]] = None,
+        overrides: Optional[List[str]] = None,
     ):
         # TODO [run] check if config exists on cluster and ask to resubmit
 
-        with open(config, "r") as f:
-            config = f.read()
-        config = parse_yaml_raw_as(RunnerConfig, config)
+        try:
+            config = load_runner_config(config, profiles=profiles or [], overrides=overrides or [])
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Config {config} is invalid!"))
+            return
 
         config.experiment.name = name or config.experiment.name
         config.container.image = image or config.container.image
@@ -136,7 +230,7 @@ class RunCommand(BaseCommand):
             return
 
         pods = self.backend.core_client.list_namespaced_pod(
-            namespace=config.experiment.namespace, label_selector=f"volcano.sh/job-name={config.experiment.name}"
+            namespace=config.experiment.namespace, label_selector=f"{LABEL_JOB_NAME}={config.experiment.name}"
         )
         if len(pods.items) > 0:
             if confirmation_prompt(
@@ -145,14 +239,27 @@ class RunCommand(BaseCommand):
             ):
                 self.backend.delete_job(job_name=config.experiment.name, namespace=config.experiment.namespace)
 
+        self.rightsize(config, apply=rightsize)
+
+        if resubmit:
+            self.run_with_resubmission(config)
+            return
+
         job, status = self.backend.run_job(config)
         if status == JobOperationStatus.Failed:
             print(mascot_message(f"Job {config.experiment.name} running failed!"))
 
         elif status == JobOperationStatus.Success:
             if verbose:
-                self.show_job_run(job)
+                watchdog = self.start_watchdog(job, config) if config.experiment.watchdog is not None else None
+                try:
+                    self.show_job_run(job)
+                finally:
+                    if watchdog is not None:
+                        watchdog.stop()
             else:
                 visualize_job(job)
+                if config.experiment.watchdog is not None:
+                    print(f"Run [bold]kubr watchdog {job.name} -n {job.namespace}[/bold] to watch it for stalls")
         else:
             print(mascot_message(f"Job {config.experiment.name} is in unknown state!"))
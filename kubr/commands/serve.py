@@ -0,0 +1,37 @@
+from rich import print
+
+from kubr.backends.cache import CACHE_PORT, CacheServer, ClusterCache
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+
+
+class ServeCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers):
+        serve_parser = subparsers.add_parser(
+            "serve", help="Serve cached jobs, pods, queues and nodes of the cluster to kubr clients over HTTP"
+        )
+        serve_parser.add_argument("--host", help="Address to listen on", default="0.0.0.0")
+        serve_parser.add_argument("-p", "--port", help="Port to listen on", default=CACHE_PORT, type=int)
+        serve_parser.add_argument(
+            "--watch-seconds", help="Lifetime of a single watch request", default=300, type=int, dest="watch_seconds"
+        )
+        return serve_parser
+
+    def __call__(self, host: str = "0.0.0.0", port: int = CACHE_PORT, watch_seconds: int = 300):
+        cache = ClusterCache(self.backend, watch_seconds=watch_seconds).start()
+        try:
+            server = CacheServer(cache, host=host, port=port)
+        except OSError as e:
+            cache.stop()
+            print(e)
+            print(mascot_message(f"Cache server could not listen on {host}:{port}!"))
+            return
+        print(f"Serving the cluster cache on {server.url}, point clients to it with KUBR_CACHE_URL")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            cache.stop()
@@ -1,4 +1,44 @@
+import time
+from collections import deque
+from typing import Deque, List, Optional
+
+from rich import print
+from rich.console import Group
+from rich.live import Live
+from rich.table import Table
+
+from kubr.backends.rightsizing import UsageRecorder
+from kubr.backends.telemetry import ResourceSample, TelemetryCollector, aggregate, find_straggler
 from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+
+
+def _fmt(value: Optional[float], precision: int = 0) -> str:
+    return "-" if value is None else f"{value:.{precision}f}"
+
+
+def generate_stat_table(samples: List[ResourceSample], by: str) -> Table:
+    summaries = aggregate(samples, by=by)
+    straggler = find_straggler(summaries) if by == "rank" else None
+
+    table = Table(title=f"Utilization by {by}", width=100)
+    table.add_column(by.capitalize(), style="cyan", justify="center")
+    table.add_column("CPU (mcores)", style="magenta", justify="center")
+    table.add_column("Peak mem (MiB)", style="yellow", justify="center")
+    table.add_column("GPU util (%)", style="red", justify="center")
+    table.add_column("Peak GPU mem (MiB)", style="red", justify="center")
+    for summary in summaries:
+        table.add_row(
+            summary.key,
+            _fmt(summary.cpu_millicores),
+            _fmt(summary.memory_mb_peak),
+            _fmt(summary.gpu_util, precision=1),
+            _fmt(summary.gpu_memory_mb_peak),
+            style="bold red" if summary.key == straggler else None,
+        )
+    if straggler is not None:
+        table.caption = f"Rank {straggler} is a straggler: lowest GPU utilization"
+    return table
 
 
 class StatCommand(BaseCommand):
@@ -7,7 +47,62 @@ class StatCommand(BaseCommand):
         stat_parser = subparsers.add_parser("stat", help="Get statistics about a job")
         stat_parser.add_argument("job", help="Name of job to get statistics about").completer = completer
         stat_parser.add_argument("-n", "--namespace", help="Namespace to get statistics from", default="default")
+        stat_parser.add_argument("-i", "--interval", help="Seconds between samples", default=5.0, type=float)
+        stat_parser.add_argument(
+            "-c", "--count", help="Number of samples to take, 0 to sample until interrupted", default=1, type=int
+        )
+        stat_parser.add_argument("-o", "--output", help="Append samples to this JSON lines file", default=None)
+        stat_parser.add_argument("--dcgm-namespace", help="Namespace of the DCGM exporter", default="gpu-operator")
+        stat_parser.add_argument(
+            "--dcgm-selector", help="Label selector of the DCGM exporter pods", default="app=nvidia-dcgm-exporter"
+        )
         return stat_parser
 
-    def __call__(self, job_name: str, namespace: str = "default"):
-        raise NotImplementedError
+    def __call__(
+        self,
+        job_name: str,
+        namespace: str = "default",
+        interval: float = 5.0,
+        count: int = 1,
+        output: Optional[str] = None,
+        dcgm_namespace: str = "gpu-operator",
+        dcgm_selector: str = "app=nvidia-dcgm-exporter",
+    ):
+        collector = TelemetryCollector(
+            backend=self.backend,
+            job_name=job_name,
+            namespace=namespace,
+            dcgm_namespace=dcgm_namespace,
+            dcgm_selector=dcgm_selector,
+        )
+        # peaks are kept in the history so that the next runs of the config can request less
+        recorder = UsageRecorder(backend=self.backend, job_name=job_name, namespace=namespace)
+        # the tables aggregate a sliding window so long sampling sessions stay cheap to render
+        window: Deque[List[ResourceSample]] = deque(maxlen=60)
+        sink = open(output, "a") if output is not None else None
+        taken = 0
+        try:
+            with Live(auto_refresh=False) as live:
+                while count == 0 or taken < count:
+                    if taken:
+                        time.sleep(interval)
+                    batch = collector.sample()
+                    if sink is not None:
+                        sink.writelines(sample.model_dump_json() + "\n" for sample in batch)
+                        sink.flush()
+                    recorder.record(batch)
+                    window.append(batch)
+                    taken += 1
+                    samples = [sample for window_batch in window for sample in window_batch]
+                    live.update(
+                        Group(generate_stat_table(samples, by="rank"), generate_stat_table(samples, by="node")),
+                        refresh=True,
+                    )
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {job_name} statistics retrieval failed!"))
+        finally:
+            if sink is not None:
+                sink.close()
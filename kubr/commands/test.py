@@ -1,13 +1,113 @@
+from typing import List, Optional
+
+import humanize
+from rich import print
+from rich.table import Table
+
+from kubr.backends.nccl import AllReduceReport, AllReduceTest
 from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.loader import load_runner_config
+
+
+def generate_allreduce_table(report: AllReduceReport) -> Table:
+    table = Table(title=f"All-reduce over {report.results[0].world} GPUs" if report.results else "All-reduce")
+    table.add_column("Size", style="cyan", justify="right")
+    table.add_column("Time (ms)", style="magenta", justify="right")
+    table.add_column("Algbw (GB/s)", style="yellow", justify="right")
+    table.add_column("Busbw (GB/s)", style="red", justify="right")
+    for result in report.results:
+        table.add_row(
+            humanize.naturalsize(result.bytes, binary=True),
+            f"{result.seconds * 1000:.3f}",
+            f"{result.algbw:.2f}",
+            f"{result.busbw:.2f}",
+        )
+    table.caption = "NCCL network: " + (report.transport or "unknown")
+    return table
+
+
+def generate_env_table(report: AllReduceReport) -> Table:
+    table = Table(title="NCCL environment")
+    table.add_column("Variable", style="cyan")
+    table.add_column("Value", style="magenta")
+    for name, value in sorted(report.env.items()):
+        table.add_row(name, value)
+    return table
 
 
 class TestCommand(BaseCommand):
     @staticmethod
-    def add_parser(subparsers, completer):
-        test_parser = subparsers.add_parser("test", help="Test a job")
+    def add_parser(subparsers):
+        test_parser = subparsers.add_parser(
+            "test", help="Measure all-reduce bandwidth with the NCCL settings kubr derives for a config"
+        )
+        test_parser.add_argument("config", help="Path to run config", type=str)
+        test_parser.add_argument("-n", "--namespace", help="Namespace to run the test in")
+        test_parser.add_argument("--name", help="Name of the test job")
+        test_parser.add_argument(
+            "-p", "--profile", help="Profile from the config to apply, can be repeated", action="append", default=[]
+        )
+        test_parser.add_argument(
+            "-s",
+            "--set",
+            help="Override a config value, e.g. resources.nodes=2, can be repeated",
+            action="append",
+            default=[],
+            dest="overrides",
+        )
+        test_parser.add_argument("--size-mb", help="Largest message size in MiB", type=int, default=256)
+        test_parser.add_argument("--iterations", help="Timed all-reduces per message size", type=int, default=20)
+        test_parser.add_argument(
+            "--min-busbw", help="Fail below this peak bus bandwidth in GB/s", type=float, default=None
+        )
+        test_parser.add_argument("--timeout", help="Seconds to wait for the test job", type=float, default=900)
+        test_parser.add_argument("--keep", help="Keep the test job for inspection", action="store_true", default=False)
         return test_parser
 
     def __call__(
         self,
-    ):
-        raise NotImplementedError
+        config: str,
+        namespace: Optional[str] = None,
+        name: Optional[str] = None,
+        profiles: Optional[List[str]] = None,
+        overrides: Optional[List[str]] = None,
+        size_mb: int = 256,
+        iterations: int = 20,
+        min_busbw: Optional[float] = None,
+        timeout: float = 900,
+        keep: bool = False,
+    ) -> int:
+        try:
+            run_config = load_runner_config(config, profiles=profiles or [], overrides=overrides or [])
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Config {config} is invalid!"))
+            return 1
+        run_config.experiment.namespace = namespace or run_config.experiment.namespace
+        if run_config.resources.gpu == 0:
+            print(mascot_message("All-reduce tests need GPUs, the config requests none!"))
+            return 1
+
+        test = AllReduceTest(self.backend, run_config, size_mb=size_mb, iterations=iterations, name=name)
+        print(
+            f"Running all-reduce test {test.name} on {run_config.resources.nodes} x {run_config.resources.gpu} GPUs..."
+        )
+        try:
+            report = test.run(timeout=timeout, keep=keep)
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"All-reduce test {test.name} failed to run!"))
+            return 1
+
+        if report.env:
+            print(generate_env_table(report))
+        if not report.results:
+            print(mascot_message(f"All-reduce test {test.name} ended {report.state} without results!"))
+            return 1
+        print(generate_allreduce_table(report))
+        if min_busbw is not None and report.peak_busbw < min_busbw:
+            print(mascot_message(f"Peak bus bandwidth {report.peak_busbw:.2f} GB/s is below {min_busbw:g} GB/s!"))
+            return 1
+        print(mascot_message(f"Peak bus bandwidth is {report.peak_busbw:.2f} GB/s"))
+        return 0
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import List, Optional
+
+from rich import print
+from rich.table import Table
+
+from kubr.backends.history import USAGE_DIMENSIONS
+from kubr.backends.usage import gpu_usage
+from kubr.commands.base import BaseCommand
+from kubr.commands.history import parse_time
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.job import GpuUsage
+
+
+def generate_usage_table(usage: List[GpuUsage], by: str, since: datetime, until: datetime) -> Table:
+    total = sum(row.gpu_hours for row in usage)
+    table = Table(title=f"GPU usage by {by}", width=100, show_footer=True, footer_style="bold")
+    table.add_column(by.capitalize(), "Total:", style="cyan", no_wrap=True, width=40)
+    table.add_column("GPU-hours", f"{total:,.1f}", style="red", justify="right")
+    table.add_column("Share", style="yellow", justify="right")
+    table.add_column("Jobs", f"{sum(row.jobs for row in usage)}", style="magenta", justify="right")
+    table.add_column("Running", f"{sum(row.running for row in usage)}", justify="right")
+    for row in usage:
+        table.add_row(
+            row.key or "-",
+            f"{row.gpu_hours:,.1f}",
+            f"{row.gpu_hours / total:.1%}" if total else "-",
+            str(row.jobs),
+            str(row.running),
+        )
+    table.caption = f"{since:%Y-%m-%d %H:%M} - {until:%Y-%m-%d %H:%M} UTC"
+    return table
+
+
+class UsageCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers):
+        usage_parser = subparsers.add_parser("usage", help="Report GPU-hours by namespace, user or queue")
+        usage_parser.add_argument("--since", help="Start of the period, e.g. 30d, 12h or 2024-01-01", default="30d")
+        usage_parser.add_argument("--until", help="End of the period, same format as --since", default=None)
+        usage_parser.add_argument("--by", help="Group usage by", choices=USAGE_DIMENSIONS, default="namespace")
+        usage_parser.add_argument(
+            "--offline",
+            help="Report from the history only, without archiving finished jobs or counting running ones",
+            action="store_true",
+            default=False,
+        )
+        return usage_parser
+
+    def __call__(self, since: str = "30d", until: Optional[str] = None, by: str = "namespace", offline: bool = False):
+        try:
+            now = datetime.utcnow()
+            period_start = parse_time(since, now=now)
+            period_end = parse_time(until, now=now) if until else now
+            live_jobs = []
+            if not offline:
+                # only jobs missing from the history are archived, so repeated reports stay cheap
+                self.backend.archive_finished_jobs()
+                live_jobs = self.backend.list_jobs()
+            usage = gpu_usage(self.backend.history, by, period_start, period_end, live_jobs=live_jobs)
+        except Exception as e:
+            print(e)
+            print(mascot_message("Usage report failed!"))
+            return
+
+        if not usage:
+            print(mascot_message("No GPU usage in this period!"))
+            return
+        print(generate_usage_table(usage, by, period_start, period_end))
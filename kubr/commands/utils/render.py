@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+from typing import List, Optional, TextIO
+
+from rich.console import Console
+
+
+def refresh_rate() -> float:
+    """Terminal refreshes per second of followed logs, ``$KUBR_LOG_REFRESH_RATE`` or 10."""
+    return float(os.environ.get("KUBR_LOG_REFRESH_RATE", 10))
+
+
+class LogRenderer:
+    """Writes log lines to the terminal in batches, without blocking the reader of the log stream.
+
+    ``write`` only appends to a buffer; a background thread writes the buffered lines every refresh as a
+    single chunk. Log content is raw text: on a terminal it goes through ``Console.out``, which skips markup
+    parsing, highlighting, wrapping and cropping, otherwise (pipes, files) it is written to the file as is.
+    When the buffer grows past ``max_buffer_lines`` the writer flushes itself, so memory stays bounded if the
+    terminal falls behind.
+
+    Args:
+        file (Optional[TextIO], optional): Output. Defaults to ``sys.stdout``.
+        refresh_per_second (Optional[float], optional): Flushes per second. Defaults to ``refresh_rate()``.
+        max_buffer_lines (int, optional): Lines buffered before ``write`` flushes itself. Defaults to 10000.
+        plain (Optional[bool], optional): Write without rich. Defaults to True unless the output is a terminal.
+    """
+
+    def __init__(
+        self,
+        file: Optional[TextIO] = None,
+        refresh_per_second: Optional[float] = None,
+        max_buffer_lines: int = 10000,
+        plain: Optional[bool] = None,
+    ):
+        self.file = file or sys.stdout
+        self.interval = 1 / (refresh_per_second or refresh_rate())
+        self.max_buffer_lines = max_buffer_lines
+        self.plain = not self.file.isatty() if plain is None else plain
+        self.console = None if self.plain else Console(file=self.file)
+        self.lines = 0
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._output_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "LogRenderer":
+        self._thread = threading.Thread(target=self._refresh, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, line: str):
+        """Queues a line, without trailing newline."""
+        with self._lock:
+            self._buffer.append(line)
+            self.lines += 1
+            full = len(self._buffer) >= self.max_buffer_lines
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._output_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            text = "\n".join(batch) + "\n"
+            if self.console is not None:
+                self.console.out(text, end="", highlight=False)
+            else:
+                self.file.write(text)
+                self.file.flush()
+
+    def close(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _refresh(self):
+        while not self._closed.wait(self.interval):
+            self.flush()
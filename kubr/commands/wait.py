@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import List, Optional
+
+from rich import print
+
+from kubr.backends.waiter import JobTracker
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.job import Job, JobState
+
+EXIT_COMPLETED = 0
+EXIT_FAILED = 1
+EXIT_TIMEOUT = 2
+
+
+class WaitCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers, completer):
+        wait_parser = subparsers.add_parser(
+            "wait", help="Wait for jobs to finish, exits with 0 if all completed, 1 if any failed, 2 on timeout"
+        )
+        wait_parser.add_argument("jobs", help="Names of jobs to wait for", nargs="*").completer = completer
+        wait_parser.add_argument("-n", "--namespace", help="Namespace of the jobs", default="default")
+        wait_parser.add_argument("-l", "--selector", help="Wait for all jobs matching the label selector")
+        wait_parser.add_argument("-t", "--timeout", help="Seconds to wait at most", default=None, type=float)
+        wait_parser.add_argument(
+            "--fail-fast", help="Stop waiting as soon as a job failed", action="store_true", default=False
+        )
+        return wait_parser
+
+    def __call__(
+        self,
+        jobs: List[str],
+        namespace: str = "default",
+        selector: Optional[str] = None,
+        timeout: Optional[float] = None,
+        fail_fast: bool = False,
+    ) -> int:
+        if not jobs and not selector:
+            print(mascot_message("Nothing to wait for, pass job names or a selector!"))
+            return EXIT_FAILED
+
+        def on_finish(job: Job):
+            color = "green" if job.state == JobState.Completed else "red"
+            print(f"[{color}]{job.name}[/{color}] {job.state}")
+            # archive while the pods and their logs still exist, finished jobs may be garbage collected any time
+            if self.backend.history is not None:
+                try:
+                    self.backend.archive_job(job.name, job.namespace)
+                except Exception as e:
+                    print(f"Archiving job {job.name} failed: {e}")
+
+        tracker = JobTracker(self.backend, namespace=namespace, label_selector=selector, on_finish=on_finish)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            if selector:
+                futures = tracker.track_selected()
+            else:
+                futures = tracker.track_many([(job_name, namespace) for job_name in jobs])
+        except Exception as e:
+            print(e)
+            print(mascot_message("Waiting for jobs failed!"))
+            return EXIT_FAILED
+
+        pending, completed, failed = set(futures), 0, 0
+        try:
+            while pending and (deadline is None or time.monotonic() < deadline):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        print(f"[red]{future.exception()}")
+                        failed += 1
+                    elif future.result().state == JobState.Completed:
+                        completed += 1
+                    else:
+                        failed += 1
+                if fail_fast and failed:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for future in pending:
+                future.cancel()
+
+        summary = f"{completed} completed, {failed} failed"
+        if pending:
+            summary += f", {len(pending)} still running"
+        print(mascot_message(summary))
+        if failed:
+            return EXIT_FAILED
+        return EXIT_TIMEOUT if pending else EXIT_COMPLETED
@@ -0,0 +1,95 @@
+import os
+import subprocess
+from typing import List, Optional
+
+from rich import print
+
+from kubr.backends.logsearch import LogSearch, PatternSet
+from kubr.commands.base import BaseCommand
+from kubr.commands.logs import visualize_match
+from kubr.commands.utils.reply import mascot_message
+
+EXIT_QUIET = 0
+EXIT_ALERT = 1
+
+
+class WatchLogsCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers, completer):
+        watch_parser = subparsers.add_parser(
+            "watch-logs",
+            help="Follow all replicas until a line matches an alert pattern, exits with 1 on alert and 0 otherwise",
+        )
+        watch_parser.add_argument("job", help="Name of job to watch").completer = completer
+        watch_parser.add_argument("-n", "--namespace", help="Namespace of the job", default="default")
+        watch_parser.add_argument(
+            "-a", "--alert", help="Regex to alert on, repeat for several patterns", action="append", required=True
+        )
+        watch_parser.add_argument("-C", "--context", help="Lines of context around the match", default=5, type=int)
+        watch_parser.add_argument(
+            "-i", "--ignore-case", help="Case insensitive patterns", action="store_true", default=False
+        )
+        watch_parser.add_argument("--delete", help="Delete the job on alert", action="store_true", default=False)
+        watch_parser.add_argument(
+            "--exec",
+            help="Shell command to run on alert, with KUBR_JOB, KUBR_NAMESPACE, KUBR_RANK and KUBR_LINE set",
+            default=None,
+            dest="exec_command",
+        )
+        return watch_parser
+
+    def __call__(
+        self,
+        job_name: str,
+        alerts: List[str],
+        namespace: str = "default",
+        context: int = 5,
+        ignore_case: bool = False,
+        delete: bool = False,
+        command: Optional[str] = None,
+    ) -> int:
+        try:
+            search = LogSearch(
+                self.backend,
+                job_name,
+                namespace,
+                PatternSet(alerts, ignore_case=ignore_case),
+                context=context,
+                follow=True,
+                max_matches=1,
+            ).start()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Watching job {job_name} logs failed!"))
+            return EXIT_ALERT
+        print(f"Watching {len(search.resume)} replicas of {job_name} for {', '.join(alerts)}")
+        try:
+            search.join()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            search.stop()
+
+        match = search.first()
+        if match is None:
+            print(mascot_message(f"No alerts, job {job_name} logs ended quietly"))
+            return EXIT_QUIET
+        print(visualize_match(match))
+        if command is not None:
+            environment = dict(
+                os.environ,
+                KUBR_JOB=job_name,
+                KUBR_NAMESPACE=namespace,
+                KUBR_RANK=str(match.rank),
+                KUBR_LINE=match.line,
+            )
+            subprocess.run(command, shell=True, env=environment)
+        if delete:
+            try:
+                self.backend.delete_job(job_name=job_name, namespace=namespace)
+                print(f"Deleted job {job_name}")
+            except Exception as e:
+                print(e)
+                print(mascot_message(f"Job {job_name} deletion failed!"))
+        print(mascot_message(f"Alert in rank {match.rank}!"))
+        return EXIT_ALERT
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional
+
+from rich import print
+
+from kubr.backends.watchdog import JobWatchdog, StallReport
+from kubr.commands.base import BaseCommand
+from kubr.commands.utils.reply import mascot_message
+from kubr.config.runner import WatchdogConfig
+
+EXIT_QUIET = 0
+EXIT_STALLED = 1
+
+
+def print_stall(report: StallReport):
+    if report.action == "notify":
+        print(f"[red]Job {report.job_name} stalled: {report.reason}[/red], diagnostics in {report.diagnostics}")
+    else:
+        print(f"[red]Job {report.job_name} still stalled, {report.action} done")
+
+
+class WatchdogCommand(BaseCommand):
+    @staticmethod
+    def add_parser(subparsers, completer):
+        watchdog_parser = subparsers.add_parser(
+            "watchdog",
+            help="Watch a job for stalled logs or idle GPUs and act on it, exits with 1 if it stalled and 0 otherwise",
+        )
+        watchdog_parser.add_argument("job", help="Name of job to watch").completer = completer
+        watchdog_parser.add_argument("-n", "--namespace", help="Namespace of the job", default="default")
+        watchdog_parser.add_argument(
+            "--action", help="Action on a stall, defaults to the job config", choices=["notify", "delete", "restart"]
+        )
+        watchdog_parser.add_argument(
+            "--log-idle", help="Minutes without log lines that count as a stall", type=float, dest="log_idle_minutes"
+        )
+        watchdog_parser.add_argument(
+            "--gpu-idle", help="Minutes of idle GPUs that count as a stall", type=float, dest="gpu_idle_minutes"
+        )
+        watchdog_parser.add_argument(
+            "--gpu-idle-percent", help="GPU utilization below which a GPU is idle", type=float, dest="gpu_idle_percent"
+        )
+        watchdog_parser.add_argument(
+            "--grace", help="Minutes between notification and action", type=float, dest="grace_minutes"
+        )
+        watchdog_parser.add_argument("--interval", help="Seconds between checks", type=float, dest="interval_seconds")
+        watchdog_parser.add_argument(
+            "--exec",
+            help="Shell command to run on a stall, with KUBR_JOB, KUBR_NAMESPACE, KUBR_STALL_REASON and "
+            "KUBR_DIAGNOSTICS set",
+            dest="exec_command",
+        )
+        return watchdog_parser
+
+    def __call__(self, job_name: str, namespace: str = "default", **overrides: Optional[Any]) -> int:
+        """Watches the job with its submitted watchdog config, or the defaults, updated by the given overrides."""
+        try:
+            config = self.backend.get_watchdog_config(job_name=job_name, namespace=namespace) or WatchdogConfig()
+        except Exception as e:
+            print(e)
+            print(mascot_message(f"Job {job_name} not found!"))
+            return EXIT_STALLED
+        update: Dict[str, Any] = {key: value for key, value in overrides.items() if value is not None}
+        config = config.model_copy(update=update)
+
+        watchdog = JobWatchdog(self.backend, job_name, namespace, config, on_stall=print_stall)
+        print(
+            f"Watching job {job_name}: logs idle {config.log_idle_minutes} min, GPUs idle {config.gpu_idle_minutes} "
+            f"min, then {config.action} after {config.grace_minutes:g} min"
+        )
+        try:
+            report = watchdog.run()
+        except KeyboardInterrupt:
+            watchdog.stop()
+            return EXIT_QUIET
+        if report is None:
+            print(mascot_message(f"Job {job_name} finished without stalling"))
+            return EXIT_QUIET
+        print(mascot_message(f"Job {job_name} stalled: {report.reason}"))
+        return EXIT_STALLED
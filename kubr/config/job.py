@@ -1,5 +1,5 @@
 import datetime
-from typing import Union
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -22,9 +22,11 @@ class JobBackend(PrettyEnum):
 
     Args:
         Volcano (str): Run a Volcano job.
+        Kubernetes (str): Run a Kubernetes Indexed Job, without gang scheduling.
     """
 
     Volcano = "Volcano"
+    Kubernetes = "Kubernetes"
 
 
 class JobState(PrettyEnum):
@@ -35,12 +37,27 @@ class JobState(PrettyEnum):
         Running (str): Job is running.
         Completed (str): Job is completed.
         Failed (str): Job has failed.
+        Aborting (str): Job is being aborted, e.g. preempted.
+        Aborted (str): Job was aborted, e.g. preempted.
+        Restarting (str): Job is restarting.
+        Completing (str): Job is completing.
+        Terminating (str): Job is being terminated.
+        Terminated (str): Job was terminated.
     """
 
     Pending = "Pending"
     Running = "Running"
     Completed = "Completed"
     Failed = "Failed"
+    Aborting = "Aborting"
+    Aborted = "Aborted"
+    Restarting = "Restarting"
+    Completing = "Completing"
+    Terminating = "Terminating"
+    Terminated = "Terminated"
+
+
+TERMINAL_JOB_STATES = (JobState.Completed, JobState.Failed, JobState.Aborted, JobState.Terminated)
 
 
 class Job(BaseModel):
@@ -52,3 +69,173 @@ class Job(BaseModel):
     age: Union[datetime.datetime, str]
     gpu: int
     nodes: int = 1
+    queue: Optional[str] = None
+    user: Optional[str] = None
+
+
+class ReplicaStatus(BaseModel):
+    """ReplicaStatus is the state of a single replica of a job.
+
+    Args:
+        rank (int): Rank of the replica.
+        pod (str): Name of the pod.
+        node (Optional[str]): Node the pod is scheduled on.
+        phase (str): Pod phase.
+        container_state (str): State of the main container, with reason and exit code when known.
+        restarts (int): Restart count of the main container.
+        gate_wait (Optional[float]): Seconds the replica waited in the startup gate for the others, None without
+            a gate or until the gate is passed.
+    """
+
+    rank: int
+    pod: str
+    node: Optional[str] = None
+    phase: str
+    container_state: str
+    restarts: int = 0
+    gate_wait: Optional[float] = None
+
+
+class EventSummary(BaseModel):
+    """EventSummary is a group of identical events of a job, its pod group or its replicas.
+
+    Args:
+        source (str): "Job", "PodGroup" or "Pod".
+        ranks (List[int]): Ranks that reported the event, empty for job and pod group events.
+        type (str): Event type, Normal or Warning.
+        reason (str): Event reason.
+        message (str): Event message, pod names replaced by ``<pod>``.
+        count (int): Number of occurrences across all ranks.
+        last_seen (Optional[datetime.datetime]): Time of the latest occurrence.
+    """
+
+    source: str
+    ranks: List[int] = []
+    type: str
+    reason: str
+    message: str
+    count: int = 1
+    last_seen: Optional[datetime.datetime] = None
+
+
+class JobDescription(BaseModel):
+    """JobDescription is the detailed state of a job.
+
+    Args:
+        name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        state (str): Job phase.
+        queue (Optional[str]): Queue of the job.
+        podgroup_phase (Optional[str]): Phase of the gang scheduling pod group.
+        podgroup_conditions (List[str]): Pod group conditions, most recent last.
+        replicas (List[ReplicaStatus]): Replicas ordered by rank.
+        events (List[EventSummary]): De-duplicated events, most recent first.
+    """
+
+    name: str
+    namespace: str
+    state: str
+    queue: Optional[str] = None
+    podgroup_phase: Optional[str] = None
+    podgroup_conditions: List[str] = []
+    replicas: List[ReplicaStatus] = []
+    events: List[EventSummary] = []
+
+
+class JobRecord(BaseModel):
+    """JobRecord is an archived run of a job, kept after the job itself is deleted from the cluster.
+
+    Args:
+        uid (str): Kubernetes uid of the job, unique across resubmissions with the same name.
+        name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        state (str): Job phase when archived.
+        queue (Optional[str]): Queue of the job.
+        user (Optional[str]): User who submitted the job, from its ``kubr.io/user`` label.
+        gpu (int): Total number of GPUs requested.
+        nodes (int): Number of replicas.
+        created_at (datetime.datetime): Creation time, UTC.
+        started_at (Optional[datetime.datetime]): Time the job first ran, UTC. Unknown for jobs archived before
+            it was recorded.
+        finished_at (Optional[datetime.datetime]): Time of the last state transition if the job finished, UTC.
+        archived_at (datetime.datetime): Time the record was written, UTC.
+        spec (Optional[Dict[str, Any]]): Volcano job spec, omitted in listings.
+        status (Optional[Dict[str, Any]]): Volcano job status, omitted in listings.
+        logs_tail (Optional[str]): Last log lines of rank 0, omitted in listings.
+    """
+
+    uid: str
+    name: str
+    namespace: str
+    state: str
+    queue: Optional[str] = None
+    user: Optional[str] = None
+    gpu: int = 0
+    nodes: int = 1
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+    archived_at: datetime.datetime
+    spec: Optional[Dict[str, Any]] = None
+    status: Optional[Dict[str, Any]] = None
+    logs_tail: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[datetime.timedelta]:
+        return self.finished_at - self.created_at if self.finished_at is not None else None
+
+
+class ResourcePeaks(BaseModel):
+    """ResourcePeaks is the peak usage of the busiest replica of a job, recorded for right-sizing its config.
+
+    Args:
+        uid (str): Kubernetes uid of the job.
+        config_key (str): Key of the config the job was submitted with, see ``config_key``.
+        name (str): Name of the job.
+        namespace (str): Namespace of the job.
+        cpu_millicores (Optional[float]): Peak CPU usage of a replica.
+        memory_mb (Optional[float]): Peak memory usage of a replica in MiB.
+        shm_mb (Optional[float]): Peak ``/dev/shm`` usage of a replica in MiB.
+        samples (int): Number of samples the peaks were taken from.
+        recorded_at (datetime.datetime): Time of the latest sample, UTC.
+    """
+
+    uid: str
+    config_key: str
+    name: str
+    namespace: str
+    cpu_millicores: Optional[float] = None
+    memory_mb: Optional[float] = None
+    shm_mb: Optional[float] = None
+    samples: int = 0
+    recorded_at: datetime.datetime
+
+
+class GcReport(BaseModel):
+    """GcReport is the outcome of a garbage collection of finished jobs.
+
+    Args:
+        deleted (List[Job]): Jobs deleted, or that would be deleted on a dry run.
+        failed (Dict[str, str]): Deletion errors by ``namespace/name``.
+        archived (int): Jobs newly archived to the history before deletion.
+    """
+
+    deleted: List[Job] = []
+    failed: Dict[str, str] = {}
+    archived: int = 0
+
+
+class GpuUsage(BaseModel):
+    """GpuUsage is the GPU time used by the jobs of a namespace, user or queue over a period.
+
+    Args:
+        key (Optional[str]): Namespace, user or queue the usage is grouped by, None for jobs without one.
+        gpu_hours (float): GPU-hours used within the period.
+        jobs (int): Number of jobs that ran within the period.
+        running (int): Number of those jobs still running.
+    """
+
+    key: Optional[str] = None
+    gpu_hours: float = 0
+    jobs: int = 0
+    running: int = 0
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.utils import cache_dir
+from kubr.config.runner import RunnerConfig
+
+EXTENDS_KEY = "extends"
+PROFILES_KEY = "profiles"
+ENV_OVERRIDE_PREFIX = "KUBR_SET__"
+
+Document = Dict[str, Any]
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def deep_merge(base: Document, override: Mapping[str, Any]) -> Document:
+    """Merges ``override`` into a copy of ``base``. Mappings are merged key by key, everything else is replaced."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def parse_yaml(raw: Union[str, bytes]) -> Any:
+    """Parses YAML 1.2 like ``parse_yaml_raw_as`` does for config files, so e.g. ``on`` and ``no`` stay strings."""
+    return parse_yaml_raw_as(Any, raw)
+
+
+def parse_override(override: str) -> Tuple[List[str], Any]:
+    """Parses ``dotted.path=value``, the value is YAML so ``resources.gpu=8`` sets an int."""
+    path, sep, value = override.partition("=")
+    if not sep or not path:
+        raise ConfigError(f"Override {override!r} is not in the form key.path=value")
+    return path.strip().split("."), parse_yaml(value)
+
+
+def apply_override(document: Document, path: List[str], value: Any) -> Document:
+    nested: Any = value
+    for key in reversed(path):
+        nested = {key: nested}
+    return deep_merge(document, nested)
+
+
+def env_overrides(environ: Mapping[str, str]) -> List[str]:
+    """Overrides from ``KUBR_SET__RESOURCES__GPU=8`` style variables, in sorted order."""
+    return [
+        f"{name[len(ENV_OVERRIDE_PREFIX):].lower().replace('__', '.')}={value}"
+        for name, value in sorted(environ.items())
+        if name.startswith(ENV_OVERRIDE_PREFIX)
+    ]
+
+
+class _ParsedFile:
+    def __init__(self, digest: str, document: Document):
+        self.digest = digest
+        self.document = document
+
+
+class ConfigLoader:
+    """Loads RunnerConfig files with inheritance, profiles and overrides, caching the validated result.
+
+    Layers are merged in order: ``extends`` bases (recursively, in listed order), the file itself, the selected
+    ``profiles`` sections, ``KUBR_SET__*`` environment overrides and finally explicit ``key.path=value`` overrides.
+    Validated configs are cached in memory and on disk keyed by the content hash of every file in the chain,
+    so repeated loads of an unchanged file skip YAML parsing and most of the validation.
+
+    Args:
+        cache_path (Optional[Path], optional): Directory of the on-disk cache. Defaults to ``cache_dir()/configs``.
+        environ (Optional[Mapping[str, str]], optional): Environment to read overrides from.
+            Defaults to ``os.environ``.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None, environ: Optional[Mapping[str, str]] = None):
+        self.cache_path = cache_path if cache_path is not None else cache_dir() / "configs"
+        self.environ = environ if environ is not None else os.environ
+        self._files: Dict[Path, _ParsedFile] = {}
+        self._configs: Dict[str, Tuple[RunnerConfig, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: str, profiles: Sequence[str] = (), overrides: Sequence[str] = ()) -> RunnerConfig:
+        """Returns a fresh copy of the config, callers are free to mutate it."""
+        path = Path(path).resolve()
+        overrides = env_overrides(self.environ) + list(overrides)
+        raw = path.read_bytes()
+        # the key covers the file itself and its location, which relative ``extends`` paths are resolved against;
+        # the bases are checked against the dependency digests of the entry
+        request_key = _digest(json.dumps([str(path), _digest(raw), list(profiles), overrides]).encode())
+
+        with self._lock:
+            entry = self._configs.get(request_key)
+        if entry is None or not _fresh(entry[1]):
+            entry = self._load_from_disk(request_key)
+        if entry is None:
+            document, dependencies = self._resolve(path, raw, chain=())
+            for profile in profiles:
+                available = document.get(PROFILES_KEY) or {}
+                if profile not in available:
+                    raise ConfigError(f"Unknown profile {profile!r}, available: {', '.join(available) or 'none'}")
+                document = deep_merge(document, available[profile])
+            document.pop(PROFILES_KEY, None)
+            for override in overrides:
+                document = apply_override(document, *parse_override(override))
+            entry = RunnerConfig.model_validate(document), dependencies
+            self._store_on_disk(request_key, *entry)
+        with self._lock:
+            self._configs[request_key] = entry
+        return entry[0].model_copy(deep=True)
+
+    def _parse(self, path: Path, raw: Optional[bytes] = None) -> _ParsedFile:
+        raw = path.read_bytes() if raw is None else raw
+        digest = _digest(raw)
+        with self._lock:
+            parsed = self._files.get(path)
+        if parsed is None or parsed.digest != digest:
+            document = parse_yaml(raw) or {}
+            if not isinstance(document, dict):
+                raise ConfigError(f"Config {path} must be a mapping")
+            parsed = _ParsedFile(digest, document)
+            with self._lock:
+                self._files[path] = parsed
+        return parsed
+
+    def _resolve(self, path: Path, raw: Optional[bytes], chain: Tuple[Path, ...]) -> Tuple[Document, Dict[str, str]]:
+        if path in chain:
+            raise ConfigError(f"Config inheritance cycle: {' -> '.join(str(p) for p in chain + (path,))}")
+        parsed = self._parse(path, raw)
+        document = dict(parsed.document)
+        dependencies = {str(path): parsed.digest}
+
+        bases = document.pop(EXTENDS_KEY, None) or []
+        merged: Document = {}
+        for base in [bases] if isinstance(bases, str) else bases:
+            base_document, base_dependencies = self._resolve((path.parent / base).resolve(), None, chain + (path,))
+            merged = deep_merge(merged, base_document)
+            dependencies.update(base_dependencies)
+        return deep_merge(merged, document), dependencies
+
+    def _load_from_disk(self, request_key: str) -> Optional[Tuple[RunnerConfig, Dict[str, str]]]:
+        try:
+            entry = json.loads((self.cache_path / f"{request_key}.json").read_text())
+            if not _fresh(entry["dependencies"]):
+                return None
+            return RunnerConfig.model_validate_json(entry["config"]), entry["dependencies"]
+        except (ValueError, KeyError, FileNotFoundError):
+            return None
+
+    def _store_on_disk(self, request_key: str, config: RunnerConfig, dependencies: Dict[str, str]):
+        try:
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            entry = {"dependencies": dependencies, "config": config.model_dump_json()}
+            tmp = self.cache_path / f"{request_key}.json.{os.getpid()}"
+            tmp.write_text(json.dumps(entry))
+            tmp.replace(self.cache_path / f"{request_key}.json")
+        except OSError:
+            pass
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fresh(dependencies: Mapping[str, str]) -> bool:
+    """Whether every file a cached config was built from still has the same content."""
+    try:
+        return all(_digest(Path(path).read_bytes()) == digest for path, digest in dependencies.items())
+    except OSError:
+        return False
+
+
+_default_loader: Optional[ConfigLoader] = None
+
+
+def load_runner_config(path: str, profiles: Sequence[str] = (), overrides: Sequence[str] = ()) -> RunnerConfig:
+    """Loads a RunnerConfig through the process-wide cached ConfigLoader."""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = ConfigLoader()
+    return _default_loader.load(path, profiles=profiles, overrides=overrides)
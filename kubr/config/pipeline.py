@@ -0,0 +1,157 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.config.loader import ConfigError, load_runner_config
+from kubr.config.runner import EnvVar, RunnerConfig
+
+LABEL_PIPELINE = "kubr.io/pipeline"
+LABEL_PIPELINE_STEP = "kubr.io/pipeline-step"
+
+_PLACEHOLDER_RE = re.compile(
+    r"\{\{\s*(?:pipeline\.(?P<pipeline>name)|steps\.(?P<step>[\w-]+)\.outputs\.(?P<output>[\w-]+))\s*\}\}"
+)
+
+
+class PipelineStep(BaseModel):
+    """PipelineStep is a job of a pipeline.
+
+    Args:
+        name (str): Name of the step, the job is named ``<pipeline>-<step>``.
+        config (str): Path of the step's RunnerConfig, relative to the pipeline file.
+        depends_on (List[str], optional): Steps that must complete before this one is submitted. Defaults to [].
+        profiles (List[str], optional): Profiles of the step config to apply. Defaults to [].
+        overrides (List[str], optional): ``key.path=value`` overrides of the step config. Defaults to [].
+        outputs (Dict[str, str], optional): Paths the step writes to on a shared volume, by name. Passed to the
+            step as ``KUBR_OUTPUT_<NAME>`` and to the steps depending on it as ``KUBR_INPUT_<STEP>_<NAME>``.
+            Defaults to {}.
+    """
+
+    name: str
+    config: str
+    depends_on: List[str] = []
+    profiles: List[str] = []
+    overrides: List[str] = []
+    outputs: Dict[str, str] = {}
+
+
+class PipelineConfig(BaseModel):
+    """PipelineConfig is a DAG of jobs submitted as their dependencies complete.
+
+    Entrypoints, environment values and outputs of the steps may reference ``{{ pipeline.name }}`` and the
+    outputs of their upstream steps as ``{{ steps.<step>.outputs.<name> }}``.
+
+    Args:
+        name (str): Name of the pipeline, prefix of the job names.
+        namespace (Optional[str], optional): Namespace of all steps, the step config namespaces when None.
+            Defaults to None.
+        steps (List[PipelineStep]): Steps of the pipeline.
+    """
+
+    name: str
+    namespace: Optional[str] = None
+    steps: List[PipelineStep]
+
+    def step(self, name: str) -> PipelineStep:
+        return next(step for step in self.steps if step.name == name)
+
+    def job_name(self, step: str) -> str:
+        return f"{self.name}-{step}"
+
+    def upstream(self, name: str) -> Set[str]:
+        """All steps the step depends on, directly or transitively."""
+        upstream, stack = set(), list(self.step(name).depends_on)
+        while stack:
+            dependency = stack.pop()
+            if dependency not in upstream:
+                upstream.add(dependency)
+                stack.extend(self.step(dependency).depends_on)
+        return upstream
+
+    def downstream(self, name: str) -> Set[str]:
+        """All steps depending on the step, directly or transitively."""
+        return {step.name for step in self.steps if name in self.upstream(step.name)}
+
+    def order(self) -> List[str]:
+        """Step names in dependency order, raising ConfigError on unknown dependencies or cycles."""
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ConfigError(f"Pipeline {self.name} has duplicate step names")
+        for step in self.steps:
+            unknown = set(step.depends_on) - set(names)
+            if unknown:
+                raise ConfigError(f"Step {step.name} depends on unknown steps: {', '.join(sorted(unknown))}")
+        ordered: List[str] = []
+        remaining = {step.name: set(step.depends_on) for step in self.steps}
+        while remaining:
+            ready = [name for name in names if name in remaining and not remaining[name] - set(ordered)]
+            if not ready:
+                raise ConfigError(f"Pipeline {self.name} has a dependency cycle among {', '.join(sorted(remaining))}")
+            for name in ready:
+                ordered.append(name)
+                del remaining[name]
+        return ordered
+
+
+def _env_name(name: str) -> str:
+    return re.sub(r"\W", "_", name).upper()
+
+
+def _substitute(value: str, pipeline: PipelineConfig, step: str, outputs: Dict[str, Dict[str, str]]) -> str:
+    def replace(match: "re.Match") -> str:
+        if match.group("pipeline"):
+            return pipeline.name
+        source, output = match.group("step"), match.group("output")
+        if source not in pipeline.upstream(step):
+            raise ConfigError(f"Step {step} references outputs of {source}, which it does not depend on")
+        if output not in outputs[source]:
+            raise ConfigError(f"Step {source} has no output {output!r}")
+        return outputs[source][output]
+
+    return _PLACEHOLDER_RE.sub(replace, value)
+
+
+def resolve_pipeline(pipeline: PipelineConfig, configs: Dict[str, RunnerConfig]) -> Dict[str, RunnerConfig]:
+    """
+    Prepares the RunnerConfig of every step: names the job after the pipeline and step, labels it, fills in
+    the output placeholders and passes the outputs through the environment.
+    """
+    outputs: Dict[str, Dict[str, str]] = {}
+    resolved = {}
+    for name in pipeline.order():
+        step = pipeline.step(name)
+        outputs[name] = {key: _substitute(path, pipeline, name, outputs) for key, path in step.outputs.items()}
+        config = configs[name].model_copy(deep=True)
+        experiment = config.experiment
+        experiment.name = pipeline.job_name(name)
+        if pipeline.namespace is not None:
+            experiment.namespace = pipeline.namespace
+        experiment.labels = dict(experiment.labels, **{LABEL_PIPELINE: pipeline.name, LABEL_PIPELINE_STEP: name})
+
+        container = config.container
+        if container.entrypoint is not None:
+            container.entrypoint = _substitute(container.entrypoint, pipeline, name, outputs)
+        env = [EnvVar(name=var.name, value=_substitute(var.value, pipeline, name, outputs)) for var in container.env]
+        env += [EnvVar(name=f"KUBR_OUTPUT_{_env_name(key)}", value=path) for key, path in outputs[name].items()]
+        for dependency in step.depends_on:
+            env += [
+                EnvVar(name=f"KUBR_INPUT_{_env_name(dependency)}_{_env_name(key)}", value=path)
+                for key, path in outputs[dependency].items()
+            ]
+        container.env = env
+        resolved[name] = config
+    return resolved
+
+
+def load_pipeline(path: str) -> Tuple[PipelineConfig, Dict[str, RunnerConfig]]:
+    """Loads a pipeline file and the resolved RunnerConfigs of its steps."""
+    path = Path(path).resolve()
+    pipeline = parse_yaml_raw_as(PipelineConfig, path.read_text())
+    configs = {
+        step.name: load_runner_config(str(path.parent / step.config), profiles=step.profiles, overrides=step.overrides)
+        for step in pipeline.steps
+    }
+    return pipeline, resolve_pipeline(pipeline, configs)
@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional, Union
+from typing import Dict, List, Literal, Optional, Union
 
 import pydantic
 from pydantic import BaseModel
@@ -55,12 +55,12 @@ class VolumeMount(BaseModel):
 
     Args:
         name (str): Name of the volume.
-        type (Literal["hostPath"]): Type of the volume.
-        mount_path (str): Mount path of the volume.
+        type (Literal["hostPath", "configMap"]): Type of the volume.
+        mount_path (str): ``<host path or ConfigMap name>:<path in the container>``.
     """
 
     name: str
-    type: Literal["hostPath"]
+    type: Literal["hostPath", "configMap"]
     mount_path: str
 
 
@@ -89,8 +89,17 @@ class ResourceConfig(BaseModel):
         cpu (int, optional): Number of CPUs to request. Defaults to 0.
         memory (int, optional): Memory in GB to request. Defaults to 0.
         gpu (int, optional): Number of GPUs to request. Defaults to 0.
-        ib (Union[int, Literal['auto']], optional): Number of Infiniband devices to request. Defaults to 0.
+        ib (Union[int, Literal['auto']], optional): Number of Infiniband devices to request, "auto" uses the HCAs
+            the nodes advertise without requesting devices. Defaults to 0.
         ib_device (str, optional): Name of the Infiniband device to request. Defaults to "nvidia.com/hostdev".
+        cpu_request (Optional[float], optional): CPUs to request, up to ``cpu``. A small reserve below ``cpu``
+            when None. Defaults to None.
+        memory_request (Optional[float], optional): Memory in GB to request, up to ``memory``. A small reserve
+            below ``memory`` when None. Defaults to None.
+        shm (Optional[float], optional): Size limit of ``/dev/shm`` in GB, derived from ``gpu`` and
+            ``dataloader_workers`` when None. Defaults to None.
+        dataloader_workers (Optional[int], optional): DataLoader workers per GPU, sizes ``/dev/shm`` when ``shm``
+            is None; ``/dev/shm`` is unbounded when both are None. Defaults to None.
     """
 
     # TODO [config][resources] add taints\tolerations\affinity
@@ -102,6 +111,116 @@ class ResourceConfig(BaseModel):
     # capabilities: Dict[str, str] = field(default_factory=dict)
     ib: Union[int, Literal["auto"]] = 0
     ib_device: str = "nvidia.com/hostdev"
+    cpu_request: Optional[float] = None
+    memory_request: Optional[float] = None
+    shm: Optional[float] = None
+    dataloader_workers: Optional[int] = None
+
+
+class NcclConfig(BaseModel):
+    """NcclConfig is the configuration of the NCCL environment of GPU jobs.
+
+    kubr sets the IB HCAs, the socket interface and the GPUDirect RDMA level from the requested ``ib`` devices
+    and the ``kubr.io/nccl-*`` annotations or labels of the nodes, see ``kubr.backends.nccl``. Variables set in
+    ``container.env`` always win.
+
+    Args:
+        auto (bool, optional): Derive the settings, only the explicit ones below are set when False.
+            Defaults to True.
+        debug (Optional[Literal["VERSION", "WARN", "INFO", "TRACE"]], optional): ``NCCL_DEBUG``. Defaults to
+            "WARN".
+        debug_subsys (Optional[str], optional): ``NCCL_DEBUG_SUBSYS``, e.g. "INIT,NET". Defaults to None.
+        ib_hca (Optional[str], optional): ``NCCL_IB_HCA``, e.g. "mlx5_0,mlx5_1". Defaults to None.
+        socket_ifname (Optional[str], optional): ``NCCL_SOCKET_IFNAME``, e.g. "eth0". Defaults to None.
+        gdr_level (Optional[str], optional): ``NCCL_NET_GDR_LEVEL``, e.g. "PHB". Defaults to None.
+    """
+
+    auto: bool = True
+    debug: Optional[Literal["VERSION", "WARN", "INFO", "TRACE"]] = "WARN"
+    debug_subsys: Optional[str] = None
+    ib_hca: Optional[str] = None
+    socket_ifname: Optional[str] = None
+    gdr_level: Optional[str] = None
+
+
+class RendezvousConfig(BaseModel):
+    """RendezvousConfig is the configuration for the multi-node torchrun rendezvous.
+
+    Args:
+        mode (Literal["env", "service"], optional): How replicas find rank 0. "env" expands the Volcano hosts
+            environment variable inside a shell, "service" creates a headless Service for rank 0 and passes
+            rank and world size to torchrun explicitly. Defaults to "env".
+        port (int, optional): Port of the rendezvous store on rank 0. Defaults to 29500.
+        wait_timeout (int, optional): Seconds non-zero ranks wait for rank 0 to accept connections
+            before giving up. Only used in "service" mode without the gate. Defaults to 600.
+        gate (bool, optional): Hold every replica in a startup gate, the last init container, until all
+            replicas reached it, i.e. were scheduled, pulled the image and ran the init container staging
+            data, then release them together. The time each replica waited is shown by ``kubr desc``.
+            Defaults to False.
+        gate_timeout (int, optional): Seconds a replica waits in the gate for the others before failing.
+            Defaults to 1800.
+    """
+
+    mode: Literal["env", "service"] = "env"
+    port: int = 29500
+    wait_timeout: int = 600
+    gate: bool = False
+    gate_timeout: int = 1800
+
+
+class CheckpointConfig(BaseModel):
+    """CheckpointConfig is the configuration for checkpoint-aware resubmission.
+
+    The job finds its checkpoint directory in ``KUBR_CHECKPOINT_DIR`` and, after every save, writes the path
+    of the latest checkpoint to the file named by ``KUBR_CHECKPOINT_MARKER``. When the job fails or is
+    preempted, ``kubr run --resubmit`` resubmits it with ``resume_arg`` appended to the entrypoint.
+
+    Args:
+        dir (str): Checkpoint directory inside the container, usually on a shared volume.
+        resume_arg (str, optional): Arguments appended to the entrypoint on resubmission, ``{checkpoint}`` is
+            replaced with the latest checkpoint. Defaults to "--resume {checkpoint}".
+        resume_from (Optional[str], optional): Checkpoint to resume from on submission. Defaults to None.
+        max_resubmits (int, optional): Maximum number of resubmissions. Defaults to 3.
+        backoff_seconds (float, optional): Delay before the first resubmission, doubled on every next one.
+            Defaults to 30.
+        max_backoff_seconds (float, optional): Upper bound of the resubmission delay. Defaults to 600.
+    """
+
+    dir: str
+    resume_arg: str = "--resume {checkpoint}"
+    resume_from: Optional[str] = None
+    max_resubmits: int = 3
+    backoff_seconds: float = 30
+    max_backoff_seconds: float = 600
+
+
+class WatchdogConfig(BaseModel):
+    """WatchdogConfig is the configuration for detecting and reaping stalled jobs.
+
+    A job is stalled when no replica logged a line for ``log_idle_minutes``, or when the GPUs of every replica
+    stayed below ``gpu_idle_percent`` utilization for ``gpu_idle_minutes``. On a stall the watchdog notifies
+    and dumps diagnostics, then takes ``action`` if the job is still stalled ``grace_minutes`` later.
+
+    Args:
+        log_idle_minutes (Optional[float], optional): Minutes without new log lines, None to not watch logs.
+            Defaults to 30.
+        gpu_idle_percent (float, optional): GPU utilization below which a replica is idle. Defaults to 5.
+        gpu_idle_minutes (Optional[float], optional): Minutes of idle GPUs, None to not watch GPUs. Defaults to 30.
+        grace_minutes (float, optional): Minutes between the notification and the action. Defaults to 10.
+        action (Literal["notify", "delete", "restart"], optional): What to do with a stalled job. Defaults to
+            "notify".
+        command (Optional[str], optional): Shell command run on a stall, with KUBR_JOB, KUBR_NAMESPACE,
+            KUBR_STALL_REASON and KUBR_DIAGNOSTICS set. Defaults to None.
+        interval_seconds (float, optional): Seconds between checks. Defaults to 60.
+    """
+
+    log_idle_minutes: Optional[float] = 30
+    gpu_idle_percent: float = 5
+    gpu_idle_minutes: Optional[float] = 30
+    grace_minutes: float = 10
+    action: Literal["notify", "delete", "restart"] = "notify"
+    command: Optional[str] = None
+    interval_seconds: float = 60
 
 
 class ExperimentConfig(BaseModel):
@@ -110,9 +229,21 @@ class ExperimentConfig(BaseModel):
     Args:
         name (str): Name of the experiment.
         namespace (str): Namespace of the experiment.
-        queue (Optional[str], optional): Queue to submit the experiment to. Defaults to "default".
+        queue (Optional[str], optional): Queue to submit the experiment to, "auto" picks the open queue with the
+            most free GPUs. Defaults to "default".
+        queue_candidates (List[str], optional): Queues considered by "auto" queue selection, all open queues
+            when empty. Defaults to [].
+        priority_class (Optional[str], optional): PriorityClass of the job and its pods. Defaults to None.
+        preemptable (Optional[bool], optional): Whether Volcano may preempt the job for higher priority ones,
+            the scheduler default when None. Defaults to None.
+        labels (Dict[str, str], optional): Labels of the job, e.g. to select a sweep in ``kubr wait``.
+            Defaults to {}.
         job_retries (int, optional): Number of retries for the job. Defaults to 0.
         worker_max_retries (int, optional): Maximum number of retries for the task. Defaults to 10.
+        ttl_seconds_after_finished (Optional[int], optional): Seconds after which Volcano deletes the finished job,
+            without archiving it to the history; kept until ``kubr gc`` or ``kubr rm`` when None. Defaults to None.
+        watchdog (Optional[WatchdogConfig], optional): Stall detection of the job, used by ``kubr watchdog`` and
+            ``kubr run``. Defaults to None.
     """
 
     name: str
@@ -122,12 +253,18 @@ class ExperimentConfig(BaseModel):
     # env: Dict[str, str] = field(default_factory=dict)
 
     queue: Optional[str] = "default"
-    # priority_class: Optional[str] = None
+    queue_candidates: List[str] = []
+    priority_class: Optional[str] = None
+    preemptable: Optional[bool] = None
+    labels: Dict[str, str] = {}
 
     # TODO add tests for retries
     job_retries: int = 0
     worker_max_retries: int = 0
 
+    ttl_seconds_after_finished: Optional[int] = None
+    watchdog: Optional[WatchdogConfig] = None
+
 
 class RunnerConfig(BaseModel):
     """RunnerConfig is the configuration for the runner.
@@ -140,6 +277,10 @@ class RunnerConfig(BaseModel):
         backend (JobBackend, optional): Job backend. Defaults to JobBackend.Volcano.
         code (Optional[CodePersistenceConfig], optional): Code persistence configuration. Defaults to None.
         data (Optional[DataConfig], optional): Data configuration. Defaults to None.
+        rendezvous (RendezvousConfig, optional): Multi-node rendezvous configuration. Defaults to RendezvousConfig().
+        checkpoint (Optional[CheckpointConfig], optional): Checkpoint-aware resubmission configuration.
+            Defaults to None.
+        nccl (NcclConfig, optional): NCCL environment of GPU jobs. Defaults to NcclConfig().
 
     """
 
@@ -151,3 +292,6 @@ class RunnerConfig(BaseModel):
     backend: JobBackend = JobBackend.Volcano
     code: Optional[CodePersistenceConfig] = None
     data: Optional[DataConfig] = None
+    rendezvous: RendezvousConfig = pydantic.Field(default_factory=RendezvousConfig)
+    checkpoint: Optional[CheckpointConfig] = None
+    nccl: NcclConfig = pydantic.Field(default_factory=NcclConfig)
@@ -1,13 +1,29 @@
 # PYTHON_ARGCOMPLETE_OK
 import argparse
+import sys
 
 import argcomplete
+from rich import print
 
-from kubr.backends.volcano import VolcanoBackend
+from kubr.backends.cluster import ClusterBackend
+from kubr.backends.history import HistoryStore
+from kubr.commands.attach import AttachCommand
+from kubr.commands.desc import DescribeCommand
+from kubr.commands.gc import GcCommand
+from kubr.commands.history import HistoryCommand
 from kubr.commands.logs import LogsCommand
 from kubr.commands.ls import LsCommand
+from kubr.commands.pipeline import PipelineCommand
+from kubr.commands.profile import ProfileCommand
 from kubr.commands.rm import RmCommand
 from kubr.commands.run import RunCommand
+from kubr.commands.serve import ServeCommand
+from kubr.commands.stat import StatCommand
+from kubr.commands.test import TestCommand
+from kubr.commands.usage import UsageCommand
+from kubr.commands.wait import WaitCommand
+from kubr.commands.watch_logs import WatchLogsCommand
+from kubr.commands.watchdog import WatchdogCommand
 
 
 def main():
@@ -16,9 +32,24 @@ def main():
     # TODO fix autopilot deployment in GKE autopilot
     # TODO fix Volcano priority class in GKE (https://github.com/volcano-sh/volcano/issues/2379)
 
-    backend = VolcanoBackend()
+    backend = ClusterBackend(history=HistoryStore())
+    arg = build_parser(backend)
+    argcomplete.autocomplete(arg)
+    args = arg.parse_args()
+
+    try:
+        dispatch(arg, args, backend)
+    finally:
+        if args.debug_api:
+            print(backend.api_client.stats.table())
+
+
+def build_parser(backend: ClusterBackend) -> argparse.ArgumentParser:
     arg = argparse.ArgumentParser(description="Kubr", add_help=True)
     arg.add_argument("--version", help="Get version of Kubr")
+    arg.add_argument(
+        "--debug-api", help="Print API call statistics on exit", action="store_true", default=False, dest="debug_api"
+    )
     subparsers = arg.add_subparsers(help="Commands", dest="command")
 
     RunCommand.add_parser(subparsers)
@@ -26,16 +57,25 @@ def main():
     RmCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
     LogsCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
 
-    # DescribeCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
-    # attach_parser = AttachCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
-    # stat_parser = StatCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
-    # test_parser = TestCommand.add_parser(subparsers)
+    DescribeCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    AttachCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    StatCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    ProfileCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    WaitCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    WatchLogsCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    WatchdogCommand.add_parser(subparsers, completer=backend._completion_list_running_jobs)
+    HistoryCommand.add_parser(subparsers)
+    UsageCommand.add_parser(subparsers)
+    ServeCommand.add_parser(subparsers)
+    GcCommand.add_parser(subparsers)
+    PipelineCommand.add_parser(subparsers)
+    TestCommand.add_parser(subparsers)
+    return arg
 
-    argcomplete.autocomplete(arg)
-    args = arg.parse_args()
 
+def dispatch(arg: argparse.ArgumentParser, args: argparse.Namespace, backend: ClusterBackend):
     if args.command == "run":
-        operator = RunCommand()
+        operator = RunCommand(backend=backend)
         operator(
             config=args.config,
             image=args.image,
@@ -43,25 +83,155 @@ def main():
             namespace=args.namespace,
             name=args.name,
             verbose=args.verbose,
+            resubmit=args.resubmit,
+            rightsize=args.rightsize,
+            profiles=args.profile,
+            overrides=args.overrides,
         )
     elif args.command == "ls":
-        operator = LsCommand()
+        operator = LsCommand(backend=backend)
         operator(namespace=args.namespace, show_all=args.all, head=args.top)
     elif args.command == "rm":
-        operator = RmCommand()
+        operator = RmCommand(backend=backend)
         operator(job_name=args.job, namespace=args.namespace)
-    # elif args.command == "desc":
-    #     operator = DescribeCommand()
-    #     operator(job_name=args.job_name, namespace=args.namespace)
+    elif args.command == "desc":
+        operator = DescribeCommand(backend=backend)
+        operator(job_name=args.job_name, namespace=args.namespace, events=args.events)
     elif args.command == "logs":
-        operator = LogsCommand()
-        operator(job_name=args.job, namespace=args.namespace, tail=args.tail, follow=args.follow)
+        operator = LogsCommand(backend=backend)
+        operator(
+            job_name=args.job,
+            namespace=args.namespace,
+            tail=args.tail,
+            follow=args.follow,
+            capture=args.capture,
+            archive=args.archive,
+            rank=args.rank,
+            since=args.since,
+            until=args.until,
+            grep=args.grep,
+            context=args.context,
+            ignore_case=args.ignore_case,
+        )
     elif args.command == "attach":
-        raise NotImplementedError  # TODO implement attach command
+        operator = AttachCommand(backend=backend)
+        operator(
+            job_name=args.job, namespace=args.namespace, rank=args.rank, ports=args.port, command=args.exec_command
+        )
     elif args.command == "stat":
-        raise NotImplementedError  # TODO implement stat command
+        operator = StatCommand(backend=backend)
+        operator(
+            job_name=args.job,
+            namespace=args.namespace,
+            interval=args.interval,
+            count=args.count,
+            output=args.output,
+            dcgm_namespace=args.dcgm_namespace,
+            dcgm_selector=args.dcgm_selector,
+        )
+    elif args.command == "profile":
+        operator = ProfileCommand(backend=backend)
+        operator(
+            job_name=args.job,
+            namespace=args.namespace,
+            duration=args.duration,
+            rate=args.rate,
+            native=args.native,
+            depth=args.depth,
+            output=args.output,
+        )
+    elif args.command == "wait":
+        operator = WaitCommand(backend=backend)
+        sys.exit(
+            operator(
+                jobs=args.jobs,
+                namespace=args.namespace,
+                selector=args.selector,
+                timeout=args.timeout,
+                fail_fast=args.fail_fast,
+            )
+        )
+    elif args.command == "watch-logs":
+        operator = WatchLogsCommand(backend=backend)
+        sys.exit(
+            operator(
+                job_name=args.job,
+                alerts=args.alert,
+                namespace=args.namespace,
+                context=args.context,
+                ignore_case=args.ignore_case,
+                delete=args.delete,
+                command=args.exec_command,
+            )
+        )
+    elif args.command == "watchdog":
+        operator = WatchdogCommand(backend=backend)
+        sys.exit(
+            operator(
+                job_name=args.job,
+                namespace=args.namespace,
+                action=args.action,
+                log_idle_minutes=args.log_idle_minutes,
+                gpu_idle_minutes=args.gpu_idle_minutes,
+                gpu_idle_percent=args.gpu_idle_percent,
+                grace_minutes=args.grace_minutes,
+                interval_seconds=args.interval_seconds,
+                command=args.exec_command,
+            )
+        )
+    elif args.command == "history":
+        operator = HistoryCommand(backend=backend)
+        operator(
+            name=args.name,
+            namespace=args.namespace,
+            state=args.state,
+            queue=args.queue,
+            since=args.since,
+            until=args.until,
+            head=args.top,
+            show=args.show,
+            sync=args.sync,
+        )
+    elif args.command == "usage":
+        operator = UsageCommand(backend=backend)
+        operator(since=args.since, until=args.until, by=args.by, offline=args.offline)
+    elif args.command == "serve":
+        operator = ServeCommand(backend=backend)
+        operator(host=args.host, port=args.port, watch_seconds=args.watch_seconds)
+    elif args.command == "gc":
+        operator = GcCommand(backend=backend)
+        sys.exit(
+            operator(
+                namespace=args.namespace,
+                ttl=args.ttl,
+                namespace_ttls=args.namespace_ttl,
+                batch_size=args.batch_size,
+                concurrency=args.concurrency,
+                archive=args.archive,
+                dry_run=args.dry_run,
+                yes=args.yes,
+            )
+        )
+    elif args.command == "pipeline":
+        operator = PipelineCommand(backend=backend)
+        sys.exit(operator(config=args.config, timeout=args.timeout, dry_run=args.dry_run))
     elif args.command == "test":
-        raise NotImplementedError  # TODO implement test command -- run IB\scheduler\metrics\registry\ethernet tests
+        # TODO extend test command with scheduler\metrics\registry tests
+        operator = TestCommand(backend=backend)
+        sys.exit(
+            operator(
+                config=args.config,
+                namespace=args.namespace,
+                name=args.name,
+                profiles=args.profile,
+                overrides=args.overrides,
+                size_mb=args.size_mb,
+                iterations=args.iterations,
+                min_busbw=args.min_busbw,
+                timeout=args.timeout,
+                keep=args.keep,
+            )
+        )
     else:
         arg.print_help()
 
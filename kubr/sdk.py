@@ -0,0 +1,173 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from kubernetes.client import ApiException
+
+from kubr.backends.base import BaseBackend, KubrError
+from kubr.backends.cluster import ClusterBackend
+from kubr.backends.history import HistoryStore
+from kubr.backends.waiter import JobTracker
+from kubr.config.job import Job, JobDescription
+from kubr.config.loader import load_runner_config
+from kubr.config.runner import RunnerConfig
+
+
+class BatchError(KubrError):
+    """Raised by batch operations when some items failed, after all of them were attempted.
+
+    Args:
+        results (List[Optional[Job]]): Result of every item in input order, None for the failed ones.
+        errors (Dict[int, Exception]): Exception of every failed item by its input index.
+    """
+
+    def __init__(self, results: List[Optional[Job]], errors: Dict[int, Exception]):
+        super().__init__(f"{len(errors)} of {len(results)} operations failed, first: {next(iter(errors.values()))}")
+        self.results = results
+        self.errors = errors
+
+
+JobRef = Union[Job, Tuple[str, str]]
+
+
+def _job_key(job: JobRef) -> Tuple[str, str]:
+    return (job.name, job.namespace) if isinstance(job, Job) else tuple(job)
+
+
+class Client:
+    """Library API of kubr: submits, lists, deletes and waits for jobs without any printing or prompting.
+
+    All calls share one backend and its API connection pool. Failures raise exceptions, batch variants run
+    concurrently and raise BatchError listing the failed items once every item was attempted.
+
+    Example:
+        ```python
+        import kubr
+
+        with kubr.Client() as client:
+            jobs = client.submit_many(["sweep/lr-1e-3.yaml", "sweep/lr-1e-4.yaml"])
+            finished = client.wait_many(jobs, timeout=3600)
+        ```
+
+    Args:
+        backend (Optional[BaseBackend], optional): Backend to use. Defaults to a ClusterBackend on the shared
+            tuned API client, which runs every job on the backend its config selects and archives deleted jobs
+            to the local history.
+        max_workers (int, optional): Concurrency of batch operations. Defaults to 16.
+    """
+
+    def __init__(self, backend: Optional[BaseBackend] = None, max_workers: int = 16):
+        self.backend = backend or ClusterBackend(history=HistoryStore())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kubr")
+        self._tracker = JobTracker(self.backend)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # submission
+
+    def submit(
+        self,
+        config: Union[RunnerConfig, str],
+        replace: bool = False,
+        profiles: Sequence[str] = (),
+        overrides: Sequence[str] = (),
+    ) -> Job:
+        """
+        Submits a job from a RunnerConfig or a config file path; ``profiles`` and ``overrides`` only apply to paths.
+        An existing job with the same name is deleted first if ``replace`` is set, otherwise the submission fails.
+        """
+        if not isinstance(config, RunnerConfig):
+            config = load_runner_config(config, profiles=profiles, overrides=overrides)
+        experiment = config.experiment
+        if replace and self._exists(experiment.name, experiment.namespace):
+            self.backend.delete_job(job_name=experiment.name, namespace=experiment.namespace)
+        return self.backend.submit_job(config)
+
+    def submit_async(self, config: Union[RunnerConfig, str], **kwargs) -> "Future[Job]":
+        return self._executor.submit(self.submit, config, **kwargs)
+
+    def submit_many(self, configs: Iterable[Union[RunnerConfig, str]], **kwargs) -> List[Job]:
+        return self._gather([self.submit_async(config, **kwargs) for config in configs])
+
+    # inspection
+
+    def list(self, namespace: str = "All") -> List[Job]:
+        return self.backend.list_jobs(namespace=namespace)
+
+    def get(self, job_name: str, namespace: str = "default") -> Job:
+        return self.backend.get_job(job_name=job_name, namespace=namespace)
+
+    def describe(self, job_name: str, namespace: str = "default") -> JobDescription:
+        return self.backend.describe_job(job_name=job_name, namespace=namespace)
+
+    def logs(self, job_name: str, namespace: str = "default", tail: Optional[int] = None) -> str:
+        return self.backend.get_logs(job_name=job_name, namespace=namespace, tail=tail)
+
+    def follow_logs(self, job_name: str, namespace: str = "default") -> Iterator[str]:
+        return self.backend.get_logs(job_name=job_name, namespace=namespace, follow=True)
+
+    # deletion
+
+    def delete(self, job: JobRef):
+        job_name, namespace = _job_key(job)
+        self.backend.delete_job(job_name=job_name, namespace=namespace)
+
+    def delete_many(self, jobs: Iterable[JobRef]):
+        self._gather([self._executor.submit(self.delete, job) for job in jobs])
+
+    # waiting
+
+    def wait_async(self, job: JobRef) -> "Future[Job]":
+        """Future resolved with the job once it reaches a terminal state, all waits share one watch."""
+        return self._tracker.track(*_job_key(job))
+
+    def wait(self, job: JobRef, timeout: Optional[float] = None) -> Job:
+        """Blocks until the job reaches a terminal state, raising ``TimeoutError`` after ``timeout`` seconds."""
+        future = self.wait_async(job)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Job {_job_key(job)[0]} did not finish in {timeout} seconds") from None
+
+    def wait_many(self, jobs: Iterable[JobRef], timeout: Optional[float] = None) -> List[Job]:
+        futures = self._tracker.track_many([_job_key(job) for job in jobs])
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                future.exception(timeout=remaining)
+            except FutureTimeoutError:
+                for pending in futures:
+                    pending.cancel()
+                raise TimeoutError(f"Jobs did not finish in {timeout} seconds") from None
+        return self._gather(futures)
+
+    def _exists(self, job_name: str, namespace: str) -> bool:
+        try:
+            self.backend.get_job(job_name=job_name, namespace=namespace)
+        except ApiException as e:
+            if e.status == 404:
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def _gather(futures: List[Future]) -> List:
+        results, errors = [], {}
+        for index, future in enumerate(futures):
+            error = future.exception()
+            if error is not None:
+                errors[index] = error
+            results.append(None if error is not None else future.result())
+        if errors:
+            raise BatchError(results, errors)
+        return results
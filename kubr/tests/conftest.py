@@ -0,0 +1,62 @@
+import os
+import time
+from typing import Optional
+
+import pytest
+
+from kubr.backends.volcano import VolcanoBackend
+from kubr.tests.fake_api import FakeKubernetesApi
+
+
+@pytest.fixture(autouse=True)
+def kubr_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("KUBR_CACHE_DIR", str(tmp_path / "kubr-cache"))
+    monkeypatch.delenv("KUBR_CACHE_URL", raising=False)
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeKubernetesApi().start()
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def backend(fake_api: FakeKubernetesApi) -> VolcanoBackend:
+    return VolcanoBackend(api_client=fake_api.api_client())
+
+
+BENCHMARK_RESULTS = {}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: performance test against the fake API server")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not BENCHMARK_RESULTS:
+        return
+    terminalreporter.section("kubr benchmarks")
+    for name, (seconds, items, unit) in BENCHMARK_RESULTS.items():
+        rate = f"{items / seconds:,.0f} {unit}/s" if items else ""
+        terminalreporter.write_line(f"{name:<40} {seconds * 1000:>10.1f} ms  {rate}")
+
+
+@pytest.fixture
+def bench(request):
+    """
+    Times a callable once and records the result for the benchmark summary. Fails when it takes longer than
+    ``budget`` seconds, scaled by ``$KUBR_BENCH_BUDGET_SCALE`` for slow machines.
+    """
+
+    def run(fn, *args, items: int = 0, unit: str = "items", budget: Optional[float] = None, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        BENCHMARK_RESULTS[request.node.name] = (elapsed, items, unit)
+        if budget is not None:
+            budget *= float(os.environ.get("KUBR_BENCH_BUDGET_SCALE", 1.0))
+            assert elapsed < budget, f"{request.node.name} took {elapsed:.2f}s, budget is {budget:.2f}s"
+        return result
+
+    return run
@@ -0,0 +1,780 @@
+"""
+In-process fake of the Kubernetes and Volcano API subset used by kubr.
+
+It serves Volcano jobs, queues and pod groups, Kubernetes Indexed Jobs, pods, ConfigMaps, pod logs, events and
+services over HTTP, so the real ``kubernetes`` client and ``VolcanoBackend`` run unmodified against it. Lists support
+equality label and field selectors, list endpoints support ``watch=true`` and pod logs support ``follow``,
+``timestamps`` and ``sinceTime``. Exec and port forwarding speak the websocket channel protocol. Every request can be
+delayed by a configurable latency, and ``populate`` generates large synthetic clusters for benchmarks.
+"""
+
+import base64
+import calendar
+import hashlib
+import json
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from kubernetes import client
+
+Object = Dict[str, Any]
+Key = Tuple[str, str]
+
+VOLCANO_JOBS = "jobs"
+QUEUES = "queues"
+PODGROUPS = "podgroups"
+PODS = "pods"
+EVENTS = "events"
+SERVICES = "services"
+NODES = "nodes"
+COMMANDS = "commands"
+BATCH_JOBS = "batchjobs"
+CONFIGMAPS = "configmaps"
+
+_ROUTES = [
+    (re.compile(r"^/apis/batch\.volcano\.sh/v1alpha1/jobs$"), VOLCANO_JOBS),
+    (re.compile(r"^/apis/batch\.volcano\.sh/v1alpha1/namespaces/(?P<ns>[^/]+)/jobs(/(?P<name>[^/]+))?$"), VOLCANO_JOBS),
+    (re.compile(r"^/apis/scheduling\.volcano\.sh/v1beta1/queues(/(?P<name>[^/]+))?$"), QUEUES),
+    (
+        re.compile(r"^/apis/scheduling\.volcano\.sh/v1beta1/namespaces/(?P<ns>[^/]+)/podgroups(/(?P<name>[^/]+))?$"),
+        PODGROUPS,
+    ),
+    (re.compile(r"^/api/v1/pods$"), PODS),
+    (
+        re.compile(
+            r"^/api/v1/namespaces/(?P<ns>[^/]+)/pods(/(?P<name>[^/]+))?"
+            r"((?P<log>/log)|(?P<exec>/exec)|(?P<portforward>/portforward))?$"
+        ),
+        PODS,
+    ),
+    (re.compile(r"^/api/v1/events$"), EVENTS),
+    (re.compile(r"^/api/v1/namespaces/(?P<ns>[^/]+)/events(/(?P<name>[^/]+))?$"), EVENTS),
+    (re.compile(r"^/api/v1/namespaces/(?P<ns>[^/]+)/services(/(?P<name>[^/]+))?$"), SERVICES),
+    (re.compile(r"^/api/v1/nodes(/(?P<name>[^/]+))?$"), NODES),
+    (re.compile(r"^/api/v1/namespaces/(?P<ns>[^/]+)/configmaps(/(?P<name>[^/]+))?$"), CONFIGMAPS),
+    (re.compile(r"^/apis/batch/v1/jobs$"), BATCH_JOBS),
+    (re.compile(r"^/apis/batch/v1/namespaces/(?P<ns>[^/]+)/jobs(/(?P<name>[^/]+))?$"), BATCH_JOBS),
+    (re.compile(r"^/apis/bus\.volcano\.sh/v1alpha1/namespaces/(?P<ns>[^/]+)/commands(/(?P<name>[^/]+))?$"), COMMANDS),
+]
+
+_KINDS = {
+    VOLCANO_JOBS: ("batch.volcano.sh/v1alpha1", "Job"),
+    QUEUES: ("scheduling.volcano.sh/v1beta1", "Queue"),
+    PODGROUPS: ("scheduling.volcano.sh/v1beta1", "PodGroup"),
+    PODS: ("v1", "Pod"),
+    EVENTS: ("v1", "Event"),
+    SERVICES: ("v1", "Service"),
+    NODES: ("v1", "Node"),
+    COMMANDS: ("bus.volcano.sh/v1alpha1", "Command"),
+    BATCH_JOBS: ("batch/v1", "Job"),
+    CONFIGMAPS: ("v1", "ConfigMap"),
+}
+
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_OPCODE_BINARY, _OPCODE_CLOSE = 0x2, 0x8
+
+
+def _ws_frame(payload: bytes, opcode: int = _OPCODE_BINARY) -> bytes:
+    """Unmasked server frame."""
+    if len(payload) < 126:
+        header = bytes([0x80 | opcode, len(payload)])
+    elif len(payload) < 2**16:
+        header = bytes([0x80 | opcode, 126]) + len(payload).to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + len(payload).to_bytes(8, "big")
+    return header + payload
+
+
+def _ws_read_frame(rfile) -> Tuple[int, bytes]:
+    """Reads a masked client frame, returns the close opcode when the client went away."""
+    header = rfile.read(2)
+    if len(header) < 2:
+        return _OPCODE_CLOSE, b""
+    length = header[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(rfile.read(2), "big")
+    elif length == 127:
+        length = int.from_bytes(rfile.read(8), "big")
+    mask = rfile.read(4) if header[1] & 0x80 else b"\0\0\0\0"
+    payload = rfile.read(length)
+    return header[0] & 0x0F, bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+
+def _timestamp(moment: Optional[datetime] = None) -> str:
+    return (moment or datetime.utcnow()).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _lookup(obj: Object, path: str) -> Optional[str]:
+    for part in path.split("."):
+        if not isinstance(obj, dict) or part not in obj:
+            return None
+        obj = obj[part]
+    return None if obj is None else str(obj)
+
+
+def _matches(obj: Object, label_selector: Optional[str], field_selector: Optional[str]) -> bool:
+    labels = obj["metadata"].get("labels") or {}
+    for requirement in filter(None, (label_selector or "").split(",")):
+        key, equals, value = requirement.partition("=")
+        if (labels.get(key) != value) if equals else (key not in labels):
+            return False
+    for requirement in filter(None, (field_selector or "").split(",")):
+        key, _, value = requirement.partition("=")
+        if _lookup(obj, key) != value:
+            return False
+    return True
+
+
+class FakeKubernetesApi:
+    """Fake API server holding all objects in memory.
+
+    Args:
+        latency (float, optional): Seconds every request is delayed by. Defaults to 0.
+        namespaces (Iterable[str], optional): Existing namespaces, writes to others fail with 404.
+            Defaults to ("default",).
+        queues (Iterable[str], optional): Existing Volcano queues, jobs in other queues are rejected.
+            Defaults to ("default",).
+    """
+
+    def __init__(self, latency: float = 0, namespaces: Iterable[str] = ("default",), queues=("default",)):
+        self.latency = latency
+        self.namespaces = set(namespaces)
+        self.objects: Dict[str, Dict[Key, Object]] = {resource: {} for resource in _KINDS}
+        self.logs: Dict[Key, List[str]] = {}
+        self.log_start: Dict[Key, datetime] = {}
+        self.disconnect_logs_after: Optional[int] = None
+        # exec runs nothing, by default the pod answers with the command it was given as a JSON list
+        self.exec_responder: Callable[[str, str, List[str]], Tuple[str, int]] = lambda ns, pod, command: (
+            json.dumps(command),
+            0,
+        )
+        self.requests: Dict[str, int] = {}
+        self.throttled = 0
+        # resources answered with 403 Forbidden, as for a user without RBAC on them
+        self.forbidden: Set[str] = set()
+        self._lock = threading.RLock()
+        self._resource_version = 0
+        self._history: List[Tuple[int, str, str, Object]] = []
+        self._watchers: List[Tuple[str, Optional[str], "queue.Queue"]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        for name in queues:
+            self.add_queue(name)
+
+    # lifecycle
+
+    def start(self) -> "FakeKubernetesApi":
+        fake = self
+
+        class Handler(_Handler):
+            api = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            for _, _, watcher in self._watchers:
+                watcher.put(None)
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def api_client(self, **configuration) -> client.ApiClient:
+        """Kubernetes api client pointed at the fake server."""
+        api_configuration = client.Configuration()
+        api_configuration.host = self.url
+        for key, value in configuration.items():
+            setattr(api_configuration, key, value)
+        return client.ApiClient(api_configuration)
+
+    def throttle(self, count: int):
+        """Answers the next ``count`` requests with 429 Too Many Requests."""
+        with self._lock:
+            self.throttled = count
+
+    def _take_throttled(self) -> bool:
+        with self._lock:
+            if self.throttled <= 0:
+                return False
+            self.throttled -= 1
+            return True
+
+    # object store
+
+    def _next_version(self) -> str:
+        self._resource_version += 1
+        return str(self._resource_version)
+
+    def _notify(self, resource: str, event_type: str, obj: Object):
+        version = int(obj["metadata"]["resourceVersion"])
+        self._history.append((version, resource, event_type, obj))
+        if len(self._history) > 100000:
+            del self._history[:50000]
+        for watched, namespace, watcher in self._watchers:
+            if watched == resource and namespace in (None, obj["metadata"].get("namespace")):
+                watcher.put((event_type, obj))
+
+    def put(self, resource: str, obj: Object, notify: bool = True) -> Object:
+        with self._lock:
+            metadata = obj.setdefault("metadata", {})
+            key = (metadata.get("namespace", ""), metadata["name"])
+            existing = self.objects[resource].get(key)
+            metadata.setdefault("uid", existing["metadata"]["uid"] if existing else str(uuid.uuid4()))
+            metadata.setdefault("creationTimestamp", _timestamp())
+            metadata["resourceVersion"] = self._next_version()
+            api_version, kind = _KINDS[resource]
+            obj.setdefault("apiVersion", api_version)
+            obj.setdefault("kind", kind)
+            self.objects[resource][key] = obj
+            if notify:
+                self._notify(resource, "MODIFIED" if existing else "ADDED", obj)
+            return obj
+
+    def remove(self, resource: str, namespace: str, name: str) -> Optional[Object]:
+        with self._lock:
+            obj = self.objects[resource].pop((namespace, name), None)
+            if obj is not None:
+                obj["metadata"]["resourceVersion"] = self._next_version()
+                self._notify(resource, "DELETED", obj)
+            return obj
+
+    def get(self, resource: str, namespace: str, name: str) -> Optional[Object]:
+        return self.objects[resource].get((namespace, name))
+
+    def add_queue(self, name: str, gpu_capability: Optional[int] = None, gpu_allocated: int = 0):
+        spec = {"capability": {"nvidia.com/gpu": gpu_capability}} if gpu_capability is not None else {}
+        status = {"state": "Open", "allocated": {"nvidia.com/gpu": str(gpu_allocated)}}
+        self.put(QUEUES, {"metadata": {"name": name}, "spec": spec, "status": status})
+
+    def add_node(
+        self,
+        name: str,
+        gpu: int = 8,
+        ready: bool = True,
+        annotations: Optional[Dict[str, str]] = None,
+        allocatable: Optional[Dict[str, str]] = None,
+    ):
+        status = {
+            "allocatable": dict({"nvidia.com/gpu": str(gpu)}, **(allocatable or {})),
+            "conditions": [{"type": "Ready", "status": "True" if ready else "False"}],
+        }
+        self.put(NODES, {"metadata": {"name": name, "annotations": annotations or {}}, "status": status})
+
+    def add_event(self, namespace: str, kind: str, name: str, reason: str, message: str, type: str = "Normal"):
+        self.put(
+            EVENTS,
+            {
+                "metadata": {"name": f"{name}.{uuid.uuid4().hex[:16]}", "namespace": namespace},
+                "involvedObject": {"kind": kind, "name": name, "namespace": namespace},
+                "reason": reason,
+                "message": message,
+                "type": type,
+                "count": 1,
+                "source": {"component": "volcano"},
+                "lastTimestamp": _timestamp(),
+            },
+        )
+
+    def set_logs(self, namespace: str, pod: str, lines: List[str], start: Optional[datetime] = None):
+        """Sets the log of a pod, line ``i`` is logged ``i`` milliseconds after ``start``."""
+        self.logs[(namespace, pod)] = lines
+        self.log_start[(namespace, pod)] = start or datetime(2024, 1, 1)
+
+    def disconnect_logs(self, after: int):
+        """Drops the connection of the next followed log in the middle of line ``after``, without ending the stream."""
+        self.disconnect_logs_after = after
+
+    def _take_disconnect(self) -> Optional[int]:
+        with self._lock:
+            after, self.disconnect_logs_after = self.disconnect_logs_after, None
+            return after
+
+    def log_lines(self, namespace: str, pod: str, timestamps: bool = False, since: Optional[str] = None) -> List[str]:
+        lines = self.logs.get((namespace, pod), [])
+        if not timestamps and since is None:
+            return lines
+        start = self.log_start[(namespace, pod)]
+        start_ns = calendar.timegm(start.utctimetuple()) * 10**9 + start.microsecond * 1000
+        stamps = [start_ns + index * 10**6 for index in range(len(lines))]
+        first = 0
+        if since is not None:
+            head, _, fraction = since.rstrip("Z").partition(".")
+            since_ns = calendar.timegm(time.strptime(head, "%Y-%m-%dT%H:%M:%S")) * 10**9
+            since_ns += int((fraction + "000000000")[:9])
+            first = next((index for index, stamp in enumerate(stamps) if stamp >= since_ns), len(lines))
+        if not timestamps:
+            return lines[first:]
+        return [
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(stamp // 10**9)) + f".{stamp % 10**9:09d}Z {line}"
+            for stamp, line in zip(stamps[first:], lines[first:])
+        ]
+
+    def set_job_phase(self, namespace: str, name: str, phase: str, pod_phase: Optional[str] = None):
+        """Moves a Volcano job, and optionally its pods, to a new phase, notifying watchers."""
+        with self._lock:
+            job = self.get(VOLCANO_JOBS, namespace, name)
+            job["status"]["state"] = {"phase": phase, "lastTransitionTime": _timestamp()}
+            job["status"].setdefault("conditions", []).append({"status": phase, "lastTransitionTime": _timestamp()})
+            self.put(VOLCANO_JOBS, job)
+            if pod_phase is not None:
+                for pod in self.list(PODS, namespace, label_selector=f"volcano.sh/job-name={name}"):
+                    pod["status"]["phase"] = pod_phase
+                    self.put(PODS, pod)
+
+    def set_batch_job_state(self, namespace: str, name: str, state: str):
+        """
+        Moves an Indexed Job and its pods to "Running", "Complete" or "Failed" the way the Job controller
+        reports it: ready pods while running, a condition once finished.
+        """
+        with self._lock:
+            job = self.get(BATCH_JOBS, namespace, name)
+            completions = job["spec"].get("completions") or 1
+            pod_phase = {"Running": "Running", "Complete": "Succeeded", "Failed": "Failed"}[state]
+            if state == "Running":
+                job["status"].update(active=completions, ready=completions)
+            else:
+                job["status"] = {
+                    "startTime": job["status"].get("startTime"),
+                    "succeeded" if state == "Complete" else "failed": completions,
+                    "conditions": [{"type": state, "status": "True", "lastTransitionTime": _timestamp()}],
+                }
+            self.put(BATCH_JOBS, job)
+            for pod in self.list(PODS, namespace, label_selector=f"job-name={name}"):
+                pod["status"]["phase"] = pod_phase
+                self.put(PODS, pod)
+
+    def list(self, resource: str, namespace: Optional[str], label_selector=None, field_selector=None) -> List[Object]:
+        with self._lock:
+            return [
+                obj
+                for (obj_namespace, _), obj in self.objects[resource].items()
+                if namespace in (None, obj_namespace) and _matches(obj, label_selector, field_selector)
+            ]
+
+    # Volcano controller emulation
+
+    def _create_job(self, namespace: str, job: Object, phase: str = "Pending", created: Optional[datetime] = None):
+        name = job["metadata"]["name"]
+        job["metadata"]["namespace"] = namespace
+        job["status"] = {"state": {"phase": phase, "lastTransitionTime": _timestamp(created)}}
+        job = self.put(VOLCANO_JOBS, job)
+        podgroup_name = f"{name}-{job['metadata']['uid']}"
+        self.put(
+            PODGROUPS,
+            {
+                "metadata": {"name": podgroup_name, "namespace": namespace},
+                "spec": {"queue": job["spec"].get("queue")},
+                "status": {"phase": phase},
+            },
+            notify=False,
+        )
+        for task in job["spec"]["tasks"]:
+            for index in range(task.get("replicas", 1)):
+                template = task["template"]
+                pod_name = f"{name}-{task['name']}-{index}"
+                labels = dict(template.get("metadata", {}).get("labels") or {})
+                labels.update({"volcano.sh/job-name": name, "volcano.sh/task-spec": task["name"]})
+                container = template["spec"]["containers"][0]["name"]
+                self.put(
+                    PODS,
+                    {
+                        "metadata": {
+                            "name": pod_name,
+                            "namespace": namespace,
+                            "labels": labels,
+                            "annotations": template.get("metadata", {}).get("annotations") or {},
+                        },
+                        "spec": template["spec"],
+                        "status": {
+                            "phase": "Running" if phase == "Running" else "Pending",
+                            "containerStatuses": [
+                                {
+                                    "name": container,
+                                    "image": template["spec"]["containers"][0].get("image", ""),
+                                    "imageID": "",
+                                    "ready": phase == "Running",
+                                    "restartCount": 0,
+                                    "state": {"running": {}} if phase == "Running" else {"waiting": {}},
+                                }
+                            ],
+                        },
+                    },
+                    notify=False,
+                )
+        return job
+
+    # Job controller emulation
+
+    def _create_batch_job(self, namespace: str, job: Object) -> Object:
+        name = job["metadata"]["name"]
+        job["metadata"]["namespace"] = namespace
+        completions = job["spec"].get("completions") or 1
+        job["status"] = {"startTime": _timestamp(), "active": completions, "ready": 0}
+        job = self.put(BATCH_JOBS, job)
+        template = job["spec"]["template"]
+        for index in range(completions):
+            labels = dict(template.get("metadata", {}).get("labels") or {})
+            labels.update({"job-name": name, "batch.kubernetes.io/job-completion-index": str(index)})
+            self.put(
+                PODS,
+                {
+                    "metadata": {
+                        "name": f"{name}-{index}-{uuid.uuid4().hex[:5]}",
+                        "namespace": namespace,
+                        "labels": labels,
+                        "annotations": template.get("metadata", {}).get("annotations") or {},
+                    },
+                    "spec": template["spec"],
+                    "status": {"phase": "Pending"},
+                },
+                notify=False,
+            )
+        return job
+
+    def populate(
+        self,
+        jobs: int,
+        namespaces: Iterable[str] = ("default",),
+        pods: bool = False,
+        events_per_job: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Adds synthetic finished and running single-node jobs, spread over ``namespaces``. Most are Completed,
+        like on a long-lived cluster. Pods are only generated when ``pods`` is set, to keep large fakes cheap.
+        """
+        rng = random.Random(seed)
+        phases = ["Completed"] * 90 + ["Failed"] * 7 + ["Running"] * 2 + ["Pending"]
+        namespaces = list(namespaces)
+        self.namespaces.update(namespaces)
+        now = datetime.utcnow()
+        template = client.ApiClient().sanitize_for_serialization(
+            client.V1PodTemplateSpec(
+                metadata=client.V1ObjectMeta(labels={}),
+                spec=client.V1PodSpec(
+                    containers=[
+                        client.V1Container(
+                            name="main",
+                            image="noop",
+                            resources=client.V1ResourceRequirements(limits={"nvidia.com/gpu": "8"}),
+                        )
+                    ]
+                ),
+            )
+        )
+        for index in range(jobs):
+            namespace = namespaces[index % len(namespaces)]
+            name = f"synthetic{index}"
+            job = {
+                "metadata": {"name": name},
+                "spec": {"queue": "default", "tasks": [{"name": "worker-0", "replicas": 1, "template": template}]},
+            }
+            created = now - timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+            if pods:
+                job["spec"]["tasks"][0]["template"] = json.loads(json.dumps(template))
+                job["spec"]["tasks"][0]["template"]["metadata"]["labels"] = {"kubr.io/job-name": name}
+                self._create_job(namespace, job, phase=rng.choice(phases), created=created)
+            else:
+                with self._lock:
+                    job["metadata"].update(namespace=namespace, uid=str(uuid.uuid4()))
+                    job["status"] = {"state": {"phase": rng.choice(phases), "lastTransitionTime": _timestamp(created)}}
+                    self.put(VOLCANO_JOBS, job, notify=False)
+            for event_index in range(events_per_job):
+                self.add_event(namespace, "Pod", f"{name}-worker-0-0", "Scheduled", f"event {event_index}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    api: FakeKubernetesApi
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    # plumbing
+
+    def _route(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        for pattern, resource in _ROUTES:
+            match = pattern.match(url.path)
+            if match is not None:
+                return resource, match.groupdict(), query
+        return None, {}, query
+
+    def _body(self) -> Object:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _send(self, status: int, payload: Object):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _status(self, code: int, reason: str, message: str):
+        self._send(
+            code,
+            {
+                "kind": "Status",
+                "apiVersion": "v1",
+                "status": "Failure",
+                "reason": reason,
+                "code": code,
+                "message": message,
+            },
+        )
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def _handle(self, method: str):
+        resource, params, query = self._route()
+        self.api.requests[f"{method} {resource}"] = self.api.requests.get(f"{method} {resource}", 0) + 1
+        if self.api.latency:
+            time.sleep(self.api.latency)
+        if self.api._take_throttled():
+            self._body()
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if resource is None:
+            self._status(404, "NotFound", f"unknown path {self.path}")
+            return
+        if resource in self.api.forbidden:
+            self._body()
+            self._status(403, "Forbidden", f"{resource} is forbidden")
+            return
+        handler: Callable = getattr(self, f"_{method.lower()}")
+        try:
+            handler(resource, params.get("ns"), params.get("name"), params, query)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    # verbs
+
+    def _get(self, resource: str, namespace: Optional[str], name: Optional[str], params, query):
+        if params.get("exec") or params.get("portforward"):
+            if self.api.get(PODS, namespace, name) is None:
+                self._status(404, "NotFound", f'pods "{name}" not found')
+            elif params.get("exec"):
+                self._exec(namespace, name)
+            else:
+                self._portforward([int(port) for port in query["ports"].split(",")])
+        elif params.get("log"):
+            self._log(namespace, name, query)
+        elif name is not None:
+            obj = self.api.get(resource, namespace or "", name)
+            if obj is None:
+                self._status(404, "NotFound", f'{resource} "{name}" not found')
+            else:
+                self._send(200, obj)
+        elif (query.get("watch") or "").lower() in ("true", "1"):
+            self._watch(resource, namespace, query)
+        else:
+            items = self.api.list(resource, namespace, query.get("labelSelector"), query.get("fieldSelector"))
+            _, kind = _KINDS[resource]
+            self._send(
+                200,
+                {
+                    "kind": f"{kind}List",
+                    "apiVersion": _KINDS[resource][0],
+                    "metadata": {"resourceVersion": str(self.api._resource_version)},
+                    "items": items,
+                },
+            )
+
+    def _post(self, resource: str, namespace: Optional[str], name: Optional[str], params, query):
+        obj = self._body()
+        if namespace is not None and namespace not in self.api.namespaces:
+            self._status(404, "NotFound", f'namespaces "{namespace}" not found')
+            return
+        if self.api.get(resource, namespace or "", obj["metadata"]["name"]) is not None:
+            self._status(409, "AlreadyExists", f'{resource} "{obj["metadata"]["name"]}" already exists')
+            return
+        if resource == VOLCANO_JOBS:
+            queue_name = obj["spec"].get("queue") or "default"
+            if self.api.get(QUEUES, "", queue_name) is None:
+                self._status(400, "BadRequest", f"unable to find job queue: {queue_name}")
+                return
+            self._send(201, self.api._create_job(namespace, obj))
+            return
+        if resource == BATCH_JOBS:
+            self._send(201, self.api._create_batch_job(namespace, obj))
+            return
+        obj["metadata"]["namespace"] = namespace
+        if resource == COMMANDS and obj.get("action") == "RestartJob":
+            self.api.set_job_phase(namespace, obj["target"]["name"], "Restarting")
+        self._send(201, self.api.put(resource, obj))
+
+    def _put(self, resource: str, namespace: Optional[str], name: Optional[str], params, query):
+        obj = self._body()
+        obj["metadata"]["namespace"] = namespace
+        self._send(200, self.api.put(resource, obj))
+
+    def _delete(self, resource: str, namespace: Optional[str], name: Optional[str], params, query):
+        if name is None:
+            for obj in self.api.list(resource, namespace, query.get("labelSelector"), query.get("fieldSelector")):
+                self.api.remove(resource, namespace or "", obj["metadata"]["name"])
+            self._send(200, {"kind": "Status", "apiVersion": "v1", "status": "Success"})
+            return
+        obj = self.api.remove(resource, namespace or "", name)
+        if obj is None:
+            self._status(404, "NotFound", f'{resource} "{name}" not found')
+            return
+        if resource == VOLCANO_JOBS:
+            for pod in self.api.list(PODS, namespace, label_selector=f"volcano.sh/job-name={name}"):
+                self.api.remove(PODS, namespace, pod["metadata"]["name"])
+            self.api.remove(PODGROUPS, namespace, f"{name}-{obj['metadata']['uid']}")
+        if resource == BATCH_JOBS:
+            for pod in self.api.list(PODS, namespace, label_selector=f"job-name={name}"):
+                self.api.remove(PODS, namespace, pod["metadata"]["name"])
+        self._send(200, {"kind": "Status", "apiVersion": "v1", "status": "Success"})
+
+    def _watch(self, resource: str, namespace: Optional[str], query):
+        watcher: "queue.Queue" = queue.Queue()
+        since = int(query.get("resourceVersion") or 0)
+        with self.api._lock:
+            if since:
+                backlog = [(t, o) for v, r, t, o in self.api._history if r == resource and v > since]
+            else:
+                backlog = [("ADDED", obj) for obj in self.api.list(resource, namespace)]
+            self.api._watchers.append((resource, namespace, watcher))
+        deadline = time.monotonic() + float(query.get("timeoutSeconds") or 3600)
+        label_selector, field_selector = query.get("labelSelector"), query.get("fieldSelector")
+        self._start_stream("application/json")
+        try:
+            for item in backlog:
+                watcher.put(item)
+            while time.monotonic() < deadline:
+                try:
+                    item = watcher.get(timeout=min(0.5, max(deadline - time.monotonic(), 0.01)))
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                event_type, obj = item
+                if namespace not in (None, obj["metadata"].get("namespace")):
+                    continue
+                if _matches(obj, label_selector, field_selector):
+                    self._chunk(json.dumps({"type": event_type, "object": obj}).encode() + b"\n")
+            self._end_stream()
+        finally:
+            with self.api._lock:
+                self.api._watchers = [w for w in self.api._watchers if w[2] is not watcher]
+
+    def _log(self, namespace: str, name: str, query):
+        if self.api.get(PODS, namespace, name) is None:
+            self._status(404, "NotFound", f'pods "{name}" not found')
+            return
+        timestamps = query.get("timestamps") in ("true", "1")
+        lines = self.api.log_lines(namespace, name, timestamps=timestamps, since=query.get("sinceTime"))
+        if query.get("tailLines"):
+            lines = lines[-int(query["tailLines"]) :]
+        if query.get("follow") not in ("true", "1"):
+            self._send_text("".join(line + "\n" for line in lines))
+            return
+        self._start_stream("text/plain")
+        disconnect_after = self.api._take_disconnect()
+        if disconnect_after is not None:
+            partial = lines[disconnect_after][:10] if disconnect_after < len(lines) else ""
+            self._chunk(("".join(line + "\n" for line in lines[:disconnect_after]) + partial).encode())
+            self.close_connection = True
+            return
+        batch = []
+        for line in lines:
+            batch.append(line + "\n")
+            if len(batch) == 512:
+                self._chunk("".join(batch).encode())
+                batch = []
+        if batch:
+            self._chunk("".join(batch).encode())
+        self._end_stream()
+
+    def _upgrade(self):
+        """Completes the websocket handshake of the channel protocol exec and port forwarding use."""
+        accept = hashlib.sha1((self.headers["Sec-WebSocket-Key"] + _WEBSOCKET_GUID).encode()).digest()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", base64.b64encode(accept).decode())
+        self.send_header("Sec-WebSocket-Protocol", self.headers["Sec-WebSocket-Protocol"].split(",")[0].strip())
+        self.end_headers()
+        self.close_connection = True
+
+    def _exec(self, namespace: str, name: str):
+        command = parse_qs(urlparse(self.path).query).get("command", [])
+        stdout, exit_code = self.api.exec_responder(namespace, name, command)
+        if exit_code == 0:
+            status = {"metadata": {}, "status": "Success"}
+        else:
+            cause = {"reason": "ExitCode", "message": str(exit_code)}
+            status = {"status": "Failure", "reason": "NonZeroExitCode", "details": {"causes": [cause]}}
+        self._upgrade()
+        if stdout:
+            self.wfile.write(_ws_frame(b"\x01" + stdout.encode()))
+        self.wfile.write(_ws_frame(b"\x03" + json.dumps(status).encode()))
+        self.wfile.write(_ws_frame(b"", _OPCODE_CLOSE))
+
+    def _portforward(self, ports: List[int]):
+        """Every forwarded port of the pod echoes what it receives."""
+        self._upgrade()
+        for index, port in enumerate(ports):
+            for channel in (2 * index, 2 * index + 1):
+                self.wfile.write(_ws_frame(bytes([channel]) + port.to_bytes(2, "little")))
+        self.wfile.flush()
+        while True:
+            opcode, payload = _ws_read_frame(self.rfile)
+            if opcode == _OPCODE_CLOSE:
+                break
+            if opcode == _OPCODE_BINARY and payload and payload[0] % 2 == 0 and len(payload) > 1:
+                self.wfile.write(_ws_frame(payload))
+                self.wfile.flush()
+
+    def _send_text(self, text: str):
+        data = text.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
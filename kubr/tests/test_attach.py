@@ -0,0 +1,102 @@
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.cluster import ClusterBackend
+from kubr.commands.attach import parse_port
+from kubr.config.runner import RunnerConfig
+from kubr.main import build_parser, dispatch
+
+attach_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "attached"
+    namespace: "default"
+"""
+
+
+@pytest.fixture
+def cluster(fake_api) -> ClusterBackend:
+    backend = ClusterBackend(api_client=fake_api.api_client())
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, attach_config))
+    return backend
+
+
+def run_cli(backend: ClusterBackend, *argv: str):
+    parser = build_parser(backend)
+    args = parser.parse_args(list(argv))
+    dispatch(parser, args, backend)
+    return args
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_parse_port():
+    assert parse_port("8888:80") == (8888, 80)
+    assert parse_port("6006") == (6006, 6006)
+
+
+def test_attach_runs_command(cluster, fake_api, capsys):
+    execs = []
+    fake_api.exec_responder = lambda ns, pod, command: (execs.append((pod, command)) or "gpu ok\n", 0)
+
+    args = run_cli(cluster, "attach", "attached", "-r", "1", "-c", "python -c 'print(\"a b\")'")
+
+    assert args.command == "attach"
+    assert execs == [("attached-worker-1-0", ["python", "-c", 'print("a b")'])]
+    assert capsys.readouterr().out == "gpu ok\n"
+
+
+def test_attach_opens_shell_by_default(cluster, capsys):
+    run_cli(cluster, "attach", "attached")
+    assert json.loads(capsys.readouterr().out)[0] == "sh"
+
+
+def test_attach_forwards_ports(cluster):
+    local_port = free_port()
+    threading.Thread(
+        target=run_cli, args=(cluster, "attach", "attached", "-p", f"{local_port}:6006"), daemon=True
+    ).start()
+
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            connection = socket.create_connection(("127.0.0.1", local_port), timeout=5)
+            break
+        except OSError:
+            assert time.monotonic() < deadline, "port forward did not start"
+            time.sleep(0.05)
+    with connection:
+        # the fake pod echoes everything sent to a forwarded port
+        connection.sendall(b"ping")
+        assert connection.recv(4) == b"ping"
+
+
+def test_streams_leave_the_shared_client_alone(cluster, fake_api):
+    fake_api.exec_responder = lambda ns, pod, command: (pod, 0)
+    shared = cluster.default.api_client
+
+    def exec_and_list(rank: int):
+        session = cluster.exec_in_replica("attached", "default", ["hostname"], rank=rank % 2)
+        session.run_forever(timeout=5)
+        # requests of other threads on the shared client stay plain HTTP while streams are open
+        return session.read_stdout(), [job.name for job in cluster.list_jobs(namespace="default")]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(exec_and_list, range(32)))
+    assert results == [(f"attached-worker-{rank % 2}-0", ["attached"]) for rank in range(32)]
+    assert "request" not in vars(shared)
@@ -0,0 +1,181 @@
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.base import JobOperationStatus
+from kubr.backends.history import HistoryStore
+from kubr.backends.volcano import VolcanoBackend
+from kubr.commands.logs import LogsCommand
+from kubr.commands.ls import LsCommand
+from kubr.commands.utils.render import LogRenderer
+from kubr.config.job import JobRecord
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import FakeKubernetesApi
+
+# sizes can be raised to cluster scale, e.g. KUBR_BENCH_JOBS=100000
+JOBS = int(os.environ.get("KUBR_BENCH_JOBS", 10000))
+LOG_LINES = int(os.environ.get("KUBR_BENCH_LOG_LINES", 20000))
+SUBMISSIONS = int(os.environ.get("KUBR_BENCH_SUBMISSIONS", 50))
+HISTORY_RECORDS = int(os.environ.get("KUBR_BENCH_HISTORY_RECORDS", 100000))
+RENDERED_LINES = int(os.environ.get("KUBR_BENCH_RENDERED_LINES", 200000))
+# budgets are generous, they catch regressions in complexity rather than small slowdowns
+
+run_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python train.py"
+
+resources:
+    gpu: 8
+
+experiment:
+    name: "bench"
+    namespace: "ns0"
+"""
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def cluster():
+    api = FakeKubernetesApi(namespaces=[f"ns{i}" for i in range(10)]).start()
+    api.populate(jobs=JOBS, namespaces=[f"ns{i}" for i in range(10)], events_per_job=1)
+    yield api
+    api.stop()
+
+
+@pytest.fixture
+def cluster_backend(cluster: FakeKubernetesApi) -> VolcanoBackend:
+    return VolcanoBackend(api_client=cluster.api_client())
+
+
+def test_list_jobs(bench, cluster_backend: VolcanoBackend):
+    jobs = bench(cluster_backend.list_jobs, items=JOBS, unit="jobs", budget=JOBS * 5e-4)
+    assert len(jobs) == JOBS
+
+
+def test_ls_command(bench, cluster_backend: VolcanoBackend, capsys):
+    bench(LsCommand(backend=cluster_backend), namespace="All", items=JOBS, unit="jobs", budget=JOBS * 1e-3)
+    assert "Running" in capsys.readouterr().out
+
+
+def test_completion(bench, cluster_backend: VolcanoBackend, capsys):
+    running = bench(cluster_backend._completion_list_running_jobs, items=JOBS, unit="jobs", budget=JOBS * 5e-4)
+    assert running
+
+
+def test_run_job(bench, cluster: FakeKubernetesApi, cluster_backend: VolcanoBackend):
+    config = parse_yaml_raw_as(RunnerConfig, run_config)
+
+    def submit():
+        statuses = []
+        for index in range(SUBMISSIONS):
+            config.experiment.name = f"bench{index}"
+            statuses.append(cluster_backend.run_job(config)[1])
+        return statuses
+
+    statuses = bench(submit, items=SUBMISSIONS, unit="jobs", budget=SUBMISSIONS * 0.2)
+    assert statuses == [JobOperationStatus.Success] * SUBMISSIONS
+
+
+def test_delete_job(bench, cluster: FakeKubernetesApi, cluster_backend: VolcanoBackend):
+    status = bench(cluster_backend.delete_job, job_name="synthetic0", namespace="ns0", budget=5)
+    assert status == JobOperationStatus.Success
+    assert cluster.get("jobs", "ns0", "synthetic0") is None
+
+
+def test_logs_follow(bench, capsys):
+    api = FakeKubernetesApi().start()
+    try:
+        backend = VolcanoBackend(api_client=api.api_client())
+        backend.run_job(parse_yaml_raw_as(RunnerConfig, run_config.replace("ns0", "default")))
+        api.set_logs("default", "bench-worker-0-0", [f"step {i} loss 0.{i}" for i in range(LOG_LINES)])
+
+        bench(
+            LogsCommand(backend=backend),
+            job_name="bench",
+            namespace="default",
+            follow=True,
+            items=LOG_LINES,
+            unit="lines",
+            budget=LOG_LINES * 1e-4,
+        )
+    finally:
+        api.stop()
+    assert capsys.readouterr().out.count("\n") >= LOG_LINES
+
+
+@pytest.mark.parametrize("plain", [True, False], ids=["plain", "terminal"])
+def test_log_renderer(bench, plain: bool):
+    output = io.StringIO()
+    lines = [f"[rank 0] step {i} loss=[bold]0.{i}[/bold] lr=3e-4 grad_norm=1.{i}" for i in range(RENDERED_LINES)]
+
+    def render():
+        with LogRenderer(file=output, plain=plain) as renderer:
+            for line in lines:
+                renderer.write(line)
+
+    # rich still wraps lines for the terminal, plain output is a single write per batch
+    bench(render, items=RENDERED_LINES, unit="lines", budget=RENDERED_LINES * (1e-5 if plain else 1e-4))
+    # log content is written verbatim, markup-like text included
+    assert output.getvalue().count("\n") == RENDERED_LINES
+    assert "loss=[bold]0.7[/bold]" in output.getvalue()
+
+
+def test_history_query(bench, tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    now = datetime.utcnow()
+    store.archive(
+        JobRecord(
+            uid=str(index),
+            name=f"sweep{index}",
+            namespace=f"ns{index % 10}",
+            state="Failed" if index % 7 == 0 else "Completed",
+            queue=f"queue{index % 5}",
+            gpu=8,
+            created_at=now - timedelta(minutes=index),
+            finished_at=now - timedelta(minutes=index) + timedelta(hours=1),
+            archived_at=now,
+            logs_tail="step 100 loss 0.1\n" * 20,
+        )
+        for index in range(HISTORY_RECORDS)
+    )
+
+    def failed_in_queue_last_week():
+        return store.query(state="Failed", queue="queue3", since=now - timedelta(days=7), limit=None)
+
+    records = bench(failed_in_queue_last_week, items=HISTORY_RECORDS, unit="records", budget=0.1)
+    assert records and all(r.state == "Failed" and r.queue == "queue3" for r in records)
+    assert len(store.query(name="sweep4*")) == 50
+
+
+def test_history_usage(bench, tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    now = datetime.utcnow()
+    # a job started every minute, so a monthly report aggregates most of the archive
+    store.archive(
+        JobRecord(
+            uid=str(index),
+            name=f"sweep{index}",
+            namespace=f"ns{index % 10}",
+            state="Completed",
+            queue=f"queue{index % 5}",
+            user=f"user{index % 50}",
+            gpu=8,
+            created_at=now - timedelta(minutes=index, seconds=30),
+            started_at=now - timedelta(minutes=index),
+            finished_at=now - timedelta(minutes=index) + timedelta(hours=1),
+            archived_at=now,
+        )
+        for index in range(HISTORY_RECORDS)
+    )
+
+    def monthly_usage_by_user():
+        return store.usage("user", since=now - timedelta(days=30), until=now)
+
+    usage = bench(monthly_usage_by_user, items=HISTORY_RECORDS, unit="records", budget=0.5)
+    # jobs started up to an hour before the period overlap it, the newest one starts right at its end
+    assert len(usage) == 50 and sum(row.jobs for row in usage) == min(HISTORY_RECORDS, 30 * 24 * 60 + 60) - 1
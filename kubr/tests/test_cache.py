@@ -0,0 +1,129 @@
+import json
+import time
+
+import pytest
+import urllib3
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends import informer
+from kubr.backends.cache import CacheClient, CacheServer, ClusterCache
+from kubr.backends.cluster import ClusterBackend
+from kubr.backends.informer import Informer
+from kubr.backends.volcano import VolcanoBackend
+from kubr.config.job import JobBackend, JobType
+from kubr.config.runner import RunnerConfig
+
+cache_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "cached"
+    namespace: "default"
+"""
+
+
+def submit(backend, name: str):
+    config = parse_yaml_raw_as(RunnerConfig, cache_config)
+    config.experiment.name = name
+    return backend.submit_job(config)
+
+
+def eventually(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def server(backend):
+    cache = ClusterCache(backend, watch_seconds=5).start()
+    assert cache.wait_synced(timeout=5)
+    server = CacheServer(cache, host="127.0.0.1", port=0).start()
+    yield server
+    server.stop()
+    cache.stop()
+
+
+def test_serves_cluster_state(backend, fake_api, server):
+    for i in range(3):
+        submit(backend, f"cached{i}")
+    fake_api.set_job_phase("default", "cached1", "Running", pod_phase="Running")
+    fake_api.add_node("gpu-node", gpu=8)
+    client = CacheClient(server.url)
+
+    eventually(lambda: len(client.list_jobs()) == 3 and client.running_job_names() == ["cached1"])
+    assert sorted(client.list_jobs(), key=lambda job: job.name) == sorted(backend.list_jobs(), key=lambda job: job.name)
+    assert [pod["rank"] for pod in client.job_pods("default", "cached1")] == [0, 1]
+    assert [queue.name for queue in client.queues()] == ["default"]
+
+    backend.delete_job("cached0", "default")
+    eventually(lambda: len(client.list_jobs()) == 2)
+
+
+def test_backend_lists_through_cache(backend, fake_api, server):
+    submit(backend, "cached")
+    cached = VolcanoBackend(api_client=fake_api.api_client(), cache=CacheClient(server.url))
+    eventually(lambda: len(cached.list_jobs()) == 1)
+
+    requests = fake_api.requests.get("GET jobs", 0)
+    for _ in range(50):
+        assert [job.name for job in cached.list_jobs(namespace="default")] == ["cached"]
+    assert fake_api.requests.get("GET jobs", 0) == requests
+
+
+def test_backend_falls_back_without_cache(backend, fake_api):
+    submit(backend, "cached")
+    offline = VolcanoBackend(api_client=fake_api.api_client(), cache=CacheClient("http://127.0.0.1:1", timeout=0.5))
+    assert [job.name for job in offline.list_jobs()] == ["cached"]
+    assert offline.job_placement("cached", "default").keys() == {"cached-worker-0-0", "cached-worker-1-0"}
+
+
+def test_caches_jobs_of_every_backend(fake_api):
+    cluster = ClusterBackend(api_client=fake_api.api_client())
+    submit(cluster, "cached")
+    config = parse_yaml_raw_as(RunnerConfig, cache_config)
+    config.experiment.name, config.backend, config.type = "indexed", JobBackend.Kubernetes, JobType.basic
+    cluster.submit_job(config)
+    fake_api.set_batch_job_state("default", "indexed", "Running")
+    cache = ClusterCache(cluster, watch_seconds=5).start()
+    assert cache.wait_synced(timeout=5)
+    server = CacheServer(cache, host="127.0.0.1", port=0).start()
+    try:
+        cached = ClusterBackend(api_client=fake_api.api_client(), cache=CacheClient(server.url))
+        eventually(lambda: len(cached.list_jobs()) == 2)
+
+        requests = fake_api.requests.get("GET batchjobs", 0)
+        jobs = {job.name: job.backend for job in cached.list_jobs()}
+        assert jobs == {"cached": JobBackend.Volcano, "indexed": JobBackend.Kubernetes}
+        assert cached._completion_list_running_jobs() == ["indexed"]
+        assert sorted(cached.job_placement("indexed", "default").values()) == [(0, None), (1, None)]
+        # only the owner lookup of the placement reads the Job itself
+        assert fake_api.requests.get("GET batchjobs", 0) == requests + 1
+    finally:
+        server.stop()
+        cache.stop()
+
+
+def test_failing_informer_is_logged_and_unhealthy(server, monkeypatch, caplog):
+    monkeypatch.setattr(informer, "MAX_FAILURES", 1)
+
+    def unreachable(**kwargs):
+        raise ConnectionRefusedError("api server down")
+
+    failing = Informer(unreachable, lambda obj: obj, name="widgets").start()
+    try:
+        eventually(lambda: "Syncing widgets failed (1 in a row): api server down" in caplog.text)
+        assert not failing.healthy
+    finally:
+        failing.stop()
+
+    healthz = urllib3.PoolManager().request("GET", f"{server.url}/healthz")
+    assert (healthz.status, json.loads(healthz.data)) == (200, {"synced": True, "failing": []})
+    server.cache.nodes.failures = 1
+    healthz = urllib3.PoolManager().request("GET", f"{server.url}/healthz")
+    assert (healthz.status, json.loads(healthz.data)) == (503, {"synced": True, "failing": ["nodes"]})
@@ -0,0 +1,134 @@
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.base import BaseBackend, JobOperationStatus
+from kubr.backends.checkpoint import CheckpointRetryPolicy, ResubmissionLoop
+from kubr.backends.k8s_runner import create_pod_definition
+from kubr.config.job import Job, JobBackend, JobState, JobType
+from kubr.config.runner import RunnerConfig
+
+checkpoint_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python train.py"
+
+resources:
+    gpu: 1
+
+experiment:
+    name: "pytest"
+    namespace: "default"
+
+checkpoint:
+    dir: "/data/checkpoints"
+    max_resubmits: 2
+    backoff_seconds: 10
+    max_backoff_seconds: 15
+"""
+
+
+class FakeBackend(BaseBackend):
+    """Plays back a final state and a checkpoint marker for every submission."""
+
+    def __init__(self, outcomes: List[tuple]):
+        super().__init__()
+        self.outcomes = outcomes
+        self.submitted: List[RunnerConfig] = []
+        self.deleted = 0
+
+    def run_job(self, run_config: RunnerConfig):
+        self.submitted.append(run_config)
+        job = Job(
+            type=JobType.torchrun,
+            backend=JobBackend.Volcano,
+            name=run_config.experiment.name,
+            namespace=run_config.experiment.namespace,
+            state=JobState.Pending,
+            age=datetime.now(),
+            gpu=run_config.resources.gpu,
+        )
+        return job, JobOperationStatus.Success
+
+    def _outcome(self):
+        return self.outcomes[len(self.submitted) - 1]
+
+    def get_job(self, job_name: str, namespace: str) -> Job:
+        state, _ = self._outcome()
+        return Job(
+            type=JobType.torchrun,
+            backend=JobBackend.Volcano,
+            name=job_name,
+            namespace=namespace,
+            state=state,
+            age=datetime.now(),
+            gpu=1,
+        )
+
+    def get_checkpoint_marker(self, job_name: str, namespace: str) -> Optional[str]:
+        _, marker = self._outcome()
+        return marker
+
+    def delete_job(self, job_name: str, namespace: str):
+        self.deleted += 1
+        return JobOperationStatus.Success
+
+
+@pytest.fixture
+def runner_config() -> RunnerConfig:
+    return parse_yaml_raw_as(RunnerConfig, checkpoint_config)
+
+
+class TestCheckpointRetryPolicy:
+    def test_backoff_is_capped(self, runner_config: RunnerConfig):
+        policy = CheckpointRetryPolicy(runner_config.checkpoint)
+        assert [policy.backoff(i) for i in range(3)] == [10, 15, 15]
+
+    @pytest.mark.parametrize(
+        "state, resubmits, expected",
+        [
+            (JobState.Completed, 0, False),
+            (JobState.Running, 0, False),
+            (JobState.Failed, 0, True),
+            (JobState.Aborted, 1, True),
+            (JobState.Failed, 2, False),
+        ],
+    )
+    def test_should_resubmit(self, runner_config: RunnerConfig, state: JobState, resubmits: int, expected: bool):
+        policy = CheckpointRetryPolicy(runner_config.checkpoint)
+        assert policy.should_resubmit(state, resubmits) == expected
+
+
+class TestResubmissionLoop:
+    def test_resumes_from_latest_checkpoint(self, runner_config: RunnerConfig):
+        backend = FakeBackend(
+            [
+                (JobState.Aborted, "/data/checkpoints/step-100"),
+                (JobState.Failed, None),
+                (JobState.Completed, None),
+            ]
+        )
+        sleeps = []
+        job = ResubmissionLoop(backend, runner_config, sleep=sleeps.append).run()
+
+        assert job.state == JobState.Completed
+        assert backend.deleted == 2
+        assert sleeps == [10, 15]
+        assert [c.checkpoint.resume_from for c in backend.submitted] == [
+            None,
+            "/data/checkpoints/step-100",
+            "/data/checkpoints/step-100",
+        ]
+        assert runner_config.checkpoint.resume_from is None
+
+        pod = create_pod_definition("pytest", backend.submitted[-1], service_account=None, rank0_env=None)
+        assert pod.spec.containers[0].command[-1].endswith("python train.py --resume /data/checkpoints/step-100")
+
+    def test_gives_up_after_max_resubmits(self, runner_config: RunnerConfig):
+        backend = FakeBackend([(JobState.Failed, None)] * 3)
+        job = ResubmissionLoop(backend, runner_config, sleep=lambda _: None).run()
+
+        assert job.state == JobState.Failed
+        assert len(backend.submitted) == 3
@@ -0,0 +1,81 @@
+import time
+
+from kubernetes import client
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.base import JobOperationStatus
+from kubr.backends.client import TokenBucket, create_api_client, endpoint_template
+from kubr.backends.volcano import VolcanoBackend
+from kubr.config.runner import RunnerConfig
+
+client_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 1
+
+experiment:
+    name: "tuned"
+    namespace: "default"
+"""
+
+
+def tuned_backend(fake_api, **tuning) -> VolcanoBackend:
+    configuration = client.Configuration()
+    configuration.host = fake_api.url
+    return VolcanoBackend(api_client=create_api_client(configuration, **tuning))
+
+
+def test_endpoint_template():
+    assert (
+        endpoint_template("GET", "http://host/api/v1/namespaces/default/pods/job-worker-0-0/log?follow=true")
+        == "GET /api/v1/namespaces/{namespace}/pods/{name}/log"
+    )
+    assert (
+        endpoint_template("POST", "https://host/apis/batch.volcano.sh/v1alpha1/namespaces/team/jobs")
+        == "POST /apis/batch.volcano.sh/v1alpha1/namespaces/{namespace}/jobs"
+    )
+    assert endpoint_template("GET", "https://host/api/v1/pods") == "GET /api/v1/pods"
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(qps=100, burst=5)
+    start = time.monotonic()
+    for _ in range(25):
+        bucket.acquire()
+    # the burst is free, the remaining 20 requests are spread at 100 qps
+    assert time.monotonic() - start >= 0.18
+
+
+def test_retries_throttled_reads(fake_api):
+    backend = tuned_backend(fake_api, retries=3)
+    fake_api.throttle(2)
+
+    assert backend.list_jobs(namespace="default") == []
+    assert fake_api.throttled == 0
+    assert backend.api_client.stats.calls["GET /apis/batch.volcano.sh/v1alpha1/namespaces/{namespace}/jobs"] == 1
+
+
+def test_retries_throttled_submissions(fake_api):
+    backend = tuned_backend(fake_api, retries=3)
+    fake_api.throttle(1)
+
+    _, status = backend.run_job(parse_yaml_raw_as(RunnerConfig, client_config))
+
+    assert status == JobOperationStatus.Success
+    assert fake_api.get("jobs", "default", "tuned") is not None
+
+
+def test_gives_up_after_retries(fake_api):
+    backend = tuned_backend(fake_api, retries=1)
+    fake_api.throttle(5)
+
+    try:
+        backend.list_jobs(namespace="default")
+    except client.ApiException as e:
+        assert e.status == 429
+    else:
+        raise AssertionError("throttled request did not fail")
+    stats = backend.api_client.stats
+    assert stats.errors["GET /apis/batch.volcano.sh/v1alpha1/namespaces/{namespace}/jobs"] == 1
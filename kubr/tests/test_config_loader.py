@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+
+from kubr.config import loader
+from kubr.config.loader import ConfigError, ConfigLoader, parse_override
+
+base_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 1
+    cpu: 8
+
+experiment:
+    name: "base"
+    namespace: "default"
+
+profiles:
+    a100x8:
+        resources:
+            gpu: 8
+            nodes: 2
+"""
+
+experiment_config = """
+extends: base.yaml
+
+container:
+    entrypoint: "python train.py"
+
+experiment:
+    name: "sweep"
+"""
+
+
+@pytest.fixture
+def configs(tmp_path: Path) -> Path:
+    (tmp_path / "base.yaml").write_text(base_config)
+    (tmp_path / "sweep.yaml").write_text(experiment_config)
+    return tmp_path
+
+
+def test_extends_profiles_and_overrides(configs: Path, tmp_path: Path):
+    config_loader = ConfigLoader(cache_path=tmp_path / "cache", environ={"KUBR_SET__EXPERIMENT__QUEUE": "research"})
+
+    config = config_loader.load(configs / "sweep.yaml", profiles=["a100x8"], overrides=["resources.cpu=16"])
+
+    assert config.container.image == "jannnash/noop:latest"
+    assert config.container.entrypoint == "python train.py"
+    assert config.experiment.name == "sweep"
+    assert config.experiment.namespace == "default"
+    assert config.experiment.queue == "research"
+    assert (config.resources.nodes, config.resources.gpu, config.resources.cpu) == (2, 8, 16)
+
+
+def test_unknown_profile(configs: Path, tmp_path: Path):
+    with pytest.raises(ConfigError, match="a100x8"):
+        ConfigLoader(cache_path=tmp_path / "cache", environ={}).load(configs / "sweep.yaml", profiles=["h100"])
+
+
+def test_inheritance_cycle(tmp_path: Path):
+    (tmp_path / "a.yaml").write_text("extends: b.yaml\n")
+    (tmp_path / "b.yaml").write_text("extends: a.yaml\n")
+    with pytest.raises(ConfigError, match="cycle"):
+        ConfigLoader(cache_path=tmp_path / "cache", environ={}).load(tmp_path / "a.yaml")
+
+
+def test_cache_skips_parsing_until_a_base_changes(configs: Path, tmp_path: Path, monkeypatch):
+    parsed = []
+    parse_yaml = loader.parse_yaml
+    monkeypatch.setattr(loader, "parse_yaml", lambda raw: parsed.append(raw) or parse_yaml(raw))
+
+    first = ConfigLoader(cache_path=tmp_path / "cache", environ={}).load(configs / "sweep.yaml")
+    assert len(parsed) == 2
+
+    # a new loader (a new process) hits the on-disk cache, copies are independent
+    second_loader = ConfigLoader(cache_path=tmp_path / "cache", environ={})
+    second = second_loader.load(configs / "sweep.yaml")
+    second.experiment.name = "changed"
+    assert second_loader.load(configs / "sweep.yaml").experiment.name == first.experiment.name
+    assert len(parsed) == 2
+
+    (configs / "base.yaml").write_text(base_config.replace("cpu: 8", "cpu: 4"))
+    assert second_loader.load(configs / "sweep.yaml").resources.cpu == 4
+    assert len(parsed) == 4
+
+
+def test_same_file_in_other_directory_resolves_its_own_bases(configs: Path, tmp_path: Path):
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "base.yaml").write_text(base_config.replace("cpu: 8", "cpu: 2"))
+    (other / "sweep.yaml").write_text(experiment_config)
+    config_loader = ConfigLoader(cache_path=tmp_path / "cache", environ={})
+
+    assert config_loader.load(configs / "sweep.yaml").resources.cpu == 8
+    assert config_loader.load(other / "sweep.yaml").resources.cpu == 2
+    assert ConfigLoader(cache_path=tmp_path / "cache", environ={}).load(other / "sweep.yaml").resources.cpu == 2
+
+
+def test_overrides_follow_yaml_1_2(configs: Path, tmp_path: Path):
+    assert parse_override("resources.gpu=8") == (["resources", "gpu"], 8)
+    assert parse_override("a.b=on")[1] == "on" and parse_override("a.b=true")[1] is True
+
+    config = ConfigLoader(cache_path=tmp_path / "cache", environ={"KUBR_SET__EXPERIMENT__QUEUE": "yes"}).load(
+        configs / "sweep.yaml", overrides=["experiment.name=no"]
+    )
+    assert (config.experiment.name, config.experiment.queue) == ("no", "yes")
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+from kubernetes.client import (
+    CoreV1Event,
+    V1Container,
+    V1ContainerState,
+    V1ContainerStateTerminated,
+    V1ContainerStatus,
+    V1ObjectMeta,
+    V1ObjectReference,
+    V1Pod,
+    V1PodSpec,
+    V1PodStatus,
+)
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.k8s_runner import STARTUP_GATE_CONTAINER
+from kubr.backends.volcano import _replica_status, group_events
+from kubr.commands.desc import format_ranks
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import PODGROUPS, VOLCANO_JOBS
+
+describe_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "desc"
+    namespace: "default"
+"""
+
+
+def pod_event(pod: str, reason: str, message: str, minute: int, count: int = 1) -> CoreV1Event:
+    return CoreV1Event(
+        metadata=V1ObjectMeta(name=f"{pod}.{minute}"),
+        involved_object=V1ObjectReference(kind="Pod", name=pod),
+        type="Normal",
+        reason=reason,
+        message=message,
+        count=count,
+        last_timestamp=datetime(2024, 1, 1, 0, minute),
+    )
+
+
+def test_group_events_merges_ranks():
+    events = [
+        ("Pod", rank, f"train-worker-{rank}-0", pod_event(f"train-worker-{rank}-0", "Pulled", "Image pulled", rank))
+        for rank in range(4)
+    ]
+    events.append(
+        ("Pod", 2, "train-worker-2-0", pod_event("train-worker-2-0", "Scheduled", "Assigned train-worker-2-0", 9, 2))
+    )
+    summaries = group_events(events)
+
+    assert [(s.reason, s.ranks, s.count) for s in summaries] == [("Scheduled", [2], 2), ("Pulled", [0, 1, 2, 3], 4)]
+    assert summaries[0].message == "Assigned <pod>"
+    assert summaries[1].last_seen == datetime(2024, 1, 1, 0, 3)
+
+
+def test_format_ranks():
+    assert format_ranks([0, 1, 2, 5, 7, 8]) == "0-2,5,7-8"
+
+
+def test_describe_job(backend, fake_api):
+    runner_config = parse_yaml_raw_as(RunnerConfig, describe_config)
+    backend.run_job(runner_config)
+    for rank in range(2):
+        fake_api.add_event(
+            "default", "Pod", f"desc-worker-{rank}-0", "Pulled", f"Pulled image for desc-worker-{rank}-0"
+        )
+    fake_api.add_event("default", "Job", "desc", "Created", "Job created")
+    uid = fake_api.get(VOLCANO_JOBS, "default", "desc")["metadata"]["uid"]
+    fake_api.add_event("default", "PodGroup", f"desc-{uid}", "Unschedulable", "0/2 nodes are available")
+
+    description = backend.describe_job(job_name="desc", namespace="default")
+
+    assert description.state == "Pending"
+    assert description.podgroup_phase == "Pending"
+    assert [replica.rank for replica in description.replicas] == [0, 1]
+    assert {(event.source, tuple(event.ranks)) for event in description.events} == {
+        ("Pod", (0, 1)),
+        ("Job", ()),
+        ("PodGroup", ()),
+    }
+
+    # older Volcano releases name the pod group after the job
+    podgroup = fake_api.remove(PODGROUPS, "default", f"desc-{uid}")
+    podgroup["metadata"]["name"] = "desc"
+    fake_api.put(PODGROUPS, podgroup, notify=False)
+    fake_api.add_event("default", "PodGroup", "desc", "Scheduled", "Pod group scheduled")
+    description = backend.describe_job(job_name="desc", namespace="default")
+    assert [event.reason for event in description.events if event.source == "PodGroup"] == ["Scheduled"]
+
+
+def test_replica_reports_gate_wait():
+    def gated_pod(message: str) -> V1Pod:
+        terminated = V1ContainerStateTerminated(
+            exit_code=0, message=message, started_at=datetime(2024, 1, 1), finished_at=datetime(2024, 1, 1, 0, 1)
+        )
+        return V1Pod(
+            metadata=V1ObjectMeta(name="desc-worker-1-0", labels={"kubr.io/replica-id": "1"}),
+            spec=V1PodSpec(containers=[V1Container(name="desc")]),
+            status=V1PodStatus(
+                phase="Running",
+                init_container_statuses=[
+                    V1ContainerStatus(
+                        name=STARTUP_GATE_CONTAINER,
+                        image="noop",
+                        image_id="",
+                        ready=False,
+                        restart_count=0,
+                        state=V1ContainerState(terminated=terminated),
+                    )
+                ],
+            ),
+        )
+
+    assert _replica_status(gated_pod("waited=12.345")).gate_wait == 12.345
+    # without the message, e.g. when it was truncated, the container times are used
+    assert _replica_status(gated_pod("")).gate_wait == 60
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.gc import JobCollector
+from kubr.backends.history import HistoryStore
+from kubr.backends.volcano import VolcanoBackend
+from kubr.commands.gc import EXIT_FAILED, EXIT_OK, GcCommand
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import EVENTS, VOLCANO_JOBS
+
+gc_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "gc"
+    namespace: "default"
+"""
+
+
+def submit(backend, name: str, namespace: str = "default", phase: str = "Completed", fake_api=None):
+    config = parse_yaml_raw_as(RunnerConfig, gc_config)
+    config.experiment.name = name
+    config.experiment.namespace = namespace
+    backend.submit_job(config)
+    if phase != "Pending":
+        fake_api.set_job_phase(namespace, name, phase)
+
+
+def test_collects_expired_jobs_per_namespace_ttl(fake_api, tmp_path: Path):
+    fake_api.namespaces.add("research")
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    backend = VolcanoBackend(api_client=fake_api.api_client(), history=store)
+    for index in range(5):
+        submit(backend, f"done{index}", fake_api=fake_api)
+    submit(backend, "failed", phase="Failed", fake_api=fake_api)
+    submit(backend, "running", phase="Running", fake_api=fake_api)
+    submit(backend, "short", namespace="research", fake_api=fake_api)
+    fake_api.add_event("default", "Pod", "done0-worker-1-0", "Pulled", "Pulled image")
+    fake_api.add_event("default", "Job", "running", "Created", "Job created")
+
+    collector = JobCollector(
+        backend, ttl=timedelta(days=7), namespace_ttls={"research": timedelta(days=1)}, batch_size=2, concurrency=2
+    )
+    assert collector.collect(now=datetime.utcnow() + timedelta(hours=12)).deleted == []
+
+    report = collector.collect(now=datetime.utcnow() + timedelta(days=2), dry_run=True)
+    assert [job.name for job in report.deleted] == ["short"]
+    assert fake_api.get(VOLCANO_JOBS, "research", "short") is not None
+
+    report = collector.collect(now=datetime.utcnow() + timedelta(days=8))
+    assert sorted(job.name for job in report.deleted) == [
+        "done0",
+        "done1",
+        "done2",
+        "done3",
+        "done4",
+        "failed",
+        "short",
+    ]
+    assert report.failed == {} and report.archived == 7
+    assert [name for _, name in fake_api.objects[VOLCANO_JOBS]] == ["running"]
+    # only the events of collected jobs are deleted
+    assert [event["involvedObject"]["name"] for event in fake_api.objects[EVENTS].values()] == ["running"]
+    assert len(store.query(limit=None)) == 7
+
+
+def test_ttl_seconds_after_finished(backend, fake_api):
+    config = parse_yaml_raw_as(RunnerConfig, gc_config)
+    config.experiment.ttl_seconds_after_finished = 3600
+    backend.submit_job(config)
+    assert fake_api.get(VOLCANO_JOBS, "default", "gc")["spec"]["ttlSecondsAfterFinished"] == 3600
+
+
+def test_gc_command_exit_codes(fake_api, monkeypatch, tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    backend = VolcanoBackend(api_client=fake_api.api_client(), history=store)
+    command = GcCommand(backend=backend)
+    assert command(yes=True) == EXIT_OK
+
+    submit(backend, "done", fake_api=fake_api)
+    submit(backend, "stuck", fake_api=fake_api)
+    store.archive([backend.job_record(fake_api.get(VOLCANO_JOBS, "default", "done"))])
+    delete = backend.delete_k8s_job
+
+    def delete_or_fail(k8s_job):
+        if k8s_job["metadata"]["name"] == "stuck":
+            raise RuntimeError("finalizer pending")
+        delete(k8s_job)
+
+    monkeypatch.setattr(backend, "delete_k8s_job", delete_or_fail)
+    assert command(ttl="0s", yes=True) == EXIT_FAILED
+    assert [name for _, name in fake_api.objects[VOLCANO_JOBS]] == ["stuck"]
+    # only the job missing from the history was archived
+    assert len(store.query(limit=None)) == 2
+    assert command(ttl="not a duration", yes=True) == EXIT_FAILED
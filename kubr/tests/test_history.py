@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.history import HistoryStore
+from kubr.backends.volcano import VolcanoBackend
+from kubr.commands.history import parse_time
+from kubr.config.job import JobRecord
+from kubr.config.runner import RunnerConfig
+
+history_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+    gpu: 4
+
+experiment:
+    name: "archived"
+    namespace: "default"
+"""
+
+NOW = datetime(2024, 6, 1)
+
+
+def record(index: int, state: str = "Completed", queue: str = "default", age_days: float = 0) -> JobRecord:
+    created = NOW - timedelta(days=age_days)
+    return JobRecord(
+        uid=f"uid-{index}",
+        name=f"sweep-{index}",
+        namespace="research",
+        state=state,
+        queue=queue,
+        gpu=8,
+        created_at=created,
+        finished_at=created + timedelta(hours=1),
+        archived_at=NOW,
+        spec={"queue": queue},
+        logs_tail="loss=0.1\n",
+    )
+
+
+def test_query_filters(tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    store.archive(
+        [
+            record(0, state="Failed", queue="prod", age_days=1),
+            record(1, state="Failed", queue="prod", age_days=10),
+            record(2, state="Failed", queue="research", age_days=2),
+            record(3, state="Completed", queue="prod", age_days=3),
+        ]
+    )
+
+    last_week = store.query(state="Failed", queue="prod", since=parse_time("7d", now=NOW))
+    assert [r.name for r in last_week] == ["sweep-0"]
+    assert last_week[0].spec is None and last_week[0].duration == timedelta(hours=1)
+
+    assert [r.name for r in store.query(name="sweep-[12]")] == ["sweep-2", "sweep-1"]
+    detailed = store.query(name="sweep-3", details=True)[0]
+    assert detailed.spec == {"queue": "prod"} and detailed.logs_tail == "loss=0.1\n"
+
+    # records are keyed by uid, archiving again replaces them
+    store.archive([record(3, state="Failed", queue="prod", age_days=3)])
+    assert store.query(name="sweep-3")[0].state == "Failed"
+    assert len(store.query(limit=None)) == 4
+
+
+def test_delete_archives_job(fake_api, tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    backend = VolcanoBackend(api_client=fake_api.api_client(), history=store)
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, history_config))
+    fake_api.set_logs("default", "archived-worker-0-0", ["step 1", "step 2"])
+    fake_api.set_job_phase("default", "archived", "Failed")
+
+    backend.delete_job(job_name="archived", namespace="default")
+
+    (archived,) = store.query(name="archived", details=True)
+    assert (archived.state, archived.gpu, archived.nodes) == ("Failed", 8, 2)
+    assert archived.finished_at is not None
+    assert archived.logs_tail == "step 1\nstep 2\n"
+    assert archived.spec["tasks"][0]["name"] == "worker-0"
+
+
+def test_archive_finished_jobs(fake_api, tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    backend = VolcanoBackend(api_client=fake_api.api_client(), history=store)
+    config = parse_yaml_raw_as(RunnerConfig, history_config)
+    for name in ["done", "running"]:
+        config.experiment.name = name
+        backend.submit_job(config)
+    fake_api.set_job_phase("default", "done", "Completed")
+
+    assert backend.archive_finished_jobs() == 1
+    assert backend.archive_finished_jobs() == 0
+    assert [r.name for r in store.query()] == ["done"]
+
+
+def test_uids_among(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr("kubr.backends.history._MAX_PARAMS", 2)
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    store.archive([record(index) for index in range(5)])
+    assert store.uids(among=["uid-0", "uid-3", "uid-4", "uid-9"]) == {"uid-0", "uid-3", "uid-4"}
+    assert store.uids(namespace="default", among=["uid-0"]) == set()
+    assert store.uids(among=[]) == set()
+    assert len(store.uids()) == 5
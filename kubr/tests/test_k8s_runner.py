@@ -0,0 +1,127 @@
+import socket
+import subprocess
+import sys
+import time
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.k8s_runner import (
+    LABEL_REPLICA_ID,
+    RDZV_WAIT_CONTAINER,
+    STARTUP_GATE_CONTAINER,
+    create_pod_definition,
+    create_rendezvous_service,
+    rendezvous_host,
+)
+from kubr.config.runner import ContainerConfig, RunnerConfig
+
+multi_node_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python train.py"
+
+resources:
+    nodes: 4
+    gpu: 8
+
+experiment:
+    name: "pytest"
+    namespace: "default"
+
+rendezvous:
+    mode: "service"
+"""
+
+
+class TestRendezvous:
+    def test_service_mode_passes_rank_explicitly(self):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        pod = create_pod_definition("pytest", runner_config, service_account=None, rank0_env=None, replica_id=2)
+        cmd = pod.spec.containers[0].command
+
+        assert cmd[0] == "torchrun"
+        assert cmd[cmd.index("--node_rank") + 1] == "2"
+        assert cmd[cmd.index("--nnodes") + 1] == "4"
+        assert cmd[cmd.index("--master_addr") + 1] == rendezvous_host("pytest", "default")
+        assert cmd[-2:] == ["python", "train.py"]
+        assert [c.name for c in pod.spec.init_containers] == [RDZV_WAIT_CONTAINER]
+        assert pod.metadata.labels[LABEL_REPLICA_ID] == "2"
+
+    def test_rank0_does_not_wait(self):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        pod = create_pod_definition("pytest", runner_config, service_account=None, rank0_env=None, replica_id=0)
+        assert pod.spec.init_containers == []
+
+    def test_env_mode_does_not_mutate_config(self):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        runner_config.rendezvous.mode = "env"
+        for replica_id in range(runner_config.resources.nodes):
+            rank0_env = "VC_WORKER_0_HOSTS" if replica_id > 0 else None
+            pod = create_pod_definition("pytest", runner_config, None, rank0_env=rank0_env, replica_id=replica_id)
+            assert pod.spec.containers[0].command[:2] == ["bash", "-c"]
+        assert runner_config.container.env == []
+
+    def test_service_selects_rank0(self):
+        service = create_rendezvous_service("pytest", "default", port=29500)
+        assert service.spec.cluster_ip == "None"
+        assert service.spec.selector[LABEL_REPLICA_ID] == "0"
+
+
+def gate_command(runner_config: RunnerConfig, replica_id: int, rank0_env=None):
+    pod = create_pod_definition("pytest", runner_config, None, rank0_env=rank0_env, replica_id=replica_id)
+    (gate,) = [c for c in pod.spec.init_containers if c.name == STARTUP_GATE_CONTAINER]
+    return gate.command
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestStartupGate:
+    def test_gate_replaces_rendezvous_wait(self):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        runner_config.rendezvous.gate = True
+        runner_config.init_container = ContainerConfig(image="stage:latest", entrypoint="stage-data")
+        for replica_id in [0, 2]:
+            pod = create_pod_definition("pytest", runner_config, None, rank0_env=None, replica_id=replica_id)
+            # the gate runs after data staging
+            assert [c.name for c in pod.spec.init_containers] == ["pytest-init", STARTUP_GATE_CONTAINER]
+        command = gate_command(runner_config, 2)
+        assert command[3:7] == ["2", "4", rendezvous_host("pytest", "default"), "29500"]
+
+        runner_config.rendezvous.mode = "env"
+        assert gate_command(runner_config, 1, rank0_env="VC_WORKER_0_HOSTS")[5] == "$VC_WORKER_0_HOSTS"
+
+    def test_gate_releases_replicas_together(self, tmp_path, monkeypatch):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        runner_config.rendezvous.mode, runner_config.rendezvous.gate = "env", True
+        runner_config.rendezvous.port = free_port()
+        runner_config.resources.nodes = 3
+        monkeypatch.setenv("RANK0_HOST", "127.0.0.1")
+
+        def start(rank: int):
+            command = gate_command(runner_config, rank, rank0_env="RANK0_HOST" if rank else None)
+            command[0], command[-1] = sys.executable, str(tmp_path / f"gate-{rank}")
+            return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+        early = [start(1), start(2)]
+        time.sleep(0.5)
+        rank0 = start(0)
+        for process in early + [rank0]:
+            assert process.wait(timeout=10) == 0, process.stderr.read()
+        waited = {rank: float((tmp_path / f"gate-{rank}").read_text().split("=")[1]) for rank in range(3)}
+        assert waited[1] >= 0.4 and waited[2] >= 0.4 and waited[0] < waited[1]
+
+    def test_gate_times_out(self, tmp_path):
+        runner_config = parse_yaml_raw_as(RunnerConfig, multi_node_config)
+        runner_config.rendezvous.gate = True
+        runner_config.rendezvous.port = free_port()
+        runner_config.rendezvous.gate_timeout = 1
+        command = gate_command(runner_config, 0)
+        command[0], command[-1] = sys.executable, str(tmp_path / "gate-0")
+
+        result = subprocess.run(command, capture_output=True, text=True, timeout=10)
+        assert result.returncode != 0 and "not all 4 replicas reached the gate" in result.stderr
+        assert not (tmp_path / "gate-0").exists()
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from kubernetes import client
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.base import KubrError
+from kubr.backends.cluster import ClusterBackend
+from kubr.backends.kubernetes import KubernetesBackend
+from kubr.backends.registry import BACKENDS, create_backend
+from kubr.backends.volcano import VolcanoBackend
+from kubr.backends.waiter import JobTracker
+from kubr.config.job import JobBackend, JobState, JobType
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import BATCH_JOBS, EVENTS, PODS, VOLCANO_JOBS, FakeKubernetesApi
+
+indexed_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python shard.py"
+
+resources:
+    nodes: 3
+    gpu: 1
+
+type: basic
+backend: Kubernetes
+
+experiment:
+    name: "shards"
+    namespace: "default"
+    job_retries: 2
+"""
+
+volcano_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+    gpu: 8
+
+experiment:
+    name: "train"
+    namespace: "default"
+"""
+
+
+@pytest.fixture
+def cluster(fake_api: FakeKubernetesApi) -> ClusterBackend:
+    return ClusterBackend(api_client=fake_api.api_client())
+
+
+def test_registry(fake_api: FakeKubernetesApi):
+    assert BACKENDS[JobBackend.Volcano] is VolcanoBackend
+    backend = create_backend(JobBackend.Kubernetes, api_client=fake_api.api_client())
+    assert isinstance(backend, KubernetesBackend) and backend.kind == JobBackend.Kubernetes
+    # Volcano-only calls, e.g. pod groups, are not inherited by other backends
+    assert not isinstance(backend, VolcanoBackend) and not hasattr(backend, "_get_podgroup")
+
+
+def test_indexed_job_replicas(fake_api: FakeKubernetesApi, cluster: ClusterBackend):
+    job = cluster.submit_job(parse_yaml_raw_as(RunnerConfig, indexed_config))
+    assert (job.backend, job.type, job.gpu) == (JobBackend.Kubernetes, JobType.basic, 3)
+    spec = fake_api.get(BATCH_JOBS, "default", "shards")["spec"]
+    assert (spec["completionMode"], spec["completions"], spec["parallelism"], spec["backoffLimit"]) == (
+        "Indexed",
+        3,
+        3,
+        2,
+    )
+    assert fake_api.list(VOLCANO_JOBS, None) == []
+
+    assert [rank for rank, _ in cluster.job_placement("shards", "default").values()] == [0, 1, 2]
+    pod = cluster.get_replica_pod("shards", "default", rank=2)
+    assert pod.metadata.name.startswith("shards-2-")
+    fake_api.set_logs("default", cluster.get_replica_pod("shards", "default").metadata.name, ["shard 0 done"])
+    assert cluster.get_logs("shards", "default").strip() == "shard 0 done"
+
+    fake_api.set_batch_job_state("default", "shards", "Running")
+    assert cluster.get_job("shards", "default").state == JobState.Running
+    fake_api.set_batch_job_state("default", "shards", "Complete")
+    description = cluster.describe_job("shards", "default")
+    assert description.state == "Completed" and description.podgroup_phase is None
+    assert [replica.phase for replica in description.replicas] == ["Succeeded"] * 3
+
+
+def test_replicas_read_their_rank_from_the_completion_index(fake_api: FakeKubernetesApi, cluster: ClusterBackend):
+    config = parse_yaml_raw_as(RunnerConfig, indexed_config)
+    config.resources.nodes = 2
+    cluster.submit_job(config)
+    (container,) = fake_api.get(BATCH_JOBS, "default", "shards")["spec"]["template"]["spec"]["containers"]
+    env = {var["name"]: var for var in container["env"]}
+    assert env["KUBR_NODE_RANK"] == {
+        "name": "KUBR_NODE_RANK",
+        "valueFrom": {"fieldRef": {"fieldPath": "metadata.annotations['batch.kubernetes.io/job-completion-index']"}},
+    }
+    assert env["KUBR_NNODES"]["value"] == "2"
+
+
+def test_listing_and_deletion_span_backends(fake_api: FakeKubernetesApi, cluster: ClusterBackend):
+    cluster.submit_job(parse_yaml_raw_as(RunnerConfig, volcano_config))
+    cluster.submit_job(parse_yaml_raw_as(RunnerConfig, indexed_config))
+    # Jobs kubr did not submit are not listed
+    fake_api.put(BATCH_JOBS, {"metadata": {"name": "kubr-gc", "namespace": "default"}, "spec": {}})
+    jobs = {job.name: job.backend for job in cluster.list_jobs(namespace="default")}
+    assert jobs == {"train": JobBackend.Volcano, "shards": JobBackend.Kubernetes}
+
+    fresh = ClusterBackend(api_client=fake_api.api_client())
+    pod = fresh.get_replica_pod("shards", "default", rank=1)
+    fake_api.add_event("default", "Pod", pod.metadata.name, "Scheduled", "scheduled")
+    assert fresh.delete_job("shards", "default") is not None
+    assert fake_api.get(BATCH_JOBS, "default", "shards") is None
+    assert fake_api.list(PODS, "default", label_selector="job-name=shards") == []
+    assert fake_api.list(EVENTS, "default") == []
+    assert [job.name for job in fresh.list_jobs()] == ["train"]
+
+
+def test_listings_skip_forbidden_backends(fake_api: FakeKubernetesApi, cluster: ClusterBackend, caplog):
+    cluster.submit_job(parse_yaml_raw_as(RunnerConfig, volcano_config))
+    fake_api.set_job_phase("default", "train", "Running")
+    fake_api.forbidden.add(BATCH_JOBS)
+
+    assert [job.name for job in cluster.list_jobs()] == ["train"]
+    assert cluster._completion_list_running_jobs() == ["train"]
+    jobs, version = cluster.list_jobs_at_version()
+    assert [job.name for job in jobs] == ["train"] and list(json.loads(version)) == [str(JobBackend.Volcano)]
+    # the forbidden backend is asked and reported once
+    assert fake_api.requests["GET batchjobs"] == 1
+    assert caplog.text.count("Skipping jobs of the Kubernetes backend") == 1
+
+    fake_api.forbidden.add(VOLCANO_JOBS)
+    with pytest.raises(client.ApiException) as error:
+        ClusterBackend(api_client=fake_api.api_client()).list_jobs()
+    assert error.value.status == 403
+
+
+def test_multi_node_torchrun_needs_volcano(cluster: ClusterBackend):
+    config = parse_yaml_raw_as(RunnerConfig, volcano_config)
+    config.backend = JobBackend.Kubernetes
+    with pytest.raises(KubrError, match="gang scheduling"):
+        cluster.submit_job(config)
+    with pytest.raises(KubrError):
+        cluster.backends[JobBackend.Kubernetes].restart_job("shards", "default")
+
+
+def test_tracks_jobs_of_every_backend(fake_api: FakeKubernetesApi, cluster: ClusterBackend):
+    cluster.submit_job(parse_yaml_raw_as(RunnerConfig, volcano_config))
+    cluster.submit_job(parse_yaml_raw_as(RunnerConfig, indexed_config))
+    tracker = JobTracker(cluster, namespace="default", watch_seconds=5)
+
+    train, shards = tracker.track_many([("train", "default"), ("shards", "default")])
+    fake_api.set_batch_job_state("default", "shards", "Complete")
+    assert shards.result(timeout=10).state == JobState.Completed
+    fake_api.set_job_phase("default", "train", "Failed")
+    assert train.result(timeout=10).state == JobState.Failed
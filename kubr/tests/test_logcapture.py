@@ -0,0 +1,90 @@
+import gzip
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.logcapture import LogArchive, LogCapture, RankLogWriter, format_timestamp, timestamp_ns
+from kubr.commands.logs import LogsCommand
+from kubr.config.runner import RunnerConfig
+
+capture_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "capture"
+    namespace: "default"
+"""
+
+START = datetime(2024, 1, 1)
+
+
+def log(rank: int, lines: int):
+    return [f"rank {rank} step {step}" for step in range(lines)]
+
+
+def test_timestamps():
+    assert timestamp_ns(b"2024-01-01T00:00:01.5Z") == 1704067201500000000
+    assert timestamp_ns(format_timestamp(1704067201000000007).encode()) == 1704067201000000007
+
+
+def test_capture_resumes_after_disconnect(backend, fake_api, tmp_path: Path):
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, capture_config))
+    for rank in range(2):
+        fake_api.set_logs("default", f"capture-worker-{rank}-0", log(rank, 5000), start=START)
+    fake_api.set_job_phase("default", "capture", "Completed", pod_phase="Succeeded")
+    fake_api.disconnect_logs(after=1000)
+
+    written = LogCapture(backend, "capture", "default", tmp_path, block_bytes=4096, retry_seconds=0).run()
+
+    assert written == {0: 5000, 1: 5000}
+    assert fake_api.requests["GET pods"] >= 3
+    archive = LogArchive(tmp_path)
+    assert archive.ranks() == [0, 1]
+    assert list(archive.read(1)) == [line + "\n" for line in log(1, 5000)]
+    # blocks are plain gzip members, the whole file decompresses with any gzip tool
+    assert gzip.decompress(archive.path(0).read_bytes()).count(b"\n") == 5000
+
+    since = START + timedelta(milliseconds=4990)
+    assert list(archive.read(0, since=since)) == [line + "\n" for line in log(0, 5000)[4990:]]
+    merged = list(archive.merged(since=since, until=since + timedelta(milliseconds=2)))
+    assert merged == [
+        (0, "rank 0 step 4990\n"),
+        (1, "rank 1 step 4990\n"),
+        (0, "rank 0 step 4991\n"),
+        (1, "rank 1 step 4991\n"),
+    ]
+
+
+def test_writer_recovers_interrupted_block(tmp_path: Path):
+    path = tmp_path / "rank-0.log.gz"
+    stamp = b"2024-01-01T00:00:00.000000001Z"
+    writer = RankLogWriter(path)
+    writer.write(stamp + b" first\n" + stamp + b" second\n")
+    writer._file.flush()  # the process dies with the block still open
+
+    writer = RankLogWriter(path)
+    assert (writer.resume.last_ns, writer.resume.last_count) == (timestamp_ns(stamp), 2)
+    assert writer.resume.since_time() == "2024-01-01T00:00:00.000000001Z"
+    # the replayed lines logged at the resume time are skipped, later ones are kept
+    replay = writer.resume.skip_replayed(stamp + b" first\n" + stamp + b" second\n" + stamp + b" third\n")
+    assert writer.write(replay) == 1
+    writer.close()
+
+    assert gzip.decompress(path.read_bytes()).split(b"\n")[:-1] == [
+        stamp + b" " + w for w in [b"first", b"second", b"third"]
+    ]
+
+
+def test_archive_filters_require_archive(backend, fake_api, capsys):
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, capture_config))
+    requests = sum(fake_api.requests.values())
+
+    LogsCommand(backend=backend)(job_name="capture", namespace="default", rank=1, since="30m")
+
+    assert "--rank" in capsys.readouterr().out
+    assert sum(fake_api.requests.values()) == requests
@@ -0,0 +1,96 @@
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.logsearch import LogSearch, PatternSet
+from kubr.commands.watch_logs import EXIT_ALERT, EXIT_QUIET, WatchLogsCommand
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import VOLCANO_JOBS
+
+search_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+
+experiment:
+    name: "search"
+    namespace: "default"
+"""
+
+
+def log(rank: int, lines: int, failures=()):
+    steps = [f"rank {rank} step {step} loss=0.5" for step in range(lines)]
+    for step, line in failures:
+        steps[step] = line
+    return steps
+
+
+def submit(backend, fake_api, pod_phase: str = "Running"):
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, search_config))
+    fake_api.set_job_phase("default", "search", "Running", pod_phase=pod_phase)
+
+
+def test_grep_all_replicas(backend, fake_api):
+    submit(backend, fake_api, pod_phase="Succeeded")
+    fake_api.set_logs("default", "search-worker-0-0", log(0, 20000, [(4000, "NCCL watchdog: collective timeout")]))
+    fake_api.set_logs("default", "search-worker-1-0", log(1, 20000, [(3000, "step 3000 loss=NaN")]))
+
+    patterns = PatternSet(["loss=nan", "NCCL.*timeout"], ignore_case=True)
+    matches = LogSearch(backend, "search", "default", patterns, context=2).run()
+
+    assert [(m.rank, m.pattern) for m in matches] == [(1, "loss=nan"), (0, "NCCL.*timeout")]
+    assert matches[0].line == "step 3000 loss=NaN"
+    assert matches[0].before == ["rank 1 step 2998 loss=0.5", "rank 1 step 2999 loss=0.5"]
+    assert matches[0].after == ["rank 1 step 3001 loss=0.5", "rank 1 step 3002 loss=0.5"]
+    # the pod list and one log request per replica, the whole log is scanned in a single pass
+    assert fake_api.requests["GET pods"] == 3
+
+
+def test_context_spans_chunks():
+    search = LogSearch(None, "search", "default", PatternSet(["boom"]), context=2)
+    stamp = b"2024-01-01T00:00:00Z "
+    search._on_data(0, stamp + b"one\n" + stamp + b"two\n")
+    search._on_data(0, stamp + b"boom\n" + stamp + b"three\n")
+
+    (match,) = search.matches
+    assert (match.before, match.line, match.after) == (["one", "two"], "boom", ["three"])
+
+
+def test_patterns_match_messages_without_timestamps():
+    search = LogSearch(None, "search", "default", PatternSet(["^ERROR", "loss$", "2024", r"(?P<w>\w+) (?P=w)"]))
+    search._on_data(
+        0,
+        b"2024-01-01T00:00:00Z step 1 ERROR\n"
+        b"2024-01-01T00:00:01Z ERROR in step 2\n"
+        b"2024-01-01T00:00:02Z step 3 loss\n"
+        b"2024-01-01T00:00:03.5Z loss 4 again again\n",
+    )
+
+    assert [(match.pattern, match.line, match.timestamp) for match in search.matches] == [
+        ("^ERROR", "ERROR in step 2", 1704067201.0),
+        ("loss$", "step 3 loss", 1704067202.0),
+        (r"(?P<w>\w+) (?P=w)", "loss 4 again again", 1704067203.5),
+    ]
+    with pytest.raises(ValueError, match="numbered backreference"):
+        PatternSet(["loss", r"(a)\1"])
+    # an escaped backslash before a digit is no backreference
+    assert PatternSet([r"C:\\1"]).search(b"C:\\1\n") == (r"C:\\1", 0)
+
+
+def test_watch_logs_alert_deletes_job(backend, fake_api):
+    submit(backend, fake_api)
+    fake_api.set_logs("default", "search-worker-0-0", log(0, 100))
+    fake_api.set_logs("default", "search-worker-1-0", log(1, 100, [(50, "RuntimeError: CUDA error")]))
+
+    command = WatchLogsCommand(backend=backend)
+    assert command(job_name="search", alerts=["CUDA error", "NCCL.*timeout"], delete=True) == EXIT_ALERT
+    assert fake_api.get(VOLCANO_JOBS, "default", "search") is None
+
+
+def test_watch_logs_quiet(backend, fake_api):
+    submit(backend, fake_api, pod_phase="Succeeded")
+    for rank in range(2):
+        fake_api.set_logs("default", f"search-worker-{rank}-0", log(rank, 100))
+
+    assert WatchLogsCommand(backend=backend)(job_name="search", alerts=["CUDA error"]) == EXIT_QUIET
@@ -0,0 +1,127 @@
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.k8s_runner import create_pod_definition, shm_size
+from kubr.backends.nccl import (
+    ANNOTATION_IB_HCA,
+    ANNOTATION_SOCKET_IFNAME,
+    AllReduceTest,
+    NetworkHints,
+    nccl_env,
+    parse_allreduce,
+)
+from kubr.config.runner import EnvVar, RunnerConfig
+from kubr.tests.fake_api import CONFIGMAPS, VOLCANO_JOBS, FakeKubernetesApi
+
+ib_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python train.py"
+
+resources:
+    nodes: 2
+    gpu: 8
+    memory: 64
+    ib: 8
+    ib_device: "rdma/ib"
+    dataloader_workers: 6
+
+experiment:
+    name: "train"
+    namespace: "default"
+"""
+
+ALLREDUCE_LOG = [
+    "[default0]:NCCL INFO NET/Plugin: No plugin found",
+    "[default0]:NCCL INFO Using network IB",
+    "[default0]:KUBR_ALLREDUCE bytes=1048576 seconds=0.000210 algbw=4.993 busbw=9.362 world=16",
+    "[default0]:KUBR_ALLREDUCE bytes=268435456 seconds=0.003020 algbw=88.885 busbw=166.659 world=16",
+]
+
+
+def pod_env(config: RunnerConfig, network: NetworkHints = None):
+    pod = create_pod_definition("train", config, None, rank0_env=None, replica_id=0, network=network)
+    return {env.name: env.value for env in pod.spec.containers[0].env}
+
+
+def test_ib_env_from_node_hints():
+    config = parse_yaml_raw_as(RunnerConfig, ib_config)
+    env = pod_env(config, NetworkHints(ib_hca="mlx5_0,mlx5_3", socket_ifname="bond0"))
+    assert "NCCL_IB_DISABLE" not in env and env["NCCL_IB_HCA"] == "mlx5_0,mlx5_3"
+    assert env["NCCL_SOCKET_IFNAME"] == "bond0" and env["NCCL_NET_GDR_LEVEL"] == "PHB"
+    assert env["NCCL_DEBUG"] == "WARN"
+
+    # explicit settings win over hints, variables of the container config win over both
+    config.nccl.socket_ifname = "eth1"
+    config.container.env = [EnvVar(name="NCCL_IB_HCA", value="mlx5_1")]
+    env = pod_env(config, NetworkHints(ib_hca="mlx5_0,mlx5_3", socket_ifname="bond0"))
+    assert (env["NCCL_SOCKET_IFNAME"], env["NCCL_IB_HCA"]) == ("eth1", "mlx5_1")
+
+
+def test_env_without_ib():
+    config = parse_yaml_raw_as(RunnerConfig, ib_config)
+    config.resources.ib = 0
+    env = nccl_env(config.resources, config.nccl)
+    # the transport is left to NCCL, a node without HCAs falls back to sockets on its own
+    assert "NCCL_IB_DISABLE" not in env and "NCCL_IB_HCA" not in env
+    config.resources.ib = "auto"
+    assert nccl_env(config.resources, config.nccl, NetworkHints(ib_hca="mlx5"))["NCCL_IB_HCA"] == "mlx5"
+    config.container.env = [EnvVar(name="NCCL_IB_DISABLE", value="1")]
+    assert pod_env(config)["NCCL_IB_DISABLE"] == "1"
+    config.nccl.auto = False
+    assert nccl_env(config.resources, config.nccl, NetworkHints(ib_hca="mlx5")) == {"NCCL_DEBUG": "WARN"}
+    config.resources.gpu = 0
+    assert nccl_env(config.resources, config.nccl) == {}
+
+
+def test_shm_size():
+    config = parse_yaml_raw_as(RunnerConfig, ib_config)
+    # 8 GPUs x (1 + 6 workers) GB, capped at half of the memory limit
+    assert shm_size(config.resources) == 32
+    config.resources.memory = 0
+    assert shm_size(config.resources) == 56
+    config.resources.shm = 4
+    assert shm_size(config.resources) == 4
+    config.resources.shm = config.resources.dataloader_workers = None
+    assert shm_size(config.resources) is None
+
+
+def test_network_hints_agreed_by_ib_nodes(fake_api: FakeKubernetesApi, backend):
+    hints = {ANNOTATION_IB_HCA: "mlx5_0,mlx5_1", ANNOTATION_SOCKET_IFNAME: "bond0"}
+    fake_api.add_node("ib1", annotations=hints, allocatable={"rdma/ib": "8"})
+    fake_api.add_node(
+        "ib2", annotations=dict(hints, **{ANNOTATION_SOCKET_IFNAME: "eth0"}), allocatable={"rdma/ib": "8"}
+    )
+    fake_api.add_node("ethernet", annotations={ANNOTATION_SOCKET_IFNAME: "eth0"})
+    fake_api.add_node("cpu", gpu=0)
+    config = parse_yaml_raw_as(RunnerConfig, ib_config)
+    assert backend.network_hints(config) == NetworkHints(ib_hca="mlx5_0,mlx5_1")
+    backend.network_hints(config)
+    assert fake_api.requests["GET nodes"] == 1
+
+    backend.submit_job(config)
+    pod = fake_api.get("pods", "default", "train-worker-1-0")
+    env = {env["name"]: env.get("value") for env in pod["spec"]["containers"][0]["env"]}
+    assert env["NCCL_IB_HCA"] == "mlx5_0,mlx5_1"
+
+
+def test_allreduce_test_job(fake_api: FakeKubernetesApi, backend):
+    config = parse_yaml_raw_as(RunnerConfig, ib_config)
+    test = AllReduceTest(backend, config, size_mb=256, poll_seconds=0)
+    test_config = test.test_config()
+    assert test_config.container.entrypoint == "/opt/kubr/allreduce.py --size-mb 256 --iterations 20"
+    assert test_config.data.volumes[-1].mount_path == "trainnccltest:/opt/kubr"
+    assert config.container.entrypoint == "python train.py"
+
+    fake_api.set_logs("default", "trainnccltest-worker-0-0", ALLREDUCE_LOG)
+    report = test.run(timeout=0)
+    assert report.transport == "IB" and report.env["NCCL_DEBUG"] == "INFO"
+    assert [result.bytes for result in report.results] == [2**20, 2**28]
+    assert report.peak_busbw == pytest.approx(166.659)
+    assert fake_api.list(VOLCANO_JOBS, None) == [] and fake_api.list(CONFIGMAPS, None) == []
+
+
+def test_parse_allreduce_ignores_other_lines():
+    assert parse_allreduce("KUBR_ALLREDUCE done\nloss=0.1\n") == []
+    (result,) = parse_allreduce(ALLREDUCE_LOG[2])
+    assert (result.world, result.busbw) == (16, 9.362)
@@ -0,0 +1,122 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from kubr.backends.pipeline import STEP_SKIPPED, PipelineRunner
+from kubr.config.loader import ConfigError
+from kubr.config.pipeline import load_pipeline
+from kubr.tests.fake_api import VOLCANO_JOBS
+
+step_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python {script} --out {{{{ steps.preprocess.outputs.data }}}}"
+
+resources:
+    nodes: 1
+
+experiment:
+    name: "step"
+    namespace: "default"
+"""
+
+pipeline_config = """
+name: "flow"
+steps:
+    - name: "preprocess"
+      config: "preprocess.yaml"
+      overrides: ["container.entrypoint=python preprocess.py"]
+      outputs:
+          data: "/data/{{ pipeline.name }}/tokens"
+    - name: "train"
+      config: "train.yaml"
+      depends_on: ["preprocess"]
+      outputs:
+          model: "/data/{{ pipeline.name }}/model"
+    - name: "stats"
+      config: "stats.yaml"
+      depends_on: ["preprocess"]
+    - name: "eval"
+      config: "eval.yaml"
+      depends_on: ["train"]
+      overrides: ["container.entrypoint=python eval.py {{ steps.train.outputs.model }}"]
+"""
+
+
+@pytest.fixture
+def pipeline_path(tmp_path: Path) -> Path:
+    for step in ["preprocess", "train", "stats", "eval"]:
+        (tmp_path / f"{step}.yaml").write_text(step_config.format(script=f"{step}.py"))
+    path = tmp_path / "pipeline.yaml"
+    path.write_text(pipeline_config)
+    return path
+
+
+def env(config):
+    return {var.name: var.value for var in config.container.env}
+
+
+def test_resolves_outputs(pipeline_path: Path):
+    pipeline, configs = load_pipeline(str(pipeline_path))
+
+    assert pipeline.order() == ["preprocess", "train", "stats", "eval"]
+    assert configs["train"].experiment.name == "flow-train"
+    assert configs["train"].experiment.labels == {"kubr.io/pipeline": "flow", "kubr.io/pipeline-step": "train"}
+    assert configs["train"].container.entrypoint == "python train.py --out /data/flow/tokens"
+    assert env(configs["train"]) == {
+        "KUBR_OUTPUT_MODEL": "/data/flow/model",
+        "KUBR_INPUT_PREPROCESS_DATA": "/data/flow/tokens",
+    }
+    assert configs["eval"].container.entrypoint == "python eval.py /data/flow/model"
+
+
+def test_rejects_cycles(tmp_path: Path, pipeline_path: Path):
+    pipeline_path.write_text(
+        pipeline_config.replace('config: "preprocess.yaml"', 'config: "preprocess.yaml"\n      depends_on: ["eval"]')
+    )
+    with pytest.raises(ConfigError, match="cycle"):
+        load_pipeline(str(pipeline_path))
+
+
+def test_submits_steps_as_dependencies_complete(backend, fake_api, pipeline_path: Path):
+    pipeline, configs = load_pipeline(str(pipeline_path))
+    changes = []
+    runner = PipelineRunner(backend, pipeline, configs, on_change=lambda step, state: changes.append((step, state)))
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(runner.run(timeout=10)))
+    thread.start()
+
+    def finish(job_name: str, phase: str):
+        deadline = time.monotonic() + 5
+        while fake_api.get(VOLCANO_JOBS, "default", job_name) is None:
+            assert time.monotonic() < deadline, f"{job_name} was not submitted"
+            time.sleep(0.01)
+        fake_api.set_job_phase("default", job_name, phase)
+
+    finish("flow-preprocess", "Completed")
+    finish("flow-stats", "Completed")
+    finish("flow-train", "Failed")
+    thread.join(timeout=10)
+
+    assert result == {"preprocess": "Completed", "train": "Failed", "stats": "Completed", "eval": STEP_SKIPPED}
+    assert fake_api.get(VOLCANO_JOBS, "default", "flow-eval") is None
+    # the dependents of a step are only submitted once it completed
+    assert changes.index(("preprocess", "Completed")) < changes.index(("train", "Submitted"))
+    # a list and a watch per batch of submitted steps at most, no polling
+    assert fake_api.requests["GET jobs"] <= 6
+
+
+def test_rerun_skips_completed_steps(backend, fake_api, pipeline_path: Path):
+    pipeline, configs = load_pipeline(str(pipeline_path))
+    for step in ["preprocess", "train", "stats", "eval"]:
+        backend.submit_job(configs[step])
+        fake_api.set_job_phase("default", f"flow-{step}", "Completed")
+
+    assert PipelineRunner(backend, pipeline, configs).run(timeout=5) == {
+        "preprocess": "Completed",
+        "train": "Completed",
+        "stats": "Completed",
+        "eval": "Completed",
+    }
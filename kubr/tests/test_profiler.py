@@ -0,0 +1,123 @@
+from pathlib import Path
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.profiler import JobProfiler, ReplicaProfile, group_ranks, parse_dump
+from kubr.commands.profile import format_ranks
+from kubr.config.runner import RunnerConfig
+
+profile_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 4
+
+experiment:
+    name: "hang"
+    namespace: "default"
+"""
+
+WAITING = """Process 71: /usr/bin/python3 -u train.py
+Python v3.10.12 (/usr/bin/python3.10)
+
+Thread 71 (idle): "MainThread"
+    all_reduce (torch/distributed/distributed_c10d.py:{line})
+    train_step (train.py:42)
+    <module> (train.py:80)
+Thread 90 (idle): "Thread-1"
+    wait (threading.py:324)
+"""
+
+LOADING = """Process 71: /usr/bin/python3 -u train.py
+Python v3.10.12 (/usr/bin/python3.10)
+
+Thread 71 (active): "MainThread"
+    read (fsspec/spec.py:1590)
+        Arguments:
+            length: 4096
+    __next__ (data.py:17)
+    train_step (train.py:38)
+    <module> (train.py:80)
+"""
+
+
+class FakeSession:
+    def __init__(self, stdout: str):
+        self.stdout = stdout
+
+    def run_forever(self, timeout=None):
+        pass
+
+    def read_stdout(self):
+        return self.stdout
+
+    def read_stderr(self):
+        return ""
+
+    def close(self):
+        pass
+
+
+def test_parse_dump_skips_locals():
+    main, helper = parse_dump(LOADING + 'Thread 90 (idle): "Thread-1"\n    wait (threading.py:324)\n')
+    assert main.name == "MainThread" and main.active
+    assert main.frames == [
+        "read (fsspec/spec.py:1590)",
+        "__next__ (data.py:17)",
+        "train_step (train.py:38)",
+        "<module> (train.py:80)",
+    ]
+    assert helper.frames == ["wait (threading.py:324)"]
+
+
+def test_straggler_diverges_from_waiting_ranks(backend, monkeypatch, tmp_path: Path):
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, profile_config))
+    dumps = {rank: WAITING.format(line=1536 + rank) for rank in range(4)}
+    dumps[2] = LOADING
+    monkeypatch.setattr(
+        backend,
+        "exec_in_replica",
+        lambda job_name, namespace, command, rank: FakeSession(f"### process 71\n{dumps[rank]}"),
+    )
+
+    profiler = JobProfiler(backend, "hang", "default")
+    profiles = profiler.run()
+    assert [profile.rank for profile in profiles] == [0, 1, 2, 3]
+
+    # line numbers differ between the ranks waiting in the collective, they still group together
+    majority, straggler = group_ranks(profiles)
+    assert majority.ranks == [0, 1, 3] and not majority.diverging
+    assert majority.signature == [
+        "all_reduce (torch/distributed/distributed_c10d.py) <- train_step (train.py) <- <module> (train.py)"
+    ]
+    assert straggler.ranks == [2] and straggler.diverging
+
+    directory = profiler.save(profiles, tmp_path)
+    assert sorted(path.name for path in directory.iterdir()) == [f"rank-{rank}.txt" for rank in range(4)]
+    assert "fsspec/spec.py:1590" in (directory / "rank-2.txt").read_text()
+
+
+def test_recorded_ranks_grouped_by_hottest_function():
+    busy = "process 71;thread (0x1);<module> (train.py:80);step (train.py:42);forward (model.py:{line}) {count}\n"
+    io = "process 71;thread (0x1);<module> (train.py:80);__next__ (data.py:17) {count}\n"
+    profiles = [
+        ReplicaProfile(
+            rank=0, pod="p0", mode="record", processes={71: busy.format(line=10, count=90) + io.format(count=10)}
+        ),
+        ReplicaProfile(
+            rank=1, pod="p1", mode="record", processes={71: busy.format(line=11, count=80) + io.format(count=20)}
+        ),
+        ReplicaProfile(
+            rank=2, pod="p2", mode="record", processes={71: busy.format(line=10, count=30) + io.format(count=70)}
+        ),
+        ReplicaProfile(rank=3, pod="p3", mode="record", error="py-spy is not installed in the container"),
+    ]
+    assert profiles[2].hot_functions()[0] == ("__next__ (data.py)", 0.7)
+    groups = group_ranks(profiles)
+    assert [(group.ranks, group.diverging) for group in groups] == [([0, 1], False), ([2], True), ([3], True)]
+    assert groups[2].signature == ["error: py-spy is not installed in the container"]
+
+
+def test_format_ranks():
+    assert format_ranks([0, 1, 2, 3, 5, 7, 8]) == "0-3, 5, 7-8"
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from kubr.backends.queues import QueueSelector
+
+
+class FakeCustomObjectsApi:
+    def __init__(self, queues):
+        self.queues = queues
+        self.calls = 0
+
+    def list_cluster_custom_object(self, group: str, version: str, plural: str):
+        self.calls += 1
+        return {"items": self.queues}
+
+
+def volcano_queue(name: str, capability=None, allocated=None, state: str = "Open"):
+    spec = {"capability": {"nvidia.com/gpu": capability}} if capability is not None else {}
+    status = {"state": state}
+    if allocated is not None:
+        status["allocated"] = {"nvidia.com/gpu": str(allocated)}
+    return {"metadata": {"name": name}, "spec": spec, "status": status}
+
+
+@pytest.fixture
+def crd_client():
+    return FakeCustomObjectsApi(
+        [
+            volcano_queue("research", capability=32, allocated=24),
+            volcano_queue("prod", capability=64, allocated=40),
+            volcano_queue("closed", capability=64, allocated=0, state="Closed"),
+        ]
+    )
+
+
+class TestQueueSelector:
+    def test_picks_queue_with_most_free_gpus(self, crd_client, tmp_path: Path):
+        selector = QueueSelector(crd_client, cache_path=tmp_path / "queues.json")
+        assert selector.select(gpu=8) == "prod"
+
+    def test_reserves_gpus_in_cached_view(self, crd_client, tmp_path: Path):
+        selector = QueueSelector(crd_client, cache_path=tmp_path / "queues.json")
+        assert [selector.select(gpu=8) for _ in range(3)] == ["prod", "prod", "research"]
+        assert crd_client.calls == 1
+
+    def test_respects_candidates(self, crd_client, tmp_path: Path):
+        selector = QueueSelector(crd_client, cache_path=tmp_path / "queues.json")
+        assert selector.select(gpu=8, candidates=["research"]) == "research"
+        with pytest.raises(ValueError):
+            selector.select(gpu=8, candidates=["closed"])
+
+    def test_expired_cache_is_refreshed(self, crd_client, tmp_path: Path):
+        selector = QueueSelector(crd_client, ttl=-1, cache_path=tmp_path / "queues.json")
+        selector.list_queues()
+        selector.list_queues()
+        assert crd_client.calls == 2
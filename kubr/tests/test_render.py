@@ -0,0 +1,16 @@
+import io
+
+from kubr.commands.utils.render import LogRenderer
+
+
+def test_renderer_batches_lines():
+    output = io.StringIO()
+    with LogRenderer(file=output, refresh_per_second=0.01, max_buffer_lines=3) as renderer:
+        renderer.write("one")
+        renderer.write("two")
+        assert output.getvalue() == ""
+        renderer.write("three")
+        assert output.getvalue() == "one\ntwo\nthree\n"
+        renderer.write("four")
+    assert output.getvalue().endswith("three\nfour\n")
+    assert renderer.plain and renderer.lines == 4
@@ -0,0 +1,139 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.cluster import ClusterBackend
+from kubr.backends.history import HistoryStore
+from kubr.backends.k8s_runner import create_pod_definition
+from kubr.backends.rightsizing import UsageRecorder, config_key, parse_shm_usage, recommend
+from kubr.backends.telemetry import ResourceSample
+from kubr.commands.run import RunCommand
+from kubr.config.job import JobBackend, ResourcePeaks
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import BATCH_JOBS
+
+sized_config = """
+container:
+    image: "jannnash/noop:latest"
+    entrypoint: "python train.py"
+
+resources:
+    nodes: 2
+    gpu: 8
+    cpu: 64
+    memory: 512
+
+experiment:
+    name: "sized"
+    namespace: "default"
+"""
+
+
+def peaks(cpu: float, memory: float, shm: float = None) -> ResourcePeaks:
+    return ResourcePeaks(
+        uid="uid",
+        config_key="key",
+        name="sized",
+        namespace="default",
+        cpu_millicores=cpu,
+        memory_mb=memory,
+        shm_mb=shm,
+        recorded_at=datetime.utcnow(),
+    )
+
+
+def test_config_key_ignores_name_and_requests():
+    config = parse_yaml_raw_as(RunnerConfig, sized_config)
+    renamed = config.model_copy(deep=True)
+    renamed.experiment.name = "sized2"
+    renamed.resources.cpu_request = 8
+    assert config_key(renamed) == config_key(config)
+    renamed.resources.gpu = 4
+    assert config_key(renamed) != config_key(config)
+
+
+def test_requests_from_resources():
+    config = parse_yaml_raw_as(RunnerConfig, sized_config)
+    pod = create_pod_definition("sized", config, None, rank0_env=None, replica_id=0)
+    resources = pod.spec.containers[0].resources
+    assert resources.limits["memory"] == "524288M" and resources.requests["memory"] == "523264M"
+    assert resources.requests["cpu"] == "63900m"
+    assert pod.spec.volumes[0].empty_dir.size_limit is None
+
+    config.resources.cpu_request, config.resources.memory_request, config.resources.shm = 6.5, 1024, 32
+    pod = create_pod_definition("sized", config, None, rank0_env=None, replica_id=0)
+    resources = pod.spec.containers[0].resources
+    # requests never exceed the limits
+    assert resources.requests["memory"] == "524288M"
+    assert resources.requests["cpu"] == "6500m"
+    assert pod.spec.volumes[0].empty_dir.size_limit == "32768Mi"
+
+
+def test_recommend_tightens_requests():
+    config = parse_yaml_raw_as(RunnerConfig, sized_config)
+    rightsizing = recommend([peaks(4000, 60 * 1024, 7 * 1024), peaks(5100, 40 * 1024)], config.resources)
+    assert rightsizing.runs == 2
+    assert rightsizing.cpu_request == pytest.approx(6.4)
+    assert rightsizing.memory_request == pytest.approx(75)
+    assert rightsizing.shm == 9
+
+    # the /dev/shm limit is only suggested, a limit below the usage would evict the pod
+    resources = rightsizing.apply(config.resources)
+    assert (resources.cpu_request, resources.memory_request, resources.shm, resources.cpu) == (6.4, 75, None, 64)
+    assert recommend([peaks(60000, 500 * 1024)], config.resources) is None
+    assert recommend([], config.resources) is None
+
+
+def test_recorder_keeps_peaks_per_config(backend, fake_api, tmp_path: Path):
+    config = parse_yaml_raw_as(RunnerConfig, sized_config)
+    backend.submit_job(config)
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    recorder = UsageRecorder(backend, "sized", "default", store=store)
+
+    def snapshot(cpu: float, memory: float):
+        return [
+            ResourceSample(
+                timestamp=0, pod=f"sized-worker-{rank}-0", rank=rank, cpu_millicores=cpu * (rank + 1), memory_mb=memory
+            )
+            for rank in range(2)
+        ]
+
+    recorder.record(snapshot(1000, 2048))
+    recorder.record(snapshot(500, 4096))
+    (recorded,) = store.peaks(config_key(config))
+    assert (recorded.cpu_millicores, recorded.memory_mb, recorded.shm_mb, recorded.samples) == (2000, 4096, None, 2)
+    assert UsageRecorder(backend, "missing", "default", store=store).record(snapshot(1, 1)) is None
+
+    # jobs of other backends are resolved through the backend owning them
+    config.experiment.name, config.backend, config.resources.nodes = "indexed", JobBackend.Kubernetes, 1
+    cluster = ClusterBackend(api_client=fake_api.api_client())
+    cluster.submit_job(config)
+    recorder = UsageRecorder(cluster, "indexed", "default", store=store)
+    recorder.record(snapshot(1000, 2048))
+    (indexed,) = store.peaks(config_key(config))
+    assert indexed.uid == fake_api.get(BATCH_JOBS, "default", "indexed")["metadata"]["uid"]
+
+
+def test_parse_shm_usage():
+    summary = {
+        "pods": [
+            {
+                "podRef": {"name": "sized-worker-0-0", "namespace": "default"},
+                "volume": [{"name": "dshm", "usedBytes": 2**30}],
+            },
+            {"podRef": {"name": "other", "namespace": "research"}, "volume": [{"name": "dshm", "usedBytes": 1}]},
+        ]
+    }
+    assert parse_shm_usage(summary, "default") == {"sized-worker-0-0": 1024}
+
+
+def test_rightsize_applies_requests_and_suggests_shm(backend, capsys):
+    config = parse_yaml_raw_as(RunnerConfig, sized_config)
+    HistoryStore().record_peaks(peaks(4000, 60 * 1024, 7 * 1024).model_copy(update={"config_key": config_key(config)}))
+
+    RunCommand(backend=backend).rightsize(config, apply=True)
+    assert (config.resources.cpu_request, config.resources.memory_request, config.resources.shm) == (5.0, 75, None)
+    out = capsys.readouterr().out
+    assert "Right-sized from 1 previous runs" in out and "shm unbounded -> 9" in out and "resources.shm" in out
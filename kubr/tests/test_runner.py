@@ -1,8 +1,7 @@
 import pytest
 from pydantic_yaml import parse_yaml_raw_as
 
-from kubr.backends.base import BaseBackend
-from kubr.backends.volcano import VolcanoBackend
+from kubr.backends.base import BaseBackend, JobOperationStatus
 from kubr.config.runner import ExperimentConfig, RunnerConfig
 
 base_config = """
@@ -21,13 +20,14 @@ experiment:
 
 class TestRunner:
     @pytest.fixture
-    def runner(self):
-        backend = VolcanoBackend()
-        runner_cfg = parse_yaml_raw_as(RunnerConfig, base_config)
-        return backend, runner_cfg
+    def runner(self) -> RunnerConfig:
+        return parse_yaml_raw_as(RunnerConfig, base_config)
 
     def test_run(self, backend: BaseBackend, runner: RunnerConfig):
-        backend.run_job(runner)
+        job, status = backend.run_job(runner)
+        assert status == JobOperationStatus.Success
+
+        assert [job.name for job in backend.list_jobs(namespace="default")] == ["pytest-test"]
 
     @pytest.mark.parametrize(
         "name, namespace, queue",
@@ -38,10 +38,9 @@ class TestRunner:
             pytest.param("pytest-test", "test", "test", marks=pytest.mark.xfail),
         ],
     )
-    def test_experiment_base(
-        self, backend: BaseBackend, runner: RunnerConfig, name: str, namespace: str, queue: str, env: dict
-    ):
+    def test_experiment_base(self, backend: BaseBackend, runner: RunnerConfig, name: str, namespace: str, queue: str):
         experiment_config = ExperimentConfig(name=name, namespace=namespace, queue=queue)
         runner.experiment = experiment_config
 
-        backend.run_job(runner)
+        job, status = backend.run_job(runner)
+        assert status == JobOperationStatus.Success
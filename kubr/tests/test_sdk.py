@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr import BatchError, Client
+from kubr.config.job import JobBackend, JobState
+from kubr.config.runner import RunnerConfig
+from kubr.tests.fake_api import BATCH_JOBS, VOLCANO_JOBS
+
+sdk_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 1
+
+experiment:
+    name: "sdk"
+    namespace: "default"
+"""
+
+
+def runner_config(name: str, namespace: str = "default") -> RunnerConfig:
+    config = parse_yaml_raw_as(RunnerConfig, sdk_config)
+    config.experiment.name = name
+    config.experiment.namespace = namespace
+    return config
+
+
+@pytest.fixture
+def sdk(backend):
+    with Client(backend=backend) as sdk_client:
+        yield sdk_client
+
+
+def test_submit_list_delete(sdk, fake_api):
+    jobs = sdk.submit_many([runner_config(f"sweep{i}") for i in range(8)])
+
+    assert [job.name for job in jobs] == [f"sweep{i}" for i in range(8)]
+    assert {job.name for job in sdk.list(namespace="default")} == {job.name for job in jobs}
+
+    sdk.delete_many(jobs)
+    assert fake_api.list(VOLCANO_JOBS, "default") == []
+
+
+def test_submit_many_reports_failures(sdk):
+    sdk.submit(runner_config("taken"))
+
+    with pytest.raises(BatchError) as error:
+        sdk.submit_many([runner_config("fresh"), runner_config("taken"), runner_config("lost", namespace="missing")])
+
+    assert [job.name if job else None for job in error.value.results] == ["fresh", None, None]
+    assert set(error.value.errors) == {1, 2}
+
+
+def test_submit_replace(sdk):
+    sdk.submit(runner_config("again"))
+    assert sdk.submit(runner_config("again"), replace=True).name == "again"
+
+
+def test_wait_many(sdk, fake_api):
+    jobs = sdk.submit_many([runner_config("first"), runner_config("second")])
+    futures = [sdk.wait_async(job) for job in jobs]
+
+    fake_api.set_job_phase("default", "first", "Completed")
+    assert futures[0].result(timeout=5).state == JobState.Completed
+    assert not futures[1].done()
+
+    threading.Timer(0.2, fake_api.set_job_phase, args=("default", "second", "Failed")).start()
+    finished = sdk.wait_many(jobs, timeout=5)
+    assert [job.state for job in finished] == [JobState.Completed, JobState.Failed]
+
+
+def test_wait_timeout(sdk):
+    job = sdk.submit(runner_config("slow"))
+    with pytest.raises(TimeoutError):
+        sdk.wait(job, timeout=0.2)
+
+
+def test_default_backend_runs_every_backend(fake_api, monkeypatch):
+    monkeypatch.setattr("kubr.backends.cluster.shared_api_client", fake_api.api_client)
+    config = runner_config("indexed")
+    config.backend = JobBackend.Kubernetes
+
+    with Client() as client:
+        job = client.submit(config)
+        assert job.backend == JobBackend.Kubernetes
+        assert fake_api.get(BATCH_JOBS, "default", "indexed") is not None
+        assert [job.name for job in client.list(namespace="default")] == ["indexed"]
+        assert client.get("indexed").backend == JobBackend.Kubernetes
+
+        threading.Timer(0.2, fake_api.set_batch_job_state, args=("default", "indexed", "Complete")).start()
+        assert client.wait(job, timeout=5).state == JobState.Completed
+        client.delete(job)
+    assert fake_api.get(BATCH_JOBS, "default", "indexed") is None
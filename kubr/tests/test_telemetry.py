@@ -0,0 +1,53 @@
+import pytest
+
+from kubr.backends.telemetry import (
+    DCGM_GPU_UTIL,
+    ResourceSample,
+    aggregate,
+    find_straggler,
+    parse_cpu_millicores,
+    parse_dcgm_metrics,
+    parse_memory_mb,
+)
+
+dcgm_page = """
+# HELP DCGM_FI_DEV_GPU_UTIL GPU utilization (in %).
+# TYPE DCGM_FI_DEV_GPU_UTIL gauge
+DCGM_FI_DEV_GPU_UTIL{gpu="0",UUID="GPU-1",pod="train-worker-0-0",namespace="default"} 97
+DCGM_FI_DEV_GPU_UTIL{gpu="1",UUID="GPU-2",pod="train-worker-0-0",namespace="default"} 93
+DCGM_FI_DEV_GPU_UTIL{gpu="2",UUID="GPU-3",pod="other-0",namespace="research"} 10
+DCGM_FI_DEV_FB_USED{gpu="0",UUID="GPU-1",pod="train-worker-0-0",namespace="default"} 40000
+"""
+
+
+@pytest.mark.parametrize("quantity, millicores", [("250m", 250), ("2", 2000), ("1500000n", 1.5), ("2500u", 2.5)])
+def test_parse_cpu(quantity: str, millicores: float):
+    assert parse_cpu_millicores(quantity) == pytest.approx(millicores)
+
+
+@pytest.mark.parametrize("quantity, mb", [("1024Ki", 1), ("2Gi", 2048), ("1048576", 1)])
+def test_parse_memory(quantity: str, mb: float):
+    assert parse_memory_mb(quantity) == pytest.approx(mb)
+
+
+def test_parse_dcgm_filters_namespace():
+    metrics = parse_dcgm_metrics(dcgm_page, namespace="default")
+    assert list(metrics) == ["train-worker-0-0"]
+    assert metrics["train-worker-0-0"][DCGM_GPU_UTIL] == [97, 93]
+
+
+def test_straggler_is_lowest_gpu_rank():
+    samples = [
+        ResourceSample(timestamp=t, pod=f"p{rank}", rank=rank, node=f"n{rank // 2}", gpu_util=util)
+        for t in range(2)
+        for rank, util in enumerate([95, 94, 40, 96])
+    ]
+    by_rank = aggregate(samples, by="rank")
+    assert [s.key for s in by_rank] == ["0", "1", "2", "3"]
+    assert find_straggler(by_rank) == "2"
+    assert [s.key for s in aggregate(samples, by="node")] == ["n0", "n1"]
+
+
+def test_balanced_job_has_no_straggler():
+    samples = [ResourceSample(timestamp=0, pod=f"p{r}", rank=r, gpu_util=90 + r) for r in range(4)]
+    assert find_straggler(aggregate(samples)) is None
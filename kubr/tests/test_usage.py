@@ -0,0 +1,121 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.history import HistoryStore
+from kubr.backends.usage import gpu_usage
+from kubr.backends.utils import current_user
+from kubr.backends.volcano import VolcanoBackend
+from kubr.config.job import JobRecord
+from kubr.config.runner import RunnerConfig
+
+usage_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+    gpu: 4
+
+experiment:
+    name: "accounted"
+    namespace: "default"
+"""
+
+NOW = datetime(2024, 6, 1)
+
+
+def record(index: int, user: str, start_hours: float, end_hours: float, state: str = "Completed", **kwargs):
+    started = NOW - timedelta(hours=start_hours)
+    return JobRecord(
+        uid=f"uid-{index}",
+        name=f"job-{index}",
+        namespace="research",
+        state=state,
+        queue="default",
+        user=user,
+        gpu=8,
+        created_at=started - timedelta(hours=1),
+        started_at=started,
+        finished_at=NOW - timedelta(hours=end_hours),
+        archived_at=NOW,
+        **kwargs,
+    )
+
+
+def test_usage_clips_jobs_to_period(tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    store.archive(
+        [
+            # 10 hours, 4 of them in the period
+            record(0, "alice", start_hours=30, end_hours=20),
+            record(1, "alice", start_hours=5, end_hours=3),
+            record(2, "bob", start_hours=2, end_hours=1, state="Failed"),
+            # ended before the period
+            record(3, "bob", start_hours=50, end_hours=40),
+        ]
+    )
+    # deleted while pending, it never held its GPUs
+    pending = record(4, "bob", start_hours=2, end_hours=1).model_copy(update={"state": "Pending", "started_at": None})
+    store.archive([pending])
+
+    alice, bob = store.usage("user", since=NOW - timedelta(hours=24), until=NOW)
+    assert (alice.key, alice.gpu_hours, alice.jobs) == ("alice", pytest.approx(8 * 6), 2)
+    assert (bob.key, bob.gpu_hours, bob.jobs) == ("bob", pytest.approx(8), 1)
+    (research,) = store.usage("namespace", since=NOW - timedelta(hours=24), until=NOW)
+    assert research.gpu_hours == pytest.approx(8 * 7)
+
+    with pytest.raises(ValueError):
+        store.usage("name; DROP TABLE jobs", since=NOW)
+
+
+def test_history_without_usage_columns_is_migrated(tmp_path: Path):
+    path = tmp_path / "history.sqlite3"
+    connection = sqlite3.connect(str(path))
+    connection.execute(
+        "CREATE TABLE jobs (uid TEXT PRIMARY KEY, name TEXT NOT NULL, namespace TEXT NOT NULL, state TEXT NOT NULL, "
+        "queue TEXT, gpu INTEGER NOT NULL, nodes INTEGER NOT NULL, created_at REAL NOT NULL, finished_at REAL, "
+        "archived_at REAL NOT NULL, spec TEXT, status TEXT, logs_tail TEXT)"
+    )
+    now = NOW.replace(tzinfo=timezone.utc).timestamp()
+    created, finished = now - 3 * 3600, now - 3600
+    connection.execute(
+        "INSERT INTO jobs VALUES ('uid-0', 'old', 'research', 'Completed', 'default', 8, 1, ?, ?, ?, NULL, NULL, NULL)",
+        [created, finished, finished],
+    )
+    connection.commit()
+    connection.close()
+
+    store = HistoryStore(path)
+    (old,) = store.query()
+    assert old.user is None and old.started_at is None
+    # without a start time the job counts from its creation
+    (row,) = store.usage("user", since=NOW - timedelta(days=1), until=NOW)
+    assert (row.key, row.gpu_hours) == (None, pytest.approx(16))
+
+
+def test_usage_adds_running_jobs(fake_api, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("KUBR_USER", "Alice Smith")
+    assert current_user() == "AliceSmith"
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    backend = VolcanoBackend(api_client=fake_api.api_client(), history=store)
+    config = parse_yaml_raw_as(RunnerConfig, usage_config)
+    for name in ["finished", "running", "queued"]:
+        config.experiment.name = name
+        backend.submit_job(config)
+    fake_api.set_job_phase("default", "finished", "Running")
+    fake_api.set_job_phase("default", "finished", "Completed")
+    fake_api.set_job_phase("default", "running", "Running")
+
+    assert backend.archive_finished_jobs() == 1
+    (finished,) = store.query()
+    assert finished.user == "AliceSmith" and finished.started_at is not None
+
+    until = datetime.utcnow() + timedelta(hours=1)
+    (row,) = gpu_usage(store, "user", since=until - timedelta(days=1), until=until, live_jobs=backend.list_jobs())
+    assert (row.key, row.jobs, row.running) == ("AliceSmith", 2, 1)
+    # both jobs ran within the last seconds, up to an hour from now only the running one holds its 8 GPUs
+    assert row.gpu_hours == pytest.approx(8, abs=0.1)
@@ -0,0 +1,63 @@
+import threading
+
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.waiter import JobTracker
+from kubr.commands.wait import EXIT_COMPLETED, EXIT_FAILED, EXIT_TIMEOUT, WaitCommand
+from kubr.config.job import JobState
+from kubr.config.runner import RunnerConfig
+
+wait_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 1
+
+experiment:
+    name: "wait"
+    namespace: "default"
+    labels:
+        sweep: "lr"
+"""
+
+
+def submit(backend, name: str):
+    config = parse_yaml_raw_as(RunnerConfig, wait_config)
+    config.experiment.name = name
+    return backend.submit_job(config)
+
+
+def test_tracks_many_jobs_over_one_watch(backend, fake_api):
+    names = [f"job{i}" for i in range(40)]
+    for name in names:
+        submit(backend, name)
+    fake_api.set_job_phase("default", "job0", "Completed")
+    finished = []
+    tracker = JobTracker(backend, namespace="default", on_finish=finished.append)
+
+    futures = tracker.track_many([(name, "default") for name in names[:20]])
+    futures += tracker.track_many([(name, "default") for name in names[20:]])
+    for name in names[1:]:
+        fake_api.set_job_phase("default", name, "Failed" if name == "job7" else "Completed")
+
+    states = {future.result(timeout=10).name: future.result().state for future in futures}
+    assert states["job7"] == JobState.Failed
+    assert sum(state == JobState.Completed for state in states.values()) == 39
+    assert len(finished) == 40
+    # a list per registered batch plus the watch, independent of the number of jobs
+    assert fake_api.requests["GET jobs"] <= 3
+
+
+def test_wait_command_exit_codes(backend, fake_api):
+    for name in ["first", "second"]:
+        submit(backend, name)
+    command = WaitCommand(backend=backend)
+
+    assert command(jobs=["first"], timeout=0.3) == EXIT_TIMEOUT
+
+    threading.Timer(0.2, fake_api.set_job_phase, args=("default", "first", "Completed")).start()
+    threading.Timer(0.3, fake_api.set_job_phase, args=("default", "second", "Completed")).start()
+    assert command(jobs=[], selector="sweep=lr", timeout=10) == EXIT_COMPLETED
+
+    assert command(jobs=["first", "missing"], timeout=10) == EXIT_FAILED
@@ -0,0 +1,148 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from pydantic_yaml import parse_yaml_raw_as
+
+from kubr.backends.telemetry import ResourceSample
+from kubr.backends.watchdog import JobWatchdog, StallReport
+from kubr.config.runner import RunnerConfig, WatchdogConfig
+from kubr.tests.fake_api import COMMANDS, VOLCANO_JOBS
+
+watchdog_config = """
+container:
+    image: "jannnash/noop:latest"
+
+resources:
+    nodes: 2
+    gpu: 8
+
+experiment:
+    name: "stuck"
+    namespace: "default"
+    watchdog:
+        log_idle_minutes: 0.001
+        gpu_idle_minutes: null
+        grace_minutes: 0.001
+        interval_seconds: 0.05
+"""
+
+
+class GpuUtilization:
+    """Telemetry stub reporting the same GPU utilization for both replicas."""
+
+    def __init__(self, util: float):
+        self.util = util
+
+    def sample(self) -> List[ResourceSample]:
+        return [
+            ResourceSample(timestamp=time.time(), pod=f"stuck-worker-{rank}-0", rank=rank, gpu_util=self.util)
+            for rank in range(2)
+        ]
+
+
+def wait_for(condition, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def start(watchdog: JobWatchdog) -> threading.Thread:
+    thread = threading.Thread(target=lambda: setattr(watchdog, "result", watchdog.run()), daemon=True)
+    thread.start()
+    return thread
+
+
+def test_idle_logs_notify_with_diagnostics(backend, fake_api, tmp_path: Path):
+    config = parse_yaml_raw_as(RunnerConfig, watchdog_config)
+    backend.submit_job(config)
+    assert backend.get_watchdog_config("stuck", "default") == config.experiment.watchdog
+    fake_api.set_job_phase("default", "stuck", "Running", pod_phase="Running")
+    fake_api.set_logs("default", "stuck-worker-0-0", ["loading data"])
+
+    reports: List[StallReport] = []
+    watchdog = JobWatchdog(
+        backend, "stuck", "default", config.experiment.watchdog, on_stall=reports.append, diagnostics_dir=tmp_path
+    )
+    thread = start(watchdog)
+    wait_for(lambda: reports)
+    fake_api.set_job_phase("default", "stuck", "Completed", pod_phase="Succeeded")
+    thread.join(10)
+
+    assert [report.action for report in reports] == ["notify"]
+    assert watchdog.result == reports[0]
+    assert reports[0].reason.startswith("no log lines")
+    diagnostics = Path(reports[0].diagnostics)
+    assert sorted(path.name for path in diagnostics.iterdir()) == [
+        "describe.json",
+        "reason.txt",
+        "samples.json",
+        "stuck-worker-0-0.log",
+        "stuck-worker-1-0.log",
+    ]
+    assert "loading data" in (diagnostics / "stuck-worker-0-0.log").read_text()
+    # notify only reports, the job is left alone
+    assert fake_api.get(VOLCANO_JOBS, "default", "stuck") is not None
+
+
+@pytest.mark.parametrize("action", ["delete", "restart"])
+def test_idle_gpus_are_reaped_after_grace(backend, fake_api, tmp_path: Path, action: str):
+    config = parse_yaml_raw_as(RunnerConfig, watchdog_config)
+    backend.submit_job(config)
+    fake_api.set_job_phase("default", "stuck", "Running", pod_phase="Running")
+
+    settings = WatchdogConfig(
+        log_idle_minutes=None, gpu_idle_minutes=0.001, grace_minutes=0.001, interval_seconds=0.05, action=action
+    )
+    reports: List[StallReport] = []
+    watchdog = JobWatchdog(
+        backend,
+        "stuck",
+        "default",
+        settings,
+        telemetry=GpuUtilization(1),
+        on_stall=reports.append,
+        diagnostics_dir=tmp_path,
+    )
+    thread = start(watchdog)
+    wait_for(lambda: len(reports) == 2)
+
+    assert [report.action for report in reports] == ["notify", action]
+    assert "GPU utilization below 5%" in reports[0].reason
+    if action == "delete":
+        thread.join(10)
+        assert fake_api.get(VOLCANO_JOBS, "default", "stuck") is None
+    else:
+        assert fake_api.get(VOLCANO_JOBS, "default", "stuck")["status"]["state"]["phase"] == "Restarting"
+        (command,) = fake_api.list(COMMANDS, "default")
+        assert command["action"] == "RestartJob" and command["target"]["name"] == "stuck"
+        fake_api.set_job_phase("default", "stuck", "Failed")
+        thread.join(10)
+    assert watchdog.result.action == action
+
+
+def test_busy_gpus_are_not_stalled(backend, fake_api, tmp_path: Path):
+    config = WatchdogConfig(log_idle_minutes=None, gpu_idle_minutes=1)
+    watchdog = JobWatchdog(backend, "stuck", "default", config, telemetry=GpuUtilization(80), diagnostics_dir=tmp_path)
+    now = time.time()
+    watchdog.reset(now)
+    assert watchdog.check(now + 60) is None
+    watchdog.telemetry = GpuUtilization(0)
+    assert watchdog.check(now + 61) is None
+    assert watchdog.check(now + 120).startswith("GPU utilization below 5%")
+
+
+def test_stops_when_job_is_deleted(backend, fake_api, tmp_path: Path):
+    backend.submit_job(parse_yaml_raw_as(RunnerConfig, watchdog_config))
+    fake_api.set_job_phase("default", "stuck", "Running", pod_phase="Running")
+    settings = WatchdogConfig(log_idle_minutes=None, gpu_idle_minutes=None, interval_seconds=0.05)
+    watchdog = JobWatchdog(backend, "stuck", "default", settings, diagnostics_dir=tmp_path)
+    thread = start(watchdog)
+
+    fake_api.throttle(2)
+    fake_api.remove(VOLCANO_JOBS, "default", "stuck")
+    thread.join(5)
+    assert not thread.is_alive() and watchdog.result is None